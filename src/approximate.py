@@ -0,0 +1,313 @@
+"""
+Este módulo oferece um modo aproximado e rápido das três hipóteses, para análises
+exploratórias que não precisam de respostas exatas. Partidas inteiras são sorteadas
+durante a leitura de events.csv: cada linha é mantida ou descartada pelo primeiro campo
+(id_odsp) antes de ser convertida, de modo que as partidas fora da amostra nunca são
+carregadas em memória. Como as partidas são mantidas completas, as sequências de eventos
+usadas por head.py continuam intactas.
+
+O sorteio é determinístico: cada partida entra na amostra se o hash do seu id_odsp cair
+abaixo da taxa de amostragem. As contagens são reescaladas pela taxa, e cada porcentagem
+vem acompanhada de uma margem de erro de 95%, calculada com o estimador de razão para
+amostragem por conglomerados (cada partida é um conglomerado).
+
+Funções
+-------
+match_in_sample(match_id, rate, seed):
+    Indica se uma partida pertence à amostra.
+
+load_sampled_dataset(csv_path, rate, seed):
+    Carrega apenas os eventos das partidas sorteadas.
+
+ratio_estimates(y, x, rate):
+    Estima razões e margens de erro a partir de totais por partida.
+
+matches_approximate(df, rate):
+    Hipótese 1 com margens de erro.
+
+shots_approximate(df, rate, locations_inside, excluded_locations):
+    Hipótese 3 com margens de erro.
+
+head_approximate(df, rate, time_window):
+    Hipótese 2 com margens de erro.
+
+approximate_main(csv_path, rate, seed):
+    Função principal que executa o modo aproximado e exibe os resultados.
+"""
+
+import io
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, headed_goal_origin_codes, origins_from_counts
+from head import graph_view as head_graph_view
+from matches import calculate_results, group_goals_by_match, summary_from_results
+from matches import graph_view as matches_graph_view
+from shots import (count_shot_outcomes, goals_percentages, graph_view_shot_outcome,
+                   prepare_shots, shot_outcome_count_from_counts, shot_outcome_percentages)
+from utils import print_dataframe
+from writer import run_output_dir
+
+# Valor da normal padrão para intervalos de 95%
+Z_95 = 1.96
+
+
+def match_in_sample(match_id: str, rate: float, seed: int = 0) -> bool:
+    """Indica se uma partida pertence à amostra. A decisão depende apenas do id da
+    partida, da taxa e da semente, e uma amostra com taxa menor está sempre contida em
+    uma amostra com taxa maior e a mesma semente.
+
+    Args:
+        match_id (str): Valor de 'id_odsp' da partida.
+        rate (float): Fração das partidas a ser sorteada, entre 0 e 1.
+        seed (int): Semente do sorteio.
+
+    Returns:
+        bool: True se a partida pertence à amostra.
+    """
+    return zlib.crc32(f'{seed}:{match_id}'.encode('utf-8')) < rate * 2 ** 32
+
+
+def load_sampled_dataset(csv_path: str, rate: float, seed: int = 0) -> pd.DataFrame:
+    """Carrega apenas os eventos das partidas sorteadas. Os eventos são filtrados pelo
+    primeiro campo (id_odsp) ainda como bytes, e só os eventos mantidos são convertidos
+    em DataFrame. Um evento com um campo entre aspas de várias linhas é mantido ou
+    descartado inteiro.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos, com 'id_odsp' como primeira coluna.
+        rate (float): Fração das partidas a ser sorteada, entre 0 (exclusivo) e 1.
+        seed (int): Semente do sorteio.
+
+    Returns:
+        pd.DataFrame: Eventos das partidas sorteadas, na ordem do arquivo.
+
+    Raises:
+        TypeError: Se `csv_path` não for uma string.
+        ValueError: Se `rate` não estiver entre 0 e 1 ou a primeira coluna não for
+        'id_odsp'.
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    # Tratamento de Erro
+    if not isinstance(csv_path, str):
+        raise TypeError("O parâmetro 'csv_path' deve ser uma string")
+
+    if not 0 < rate <= 1:
+        raise ValueError("O parâmetro 'rate' deve estar entre 0 (exclusivo) e 1")
+
+    try:
+        file = open(csv_path, 'rb')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"O arquivo '{csv_path}' não foi encontrado")
+
+    # Código Principal
+    with file:
+        header = file.readline()
+        if header.split(b',', 1)[0].strip().strip(b'"') != b'id_odsp':
+            raise ValueError("A primeira coluna do arquivo deve ser 'id_odsp'")
+
+        kept = [header]
+        current_match, keep = None, False
+        record, quote_parity = b'', 0
+        for line in file:
+            # Uma quebra de linha dentro de aspas (um 'text' com várias linhas) não
+            # termina o evento: as linhas são juntadas até a paridade das aspas fechar
+            record += line
+            quote_parity = (quote_parity + line.count(b'"')) % 2
+            if quote_parity:
+                continue
+            line, record = record, b''
+
+            match = line[:line.find(b',')]
+            if match != current_match:
+                # Os eventos de uma partida são consecutivos: um sorteio por partida
+                current_match = match
+                keep = match_in_sample(match.strip(b'"').decode('utf-8'), rate, seed)
+            if keep:
+                kept.append(line)
+        if record and keep:
+            # Último evento com aspas sem fechamento: fica para o pandas reportar
+            kept.append(record)
+
+    return pd.read_csv(io.BytesIO(b''.join(kept)))
+
+
+def ratio_estimates(y: np.ndarray, x: np.ndarray, rate: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Estima as razões sum(y) / sum(x) e as margens de erro de 95% a partir dos totais de
+    cada partida sorteada (estimador de razão para amostragem por conglomerados, com
+    correção de população finita).
+
+    Args:
+        y (np.ndarray): Matriz partidas x categorias com os totais de cada categoria.
+        x (np.ndarray): Vetor com o total de referência de cada partida.
+        rate (float): Taxa de amostragem usada no sorteio.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: As razões e as margens de erro de cada categoria
+        (NaN se houver menos de duas partidas).
+    """
+    y = np.asarray(y, dtype=float).reshape(len(x), -1)
+    x = np.asarray(x, dtype=float)
+    n_matches, total = x.size, x.sum()
+    if total == 0:
+        nan = np.full(y.shape[1], np.nan)
+        return nan, nan
+
+    ratios = y.sum(axis=0) / total
+    if n_matches < 2:
+        return ratios, np.full(y.shape[1], np.nan)
+
+    residuals = y - ratios * x[:, None]
+    variance = (1 - rate) * residuals.var(axis=0, ddof=1) * n_matches / total ** 2
+    return ratios, Z_95 * np.sqrt(variance)
+
+
+def matches_approximate(df: pd.DataFrame, rate: float) -> pd.DataFrame:
+    """Calcula a hipótese 1 a partir de uma amostra de partidas.
+
+    Args:
+        df (pd.DataFrame): Eventos carregados por `load_sampled_dataset`.
+        rate (float): Taxa de amostragem usada no sorteio.
+
+    Returns:
+        pd.DataFrame: DataFrame no formato de create_summary_dataframe com as colunas
+        adicionais 'margin' (margem de erro, em pontos percentuais) e 'estimated_count'
+        (número estimado de partidas no dataset completo).
+    """
+    results = calculate_results(group_goals_by_match(df))['result'].to_numpy()
+    indicators = np.column_stack([results == 1, results == 0, results == -1])
+
+    summary_df = summary_from_results(*indicators.sum(axis=0))
+    _, margins = ratio_estimates(indicators, np.ones(len(results)), rate)
+    summary_df['margin'] = (margins * 100).round(2)
+    summary_df['estimated_count'] = (indicators.sum(axis=0) / rate).round().astype('int64')
+    return summary_df
+
+
+def shots_approximate(df: pd.DataFrame, rate: float,
+                      locations_inside: Optional[List[int]] = None,
+                      excluded_locations: Optional[List[int]] = None
+                      ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Calcula a hipótese 3 a partir de uma amostra de partidas.
+
+    Args:
+        df (pd.DataFrame): Eventos carregados por `load_sampled_dataset`.
+        rate (float): Taxa de amostragem usada no sorteio.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Os DataFrames de shots_summary com as colunas
+        adicionais 'Margem' e 'Estimativa' (gols) e 'Margem_in', 'Margem_out',
+        'Estimativa_in' e 'Estimativa_out' (chutes).
+    """
+    shots = prepare_shots(df, locations_inside, excluded_locations)
+    shots = shots.assign(id_odsp=df.loc[shots.index, 'id_odsp'])
+
+    # Gols dentro e fora da área, por partida
+    goals = shots[shots['is_goal'] == 1]
+    per_match = pd.crosstab(goals['id_odsp'], goals['situation']).reindex(
+        columns=['inside', 'outside'], fill_value=0)
+    totals = per_match.sum(axis=0)
+    stats_goals = goals_percentages(totals['inside'], totals['outside'], totals.sum())
+    _, margins = ratio_estimates(per_match.to_numpy(), per_match.sum(axis=1).to_numpy(), rate)
+    stats_goals['Margem'] = (margins * 100).round(2)
+    stats_goals['Estimativa'] = (totals.to_numpy() / rate).round().astype('int64')
+
+    # Resultados dos chutes, com as mesmas categorias de shot_outcome_count
+    attempts = shot_outcome_count_from_counts(*count_shot_outcomes(shots))
+    perc_attempts = shot_outcome_percentages(attempts.copy())
+    for situation, suffix in [('inside', 'in'), ('outside', 'out')]:
+        selected = shots[(shots['situation'] == situation) &
+                         shots['shot_outcome'].isin(attempts['Resultado'])]
+        per_match = pd.crosstab(selected['id_odsp'], selected['shot_outcome']).reindex(
+            columns=attempts['Resultado'], fill_value=0)
+        _, margins = ratio_estimates(per_match.to_numpy(), per_match.sum(axis=1).to_numpy(),
+                                     rate)
+        perc_attempts[f'Margem_{suffix}'] = (margins * 100).round(2)
+        perc_attempts[f'Estimativa_{suffix}'] = (attempts[f'count_{suffix}'] / rate).round() \
+            .astype('int64')
+
+    return stats_goals, perc_attempts
+
+
+def head_approximate(df: pd.DataFrame, rate: float,
+                     time_window: float = HEADER_TIME_WINDOW) -> pd.DataFrame:
+    """Calcula a hipótese 2 a partir de uma amostra de partidas. Cada gol de cabeça é
+    classificado pelo evento anterior da mesma partida, com a regra de
+    headed_goal_origin_codes.
+
+    Args:
+        df (pd.DataFrame): Eventos carregados por `load_sampled_dataset`.
+        rate (float): Taxa de amostragem usada no sorteio.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
+
+    Returns:
+        pd.DataFrame: DataFrame no formato de origin_of_headed_goals com as colunas
+        adicionais 'MARGEM' e 'ESTIMATIVA'.
+    """
+    # 0: escanteios, 1: faltas, 2: impedimentos, 3: outros (ver head.py)
+    codes = headed_goal_origin_codes(df, True, time_window)
+    counted = codes >= 0
+    match_codes, match_ids = pd.factorize(df['id_odsp'].to_numpy()[counted])
+
+    labels = ['corners', 'fouls', 'offsides', 'others']
+    per_match = pd.DataFrame(
+        np.bincount(match_codes * len(labels) + codes[counted],
+                    minlength=len(match_ids) * len(labels)).reshape(-1, len(labels)),
+        index=match_ids, columns=labels)
+    counts = {label: int(per_match[label].sum()) for label in labels}
+
+    percent_of_origins = origins_from_counts(counts)
+    if 'ORIGEM' not in percent_of_origins.columns:
+        return percent_of_origins
+
+    # Mesma ordem de linhas de origins_from_counts
+    per_match.insert(3, 'set_pieces', per_match[['corners', 'fouls', 'offsides']].sum(axis=1))
+    _, margins = ratio_estimates(per_match.to_numpy(),
+                                 per_match[labels].sum(axis=1).to_numpy(), rate)
+    percent_of_origins['MARGEM'] = (margins * 100).round(2)
+    percent_of_origins['ESTIMATIVA'] = (per_match.sum(axis=0).to_numpy() / rate).round() \
+        .astype('int64')
+    return percent_of_origins
+
+
+def approximate_main(csv_path: str = '../data/events.csv', rate: float = 0.1,
+                     seed: int = 0, output_dir: Optional[str] = None) -> None:
+    """Função principal do modo aproximado: carrega uma amostra das partidas, calcula as
+    três hipóteses com margens de erro e exibe os resultados. Os gráficos são gravados
+    em um diretório de execução próprio e não são publicados em ../data, onde ficam os
+    gráficos do modo exato (ver writer.py).
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        rate (float): Fração das partidas a ser sorteada.
+        seed (int): Semente do sorteio.
+        output_dir (Optional[str]): Diretório dos gráficos. Padrão: um novo diretório
+                                    criado por `run_output_dir`.
+    """
+    if output_dir is None:
+        output_dir = run_output_dir()
+
+    df = load_sampled_dataset(csv_path, rate, seed)
+    print(f"Modo aproximado: {df['id_odsp'].nunique()} partidas sorteadas (taxa {rate})")
+    print(f"Gráficos gravados em {output_dir}")
+
+    summary_df = matches_approximate(df, rate)
+    matches_graph_view(summary_df, output_dir)
+    print_dataframe(summary_df, "RESULTADOS DOS JOGOS (APROXIMADO)")
+
+    stats_goals, perc_attempts = shots_approximate(df, rate)
+    print_dataframe(stats_goals, "ESTATÍSTICAS POR GOL (APROXIMADO)")
+    print_dataframe(perc_attempts, "ESTATÍSTICAS POR CHUTE (APROXIMADO)")
+    graph_view_shot_outcome(perc_attempts[['Resultado', 'Porcentagem_in', 'Porcentagem_out']],
+                            output_dir)
+
+    percent_of_origins = head_approximate(df, rate)
+    print_dataframe(percent_of_origins, "ORIGEM DOS GOLS DE CABEÇA (APROXIMADO)")
+    if 'ORIGEM' in percent_of_origins.columns:
+        head_graph_view(percent_of_origins, output_dir)
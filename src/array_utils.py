@@ -0,0 +1,328 @@
+"""
+Este módulo reimplementa as funções de manipulação de utils.py sobre tabelas de arrays
+NumPy, em vez de DataFrames. Uma tabela é um dicionário {coluna: array} com arrays do
+mesmo tamanho, ou um array estruturado do NumPy. As funções têm os mesmos nomes,
+parâmetros, resultados e erros das versões de utils.py, e podem substituí-las nas análises
+que aplicam os filtros a milhares de recortes pequenos (por partida ou por time), em que o
+custo de criar e validar um DataFrame a cada chamada domina o tempo total.
+
+Diferenças em relação a utils.py: as tabelas não têm índice (as linhas filtradas são
+renumeradas a partir de zero), e os filtros combinam todas as condições em uma única
+máscara antes de recortar os arrays.
+
+Funções
+-------
+to_arrays(df):
+    Converte um DataFrame em um dicionário de arrays.
+
+to_dataframe(df):
+    Converte uma tabela de arrays em um DataFrame.
+
+remove_columns(df, columns):
+    Remove colunas da tabela.
+
+filter_df(df, conditions):
+    Mantém as linhas em que cada coluna tem o valor pedido.
+
+remove_lines_by_condition(df, column, conditions):
+    Remove as linhas em que a coluna tem algum dos valores dados.
+
+map_column_values(df, column, map):
+    Mapeia os valores de uma coluna com um dicionário.
+
+split_table(df, column):
+    Separa a tabela em uma tabela por valor de uma coluna.
+"""
+
+from numbers import Number
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+Table = Union[Dict[str, np.ndarray], np.ndarray]
+
+
+def _is_table(df: Any) -> bool:
+    """Verifica se `df` é um dicionário de arrays ou um array estruturado."""
+    if isinstance(df, dict):
+        return True
+    return isinstance(df, np.ndarray) and df.dtype.names is not None
+
+
+def _columns(df: Table):
+    """Nomes das colunas da tabela."""
+    return df.keys() if isinstance(df, dict) else df.dtype.names
+
+
+def _n_rows(df: Table) -> int:
+    """Número de linhas da tabela."""
+    if isinstance(df, dict):
+        return len(next(iter(df.values()))) if df else 0
+    return df.shape[0]
+
+
+def _check_table(df: Any) -> None:
+    """Lança TypeError se `df` não for uma tabela de arrays."""
+    if not _is_table(df):
+        raise TypeError("O parâmetro 'df' deve ser um dicionário de arrays NumPy "
+                        "ou um array estruturado.")
+
+
+def _take(df: Table, rows: np.ndarray) -> Table:
+    """Seleciona as linhas de `rows` (máscara ou posições) em todas as colunas."""
+    if isinstance(df, dict):
+        return {column: values[rows] for column, values in df.items()}
+    return df[rows]
+
+
+def _equals(values: np.ndarray, value: Any) -> np.ndarray:
+    """Compara os valores de uma coluna com um valor, sempre devolvendo uma máscara."""
+    mask = values == value
+    if np.ndim(mask) == 0:
+        mask = np.full(values.shape[0], bool(mask))
+    return mask
+
+
+def to_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Converte um DataFrame em um dicionário {coluna: array}, sem o índice.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser convertido.
+
+    Returns:
+        Dict[str, np.ndarray]: Os valores de cada coluna.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    return {column: df[column].to_numpy() for column in df.columns}
+
+
+def to_dataframe(df: Table) -> pd.DataFrame:
+    """Converte uma tabela de arrays em um DataFrame, com índice a partir de zero.
+
+    Args:
+        df (Table): Dicionário de arrays ou array estruturado.
+
+    Returns:
+        pd.DataFrame: DataFrame com as mesmas colunas.
+
+    Raises:
+        TypeError: Se `df` não for uma tabela de arrays.
+    """
+    _check_table(df)
+
+    if isinstance(df, dict):
+        return pd.DataFrame(df)
+    return pd.DataFrame({column: df[column] for column in df.dtype.names})
+
+
+def remove_columns(df: Table, columns: List[str]) -> Table:
+    """Remove colunas da tabela. O dicionário é modificado; no array estruturado, o
+    resultado é uma visão com as demais colunas.
+
+    Args:
+        df (Table): Tabela a ser recebida pela função.
+        columns (List[str]): Lista com os nomes das colunas a serem deletadas.
+
+    Returns:
+        Table: A tabela sem as colunas.
+
+    Raises:
+        TypeError: Se `df` não for uma tabela de arrays ou `columns` não for uma lista.
+        KeyError: Se alguma coluna em `columns` não existir na tabela.
+    """
+    # Tratamento de Erro
+    _check_table(df)
+
+    if not isinstance(columns, list):
+        raise TypeError("O parâmetro 'columns' deve ser uma lista")
+
+    missing_columns = set(columns) - set(_columns(df))
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+
+    # Código Principal
+    if isinstance(df, dict):
+        for column in columns:
+            del df[column]
+        return df
+
+    return df[[column for column in df.dtype.names if column not in columns]]
+
+
+def filter_df(df: Table, conditions: Dict[str, Union[str, int, float]]) -> Table:
+    """Filtra a tabela com base em valores específicos de colunas dadas.
+
+    Args:
+        df (Table): Tabela a ser recebida pela função.
+        conditions (Dict[str, Union[str, int, float]]): Condições a serem usadas
+        pelo filtro.
+
+    Returns:
+        Table: Nova tabela contendo apenas as linhas que atendem às condições.
+
+    Raises:
+        TypeError: Se `df` não for uma tabela de arrays ou `conditions` não for um
+                   dicionário.
+        KeyError: Se alguma coluna em `conditions` não existir na tabela.
+
+    Examples:
+        >>> table = {'ID': np.array([1, 2, 3]), 'Nota': np.array([7.0, 8.5, 7.0])}
+        >>> filter_df(table, {'Nota': 7.0})
+        {'ID': array([1, 3]), 'Nota': array([7., 7.])}
+    """
+    # Tratamento de Erro
+    _check_table(df)
+
+    if not isinstance(conditions, dict):
+        raise TypeError("O parâmetro 'conditions' deve ser um dicionário")
+
+    columns = _columns(df)
+    for column in conditions:
+        if column not in columns:
+            raise KeyError(f"A coluna '{column}' não existe no DataFrame.")
+
+    # Código Principal
+    mask = np.ones(_n_rows(df), dtype=bool)
+    for column, value in conditions.items():
+        mask &= _equals(df[column], value)
+
+    return _take(df, mask)
+
+
+def remove_lines_by_condition(df: Table, column: str,
+                              conditions: List[Union[str, int, float]]) -> Table:
+    """Remove linhas da tabela com base em condições específicas.
+
+    Args:
+        df (Table): Tabela a ser recebida pela função.
+        column (str): Nome da coluna a ser usada para verificar as condições.
+        conditions (List[Union[str, int, float]]): Lista de valores que, se encontrados
+        na coluna especificada, resultarão na remoção das linhas correspondentes.
+
+    Returns:
+        Table: Nova tabela sem as linhas que atendem às condições.
+
+    Raises:
+        TypeError: Se `df` não for uma tabela de arrays ou `conditions` não for uma lista.
+        KeyError: Se a coluna 'column' não existir na tabela.
+    """
+    # Tratamento de Erro
+    _check_table(df)
+
+    if not isinstance(conditions, list):
+        raise TypeError("O parâmetro 'conditions' deve ser uma lista.")
+
+    if column not in _columns(df):
+        raise KeyError(f"A coluna '{column}' não existe no DataFrame.")
+
+    # Código Principal
+    values = df[column]
+    keep = np.ones(values.shape[0], dtype=bool)
+    for cond in conditions:
+        keep &= ~_equals(values, cond)
+
+    return _take(df, keep)
+
+
+def _mapped_array(values: np.ndarray, map: Dict) -> np.ndarray:
+    """Aplica o dicionário aos valores distintos da coluna e espalha o resultado. Valores
+    sem correspondência viram NaN, como em `pd.Series.map`."""
+    try:
+        uniques, inverse = np.unique(values, return_inverse=True)
+    except TypeError:
+        # Colunas de objetos com tipos que não podem ser ordenados juntos
+        inverse, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = [map.get(value.item() if isinstance(value, np.generic) else value, np.nan)
+              for value in uniques]
+
+    if all(isinstance(value, Number) and not isinstance(value, bool) for value in mapped):
+        result = np.asarray(mapped, dtype=np.float64)
+        if not np.isnan(result).any() and all(isinstance(value, (int, np.integer))
+                                              for value in mapped):
+            result = result.astype(np.int64)
+    else:
+        result = np.empty(len(mapped), dtype=object)
+        result[:] = mapped
+    return result[inverse.reshape(-1)]
+
+
+def map_column_values(df: Table, column: str, map: Dict) -> Table:
+    """Mapeia os valores de uma coluna específica de acordo com um mapeamento dado por
+    meio de um dicionário. O dicionário é modificado; o array estruturado é copiado, já
+    que o tipo da coluna pode mudar.
+
+    Args:
+        df (Table): Tabela a ser recebida pela função.
+        column (str): Nome da coluna que será mapeada.
+        map (Dict): Dicionário de mapeamento dos valores.
+
+    Returns:
+        Table: Tabela com a coluna mapeada.
+
+    Raises:
+        TypeError: Se `df` não for uma tabela de arrays ou `map` não for um dicionário.
+        KeyError: Se a coluna 'column' não existir na tabela.
+    """
+    # Tratamento de Erro
+    _check_table(df)
+
+    if not isinstance(map, dict):
+        raise TypeError("O parâmetro 'map' deve ser um dicionário.")
+
+    if column not in _columns(df):
+        raise KeyError(f"A coluna '{column}' não existe no DataFrame.")
+
+    # Código Principal
+    mapped = _mapped_array(df[column], map)
+    if isinstance(df, dict):
+        df[column] = mapped
+        return df
+
+    dtype = [(name, mapped.dtype if name == column else df.dtype[name])
+             for name in df.dtype.names]
+    result = np.empty(df.shape[0], dtype=dtype)
+    for name in df.dtype.names:
+        result[name] = mapped if name == column else df[name]
+    return result
+
+
+def split_table(df: Table, column: str) -> Dict[Any, Table]:
+    """Separa a tabela em uma tabela por valor de uma coluna, com uma única ordenação,
+    para aplicar as funções acima a cada partida ou time. As linhas de cada grupo mantêm
+    a ordem original.
+
+    Args:
+        df (Table): Tabela a ser separada.
+        column (str): Coluna cujos valores definem os grupos.
+
+    Returns:
+        Dict[Any, Table]: Tabela de cada valor da coluna, em ordem crescente dos valores.
+
+    Raises:
+        TypeError: Se `df` não for uma tabela de arrays.
+        KeyError: Se a coluna 'column' não existir na tabela.
+    """
+    # Tratamento de Erro
+    _check_table(df)
+
+    if column not in _columns(df):
+        raise KeyError(f"A coluna '{column}' não existe no DataFrame.")
+
+    # Código Principal
+    values = df[column]
+    order = np.argsort(values, kind='stable')
+    keys, starts = np.unique(values[order], return_index=True)
+    ordered = _take(df, order)
+    bounds = np.append(starts, values.shape[0])
+
+    groups = {}
+    for position, key in enumerate(keys):
+        rows = slice(bounds[position], bounds[position + 1])
+        groups[key.item() if isinstance(key, np.generic) else key] = _take(ordered, rows)
+    return groups
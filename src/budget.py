@@ -0,0 +1,334 @@
+"""
+Este módulo executa as três hipóteses dentro de um limite de memória. O tamanho do
+conjunto de trabalho do caminho em memória (o DataFrame carregado, a cópia feita por
+main.py e os intermediários das hipóteses) é estimado a partir de uma amostra do CSV. Se
+a estimativa couber no limite, o caminho em memória é usado; caso contrário, o arquivo é
+processado em pedaços, com as mesmas contagens parciais de mapreduce.py.
+
+No caminho em pedaços, as contagens de gols por partida (a única parte que cresce com o
+dataset) são despejadas em um arquivo temporário e lidas no final com `np.memmap`; as
+demais contagens têm tamanho fixo e ficam em memória. Se um pedaço ainda assim não couber
+na memória (MemoryError), ele é dividido ao meio até caber, em vez de interromper a
+execução.
+
+Funções
+-------
+estimate_working_set(csv_path, sample_rows):
+    Estima a memória usada pelo caminho em memória.
+
+plan_execution(csv_path, budget_bytes):
+    Escolhe entre o caminho em memória e o caminho em pedaços.
+
+run_out_of_core(csv_path, chunk_rows, spill_dir):
+    Calcula os resumos das três hipóteses lendo o arquivo em pedaços.
+
+budgeted_summaries(csv_path, budget_bytes, spill_dir):
+    Função principal que calcula os resumos respeitando o limite de memória.
+
+execution_report(report):
+    Monta o DataFrame que descreve a execução.
+"""
+
+import os
+import resource
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from head import head_summary, origins_from_counts
+from mapreduce import EVENT_COLUMNS, _count_rows, map_events, reduce_partials
+from matches import (calculate_results, create_summary_dataframe,
+                     goals_per_match_from_counts, matches_summary)
+from shots import (goals_percentages, prepare_shots, shot_outcome_count_from_counts,
+                   shot_outcome_percentages, shots_summary)
+from utils import load_dataset
+
+# Razão entre a memória do caminho em memória e a do DataFrame carregado: o DataFrame,
+# a cópia de main.py e os intermediários das hipóteses
+WORKING_SET_FACTOR = 4
+
+SAMPLE_ROWS = 10_000
+MIN_CHUNK_ROWS = 1_000
+
+# Registro despejado em disco: código da partida, lado e número de gols
+SPILL_DTYPE = np.dtype([('match', np.int32), ('side', np.int8), ('goals', np.int32)])
+
+
+def _peak_rss_bytes() -> int:
+    """Pico de memória residente do processo (ru_maxrss é dado em KiB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _bytes_per_row(csv_path: str, sample_rows: int, usecols=None) -> float:
+    """Memória média de uma linha do DataFrame, medida em uma amostra do CSV."""
+    sample = pd.read_csv(csv_path, nrows=sample_rows, usecols=usecols)
+    if sample.empty:
+        return 0.0
+    return sample.memory_usage(deep=True).sum() / sample.shape[0]
+
+
+def estimate_working_set(csv_path: str, sample_rows: int = SAMPLE_ROWS) -> int:
+    """Estima a memória, em bytes, usada pelo caminho em memória de main.py.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        sample_rows (int): Número de linhas lidas para medir o tamanho de uma linha.
+
+    Returns:
+        int: Memória estimada, em bytes.
+
+    Raises:
+        TypeError: Se `csv_path` não for uma string.
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    # Tratamento de Erro
+    if not isinstance(csv_path, str):
+        raise TypeError("O parâmetro 'csv_path' deve ser uma string")
+
+    if not os.path.isfile(csv_path):
+        raise FileNotFoundError(f"O arquivo '{csv_path}' não foi encontrado")
+
+    # Código Principal
+    rows = _count_rows(csv_path)
+    return int(rows * _bytes_per_row(csv_path, sample_rows) * WORKING_SET_FACTOR)
+
+
+def plan_execution(csv_path: str, budget_bytes: Optional[int]) -> Dict[str, Any]:
+    """Escolhe o caminho de execução. Sem limite, ou se a estimativa de
+    `estimate_working_set` couber no limite, o caminho em memória é usado. Caso contrário,
+    o tamanho dos pedaços é o maior que cabe no limite (e no mínimo MIN_CHUNK_ROWS).
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        budget_bytes (Optional[int]): Limite de memória, em bytes. None para sem limite.
+
+    Returns:
+        Dict[str, Any]: Plano com as chaves 'mode' ('memory' ou 'chunked'),
+        'budget_bytes', 'estimated_bytes' e 'chunk_rows' (None no caminho em memória).
+
+    Raises:
+        TypeError: Se `budget_bytes` não for um inteiro ou None.
+        ValueError: Se `budget_bytes` não for positivo.
+    """
+    # Tratamento de Erro
+    if budget_bytes is not None and not isinstance(budget_bytes, int):
+        raise TypeError("O parâmetro 'budget_bytes' deve ser um inteiro ou None")
+
+    if budget_bytes is not None and budget_bytes <= 0:
+        raise ValueError("O parâmetro 'budget_bytes' deve ser positivo")
+
+    # Código Principal
+    estimated = estimate_working_set(csv_path)
+    if budget_bytes is None or estimated <= budget_bytes:
+        return {'mode': 'memory', 'budget_bytes': budget_bytes,
+                'estimated_bytes': estimated, 'chunk_rows': None}
+
+    row_bytes = _bytes_per_row(csv_path, SAMPLE_ROWS, EVENT_COLUMNS) * WORKING_SET_FACTOR
+    chunk_rows = max(MIN_CHUNK_ROWS, int(budget_bytes // max(row_bytes, 1.0)))
+    return {'mode': 'chunked', 'budget_bytes': budget_bytes,
+            'estimated_bytes': estimated, 'chunk_rows': chunk_rows}
+
+
+def _map_chunk(chunk: pd.DataFrame, is_first: bool, stats: Dict[str, int]) -> Dict[str, Any]:
+    """Calcula as contagens parciais de um pedaço. Se faltar memória, o pedaço é
+    dividido ao meio e as contagens das metades são combinadas."""
+    try:
+        partial = map_events(chunk, is_first)
+        shots = prepare_shots(chunk)
+        goals = shots['situation'][(shots['is_goal'] == 1).to_numpy()]
+        partial['goals_inside'] = int((goals == 'inside').sum())
+        partial['goals_outside'] = int((goals == 'outside').sum())
+        return partial
+    except MemoryError:
+        if chunk.shape[0] <= MIN_CHUNK_ROWS:
+            raise
+        stats['splits'] += 1
+        middle = chunk.shape[0] // 2
+        left = _map_chunk(chunk.iloc[:middle], is_first, stats)
+        right = _map_chunk(chunk.iloc[middle:], False, stats)
+        goals = pd.concat([left['goals'], right['goals']])
+        goals = goals.groupby(level=[0, 1]).sum()
+        combined = reduce_partials([left, right])
+        combined['goals'] = goals
+        combined['goals_inside'] = left['goals_inside'] + right['goals_inside']
+        combined['goals_outside'] = left['goals_outside'] + right['goals_outside']
+        return combined
+
+
+def _spill_goals(goals: pd.Series, match_codes: Dict[Any, int], file) -> int:
+    """Grava as contagens de gols por partida de um pedaço no arquivo de despejo e
+    devolve o número de bytes gravados."""
+    matches = goals.index.get_level_values(0)
+    for match in matches.unique():
+        match_codes.setdefault(match, len(match_codes))
+
+    records = np.empty(goals.shape[0], dtype=SPILL_DTYPE)
+    records['match'] = matches.map(match_codes).to_numpy()
+    records['side'] = goals.index.get_level_values(1).to_numpy()
+    records['goals'] = goals.to_numpy()
+    records.tofile(file)
+    return records.nbytes
+
+
+def _goals_from_spill(path: str, match_codes: Dict[Any, int]) -> pd.Series:
+    """Lê os registros despejados com `np.memmap` e soma os gols de cada partida e lado,
+    no formato de count_goals_by_side."""
+    names = np.array(list(match_codes), dtype=object)
+    if os.path.getsize(path) == 0:
+        index = pd.MultiIndex.from_arrays([names[:0], np.array([], dtype='int64')],
+                                          names=['id_odsp', 'side'])
+        return pd.Series([], index=index, dtype='int64')
+
+    records = np.memmap(path, dtype=SPILL_DTYPE, mode='r')
+    keys = records['match'].astype(np.int64) * 2 + (records['side'] - 1)
+    totals = np.bincount(keys, weights=records['goals'], minlength=2 * len(names))
+    del records
+
+    present = np.flatnonzero(totals)
+    index = pd.MultiIndex.from_arrays([names[present // 2], present % 2 + 1],
+                                      names=['id_odsp', 'side'])
+    return pd.Series(totals[present].astype('int64'), index=index).sort_index()
+
+
+def run_out_of_core(csv_path: str, chunk_rows: int,
+                    spill_dir: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Calcula os resumos das três hipóteses lendo o CSV em pedaços de `chunk_rows`
+    linhas. O resultado é o mesmo de matches_summary, shots_summary e head_summary com os
+    parâmetros padrão.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        chunk_rows (int): Número de linhas de cada pedaço.
+        spill_dir (Optional[str]): Diretório do arquivo de despejo. Padrão: o diretório
+                                   temporário do sistema.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any]]: Os resumos ('matches', 'shots' e 'head')
+        e as estatísticas da execução ('chunks', 'splits', 'rows', 'spilled_bytes').
+
+    Raises:
+        TypeError: Se `chunk_rows` não for um inteiro.
+        ValueError: Se `chunk_rows` não for positivo ou o arquivo não tiver eventos.
+    """
+    # Tratamento de Erro
+    if not isinstance(chunk_rows, int):
+        raise TypeError("O parâmetro 'chunk_rows' deve ser um inteiro")
+
+    if chunk_rows <= 0:
+        raise ValueError("O parâmetro 'chunk_rows' deve ser positivo")
+
+    # Código Principal
+    stats = {'chunks': 0, 'splits': 0, 'rows': 0, 'spilled_bytes': 0}
+    match_codes: Dict[Any, int] = {}
+    running = None
+
+    descriptor, spill_path = tempfile.mkstemp(prefix='events_spill_', suffix='.bin',
+                                              dir=spill_dir)
+    try:
+        with os.fdopen(descriptor, 'wb') as spill_file:
+            chunks = pd.read_csv(csv_path, usecols=EVENT_COLUMNS, chunksize=chunk_rows)
+            for chunk in chunks:
+                partial = _map_chunk(chunk, running is None, stats)
+                stats['spilled_bytes'] += _spill_goals(partial['goals'], match_codes,
+                                                       spill_file)
+                partial['goals'] = partial['goals'].iloc[:0]
+
+                if running is None:
+                    running = partial
+                else:
+                    goals_inside = running['goals_inside'] + partial['goals_inside']
+                    goals_outside = running['goals_outside'] + partial['goals_outside']
+                    running = reduce_partials([running, partial])
+                    running['goals_inside'] = goals_inside
+                    running['goals_outside'] = goals_outside
+
+                stats['chunks'] += 1
+                stats['rows'] += chunk.shape[0]
+
+        if running is None:
+            raise ValueError("O arquivo não contém eventos")
+
+        goals_per_match = goals_per_match_from_counts(_goals_from_spill(spill_path, match_codes))
+    finally:
+        os.remove(spill_path)
+
+    total_goals = running['goals_inside'] + running['goals_outside']
+    attempts = shot_outcome_count_from_counts(running['shots_in'], running['shots_out'])
+    summaries = {
+        'matches': create_summary_dataframe(calculate_results(goals_per_match)),
+        'shots': (goals_percentages(running['goals_inside'], running['goals_outside'],
+                                    total_goals),
+                  shot_outcome_percentages(attempts)),
+        'head': origins_from_counts(running['head']),
+    }
+    return summaries, stats
+
+
+def budgeted_summaries(csv_path: str, budget_bytes: Optional[int],
+                       spill_dir: Optional[str] = None,
+                       plan: Optional[Dict[str, Any]] = None
+                       ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Calcula os resumos das três hipóteses respeitando o limite de memória. Se o
+    caminho em memória ficar sem memória, a execução recomeça no caminho em pedaços.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        budget_bytes (Optional[int]): Limite de memória, em bytes. None para sem limite.
+        spill_dir (Optional[str]): Diretório do arquivo de despejo do caminho em pedaços.
+        plan (Optional[Dict[str, Any]]): Plano já calculado por `plan_execution` para o
+                                         mesmo arquivo e limite, para não ler o arquivo
+                                         de novo. Padrão: o plano é calculado aqui.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any]]: Os resumos ('matches', 'shots' e 'head')
+        e o relatório da execução (o plano de `plan_execution` com as estatísticas de
+        `run_out_of_core` e o pico de memória 'peak_rss_bytes').
+    """
+    if plan is None:
+        plan = plan_execution(csv_path, budget_bytes)
+
+    if plan['mode'] == 'memory':
+        try:
+            df = load_dataset(csv_path)
+            summaries = {'matches': matches_summary(df),
+                         'shots': shots_summary(df),
+                         'head': head_summary(df)}
+            report = {**plan, 'chunks': 1, 'splits': 0, 'rows': df.shape[0],
+                      'spilled_bytes': 0}
+            del df
+            return summaries, {**report, 'peak_rss_bytes': _peak_rss_bytes()}
+        except MemoryError:
+            # A estimativa errou para baixo: recomeça com pedaços de 1/8 do arquivo
+            df = None
+            chunk_rows = max(MIN_CHUNK_ROWS, _count_rows(csv_path) // 8)
+            plan = {**plan, 'mode': 'chunked', 'chunk_rows': chunk_rows}
+
+    summaries, stats = run_out_of_core(csv_path, plan['chunk_rows'], spill_dir)
+    return summaries, {**plan, **stats, 'peak_rss_bytes': _peak_rss_bytes()}
+
+
+def execution_report(report: Dict[str, Any]) -> pd.DataFrame:
+    """Monta o DataFrame que descreve a execução, com os tamanhos em MiB.
+
+    Args:
+        report (Dict[str, Any]): Relatório gerado por `budgeted_summaries`.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Item' e 'Valor'.
+    """
+    def mib(value: Optional[int]) -> str:
+        return 'sem limite' if value is None else f'{value / 2 ** 20:.1f} MiB'
+
+    items = [
+        ('Caminho', 'em memória' if report['mode'] == 'memory' else 'em pedaços'),
+        ('Limite de memória', mib(report['budget_bytes'])),
+        ('Memória estimada em memória', mib(report['estimated_bytes'])),
+        ('Linhas por pedaço', report['chunk_rows'] or '-'),
+        ('Pedaços', report['chunks']),
+        ('Pedaços divididos por falta de memória', report['splits']),
+        ('Dados despejados em disco', mib(report['spilled_bytes'])),
+        ('Pico de memória do processo', mib(report['peak_rss_bytes'])),
+    ]
+    return pd.DataFrame(items, columns=['Item', 'Valor'])
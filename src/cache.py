@@ -0,0 +1,202 @@
+"""
+Este módulo guarda em disco os resumos calculados pelas hipóteses, para que execuções
+repetidas de main.py não recalculem nada quando nem o dataset nem os parâmetros das
+análises mudaram. Cada resultado é identificado pela impressão digital (hash) do arquivo
+de eventos, pelo nome da hipótese e pelos seus parâmetros, de modo que alterar os
+parâmetros de uma hipótese recalcula apenas aquela hipótese. O tamanho total do cache é
+limitado, e os resultados usados há mais tempo são removidos primeiro (LRU).
+
+Funções
+-------
+dataset_fingerprint(path, cache_dir):
+    Calcula a impressão digital do conteúdo de um arquivo de eventos.
+
+cache_key(fingerprint, name, params):
+    Gera a chave de um resultado a partir do dataset, da hipótese e dos parâmetros.
+
+cached_call(cache_dir, fingerprint, name, params, compute, max_bytes):
+    Devolve o resultado guardado no cache ou o calcula e guarda.
+
+evict(cache_dir, max_bytes):
+    Remove os resultados usados há mais tempo até o cache caber no limite.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Any, Callable, Dict, Optional
+
+INDEX_FILE = 'index.json'
+FINGERPRINTS_FILE = 'fingerprints.json'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """Escreve em um arquivo temporário e o renomeia, para que leitores concorrentes
+    nunca vejam um arquivo pela metade."""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+    os.replace(tmp_path, path)
+
+
+def dataset_fingerprint(path: str, cache_dir: Optional[str] = None) -> str:
+    """Calcula o hash SHA-256 do conteúdo de um arquivo. Se `cache_dir` for dado, o hash é
+    reaproveitado enquanto o tamanho e a data de modificação do arquivo não mudarem, de
+    modo que o arquivo só é relido quando é alterado.
+
+    Args:
+        path (str): Caminho do arquivo de eventos.
+        cache_dir (Optional[str]): Diretório do cache.
+
+    Returns:
+        str: Impressão digital do arquivo, em hexadecimal.
+
+    Raises:
+        TypeError: Se `path` não for uma string.
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    # Tratamento de Erro
+    if not isinstance(path, str):
+        raise TypeError("O parâmetro 'path' deve ser uma string")
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"O arquivo '{path}' não foi encontrado")
+
+    # Código Principal
+    stat = os.stat(path)
+    stat_key = f'{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}'
+    if cache_dir is not None:
+        known = _read_json(os.path.join(cache_dir, FINGERPRINTS_FILE))
+        if stat_key in known:
+            return known[stat_key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    fingerprint = digest.hexdigest()
+
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        fingerprints_path = os.path.join(cache_dir, FINGERPRINTS_FILE)
+        known = _read_json(fingerprints_path)
+        known[stat_key] = fingerprint
+        _write_json(fingerprints_path, known)
+
+    return fingerprint
+
+
+def cache_key(fingerprint: str, name: str, params: Dict[str, Any]) -> str:
+    """Gera a chave de um resultado. Parâmetros iguais geram a mesma chave
+    independentemente da ordem das chaves de `params`.
+
+    Args:
+        fingerprint (str): Impressão digital do dataset.
+        name (str): Nome da hipótese (por exemplo, 'shots').
+        params (Dict[str, Any]): Parâmetros da análise, serializáveis em JSON.
+
+    Returns:
+        str: Chave do resultado, em hexadecimal.
+
+    Raises:
+        TypeError: Se `params` não for um dicionário serializável em JSON.
+    """
+    if not isinstance(params, dict):
+        raise TypeError("O parâmetro 'params' deve ser um dicionário")
+
+    payload = json.dumps([fingerprint, name, params], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def evict(cache_dir: str, max_bytes: int) -> int:
+    """Remove os resultados usados há mais tempo até o tamanho total do cache ser no
+    máximo `max_bytes`.
+
+    Args:
+        cache_dir (str): Diretório do cache.
+        max_bytes (int): Tamanho máximo do cache, em bytes.
+
+    Returns:
+        int: Número de resultados removidos.
+    """
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+    index = _read_json(index_path)
+    total = sum(entry['size'] for entry in index.values())
+
+    removed = 0
+    for key in sorted(index, key=lambda key: index[key]['last_used']):
+        if total <= max_bytes:
+            break
+        total -= index[key]['size']
+        del index[key]
+        try:
+            os.remove(os.path.join(cache_dir, f'{key}.pkl'))
+        except FileNotFoundError:
+            pass
+        removed += 1
+
+    _write_json(index_path, index)
+    return removed
+
+
+def cached_call(cache_dir: str, fingerprint: str, name: str, params: Dict[str, Any],
+                compute: Callable[[], Any], max_bytes: int = DEFAULT_MAX_BYTES) -> Any:
+    """Devolve o resultado guardado para (dataset, hipótese, parâmetros) ou, se ele não
+    existir, chama `compute`, guarda o resultado e aplica o limite de tamanho.
+
+    Args:
+        cache_dir (str): Diretório do cache.
+        fingerprint (str): Impressão digital do dataset (ver `dataset_fingerprint`).
+        name (str): Nome da hipótese.
+        params (Dict[str, Any]): Parâmetros da análise, serializáveis em JSON.
+        compute (Callable[[], Any]): Função sem argumentos que calcula o resultado (por
+        exemplo, um ou mais DataFrames).
+        max_bytes (int): Tamanho máximo do cache, em bytes.
+
+    Returns:
+        Any: O resultado guardado ou recém-calculado.
+
+    Raises:
+        TypeError: Se `cache_dir` não for uma string ou `compute` não for chamável.
+    """
+    # Tratamento de Erro
+    if not isinstance(cache_dir, str):
+        raise TypeError("O parâmetro 'cache_dir' deve ser uma string")
+
+    if not callable(compute):
+        raise TypeError("O parâmetro 'compute' deve ser uma função")
+
+    # Código Principal
+    os.makedirs(cache_dir, exist_ok=True)
+    key = cache_key(fingerprint, name, params)
+    path = os.path.join(cache_dir, f'{key}.pkl')
+    index_path = os.path.join(cache_dir, INDEX_FILE)
+
+    try:
+        with open(path, 'rb') as file:
+            result = pickle.load(file)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        result = compute()
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    index = _read_json(index_path)
+    last_used = max([time.time_ns()] + [entry['last_used'] + 1 for entry in index.values()])
+    index[key] = {'name': name, 'size': os.path.getsize(path), 'last_used': last_used}
+    _write_json(index_path, index)
+    evict(cache_dir, max_bytes)
+
+    return result
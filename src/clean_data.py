@@ -1,21 +1,46 @@
+import os
+from concurrent.futures import Future
+from typing import Optional
+
 import pandas as pd
 from utils import remove_columns, remove_lines_by_condition
+from writer import OUTPUT_DIR, write_csv, write_in_background
+
+CLEANED_EVENTS_FILE = "cleaned_events.csv"
 
-def clean_data(df: pd.DataFrame) -> None:
+def clean_data(df: pd.DataFrame, output_dir: str = OUTPUT_DIR, background: bool = False,
+               compression: Optional[str] = None, blocks: int = 1) -> Optional[Future]:
     """Remove todas as colunas que não serão necessárias para a análise exploratória
-    e salva em um novo arquivo "cleaned_events.csv"
+    e salva em um novo arquivo "cleaned_events.csv". As colunas 'assist_method',
+    'situation' e 'fast_break' são mantidas para o modelo de gols esperados (xg.py).
 
     Args:
         df (pd.DataFrame): DataFrame de events.csv
+        output_dir (str): Diretório em que o arquivo é gravado
+        background (bool): Se True, o arquivo é gravado em segundo plano (ver writer.py),
+        e `df` não deve ser modificado até a gravação terminar
+        compression (Optional[str]): Extensão da compressão ('gz', 'bz2' ou 'xz'), ou
+        None para gravar o CSV sem compressão
+        blocks (int): Número de blocos serializados e comprimidos em paralelo
+
+    Returns:
+        Optional[Future]: A gravação em segundo plano, ou None se o arquivo já foi gravado
 
     """
     columns_to_remove = ['id_event','sort_order','text','event_type2','event_team',
                         'opponent', 'player', 'player2','player_in','player_out',
-                        'shot_place','assist_method', 'situation', 'fast_break']
+                        'shot_place']
     remove_columns(df, columns_to_remove)
 
     events_to_remove = [0, 4, 5, 6, 7, 8, 10]
     remove_lines_by_condition(df, 'event_type', events_to_remove)
-    
-    new_filepath = "../data/cleaned_events.csv"
-    df.to_csv(new_filepath, index=False)
+
+    new_filepath = os.path.join(output_dir, CLEANED_EVENTS_FILE)
+    if compression is not None:
+        new_filepath = f'{new_filepath}.{compression}'
+
+    if background:
+        return write_in_background(df, new_filepath, blocks)
+
+    write_csv(df, new_filepath, blocks)
+    return None
@@ -0,0 +1,232 @@
+"""
+Este módulo calcula o placar de cada partida no momento de cada evento, para que as
+hipóteses possam ser separadas pela situação do jogo (vencendo, empatando ou perdendo).
+O placar imediatamente antes de cada evento é obtido em uma única passada vetorizada,
+com somas acumuladas agrupadas por partida; os eventos de cada partida devem estar na
+ordem em que ocorreram, como em events.csv.
+
+A situação do jogo é sempre do ponto de vista do time do evento ('side'): um chute do
+visitante com o placar 1 x 0 é um chute de um time que está perdendo.
+
+Funções
+-------
+add_game_state(df):
+    Acrescenta o placar antes de cada evento e a situação do jogo.
+
+shots_by_game_state(df, locations_inside, excluded_locations, states):
+    Conversão dos chutes dentro e fora da área em cada situação do jogo.
+
+headed_goals_by_game_state(df, time_window, states):
+    Origem dos gols de cabeça em cada situação do jogo.
+
+matches_by_game_state(df, minute):
+    Resultado final do time da casa pela situação do jogo em um minuto.
+
+game_state_summary(df, locations_inside, excluded_locations, minute, time_window):
+    Função principal que calcula os três resumos.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, ORIGIN_EVENT_TYPES, headed_goal_origin_codes
+from shots import prepare_shots
+
+GAME_STATES = ['leading', 'level', 'trailing']
+GAME_STATE_LABELS = {'leading': 'Vencendo', 'level': 'Empatando', 'trailing': 'Perdendo'}
+
+# Minuto em que a situação do jogo é comparada com o resultado final
+HALF_TIME = 45
+
+# Rótulos dos códigos de headed_goal_origin_codes, na ordem de ORIGIN_EVENT_TYPES
+ORIGIN_LABELS = ['Escanteios', 'Faltas', 'Impedimentos', 'Outros']
+
+
+def add_game_state(df: pd.DataFrame) -> pd.DataFrame:
+    """Acrescenta a `df` o placar imediatamente antes de cada evento e a situação do jogo
+    para o time do evento.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos com as colunas 'id_odsp', 'side',
+                           'event_type' e 'is_goal'. Não é modificado.
+
+    Returns:
+        pd.DataFrame: Cópia de `df` com as colunas 'home_score', 'away_score',
+        'goal_difference' (gols do time do evento menos os do adversário) e 'game_state'
+        ('leading', 'level' ou 'trailing').
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    for column in ['id_odsp', 'side', 'event_type', 'is_goal']:
+        if column not in df.columns:
+            raise KeyError(f"A coluna {column} não existe no DataFrame")
+
+    # Código Principal
+    goals = ((df['event_type'] == 1) & (df['is_goal'] == 1)).to_numpy()
+    home = df['side'].to_numpy() == 1
+    scored = pd.DataFrame({'home': (goals & home).astype(np.int32),
+                           'away': (goals & ~home).astype(np.int32)}, index=df.index)
+    before = scored.groupby(df['id_odsp'].to_numpy(), sort=False).cumsum() - scored
+
+    df = df.copy()
+    df['home_score'] = before['home'].to_numpy()
+    df['away_score'] = before['away'].to_numpy()
+    difference = df['home_score'].to_numpy() - df['away_score'].to_numpy()
+    df['goal_difference'] = np.where(home, difference, -difference)
+    df['game_state'] = np.select([df['goal_difference'] > 0, df['goal_difference'] < 0],
+                                 ['leading', 'trailing'], 'level')
+    return df
+
+
+def shots_by_game_state(df: pd.DataFrame, locations_inside: Optional[List[int]] = None,
+                        excluded_locations: Optional[List[int]] = None,
+                        states: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Calcula a conversão dos chutes dentro e fora da área em cada situação do jogo.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+        states (Optional[pd.DataFrame]): Resultado de `add_game_state(df)`, se já
+                                         calculado.
+
+    Returns:
+        pd.DataFrame: Uma linha por situação do jogo e local do chute, com as colunas
+        'Situação do jogo', 'Situação', 'Chutes', 'Gols' e 'Conversão' (em %).
+    """
+    if states is None:
+        states = add_game_state(df)
+    shots = prepare_shots(states, locations_inside, excluded_locations)
+    shots['game_state'] = states.loc[shots.index, 'game_state']
+
+    grouped = shots.groupby(['game_state', 'situation'])['is_goal']
+    result = pd.DataFrame({'Chutes': grouped.size(), 'Gols': grouped.sum()})
+    index = pd.MultiIndex.from_product([GAME_STATES, ['inside', 'outside']])
+    result = result.reindex(index, fill_value=0).reset_index()
+    result.columns = ['Situação do jogo', 'Situação', 'Chutes', 'Gols']
+
+    attempts = result['Chutes'].to_numpy()
+    result['Conversão'] = np.round(np.divide(result['Gols'] * 100, attempts,
+                                             out=np.zeros(len(result)),
+                                             where=attempts > 0), 2)
+    result['Situação do jogo'] = result['Situação do jogo'].map(GAME_STATE_LABELS)
+    result['Situação'] = result['Situação'].map({'inside': 'Dentro da área',
+                                                 'outside': 'Fora da área'})
+    return result
+
+
+def headed_goals_by_game_state(df: pd.DataFrame, time_window: float = HEADER_TIME_WINDOW,
+                               states: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Cruza a origem dos gols de cabeça, com a regra do evento anterior de
+    `head.headed_goal_origin_codes`, com a situação do jogo do time que marcou.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com as colunas 'bodypart' e 'time'.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+                             anterior para que a origem seja contada.
+        states (Optional[pd.DataFrame]): Resultado de `add_game_state(df)`, se já
+                                         calculado.
+
+    Returns:
+        pd.DataFrame: Uma linha por situação do jogo e origem, com as colunas
+        'Situação do jogo', 'ORIGEM', 'Gols de cabeça' e 'Porcentagem' (em % dos gols
+        de cabeça da mesma situação do jogo).
+    """
+    if states is None:
+        states = add_game_state(df)
+
+    codes = headed_goal_origin_codes(states, True, time_window)
+    counted = codes >= 0
+    state_codes = pd.Categorical(states['game_state'].to_numpy()[counted],
+                                 categories=GAME_STATES).codes
+    n_origins = len(ORIGIN_EVENT_TYPES) + 1
+    counts = np.bincount(state_codes * n_origins + codes[counted],
+                         minlength=len(GAME_STATES) * n_origins).reshape(-1, n_origins)
+
+    totals = counts.sum(axis=1, keepdims=True)
+    percentages = np.round(np.divide(counts * 100, totals, out=np.zeros(counts.shape),
+                                     where=totals > 0), 2)
+    return pd.DataFrame({
+        'Situação do jogo': np.repeat([GAME_STATE_LABELS[state] for state in GAME_STATES],
+                                      n_origins),
+        'ORIGEM': ORIGIN_LABELS * len(GAME_STATES),
+        'Gols de cabeça': counts.ravel(),
+        'Porcentagem': percentages.ravel(),
+    })
+
+
+def matches_by_game_state(df: pd.DataFrame, minute: float = HALF_TIME) -> pd.DataFrame:
+    """Relaciona a situação do time da casa em um minuto da partida com o resultado
+    final. Partidas sem eventos são ignoradas; gols marcados até `minute` (inclusive)
+    contam para o placar parcial.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com a coluna 'time'.
+        minute (float): Minuto em que a situação é observada. Padrão: `HALF_TIME`.
+
+    Returns:
+        pd.DataFrame: Uma linha por situação do time da casa, com as colunas
+        'Situação do jogo', 'Partidas' e as porcentagens de 'Vitórias', 'Empates' e
+        'Derrotas' do time da casa.
+
+    Raises:
+        KeyError: Se a coluna 'time' não existir em `df`.
+    """
+    if 'time' not in df.columns:
+        raise KeyError("A coluna time não existe no DataFrame")
+
+    goals = ((df['event_type'] == 1) & (df['is_goal'] == 1)).to_numpy()
+    home = (df['side'] == 1).to_numpy()
+    partial = (df['time'] <= minute).to_numpy()
+    table = pd.DataFrame({
+        'home_final': goals & home, 'away_final': goals & ~home,
+        'home_partial': goals & home & partial, 'away_partial': goals & ~home & partial,
+    }).groupby(df['id_odsp'].to_numpy(), sort=False).sum()
+
+    state = np.sign(table['home_partial'] - table['away_partial'])
+    final = np.sign(table['home_final'] - table['away_final'])
+
+    rows = []
+    for code, name in zip([1, 0, -1], GAME_STATES):
+        results = final[state == code]
+        n_matches = int(results.shape[0])
+        percentages = [round(float((results == value).mean() * 100), 2) if n_matches else 0.0
+                       for value in (1, 0, -1)]
+        rows.append([GAME_STATE_LABELS[name], n_matches] + percentages)
+
+    return pd.DataFrame(rows, columns=['Situação do jogo', 'Partidas', 'Vitórias',
+                                       'Empates', 'Derrotas'])
+
+
+def game_state_summary(df: pd.DataFrame, locations_inside: Optional[List[int]] = None,
+                       excluded_locations: Optional[List[int]] = None,
+                       minute: float = HALF_TIME,
+                       time_window: float = HEADER_TIME_WINDOW) -> Dict[str, pd.DataFrame]:
+    """Função principal que separa as três hipóteses pela situação do jogo. A situação
+    do jogo de cada evento é calculada uma única vez e usada pelos chutes e pelos gols de
+    cabeça.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos. Não é modificado.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+        minute (float): Minuto usado por `matches_by_game_state`.
+        time_window (float): Janela usada por `headed_goals_by_game_state`.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'matches', 'shots' e 'head'.
+    """
+    states = add_game_state(df)
+    return {
+        'matches': matches_by_game_state(df, minute),
+        'shots': shots_by_game_state(df, locations_inside, excluded_locations, states),
+        'head': headed_goals_by_game_state(df, time_window, states),
+    }
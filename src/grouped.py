@@ -0,0 +1,315 @@
+"""
+Este módulo calcula as três hipóteses para cada grupo de eventos (por liga, temporada ou
+qualquer coluna) em uma única passada, em vez de chamar matches_main, shots_main e
+head_main uma vez por grupo. Cada evento recebe o código do seu grupo, e as contagens de
+todos os grupos são feitas juntas com `np.bincount` e `np.unique`; o resultado de cada
+hipótese é uma única tabela com uma coluna por chave de agrupamento.
+
+As chaves que não existem em events.csv, como 'league', 'season' e 'country', vêm de
+ginf.csv (do mesmo dataset do Kaggle), ligado aos eventos por 'id_odsp' com uma junção
+por tabela hash (`pd.Index.get_indexer`). Eventos sem grupo (chave ausente) são
+ignorados.
+
+Na hipótese dos gols de cabeça, o evento anterior é sempre o evento anterior da mesma
+partida no dataset completo. Com chaves que não separam as partidas (como 'side'), isso
+difere de chamar head_main sobre cada grupo, que compararia eventos não consecutivos.
+
+Funções
+-------
+load_match_metadata(path, columns):
+    Lê as colunas de ginf.csv usadas como chaves de agrupamento.
+
+attach_metadata(df, metadata, columns):
+    Acrescenta aos eventos as colunas de `metadata` da sua partida.
+
+grouped_matches_summary(df, keys):
+    Porcentagens de vitórias, derrotas e empates do mandante em cada grupo.
+
+grouped_shots_summary(df, keys, locations_inside, excluded_locations):
+    Gols e resultados de chutes dentro e fora da área em cada grupo.
+
+grouped_head_summary(df, keys, time_window):
+    Origens dos gols de cabeça em cada grupo.
+
+grouped_summaries(df, keys, metadata):
+    Função principal que calcula as três hipóteses por grupo.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, headed_goal_origin_codes
+from shots import prepare_shots
+
+GINF_PATH = "../data/ginf.csv"
+METADATA_COLUMNS = ['league', 'season', 'country']
+
+Keys = Union[str, List[str]]
+
+
+def load_match_metadata(path: str = GINF_PATH,
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Lê as colunas de ginf.csv usadas como chaves de agrupamento.
+
+    Args:
+        path (str): Caminho de ginf.csv. Padrão: `GINF_PATH`.
+        columns (Optional[List[str]]): Colunas lidas, além de 'id_odsp'.
+                                       Padrão: `METADATA_COLUMNS`.
+
+    Returns:
+        pd.DataFrame: Uma linha por partida, com 'id_odsp' e as colunas pedidas.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    if columns is None:
+        columns = METADATA_COLUMNS
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"O arquivo '{path}' não foi encontrado")
+
+    return pd.read_csv(path, usecols=['id_odsp'] + list(columns))
+
+
+def attach_metadata(df: pd.DataFrame, metadata: pd.DataFrame,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Acrescenta a cada evento as colunas de `metadata` da sua partida. Eventos de
+    partidas ausentes em `metadata` ficam com valores ausentes.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos. Não é modificado.
+        metadata (pd.DataFrame): Uma linha por partida, com a coluna 'id_odsp'.
+        columns (Optional[List[str]]): Colunas acrescentadas. Padrão: todas as colunas de
+                                       `metadata` exceto 'id_odsp'.
+
+    Returns:
+        pd.DataFrame: Cópia de `df` com as colunas acrescentadas.
+
+    Raises:
+        TypeError: Se `df` ou `metadata` não forem pd.DataFrame.
+        KeyError: Se 'id_odsp' ou alguma coluna pedida não existir.
+        ValueError: Se alguma partida aparecer mais de uma vez em `metadata`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame) or not isinstance(metadata, pd.DataFrame):
+        raise TypeError("Os parâmetros 'df' e 'metadata' devem ser pandas DataFrames.")
+
+    if columns is None:
+        columns = [column for column in metadata.columns if column != 'id_odsp']
+
+    for column in ['id_odsp'] + list(columns):
+        if column not in metadata.columns:
+            raise KeyError(f"A coluna {column} não existe em metadata")
+
+    if 'id_odsp' not in df.columns:
+        raise KeyError("A coluna id_odsp não existe no DataFrame")
+
+    matches = pd.Index(metadata['id_odsp'])
+    if not matches.is_unique:
+        raise ValueError("Cada partida deve aparecer uma única vez em metadata.")
+
+    # Código Principal
+    positions = matches.get_indexer(df['id_odsp'])
+    found = positions >= 0
+    df = df.copy()
+    for column in columns:
+        values = metadata[column].to_numpy()
+        df[column] = pd.Series(values[positions], index=df.index).where(found)
+    return df
+
+
+def _group_codes(df: pd.DataFrame, keys: Keys) -> Tuple[np.ndarray, pd.DataFrame, List[str]]:
+    """Código do grupo de cada evento (-1 se a chave estiver ausente) e os valores das
+    chaves de cada grupo, na ordem dos códigos."""
+    if isinstance(keys, str):
+        keys = [keys]
+
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    for key in keys:
+        if key not in df.columns:
+            raise KeyError(f"A coluna {key} não existe no DataFrame")
+
+    grouped = df.groupby(keys, sort=True, dropna=True)
+    codes = grouped.ngroup().to_numpy()
+    labels = grouped.size().index.to_frame(index=False)[keys]
+    return codes, labels, keys
+
+
+def _tidy(labels: pd.DataFrame, groups: np.ndarray, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Monta a tabela de resultados com as chaves do grupo de cada linha."""
+    table = labels.iloc[groups].reset_index(drop=True)
+    for name, values in columns.items():
+        table[name] = values
+    return table
+
+
+def grouped_matches_summary(df: pd.DataFrame, keys: Keys) -> pd.DataFrame:
+    """Calcula as porcentagens de vitórias, derrotas e empates do mandante em cada grupo,
+    como matches_summary sobre os eventos do grupo (só partidas com gols no grupo).
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        keys (Keys): Coluna ou lista de colunas de agrupamento.
+
+    Returns:
+        pd.DataFrame: Colunas das chaves, 'results' e 'home_percentage'.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma chave não existir em `df`.
+    """
+    groups, labels, _ = _group_codes(df, keys)
+    match_codes, _ = pd.factorize(df['id_odsp'])
+
+    goals = ((df['event_type'] == 1) & (df['is_goal'] == 1)).to_numpy() & (groups >= 0)
+    pairs = groups[goals].astype(np.int64) * (match_codes.max() + 1) + match_codes[goals]
+    unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+    home = np.bincount(inverse, weights=(df['side'].to_numpy()[goals] == 1),
+                       minlength=unique_pairs.size)
+    away = np.bincount(inverse, minlength=unique_pairs.size) - home
+
+    # 0: vitória, 1: derrota, 2: empate (a ordem de summary_from_results)
+    outcome = np.select([home > away, home < away], [0, 1], 2)
+    pair_groups = unique_pairs // (match_codes.max() + 1)
+    counts = np.bincount(pair_groups * 3 + outcome,
+                         minlength=len(labels) * 3).reshape(len(labels), 3)
+
+    present = np.flatnonzero(counts.sum(axis=1))
+    percentages = counts[present] * 100 / counts[present].sum(axis=1, keepdims=True)
+    return _tidy(labels, np.repeat(present, 3), {
+        'results': np.tile(['Vitórias', 'Derrotas', 'Empates'], present.size),
+        'home_percentage': percentages.ravel(),
+    })
+
+
+def grouped_shots_summary(df: pd.DataFrame, keys: Keys,
+                          locations_inside: Optional[List[int]] = None,
+                          excluded_locations: Optional[List[int]] = None
+                          ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Calcula, para cada grupo, as porcentagens de gols dentro e fora da área e as
+    porcentagens de cada resultado de chute, como shots_summary sobre os eventos do
+    grupo.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        keys (Keys): Coluna ou lista de colunas de agrupamento.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: A tabela de gols (chaves, 'Situação' e
+        'Porcentagem') e a de chutes (chaves, 'Resultado', 'Porcentagem_in' e
+        'Porcentagem_out'). Os resultados de cada grupo estão ordenados pela contagem
+        dentro da área.
+    """
+    groups, labels, _ = _group_codes(df, keys)
+    positions = pd.Series(np.arange(df.shape[0]), index=df.index)
+    shots = prepare_shots(df, locations_inside, excluded_locations)
+    shot_groups = groups[positions.loc[shots.index].to_numpy()]
+    keep = shot_groups >= 0
+    shots, shot_groups = shots[keep], shot_groups[keep]
+    inside = (shots['situation'] == 'inside').to_numpy().astype(np.int64)
+
+    # Gols dentro e fora da área
+    goals = (shots['is_goal'] == 1).to_numpy()
+    goal_counts = np.bincount(shot_groups[goals] * 2 + inside[goals],
+                              minlength=len(labels) * 2).reshape(len(labels), 2)
+    with_goals = np.flatnonzero(goal_counts.sum(axis=1))
+    goal_percentages = np.round(goal_counts[with_goals][:, ::-1] * 100 /
+                                goal_counts[with_goals].sum(axis=1, keepdims=True), 2)
+    goals_table = _tidy(labels, np.repeat(with_goals, 2), {
+        'Situação': np.tile(['Dentro da área', 'Fora da área'], with_goals.size),
+        'Porcentagem': goal_percentages.ravel(),
+    })
+
+    # Resultados dos chutes dentro e fora da área
+    outcome_codes, outcomes = pd.factorize(shots['shot_outcome'])
+    n_outcomes = len(outcomes)
+    valid = outcome_codes >= 0
+    counts = np.bincount((shot_groups[valid] * n_outcomes + outcome_codes[valid]) * 2 +
+                         inside[valid], minlength=len(labels) * n_outcomes * 2)
+    counts = counts.reshape(len(labels), n_outcomes, 2)
+    count_in, count_out = counts[:, :, 1], counts[:, :, 0]
+
+    # Como em shot_outcome_count, só entram os resultados presentes dentro e fora da área
+    both = (count_in > 0) & (count_out > 0)
+    group_index, outcome_index = np.nonzero(both)
+    total_in = np.where(both, count_in, 0).sum(axis=1)[group_index]
+    total_out = np.where(both, count_out, 0).sum(axis=1)[group_index]
+    table = _tidy(labels, group_index, {
+        'Resultado': np.asarray(outcomes)[outcome_index],
+        'Porcentagem_in': np.round(count_in[group_index, outcome_index] * 100 / total_in, 2),
+        'Porcentagem_out': np.round(count_out[group_index, outcome_index] * 100 / total_out, 2),
+    })
+    order = np.lexsort((-table['Porcentagem_in'].to_numpy(), group_index))
+    return goals_table, table.iloc[order].reset_index(drop=True)
+
+
+def grouped_head_summary(df: pd.DataFrame, keys: Keys,
+                         time_window: float = HEADER_TIME_WINDOW) -> pd.DataFrame:
+    """Calcula as porcentagens das origens dos gols de cabeça em cada grupo, com a regra
+    de origin_of_headed_goals. Grupos sem gols de cabeça não aparecem.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, na ordem original.
+        keys (Keys): Coluna ou lista de colunas de agrupamento.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+                             anterior para que a origem seja contada.
+
+    Returns:
+        pd.DataFrame: Colunas das chaves, 'ORIGEM' e 'PORCENTAGEM', no formato de
+        origin_of_headed_goals.
+    """
+    groups, labels, _ = _group_codes(df, keys)
+    # 0: escanteios, 1: faltas, 2: impedimentos, 3: outros (ver head.py)
+    origin = headed_goal_origin_codes(df, True, time_window)
+
+    counted = (origin >= 0) & (groups >= 0)
+    counts = np.bincount(groups[counted] * 4 + origin[counted],
+                         minlength=len(labels) * 4).reshape(len(labels), 4)
+    present = np.flatnonzero(counts.sum(axis=1))
+    counts = counts[present]
+    # Escanteios, faltas, impedimentos, bola parada (os três anteriores) e outros
+    table = np.column_stack([counts[:, :3], counts[:, :3].sum(axis=1), counts[:, 3]])
+    percentages = np.round(table * 100 / counts.sum(axis=1, keepdims=True), 2)
+
+    return _tidy(labels, np.repeat(present, 5), {
+        'ORIGEM': np.tile(['Escanteios', 'Faltas', 'Impedimentos', 'BOLA PARADA', 'Outros'],
+                          present.size),
+        'PORCENTAGEM': percentages.ravel(),
+    })
+
+
+def grouped_summaries(df: pd.DataFrame, keys: Keys,
+                      metadata: Optional[pd.DataFrame] = None) -> Dict[str, pd.DataFrame]:
+    """Função principal que calcula as três hipóteses para cada grupo. Chaves que não
+    estão em `df` são buscadas em `metadata` (por padrão, lida de ginf.csv).
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        keys (Keys): Coluna ou lista de colunas de agrupamento.
+        metadata (Optional[pd.DataFrame]): Uma linha por partida, com 'id_odsp' e as
+                                           chaves ausentes em `df`.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'matches', 'goals', 'shots' e 'head'.
+    """
+    key_list = [keys] if isinstance(keys, str) else list(keys)
+    missing = [key for key in key_list if key not in df.columns]
+    if missing:
+        if metadata is None:
+            metadata = load_match_metadata(columns=missing)
+        df = attach_metadata(df, metadata, missing)
+
+    goals, shots = grouped_shots_summary(df, key_list)
+    return {
+        'matches': grouped_matches_summary(df, key_list),
+        'goals': goals,
+        'shots': shots,
+        'head': grouped_head_summary(df, key_list),
+    }
@@ -12,10 +12,20 @@ is_headed_goal(df, row_index)
     Verifica se um evento é um gol marcado de cabeça.
 is_same_match(df, row_index_a, row_index_b):
     Verifica se dois eventos ocorreram na mesma partida.
+headed_goal_origin_codes(df, is_first_partition, time_window):
+    Classifica, de forma vetorizada, a origem de cada gol de cabeça.
+count_headed_goal_origins(df, is_first_partition):
+    Conta, de forma vetorizada, os gols de cabeça de cada origem.
+origins_from_counts(counts):
+    Monta o DataFrame de porcentagens a partir das contagens de cada origem.
 origin_of_headed_goals(df):
     Calcula a porcentagem de gols de cabeça com base na origem.
 graph_view(df)
     Gera um gráfico de barras das porcentagens das origens dos gols de cabeça.
+head_summary(df, time_window)
+    Calcula as porcentagens das origens sem exibir os resultados.
+head_report(percent_of_origins)
+    Exibe e salva as porcentagens das origens dos gols de cabeça.
 head_main(df)
     Função principal que executa a análise e a visualização.
 
@@ -24,15 +34,25 @@ Autor
     Antonio Francisco Batista Filho
 """
 
+import os
+
+import numpy as np
 import pandas as pd
 from typing import Dict, Union
 import matplotlib.pyplot as plt
 
 from utils import remove_columns, filter_df, print_dataframe
+from writer import OUTPUT_DIR, save_figure
 
 # Hipótese: maior parte dos gols de cabeça tem origem em lances de bola parada.
 # Lances de bola parada: escanteios, faltas e impedimentos. 
 
+# event_type do evento anterior -> origem do gol de cabeça
+ORIGIN_EVENT_TYPES = {2: 'corners', 3: 'fouls', 9: 'offsides'}
+
+# Diferença máxima, em minutos, entre o gol de cabeça e o evento anterior
+HEADER_TIME_WINDOW = 1
+
 def get_rows_with_previous(df: pd.DataFrame,
                         conditions: Dict[str, Union[str, int, float]]) -> pd.DataFrame:
     """Filtra as linhas de um DataFrame com base em condições dadas e inclui, se existir,
@@ -98,12 +118,15 @@ def is_same_match(df: pd.DataFrame, row_index_a: int, row_index_b: int) -> bool:
     return df.loc[row_index_a, 'id_odsp'] == df.loc[row_index_b, 'id_odsp']
 
 
-def origin_of_headed_goals(df: pd.DataFrame) -> pd.DataFrame:
+def origin_of_headed_goals(df: pd.DataFrame,
+                           time_window: float = HEADER_TIME_WINDOW) -> pd.DataFrame:
     """Calcula a porcentagem das origens dos gols de cabeça.
 
     Args:
         df (pd.DataFrame): Dataframe que contém os gols de cabeça e os eventos
         anteriores.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
 
     Returns:
         pd.DataFrame: DataFrame contendo as seguintes colunas:
@@ -122,7 +145,7 @@ def origin_of_headed_goals(df: pd.DataFrame) -> pd.DataFrame:
         if i == 0 and is_headed_goal(df, i):
             others += 1
         elif (is_headed_goal(df, i) and is_same_match(df, i, i-1) and
-            (df.loc[i, 'time'] - df.loc[i-1, 'time']) <= 1):
+            (df.loc[i, 'time'] - df.loc[i-1, 'time']) <= time_window):
 
             if df.loc[i-1, 'event_type'] == 2:
                 corners += 1
@@ -133,6 +156,98 @@ def origin_of_headed_goals(df: pd.DataFrame) -> pd.DataFrame:
             else:
                 others += 1
 
+    return origins_from_counts({'corners': corners, 'fouls': fouls,
+                                'offsides': offsides, 'others': others})
+
+
+def headed_goal_origin_codes(df: pd.DataFrame, is_first_partition: bool = True,
+                             time_window: float = HEADER_TIME_WINDOW) -> np.ndarray:
+    """Classifica cada evento com a regra do evento anterior de origin_of_headed_goals,
+    de forma vetorizada. É a regra usada por count_headed_goal_origins e pelos resumos
+    por grupo (grouped.py).
+
+    Args:
+        df (pd.DataFrame): Dataframe que contém os eventos, na ordem original.
+        is_first_partition (bool): Se True, um gol de cabeça na primeira linha conta
+        como 'Outros', como em origin_of_headed_goals. Se False, a primeira linha é
+        ignorada, pois seu evento anterior está em outra parte do dataset.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
+
+    Returns:
+        np.ndarray: Um código por evento: a posição da origem em `ORIGIN_EVENT_TYPES`,
+        `len(ORIGIN_EVENT_TYPES)` para 'Outros', ou -1 se o evento não for um gol de
+        cabeça contado.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O argumento deve ser um DataFrame.")
+
+    headed = (df['is_goal'].to_numpy() == 1) & (df['bodypart'].to_numpy() == 3)
+    matches = df['id_odsp'].to_numpy()
+    times = df['time'].to_numpy(dtype=float)
+    event_types = df['event_type'].to_numpy()
+
+    valid = np.zeros(headed.size, dtype=bool)
+    valid[1:] = (headed[1:] & (matches[1:] == matches[:-1]) &
+                 ((times[1:] - times[:-1]) <= time_window))
+    previous = np.full(headed.size, -1)
+    previous[1:] = event_types[:-1]
+
+    codes = np.full(headed.size, -1)
+    codes[valid] = len(ORIGIN_EVENT_TYPES)
+    for code, event_type in enumerate(ORIGIN_EVENT_TYPES):
+        codes[valid & (previous == event_type)] = code
+    if is_first_partition and headed.size > 0 and headed[0]:
+        codes[0] = len(ORIGIN_EVENT_TYPES)
+
+    return codes
+
+
+def count_headed_goal_origins(df: pd.DataFrame, is_first_partition: bool = True,
+                              time_window: float = HEADER_TIME_WINDOW) -> Dict[str, int]:
+    """Conta os gols de cabeça de cada origem com a mesma regra de
+    origin_of_headed_goals, mas de forma vetorizada (ver headed_goal_origin_codes). As
+    contagens de partes consecutivas do dataset podem ser somadas, desde que o primeiro
+    evento de cada parte seja tratado à parte (ver `is_first_partition`).
+
+    Args:
+        df (pd.DataFrame): Dataframe que contém os eventos, na ordem original.
+        is_first_partition (bool): Se True, um gol de cabeça na primeira linha conta
+        como 'Outros', como em origin_of_headed_goals. Se False, a primeira linha é
+        ignorada, pois seu evento anterior está em outra parte do dataset.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
+
+    Returns:
+        Dict[str, int]: Número de gols de cabeça com origem em escanteios ('corners'),
+        faltas ('fouls'), impedimentos ('offsides') e outros ('others').
+    """
+    codes = headed_goal_origin_codes(df, is_first_partition, time_window)
+    counts = np.bincount(codes[codes >= 0], minlength=len(ORIGIN_EVENT_TYPES) + 1)
+
+    origins = list(ORIGIN_EVENT_TYPES.values()) + ['others']
+    return {origin: int(count) for origin, count in zip(origins, counts)}
+
+
+def origins_from_counts(counts: Dict[str, int]) -> pd.DataFrame:
+    """Calcula a porcentagem das origens dos gols de cabeça a partir das contagens de
+    cada origem.
+
+    Args:
+        counts (Dict[str, int]): Contagens com as chaves 'corners', 'fouls', 'offsides'
+        e 'others'.
+
+    Returns:
+        pd.DataFrame: DataFrame no mesmo formato de origin_of_headed_goals.
+    """
+    if not isinstance(counts, dict):
+        raise TypeError("O argumento deve ser um dicionário.")
+
+    corners = counts['corners']
+    fouls = counts['fouls']
+    offsides = counts['offsides']
+    others = counts['others']
+
     total = corners + fouls + offsides + others
     if total == 0:
         return pd.DataFrame({'': ['Sem gols de cabeça']})
@@ -148,12 +263,13 @@ def origin_of_headed_goals(df: pd.DataFrame) -> pd.DataFrame:
     return results
 
 
-def graph_view(df: pd.DataFrame) -> None:
+def graph_view(df: pd.DataFrame, output_dir: str = OUTPUT_DIR) -> None:
     """Salva um gráfico de barras que indicam as porcentagens das origens dos gols de
     cabeça.
 
     Args:
         df (pd.DataFrame): DataFrame que contém as porcentagens de cada origem.
+        output_dir (str): Diretório em que o gráfico é salvo.
     """
     plt.figure(figsize=(8, 6))
     plt.bar(df['ORIGEM'], df['PORCENTAGEM'],
@@ -172,20 +288,49 @@ def graph_view(df: pd.DataFrame) -> None:
     ax.tick_params(axis='x', colors='white')
     ax.tick_params(axis='y', colors='white')
 
-    plt.savefig('../data/graph_head.png',format='png', dpi=300, transparent=True)
+    save_figure(os.path.join(output_dir, 'graph_head.png'), format='png', dpi=300,
+                transparent=True)
     plt.plot()
 
 
-def head_main(df: pd.DataFrame):
+def head_summary(df: pd.DataFrame,
+                 time_window: float = HEADER_TIME_WINDOW) -> pd.DataFrame:
+    """Calcula as porcentagens das origens dos gols de cabeça a partir do DataFrame de
+    eventos, sem exibir nem salvar os resultados.
+
+    Args:
+        df (pd.DataFrame): DataFrame que contém os eventos.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
+
+    Returns:
+        pd.DataFrame: DataFrame no formato de origin_of_headed_goals.
+    """
+    df = get_rows_with_previous(df, {'bodypart': 3, 'is_goal': 1})
+
+    return origin_of_headed_goals(df, time_window)
+
+
+def head_report(percent_of_origins: pd.DataFrame, output_dir: str = OUTPUT_DIR) -> None:
+    """Exibe e salva o gráfico das porcentagens das origens dos gols de cabeça.
+
+    Args:
+        percent_of_origins (pd.DataFrame): DataFrame gerado por head_summary.
+        output_dir (str): Diretório em que o gráfico é salvo.
+    """
+    print_dataframe(percent_of_origins, "ORIGEM DOS GOLS DE CABEÇA")
+    graph_view(percent_of_origins, output_dir)
+
+
+def head_main(df: pd.DataFrame, time_window: float = HEADER_TIME_WINDOW):
     """Função principal que executa a análise e visilação das origens dos gols de cabeça,
     utilizando as funções documentadas anteriormentes.
 
     Args:
         df (pd.DataFrame): DataFrame que contém os eventos.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
     """
     remove_columns(df, ['side', 'shot_outcome', 'location'])
-    df = get_rows_with_previous(df, {'bodypart': 3, 'is_goal': 1})
 
-    percent_of_origins = origin_of_headed_goals(df)
-    print_dataframe(percent_of_origins, "ORIGEM DOS GOLS DE CABEÇA")
-    graph_view(percent_of_origins)
+    head_report(head_summary(df, time_window))
@@ -0,0 +1,256 @@
+"""
+Este módulo permite acrescentar novos lotes de eventos (por exemplo, uma nova rodada de
+partidas) a um histórico já processado, sem reprocessar o dataset inteiro. O estado
+persistido guarda as contagens de resultados de partidas e de chutes, as contagens de
+origens dos gols de cabeça e o último evento recebido, o que permite tratar partidas cujos
+eventos chegam em lotes diferentes. Essas contagens têm tamanho fixo e ficam em um
+pickle; a tabela de gols por partida, que cresce com o histórico, fica em uma tabela
+SQLite indexada pela partida e pelo lado, de modo que cada lote só lê e atualiza as
+partidas em que houve gols. Cada lote é validado contra os códigos de dictionary.txt
+antes de ser incorporado.
+
+Funções
+-------
+validate_batch(batch, dictionary):
+    Confere se um lote de eventos tem as colunas e os códigos esperados.
+
+append_events(store_dir, batch, dictionary_path):
+    Incorpora um lote de eventos ao estado persistido e devolve os resumos atualizados.
+
+load_summaries(store_dir):
+    Monta os três resumos a partir do estado persistido.
+"""
+
+import os
+import pickle
+import sqlite3
+from typing import Any, Dict, List, Tuple
+
+import pandas as pd
+
+from head import origins_from_counts
+from mapreduce import EVENT_COLUMNS, boundary_origin, map_events
+from matches import goals_per_match_from_counts, summary_from_results
+from shots import shot_outcome_count_from_counts
+from utils import load_dictionary
+from validation import code_violations
+
+STATE_FILE = 'incremental_state.pkl'
+GOALS_FILE = 'incremental_goals.sqlite'
+# Número de partidas por consulta, abaixo do limite de parâmetros do SQLite
+QUERY_MATCHES = 500
+
+
+def _empty_state() -> Dict[str, Any]:
+    """Estado de um histórico sem eventos."""
+    return {
+        'shots_in': {},
+        'shots_out': {},
+        'head': {'corners': 0, 'fouls': 0, 'offsides': 0, 'others': 0},
+        'results': {1: 0, 0: 0, -1: 0},
+        'last': None,
+        'rows': 0,
+    }
+
+
+def _match_result(home: int, away: int) -> int:
+    """Resultado de uma partida com a mesma codificação de calculate_results."""
+    return 1 if home > away else (0 if home < away else -1)
+
+
+def _load_state(store_dir: str) -> Dict[str, Any]:
+    path = os.path.join(store_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return _empty_state()
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+def _save_state(store_dir: str, state: Dict[str, Any]) -> None:
+    """Grava o estado em um arquivo temporário e o renomeia, para que uma falha no meio
+    da escrita não corrompa o histórico."""
+    path = os.path.join(store_dir, STATE_FILE)
+    with open(path + '.tmp', 'wb') as file:
+        pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+
+
+def _connect_goals(store_dir: str) -> sqlite3.Connection:
+    """Abre a tabela de gols por partida, criando-a se necessário."""
+    conn = sqlite3.connect(os.path.join(store_dir, GOALS_FILE))
+    conn.execute('CREATE TABLE IF NOT EXISTS goals (id_odsp TEXT NOT NULL, '
+                 'side INTEGER NOT NULL, goals INTEGER NOT NULL, PRIMARY KEY (id_odsp, side))')
+    return conn
+
+
+def _match_scores(conn: sqlite3.Connection, matches: List[str]) -> Dict[str, List[int]]:
+    """Placar gravado (gols da casa e do visitante) de cada partida pedida."""
+    scores = {match: [0, 0] for match in matches}
+    for start in range(0, len(matches), QUERY_MATCHES):
+        part = matches[start:start + QUERY_MATCHES]
+        rows = conn.execute('SELECT id_odsp, side, goals FROM goals WHERE id_odsp IN '
+                            f'({", ".join(["?"] * len(part))})', part)
+        for match, side, goals in rows:
+            scores[match][side - 1] = goals
+    return scores
+
+
+def validate_batch(batch: pd.DataFrame, dictionary: Dict[str, Dict[int, str]]) -> None:
+    """Confere se um lote de eventos contém as colunas usadas pelas hipóteses e se as
+    colunas codificadas só contêm códigos descritos em dictionary.txt (ou valores
+    ausentes), com as mesmas verificações de `validation.code_violations`.
+
+    Args:
+        batch (pd.DataFrame): Lote de eventos com as colunas de events.csv.
+        dictionary (Dict[str, Dict[int, str]]): Códigos lidos por `load_dictionary`.
+
+    Raises:
+        TypeError: Se `batch` não for um pd.DataFrame ou `dictionary` não for um dicionário.
+        KeyError: Se alguma coluna necessária não existir em `batch`.
+        ValueError: Se alguma coluna contiver códigos inválidos.
+    """
+    # Tratamento de Erro
+    if not isinstance(batch, pd.DataFrame):
+        raise TypeError("O parâmetro 'batch' deve ser um pandas DataFrame.")
+
+    if not isinstance(dictionary, dict):
+        raise TypeError("O parâmetro 'dictionary' deve ser um dicionário.")
+
+    missing_columns = set(EVENT_COLUMNS) - set(batch.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas não existem no lote: {missing_columns}")
+
+    # Código Principal
+    invalid_columns = [column for column, mask in code_violations(batch, dictionary).items()
+                       if mask.any()]
+
+    if invalid_columns:
+        raise ValueError(f"As seguintes colunas contêm códigos inválidos: {invalid_columns}")
+
+
+def append_events(store_dir: str, batch: pd.DataFrame,
+                  dictionary_path: str = '../data/dictionary.txt') -> Dict[str, pd.DataFrame]:
+    """Incorpora um lote de eventos ao histórico persistido em `store_dir`. Os lotes
+    devem ser acrescentados na ordem dos eventos; uma partida pode continuar no lote
+    seguinte. Apenas os eventos do lote são processados, e apenas as partidas com gols
+    no lote são lidas e atualizadas na tabela de gols; o restante do estado tem tamanho
+    fixo.
+
+    Args:
+        store_dir (str): Diretório onde o estado do histórico é guardado.
+        batch (pd.DataFrame): Novo lote de eventos com as colunas de events.csv.
+        dictionary_path (str): Caminho para o arquivo dictionary.txt.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Os resumos atualizados (ver `load_summaries`).
+
+    Raises:
+        TypeError: Se `store_dir` não for uma string ou `batch` não for um pd.DataFrame.
+        KeyError: Se alguma coluna necessária não existir em `batch`.
+        ValueError: Se o lote contiver códigos inválidos.
+    """
+    # Tratamento de Erro
+    if not isinstance(store_dir, str):
+        raise TypeError("O parâmetro 'store_dir' deve ser uma string")
+
+    validate_batch(batch, load_dictionary(dictionary_path))
+
+    # Código Principal
+    os.makedirs(store_dir, exist_ok=True)
+    state = _load_state(store_dir)
+    partial = map_events(batch[EVENT_COLUMNS], is_first_partition=state['rows'] == 0)
+    batch_goals: List[Tuple[str, int, int]] = [
+        (str(match), int(side), int(goals)) for (match, side), goals in partial['goals'].items()]
+
+    conn = _connect_goals(store_dir)
+    try:
+        # Apenas as partidas com gols no lote mudam de resultado
+        scores = _match_scores(conn, sorted({match for match, _, _ in batch_goals}))
+        for score in scores.values():
+            if any(score):
+                state['results'][_match_result(*score)] -= 1
+        for match, side, goals in batch_goals:
+            scores[match][side - 1] += goals
+        for score in scores.values():
+            state['results'][_match_result(*score)] += 1
+
+        conn.executemany('INSERT INTO goals VALUES (?, ?, ?) ON CONFLICT (id_odsp, side) '
+                         'DO UPDATE SET goals = goals + excluded.goals', batch_goals)
+
+        for key in ['shots_in', 'shots_out']:
+            for outcome, count in partial[key].items():
+                state[key][outcome] = state[key].get(outcome, 0) + int(count)
+
+        for origin, count in partial['head'].items():
+            state['head'][origin] += count
+        if state['rows'] > 0:
+            origin = boundary_origin(state['last'], partial['first'], False)
+            if origin is not None:
+                state['head'][origin] += 1
+
+        if partial['last'] is not None:
+            state['last'] = partial['last']
+        state['rows'] += batch.shape[0]
+
+        # Os resumos são montados antes de gravar, para que um erro não deixe o histórico
+        # alterado sem que o chamador receba os resumos; a tabela de gols só é confirmada
+        # depois que o restante do estado foi gravado
+        summaries = _summaries(state)
+        _save_state(store_dir, state)
+        conn.commit()
+    finally:
+        conn.close()
+    return summaries
+
+
+def _summaries(state: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """Monta os resumos das três hipóteses a partir do estado."""
+    results = state['results']
+    return {
+        'matches': summary_from_results(results[1], results[0], results[-1]),
+        'shots': shot_outcome_count_from_counts(
+            pd.Series(state['shots_in'], dtype='int64', name='count').rename_axis('shot_outcome'),
+            pd.Series(state['shots_out'], dtype='int64', name='count').rename_axis('shot_outcome')),
+        'head': origins_from_counts(state['head']),
+    }
+
+
+def load_summaries(store_dir: str, include_match_table: bool = False) -> Dict[str, pd.DataFrame]:
+    """Monta os resumos das três hipóteses a partir do histórico persistido, sem
+    reprocessar nenhum evento.
+
+    Args:
+        store_dir (str): Diretório onde o estado do histórico é guardado.
+        include_match_table (bool): Se True, inclui também a tabela de gols por partida
+        (chave 'goals_per_match'), no formato de group_goals_by_match.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'matches' no formato de create_summary_dataframe,
+        'shots' no formato de shot_outcome_count e 'head' no formato de
+        origin_of_headed_goals.
+
+    Raises:
+        TypeError: Se `store_dir` não for uma string.
+        FileNotFoundError: Se não houver histórico em `store_dir`.
+    """
+    # Tratamento de Erro
+    if not isinstance(store_dir, str):
+        raise TypeError("O parâmetro 'store_dir' deve ser uma string")
+
+    if not os.path.exists(os.path.join(store_dir, STATE_FILE)):
+        raise FileNotFoundError(f"Não há histórico em '{store_dir}'")
+
+    # Código Principal
+    state = _load_state(store_dir)
+    summaries = _summaries(state)
+    if include_match_table:
+        conn = _connect_goals(store_dir)
+        try:
+            rows = conn.execute('SELECT id_odsp, side, goals FROM goals').fetchall()
+        finally:
+            conn.close()
+        index = pd.MultiIndex.from_tuples([row[:2] for row in rows], names=['id_odsp', 'side'])
+        goal_counts = pd.Series([row[2] for row in rows], index=index,
+                                dtype='int64').sort_index()
+        summaries['goals_per_match'] = goals_per_match_from_counts(goal_counts)
+    return summaries
@@ -0,0 +1,194 @@
+"""
+Este módulo reúne os laços que são sequenciais dentro de cada partida, como a regra do
+evento anterior de head.py e o placar corrente de cada partida. Cada laço é escrito uma
+única vez, como uma função simples sobre arrays de inteiros e os deslocamentos (offsets)
+das partidas, e é compilado com numba quando o pacote está instalado. Sem numba, a mesma
+função é executada pelo interpretador, com o mesmo resultado.
+
+As funções públicas recebem o DataFrame de eventos, extraem os arrays e escolhem a versão
+do laço pelo parâmetro `use_jit` (padrão: compilada, se disponível).
+
+Funções
+-------
+match_offsets(match_ids):
+    Calcula os deslocamentos dos blocos consecutivos de cada partida.
+
+headed_goal_origins(df, time_window, is_first_partition, use_jit):
+    Conta as origens dos gols de cabeça com a regra de origin_of_headed_goals.
+
+running_score(df, use_jit):
+    Calcula o placar de cada partida imediatamente antes de cada evento.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, ORIGIN_EVENT_TYPES
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    numba = None
+    HAS_NUMBA = False
+
+# Número de códigos de 'event_type' em dictionary.txt (0 a 11)
+N_EVENT_TYPES = 12
+
+
+def _jit(function):
+    """Compila `function` com numba, se disponível; caso contrário, a devolve intacta."""
+    if HAS_NUMBA:
+        return numba.njit(cache=True, nogil=True)(function)
+    return function
+
+
+def _previous_event_counts(offsets, times, event_types, headed, time_window,
+                           is_first_partition, n_types):
+    """Laço da regra do evento anterior: para cada gol de cabeça que não é o primeiro
+    evento da sua partida, conta o tipo do evento anterior se ele ocorreu até
+    `time_window` minutos antes. A última posição conta os gols de cabeça na primeira
+    linha do dataset, que origin_of_headed_goals classifica como 'Outros'."""
+    counts = np.zeros(n_types + 1, dtype=np.int64)
+    if is_first_partition and headed.shape[0] > 0 and headed[0]:
+        counts[n_types] += 1
+
+    for match in range(offsets.shape[0] - 1):
+        for row in range(offsets[match] + 1, offsets[match + 1]):
+            if headed[row] and times[row] - times[row - 1] <= time_window:
+                counts[event_types[row - 1]] += 1
+    return counts
+
+
+def _running_score(offsets, sides, goals):
+    """Laço do placar corrente: gols da casa e do visitante antes de cada evento,
+    recomeçando do zero em cada partida."""
+    home = np.zeros(sides.shape[0], dtype=np.int32)
+    away = np.zeros(sides.shape[0], dtype=np.int32)
+
+    for match in range(offsets.shape[0] - 1):
+        home_goals = 0
+        away_goals = 0
+        for row in range(offsets[match], offsets[match + 1]):
+            home[row] = home_goals
+            away[row] = away_goals
+            if goals[row]:
+                if sides[row] == 1:
+                    home_goals += 1
+                else:
+                    away_goals += 1
+    return home, away
+
+
+# Versões interpretadas e compiladas de cada laço
+PYTHON_KERNELS = {'previous_event_counts': _previous_event_counts,
+                  'running_score': _running_score}
+JIT_KERNELS = {name: _jit(kernel) for name, kernel in PYTHON_KERNELS.items()}
+
+
+def _kernel(name: str, use_jit: Optional[bool]):
+    """Escolhe a versão de um laço. Pedir a versão compilada sem numba usa a
+    interpretada."""
+    if use_jit is None:
+        use_jit = HAS_NUMBA
+    return JIT_KERNELS[name] if use_jit else PYTHON_KERNELS[name]
+
+
+def match_offsets(match_ids: np.ndarray) -> np.ndarray:
+    """Calcula os deslocamentos dos blocos consecutivos de eventos de cada partida: o
+    bloco `i` ocupa as linhas `offsets[i]` a `offsets[i + 1] - 1`.
+
+    Args:
+        match_ids (np.ndarray): Identificador da partida de cada evento, na ordem do
+                                arquivo.
+
+    Returns:
+        np.ndarray: Deslocamentos (int64), começando em 0 e terminando no número de
+        eventos.
+    """
+    codes, _ = pd.factorize(np.asarray(match_ids))
+    if codes.shape[0] == 0:
+        return np.zeros(1, dtype=np.int64)
+    starts = np.flatnonzero(np.diff(codes)) + 1
+    return np.concatenate([[0], starts, [codes.shape[0]]]).astype(np.int64)
+
+
+def headed_goal_origins(df: pd.DataFrame, time_window: float = HEADER_TIME_WINDOW,
+                        is_first_partition: bool = True,
+                        use_jit: Optional[bool] = None) -> Dict[str, int]:
+    """Conta os gols de cabeça de cada origem com a regra de origin_of_headed_goals,
+    percorrendo cada partida em um laço.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, na ordem original.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+                             anterior para que a origem seja contada.
+        is_first_partition (bool): Se True, um gol de cabeça na primeira linha conta
+                                   como 'Outros' (ver count_headed_goal_origins).
+        use_jit (Optional[bool]): Se True, usa o laço compilado (se numba estiver
+                                  instalado). Padrão: compilado, se disponível.
+
+    Returns:
+        Dict[str, int]: Contagens com as chaves 'corners', 'fouls', 'offsides' e
+        'others', como em count_headed_goal_origins.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    for column in ['id_odsp', 'time', 'event_type', 'is_goal', 'bodypart']:
+        if column not in df.columns:
+            raise KeyError(f"A coluna {column} não existe no DataFrame")
+
+    # Código Principal
+    headed = (df['is_goal'].to_numpy() == 1) & (df['bodypart'].to_numpy() == 3)
+    kernel = _kernel('previous_event_counts', use_jit)
+    counts = kernel(match_offsets(df['id_odsp'].to_numpy()),
+                    df['time'].to_numpy(dtype=np.float64),
+                    df['event_type'].to_numpy(dtype=np.int64), headed,
+                    float(time_window), bool(is_first_partition), N_EVENT_TYPES)
+
+    origins = {origin: int(counts[event_type])
+               for event_type, origin in ORIGIN_EVENT_TYPES.items()}
+    origins['others'] = int(counts.sum()) - sum(origins.values())
+    return origins
+
+
+def running_score(df: pd.DataFrame,
+                  use_jit: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Calcula o placar de cada partida imediatamente antes de cada evento. Os eventos
+    de cada partida devem estar em blocos consecutivos, na ordem em que ocorreram.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com as colunas 'id_odsp', 'side',
+                           'event_type' e 'is_goal'.
+        use_jit (Optional[bool]): Se True, usa o laço compilado (se numba estiver
+                                  instalado). Padrão: compilado, se disponível.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Gols do time da casa e do visitante antes de cada
+        evento.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    for column in ['id_odsp', 'side', 'event_type', 'is_goal']:
+        if column not in df.columns:
+            raise KeyError(f"A coluna {column} não existe no DataFrame")
+
+    # Código Principal
+    goals = (df['event_type'].to_numpy() == 1) & (df['is_goal'].to_numpy() == 1)
+    kernel = _kernel('running_score', use_jit)
+    return kernel(match_offsets(df['id_odsp'].to_numpy()),
+                  df['side'].to_numpy(dtype=np.int64), goals)
@@ -1,19 +1,114 @@
+from budget import budgeted_summaries, execution_report, plan_execution
+from cache import cached_call, dataset_fingerprint
 from clean_data import clean_data
-from utils import load_dataset
-from head import head_main
-from matches import matches_main
-from shots import shots_main
+from utils import load_dataset, load_dictionary, print_dataframe
+from validation import validate_events
+from writer import prune_runs, publish_latest, run_output_dir, wait_for_writes
+from game_state import game_state_summary
+from head import HEADER_TIME_WINDOW, head_report
+from matches import matches_report
+from plugins import build_plugins, scan_events
+from shots import (EXCLUDED_LOCATIONS, LOCATIONS_INSIDE, expected_goals_summary,
+                   shots_report)
+from xg import XG_MODEL_PATH, load_or_fit_xg
+
+CACHE_DIR = "../data/cache"
+DICTIONARY_PATH = "../data/dictionary.txt"
+# Limite de memória, em bytes (None para sem limite). Se o caminho em memória não couber
+# no limite, as hipóteses são calculadas em pedaços (ver budget.py)
+MEMORY_BUDGET = None
 
 def main():
-    """Função principal que orquestra todas as hipóteses da análise exploratória"""
+    """Função principal que orquestra todas as hipóteses da análise exploratória.
+    Os resumos de cada hipótese são guardados em cache e só são recalculados quando o
+    dataset ou os parâmetros da hipótese mudam; o dataset só é carregado (e validado) se
+    algum resumo precisar ser recalculado. As três hipóteses principais são calculadas
+    juntas, em uma única leitura dos eventos (ver plugins.py). Com MEMORY_BUDGET definido,
+    só as três hipóteses são calculadas, sem validação, gols esperados nem situação do
+    jogo: em memória se a estimativa couber no limite e em pedaços caso contrário (ou se
+    o caminho em memória ficar sem memória). Os arquivos de cada execução (gráficos e eventos limpos)
+    são gravados em um diretório próprio dentro de ../data/runs (ver writer.py); os
+    eventos limpos são gravados em segundo plano, enquanto as hipóteses são calculadas.
+    Ao final, os arquivos da execução são publicados em ../data e só as execuções mais
+    recentes são mantidas em ../data/runs."""
     filepath = "../data/events.csv"
-    df = load_dataset(filepath)
-    
-    clean_data(df)
+    fingerprint = dataset_fingerprint(filepath, CACHE_DIR)
+    output_dir = run_output_dir()
+
+    if MEMORY_BUDGET is not None:
+        # Só os resumos vão para o cache; o relatório da execução (memória, dados
+        # despejados) só é exibido quando os resumos são de fato calculados. O plano
+        # também só é feito nesse caso, pois estimar a memória lê o arquivo inteiro
+        reports = []
+        def budgeted():
+            plan = plan_execution(filepath, MEMORY_BUDGET)
+            summaries, report = budgeted_summaries(filepath, MEMORY_BUDGET, plan=plan)
+            reports.append(report)
+            return summaries
+
+        summaries = cached_call(CACHE_DIR, fingerprint, 'budgeted_summaries',
+                                {'budget_bytes': MEMORY_BUDGET}, budgeted)
+        if reports:
+            print_dataframe(execution_report(reports[0]), "EXECUÇÃO COM LIMITE DE MEMÓRIA")
+        matches_report(summaries['matches'], output_dir)
+        shots_report(*summaries['shots'], output_dir)
+        head_report(summaries['head'], output_dir)
+        publish_latest(output_dir)
+        prune_runs()
+        return
+
+    loaded = {}
+    def loaded_events():
+        if 'df' not in loaded:
+            loaded['df'] = load_dataset(filepath)
+            report = validate_events(loaded['df'], load_dictionary(DICTIONARY_PATH))
+            if report['violations'].any():
+                print_dataframe(report[report['violations'] > 0], "VIOLAÇÕES DE INTEGRIDADE")
+            clean_data(loaded['df'], output_dir, background=True)
+        return loaded['df']
+
+    def events():
+        return loaded_events().copy()
+
+    shots_params = {'locations_inside': LOCATIONS_INSIDE,
+                    'excluded_locations': EXCLUDED_LOCATIONS}
+    head_params = {'time_window': HEADER_TIME_WINDOW}
+    hypothesis_params = {'matches': {}, 'shots': shots_params, 'head': head_params}
+
+    scanned = {}
+    def scanned_summary(name):
+        # Na primeira hipótese fora do cache, as três são calculadas em uma única leitura
+        if not scanned:
+            scanned.update(scan_events(loaded_events(), build_plugins(hypothesis_params)))
+        return scanned[name]
+
+    def expected_goals():
+        df = events()
+        return expected_goals_summary(df, load_or_fit_xg(df, XG_MODEL_PATH, fingerprint),
+                                      **shots_params)
+
+    matches_report(cached_call(CACHE_DIR, fingerprint, 'matches', {},
+                               lambda: scanned_summary('matches')), output_dir)
+    shots_report(*cached_call(CACHE_DIR, fingerprint, 'shots', shots_params,
+                              lambda: scanned_summary('shots')), output_dir)
+    print_dataframe(cached_call(CACHE_DIR, fingerprint, 'xg',
+                                {'model_path': XG_MODEL_PATH, **shots_params}, expected_goals),
+                    "GOLS ESPERADOS (xG)")
+    head_report(cached_call(CACHE_DIR, fingerprint, 'head', head_params,
+                            lambda: scanned_summary('head')), output_dir)
+
+    # game_state_summary não modifica o DataFrame, então a cópia de events() é dispensada
+    by_game_state = cached_call(CACHE_DIR, fingerprint, 'game_state',
+                                {**shots_params, **head_params},
+                                lambda: game_state_summary(loaded_events(), **shots_params,
+                                                           **head_params))
+    print_dataframe(by_game_state['matches'], "RESULTADO PELA SITUAÇÃO NO INTERVALO")
+    print_dataframe(by_game_state['shots'], "CONVERSÃO PELA SITUAÇÃO DO JOGO")
+    print_dataframe(by_game_state['head'], "ORIGEM DOS GOLS DE CABEÇA PELA SITUAÇÃO DO JOGO")
 
-    matches_main(df.copy())
-    shots_main(df.copy())
-    head_main(df.copy())
+    wait_for_writes()
+    publish_latest(output_dir)
+    prune_runs()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,354 @@
+"""
+Este módulo executa, em vários processos, as partes das três hipóteses que dependem de
+cada evento: a contagem de gols por partida (group_goals_by_match), a contagem de
+resultados de chutes (shot_outcome_count) e a contagem das origens dos gols de cabeça
+(origin_of_headed_goals). Cada pedaço do dataset é lido e reduzido a contagens parciais
+dentro do próprio processo trabalhador, de modo que apenas essas contagens (pequenas)
+trafegam entre os processos. As contagens são então combinadas nos mesmos DataFrames de
+resumo produzidos pelo caminho em um único processo.
+
+Funções
+-------
+plan_partitions(paths, chunk_rows):
+    Divide um ou mais arquivos CSV em pedaços consecutivos de linhas, delimitados por
+    posições em bytes.
+
+map_events(df, is_first_partition):
+    Calcula as contagens parciais das três hipóteses para um pedaço do dataset.
+
+boundary_origin(last, first, left_is_first):
+    Aplica a regra do evento anterior de head.py na fronteira entre dois pedaços.
+
+reduce_partials(partials):
+    Combina, em ordem, as contagens parciais de pedaços consecutivos.
+
+finalize_partial(partial):
+    Monta os DataFrames de resumo a partir das contagens combinadas.
+
+run_map_reduce(paths, workers, chunk_rows):
+    Função principal que executa o map-reduce em `workers` processos.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from head import (HEADER_TIME_WINDOW, ORIGIN_EVENT_TYPES, count_headed_goal_origins,
+                  origins_from_counts)
+from matches import count_goals_by_side, goals_per_match_from_counts
+from shots import count_shot_outcomes, prepare_shots, shot_outcome_count_from_counts
+
+# Colunas de events.csv usadas pelas três hipóteses
+EVENT_COLUMNS = ['id_odsp', 'time', 'event_type', 'side', 'is_goal', 'location',
+                 'bodypart', 'shot_outcome']
+
+# (caminho, primeiro byte, byte final (exclusivo), número de linhas, se é o início do
+# dataset). Os limites caem sempre no início de um evento.
+Partition = Tuple[str, int, int, int, bool]
+
+# Tamanho dos blocos lidos ao percorrer os arquivos
+READ_BLOCK_BYTES = 1 << 20
+
+
+def _scan_records(path: str, chunk_rows: int) -> Tuple[int, List[int]]:
+    """Percorre o arquivo CSV uma única vez, em blocos binários, e devolve o número de
+    linhas de dados (sem o cabeçalho) e a posição, em bytes, do início do primeiro evento
+    e de cada `chunk_rows` eventos. Uma quebra de linha só termina um evento se estiver
+    fora de aspas, de modo que campos de texto com várias linhas (como 'text') contam
+    como um único evento."""
+    starts = []
+    terminators = 0
+    quote_parity = 0
+    position = 0
+    last_byte = b'\n'
+    with open(path, 'rb') as file:
+        while True:
+            block = file.read(READ_BLOCK_BYTES)
+            if not block:
+                break
+            data = np.frombuffer(block, dtype=np.uint8)
+            # Aspas escapadas ("") trocam a paridade duas vezes, então a paridade das aspas
+            # até cada quebra de linha diz se ela está dentro de um campo entre aspas
+            quotes = np.cumsum(data == ord('"')) + quote_parity
+            newlines = np.flatnonzero(data == ord('\n'))
+            ends = newlines[quotes[newlines] % 2 == 0]
+
+            # O terminador de número t (o primeiro é o do cabeçalho) começa o evento t
+            numbers = terminators + np.arange(1, ends.size + 1)
+            boundaries = ends[(numbers - 1) % chunk_rows == 0]
+            starts.extend((position + boundaries + 1).tolist())
+
+            terminators += int(ends.size)
+            quote_parity = int(quotes[-1] % 2)
+            position += len(block)
+            last_byte = block[-1:]
+
+    rows = terminators - 1 + (1 if last_byte != b'\n' else 0)
+    return max(rows, 0), starts
+
+
+def _count_rows(path: str) -> int:
+    """Conta as linhas de dados (sem o cabeçalho) de um arquivo CSV, considerando campos
+    entre aspas com quebras de linha."""
+    return _scan_records(path, 1 << 62)[0]
+
+
+def plan_partitions(paths: List[str], chunk_rows: int) -> List[Partition]:
+    """Divide os arquivos CSV em pedaços de até `chunk_rows` linhas, delimitados por
+    posições em bytes, de modo que cada processo leia apenas o próprio pedaço. Cada
+    arquivo é percorrido uma única vez. A ordem dos pedaços é a ordem de concatenação dos
+    arquivos.
+
+    Args:
+        paths (List[str]): Caminhos dos arquivos CSV de eventos.
+        chunk_rows (int): Número máximo de linhas de cada pedaço.
+
+    Returns:
+        List[Partition]: Lista de tuplas (caminho, primeiro byte, byte final, número de
+        linhas, se é o início do dataset).
+
+    Raises:
+        TypeError: Se `paths` não for uma lista ou `chunk_rows` não for um inteiro.
+        ValueError: Se `chunk_rows` não for positivo.
+        FileNotFoundError: Se algum arquivo não for encontrado.
+    """
+    # Tratamento de Erro
+    if not isinstance(paths, list):
+        raise TypeError("O parâmetro 'paths' deve ser uma lista")
+
+    if not isinstance(chunk_rows, int):
+        raise TypeError("O parâmetro 'chunk_rows' deve ser um inteiro")
+
+    if chunk_rows <= 0:
+        raise ValueError("O parâmetro 'chunk_rows' deve ser positivo")
+
+    for path in paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"O arquivo '{path}' não foi encontrado")
+
+    # Código Principal
+    partitions = []
+    for path in paths:
+        total_rows, starts = _scan_records(path, chunk_rows)
+        size = os.path.getsize(path)
+        for index, start in enumerate(starts):
+            nrows = min(chunk_rows, total_rows - index * chunk_rows)
+            if nrows <= 0:
+                break
+            end = starts[index + 1] if index + 1 < len(starts) else size
+            partitions.append((path, start, end, nrows, not partitions))
+    return partitions
+
+
+def _boundary_records(df: pd.DataFrame) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Guarda o primeiro e o último evento de um pedaço, necessários para aplicar a regra
+    do evento anterior de head.py na fronteira entre dois pedaços."""
+    if df.shape[0] == 0:
+        return None, None
+
+    first = df.iloc[0]
+    last = df.iloc[-1]
+    first_record = {'id_odsp': first['id_odsp'], 'time': float(first['time']),
+                    'headed': bool(first['is_goal'] == 1 and first['bodypart'] == 3)}
+    last_record = {'id_odsp': last['id_odsp'], 'time': float(last['time']),
+                   'event_type': int(last['event_type'])}
+    return first_record, last_record
+
+
+def map_events(df: pd.DataFrame, is_first_partition: bool = True) -> Dict[str, Any]:
+    """Calcula as contagens parciais das três hipóteses para um pedaço do dataset.
+
+    Args:
+        df (pd.DataFrame): Pedaço do DataFrame de eventos com as colunas `EVENT_COLUMNS`.
+        is_first_partition (bool): Se o pedaço começa na primeira linha do dataset.
+
+    Returns:
+        Dict[str, Any]: Contagens parciais com as chaves 'goals', 'shots_in',
+        'shots_out', 'head', 'first', 'last' e 'is_first'.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        KeyError: Se alguma coluna de `EVENT_COLUMNS` não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    missing_columns = set(EVENT_COLUMNS) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+
+    # Código Principal
+    df = df.reset_index(drop=True)
+    shots_in, shots_out = count_shot_outcomes(prepare_shots(df))
+    first, last = _boundary_records(df)
+
+    return {
+        'goals': count_goals_by_side(df),
+        'shots_in': shots_in,
+        'shots_out': shots_out,
+        'head': count_headed_goal_origins(df, is_first_partition),
+        'first': first,
+        'last': last,
+        'is_first': is_first_partition,
+    }
+
+
+def boundary_origin(last: Optional[Dict], first: Optional[Dict], left_is_first: bool,
+                    time_window: float = HEADER_TIME_WINDOW) -> Optional[str]:
+    """Aplica a regra do evento anterior de head.py ao primeiro evento de um pedaço,
+    cujo evento anterior é o último evento do pedaço que o precede.
+
+    Args:
+        last (Optional[Dict]): Último evento do pedaço anterior (None se vazio).
+        first (Optional[Dict]): Primeiro evento do pedaço seguinte (None se vazio).
+        left_is_first (bool): Se o pedaço anterior começa no início do dataset.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+                             anterior para que a origem seja contada.
+
+    Returns:
+        Optional[str]: A origem do gol de cabeça ('corners', 'fouls', 'offsides' ou
+        'others'), ou None se o primeiro evento não for contado.
+    """
+    if first is None or not first['headed']:
+        return None
+    if last is None:
+        return 'others' if left_is_first else None
+    if (last['id_odsp'] == first['id_odsp'] and
+            first['time'] - last['time'] <= time_window):
+        return ORIGIN_EVENT_TYPES.get(last['event_type'], 'others')
+    return None
+
+
+def _sum_counts(left: pd.Series, right: pd.Series, sort: bool) -> pd.Series:
+    """Soma duas séries de contagens pelo índice. Com sort=False a ordem de primeira
+    aparição é preservada, como em value_counts(sort=False)."""
+    combined = pd.concat([left, right])
+    return combined.groupby(level=list(range(combined.index.nlevels)), sort=sort).sum()
+
+
+def _combine(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Combina as contagens de dois pedaços consecutivos (left antes de right)."""
+    head = {origin: left['head'][origin] + right['head'][origin] for origin in left['head']}
+
+    origin = boundary_origin(left['last'], right['first'], left['is_first'])
+    if origin is not None:
+        head[origin] += 1
+
+    return {
+        'goals': _sum_counts(left['goals'], right['goals'], sort=True),
+        'shots_in': _sum_counts(left['shots_in'], right['shots_in'], sort=False),
+        'shots_out': _sum_counts(left['shots_out'], right['shots_out'], sort=False),
+        'head': head,
+        'first': left['first'] if left['first'] is not None else right['first'],
+        'last': right['last'] if right['last'] is not None else left['last'],
+        'is_first': left['is_first'],
+    }
+
+
+def reduce_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combina, em ordem, as contagens parciais de pedaços consecutivos do dataset.
+
+    Args:
+        partials (List[Dict[str, Any]]): Contagens parciais geradas por `map_events`,
+        na ordem em que os pedaços aparecem no dataset.
+
+    Returns:
+        Dict[str, Any]: Contagens parciais equivalentes às do dataset inteiro.
+
+    Raises:
+        TypeError: Se `partials` não for uma lista.
+        ValueError: Se `partials` estiver vazia.
+    """
+    # Tratamento de Erro
+    if not isinstance(partials, list):
+        raise TypeError("O parâmetro 'partials' deve ser uma lista")
+
+    if not partials:
+        raise ValueError("O parâmetro 'partials' deve conter ao menos um elemento")
+
+    # Código Principal
+    result = partials[0]
+    for partial in partials[1:]:
+        result = _combine(result, partial)
+    return result
+
+
+def finalize_partial(partial: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """Monta os DataFrames de resumo das três hipóteses a partir das contagens combinadas.
+
+    Args:
+        partial (Dict[str, Any]): Contagens geradas por `map_events` ou `reduce_partials`.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'matches' no formato de group_goals_by_match, 'shots' no
+        formato de shot_outcome_count e 'head' no formato de origin_of_headed_goals.
+    """
+    if not isinstance(partial, dict):
+        raise TypeError("O parâmetro 'partial' deve ser um dicionário")
+
+    return {
+        'matches': goals_per_match_from_counts(partial['goals']),
+        'shots': shot_outcome_count_from_counts(partial['shots_in'], partial['shots_out']),
+        'head': origins_from_counts(partial['head']),
+    }
+
+
+def _map_partition(partition: Partition) -> Dict[str, Any]:
+    """Tarefa executada em cada processo: lê o próprio pedaço e devolve as contagens."""
+    path, start, end, _, is_first = partition
+    with open(path, 'rb') as file:
+        header = file.readline()
+        file.seek(start)
+        data = file.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + data), usecols=EVENT_COLUMNS)
+    return map_events(df, is_first)
+
+
+def run_map_reduce(paths: Union[str, List[str]], workers: Optional[int] = None,
+                   chunk_rows: int = 200_000) -> Dict[str, pd.DataFrame]:
+    """Executa as três hipóteses em `workers` processos. O resultado é idêntico ao de
+    aplicar group_goals_by_match, shot_outcome_count e origin_of_headed_goals à
+    concatenação dos arquivos.
+
+    Args:
+        paths (Union[str, List[str]]): Caminho ou lista de caminhos dos CSVs de eventos.
+        workers (Optional[int]): Número de processos. Padrão: número de CPUs.
+        chunk_rows (int): Número máximo de linhas de cada tarefa.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Resumos com as chaves 'matches', 'shots' e 'head'.
+
+    Raises:
+        TypeError: Se `paths` não for uma string ou lista, ou `workers` não for inteiro.
+        ValueError: Se `workers` não for positivo ou os arquivos estiverem vazios.
+    """
+    # Tratamento de Erro
+    if isinstance(paths, str):
+        paths = [paths]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if not isinstance(workers, int):
+        raise TypeError("O parâmetro 'workers' deve ser um inteiro")
+
+    if workers <= 0:
+        raise ValueError("O parâmetro 'workers' deve ser positivo")
+
+    partitions = plan_partitions(paths, chunk_rows)
+    if not partitions:
+        raise ValueError("Os arquivos não contêm eventos")
+
+    # Código Principal
+    if workers == 1 or len(partitions) == 1:
+        partials = [_map_partition(partition) for partition in partitions]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(partitions))) as executor:
+            partials = list(executor.map(_map_partition, partitions))
+
+    return finalize_partial(reduce_partials(partials))
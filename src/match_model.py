@@ -0,0 +1,302 @@
+"""
+Este módulo ajusta um modelo de Poisson para os gols de cada partida, separando a
+vantagem de jogar em casa da força dos times. create_summary_dataframe mede a vantagem
+do mandante apenas pelas porcentagens de vitórias, empates e derrotas, que dependem de
+quais times jogaram em casa; o modelo estima um único parâmetro de vantagem, descontados
+o ataque e a defesa de cada time.
+
+Modelo
+------
+Os gols do mandante `i` e do visitante `j` são variáveis de Poisson independentes com
+médias
+
+    log(lambda) = intercepto + casa + ataque[i] - defesa[j]
+    log(mu)     = intercepto + ataque[j] - defesa[i]
+
+O ajuste é feito por Newton-Raphson (IRLS) sobre todas as partidas de uma vez, com uma
+penalização L2 pequena em ataque e defesa, que torna os parâmetros identificáveis. Com
+`dixon_coles=True`, o parâmetro `rho` da correção de Dixon e Coles para placares baixos
+(0 x 0, 1 x 0, 0 x 1 e 1 x 1) é ajustado em seguida, com as forças fixas.
+
+Funções
+-------
+match_goals(df):
+    Monta a tabela de gols por partida com os códigos dos times.
+
+fit_match_model(df, dixon_coles, l2, max_iter, tol):
+    Ajusta o modelo sobre as partidas de `df`.
+
+expected_match_goals(model, home_ids, away_ids):
+    Calcula as médias de gols de cada confronto.
+
+outcome_probabilities(model, home_teams, away_teams, max_goals):
+    Calcula as probabilidades de vitória, empate e derrota de vários confrontos.
+
+team_strengths(model):
+    Monta a tabela de ataque e defesa de cada time.
+"""
+
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from matches import count_goals_by_side, match_teams
+
+MAX_GOALS = 10
+
+# Intervalo de busca de rho na correção de Dixon-Coles
+RHO_BOUNDS = (-0.3, 0.3)
+
+MatchModel = Dict[str, Any]
+
+
+def match_goals(df: pd.DataFrame) -> pd.DataFrame:
+    """Monta a tabela de gols por partida com os códigos dos times. Diferente de
+    group_goals_by_match, as partidas sem gols também aparecem.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com as colunas 'event_team' e
+                           'opponent'.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado por 'id_odsp' com as colunas de `match_teams`
+        e 'home_goals' e 'away_goals'. O atributo `attrs['teams']` guarda os nomes dos
+        times na ordem dos códigos.
+    """
+    teams = match_teams(df)
+    # Partidas sem gols, ou em que só um lado marcou, recebem zero pelo reindex
+    goals = count_goals_by_side(df).unstack(fill_value=0).reindex(
+        index=teams.index, columns=[1, 2], fill_value=0)
+    teams['home_goals'] = goals[1].to_numpy()
+    teams['away_goals'] = goals[2].to_numpy()
+    return teams
+
+
+def _design(home_ids: np.ndarray, away_ids: np.ndarray, n_teams: int) -> np.ndarray:
+    """Matriz do modelo: uma linha para os gols do mandante e outra para os do
+    visitante de cada partida. Colunas: intercepto, casa, ataque (n_teams) e defesa
+    (n_teams, com sinal negativo)."""
+    n_matches = home_ids.shape[0]
+    design = np.zeros((2 * n_matches, 2 + 2 * n_teams))
+    rows = np.arange(2 * n_matches)
+    scorers = np.concatenate([home_ids, away_ids])
+    conceders = np.concatenate([away_ids, home_ids])
+
+    design[:, 0] = 1.0
+    design[:n_matches, 1] = 1.0
+    design[rows, 2 + scorers] = 1.0
+    design[rows, 2 + n_teams + conceders] = -1.0
+    return design
+
+
+def _log_factorial(values: np.ndarray) -> np.ndarray:
+    """log(k!) de inteiros não negativos, por uma tabela acumulada."""
+    table = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, values.max() + 2)))])
+    return table[values]
+
+
+def _dixon_coles_tau(home_goals: np.ndarray, away_goals: np.ndarray, home_mean: np.ndarray,
+                     away_mean: np.ndarray, rho: float) -> np.ndarray:
+    """Fator de correção de Dixon-Coles de cada placar (1 fora dos placares baixos)."""
+    tau = np.ones(np.broadcast(home_goals, away_goals, home_mean).shape)
+    low = (home_goals <= 1) & (away_goals <= 1)
+    both_zero = low & (home_goals == 0) & (away_goals == 0)
+    home_zero = low & (home_goals == 0) & (away_goals == 1)
+    away_zero = low & (home_goals == 1) & (away_goals == 0)
+    both_one = low & (home_goals == 1) & (away_goals == 1)
+
+    home_mean, away_mean = np.broadcast_arrays(home_mean, away_mean)
+    tau = np.where(both_zero, 1 - home_mean * away_mean * rho, tau)
+    tau = np.where(home_zero, 1 + home_mean * rho, tau)
+    tau = np.where(away_zero, 1 + away_mean * rho, tau)
+    tau = np.where(both_one, 1 - rho, tau)
+    return tau
+
+
+def _fit_rho(home_goals: np.ndarray, away_goals: np.ndarray, home_mean: np.ndarray,
+             away_mean: np.ndarray, iterations: int = 60) -> float:
+    """Ajusta rho por busca da razão áurea na log-verossimilhança da correção."""
+    def objective(rho):
+        tau = _dixon_coles_tau(home_goals, away_goals, home_mean, away_mean, rho)
+        return np.log(np.maximum(tau, 1e-12)).sum()
+
+    low, high = RHO_BOUNDS
+    ratio = (np.sqrt(5) - 1) / 2
+    left, right = high - ratio * (high - low), low + ratio * (high - low)
+    for _ in range(iterations):
+        if objective(left) > objective(right):
+            high, right = right, left
+            left = high - ratio * (high - low)
+        else:
+            low, left = left, right
+            right = low + ratio * (high - low)
+    return float((low + high) / 2)
+
+
+def fit_match_model(df: pd.DataFrame, dixon_coles: bool = False, l2: float = 1e-3,
+                    max_iter: int = 50, tol: float = 1e-8) -> MatchModel:
+    """Ajusta o modelo de Poisson sobre as partidas de `df`.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com as colunas 'event_team' e
+                           'opponent'.
+        dixon_coles (bool): Se True, ajusta também a correção de Dixon-Coles.
+        l2 (float): Peso da penalização L2 em ataque e defesa.
+        max_iter (int): Número máximo de iterações de Newton.
+        tol (float): O ajuste termina quando o maior passo for menor que `tol`.
+
+    Returns:
+        MatchModel: Dicionário com 'teams', 'intercept', 'home_advantage' (log da razão
+        entre as médias de gols em casa e fora), 'attack', 'defence', 'rho' (0 sem
+        Dixon-Coles), 'log_likelihood', 'n_matches' e 'iterations'.
+
+    Raises:
+        ValueError: Se não houver partidas ou `l2` não for positivo.
+    """
+    # Tratamento de Erro
+    goals = match_goals(df)
+    if goals.empty:
+        raise ValueError("O DataFrame não tem partidas para ajustar o modelo.")
+
+    if l2 <= 0:
+        raise ValueError("O parâmetro 'l2' deve ser positivo.")
+
+    # Código Principal
+    teams = goals.attrs['teams']
+    n_teams = len(teams)
+    home_ids = goals['home_id'].to_numpy()
+    away_ids = goals['away_id'].to_numpy()
+    design = _design(home_ids, away_ids, n_teams)
+    scored = np.concatenate([goals['home_goals'].to_numpy(),
+                             goals['away_goals'].to_numpy()]).astype(np.float64)
+
+    penalty = np.full(design.shape[1], float(l2))
+    penalty[:2] = 0.0
+    weights = np.zeros(design.shape[1])
+    weights[0] = np.log(max(scored.mean(), 1e-3))
+
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        means = np.exp(design @ weights)
+        gradient = design.T @ (scored - means) - penalty * weights
+        hessian = design.T @ (design * means[:, None])
+        hessian[np.diag_indices_from(hessian)] += penalty + 1e-12
+        step = np.linalg.solve(hessian, gradient)
+        weights += step
+        if np.abs(step).max() < tol:
+            break
+
+    means = np.exp(design @ weights)
+    n_matches = home_ids.shape[0]
+    home_goals = scored[:n_matches].astype(np.int64)
+    away_goals = scored[n_matches:].astype(np.int64)
+    rho = (_fit_rho(home_goals, away_goals, means[:n_matches], means[n_matches:])
+           if dixon_coles else 0.0)
+
+    integer_goals = scored.astype(np.int64)
+    log_likelihood = float((scored * np.log(means) - means - _log_factorial(integer_goals)).sum())
+    if dixon_coles:
+        tau = _dixon_coles_tau(home_goals, away_goals, means[:n_matches], means[n_matches:], rho)
+        log_likelihood += float(np.log(np.maximum(tau, 1e-12)).sum())
+
+    return {'teams': teams, 'intercept': float(weights[0]),
+            'home_advantage': float(weights[1]),
+            'attack': weights[2:2 + n_teams], 'defence': weights[2 + n_teams:],
+            'rho': rho, 'log_likelihood': log_likelihood, 'n_matches': int(n_matches),
+            'iterations': iterations}
+
+
+def expected_match_goals(model: MatchModel, home_ids: np.ndarray,
+                         away_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Calcula as médias de gols do mandante e do visitante de cada confronto.
+
+    Args:
+        model (MatchModel): Modelo criado por `fit_match_model`.
+        home_ids (np.ndarray): Código do mandante de cada confronto.
+        away_ids (np.ndarray): Código do visitante de cada confronto.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Médias de gols do mandante e do visitante.
+    """
+    attack, defence = model['attack'], model['defence']
+    home_mean = np.exp(model['intercept'] + model['home_advantage'] +
+                       attack[home_ids] - defence[away_ids])
+    away_mean = np.exp(model['intercept'] + attack[away_ids] - defence[home_ids])
+    return home_mean, away_mean
+
+
+def _team_ids(model: MatchModel, names: Sequence[str]) -> np.ndarray:
+    """Converte nomes de times nos códigos do modelo."""
+    lookup = pd.Index(model['teams'])
+    ids = lookup.get_indexer(list(names))
+    if (ids < 0).any():
+        unknown = [name for name, code in zip(names, ids) if code < 0]
+        raise KeyError(f"Times desconhecidos pelo modelo: {unknown[:5]}")
+    return ids
+
+
+def outcome_probabilities(model: MatchModel, home_teams: Sequence[str],
+                          away_teams: Sequence[str], max_goals: int = MAX_GOALS) -> pd.DataFrame:
+    """Calcula, em uma única operação sobre todos os confrontos, as probabilidades de
+    vitória do mandante, empate e vitória do visitante. Os placares são truncados em
+    `max_goals` gols por time e as probabilidades são renormalizadas.
+
+    Args:
+        model (MatchModel): Modelo criado por `fit_match_model`.
+        home_teams (Sequence[str]): Nome do mandante de cada confronto.
+        away_teams (Sequence[str]): Nome do visitante de cada confronto.
+        max_goals (int): Maior número de gols por time considerado.
+
+    Returns:
+        pd.DataFrame: Colunas 'home_team', 'away_team', 'home_goals', 'away_goals'
+        (médias de gols), 'home_win', 'draw' e 'away_win'.
+
+    Raises:
+        ValueError: Se as listas de times tiverem tamanhos diferentes.
+        KeyError: Se algum time não existir no modelo.
+    """
+    # Tratamento de Erro
+    if len(home_teams) != len(away_teams):
+        raise ValueError("As listas de mandantes e visitantes devem ter o mesmo tamanho.")
+
+    # Código Principal
+    home_mean, away_mean = expected_match_goals(model, _team_ids(model, home_teams),
+                                                _team_ids(model, away_teams))
+    goals = np.arange(max_goals + 1)
+    log_factorial = _log_factorial(goals)
+    home_pmf = np.exp(goals * np.log(home_mean)[:, None] - home_mean[:, None] - log_factorial)
+    away_pmf = np.exp(goals * np.log(away_mean)[:, None] - away_mean[:, None] - log_factorial)
+
+    # scores[k, i, j]: probabilidade do placar i x j no confronto k
+    scores = home_pmf[:, :, None] * away_pmf[:, None, :]
+    if model['rho'] != 0.0:
+        scores *= _dixon_coles_tau(goals[None, :, None], goals[None, None, :],
+                                   home_mean[:, None, None], away_mean[:, None, None],
+                                   model['rho'])
+    scores /= scores.sum(axis=(1, 2), keepdims=True)
+
+    home_win = np.tril(np.ones((max_goals + 1, max_goals + 1)), -1)
+    return pd.DataFrame({
+        'home_team': list(home_teams), 'away_team': list(away_teams),
+        'home_goals': home_mean, 'away_goals': away_mean,
+        'home_win': np.einsum('kij,ij->k', scores, home_win),
+        'draw': np.einsum('kii->k', scores),
+        'away_win': np.einsum('kij,ji->k', scores, home_win),
+    })
+
+
+def team_strengths(model: MatchModel) -> pd.DataFrame:
+    """Monta a tabela de força dos times, ordenada pela soma de ataque e defesa.
+
+    Args:
+        model (MatchModel): Modelo criado por `fit_match_model`.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado pelo nome do time com as colunas 'attack',
+        'defence' e 'strength' (ataque + defesa).
+    """
+    strengths = pd.DataFrame({'attack': model['attack'], 'defence': model['defence']},
+                             index=pd.Index(model['teams'], name='team'))
+    strengths['strength'] = strengths['attack'] + strengths['defence']
+    return strengths.sort_values('strength', ascending=False)
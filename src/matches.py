@@ -5,6 +5,13 @@ jogos (vitórias, derrotas, empates) e visualizar as porcentagens de cada um.
 
 Funções
 -------
+count_goals_by_side(df):
+    Conta os gols de cada lado em cada partida, em um formato que pode ser somado
+    entre partes do dataset.
+
+goals_per_match_from_counts(goal_counts):
+    Monta o DataFrame de gols por partida a partir das contagens por lado.
+
 group_goals_by_match(df):
     Agrupa os eventos por partida e lado do time (casa ou visitante), focando
     especificamente nos gols.
@@ -16,22 +23,106 @@ calculate_results(goals_per_match):
 create_summary_dataframe(goals_per_match):
     Cria um DataFrame com as porcentagens de vitórias, derrotas e empates do time da casa.
 
+summary_from_results(home_victories, home_defeats, home_draws):
+    Cria o mesmo DataFrame a partir das contagens de vitórias, derrotas e empates.
+
 graph_view(df):
     Plota um gráfico de barras com as porcentagens de vitórias, derrotas e empates do
     time da casa.
 
+matches_summary(df):
+    Calcula as porcentagens de vitórias, derrotas e empates sem exibir os resultados.
+
+matches_report(summary_df):
+    Exibe e salva as porcentagens de vitórias, derrotas e empates.
+
 matches_main(df):
     Função principal que orquestra a análise e visualização dos resultados das partidas.
 
+match_teams(df):
+    Identifica os times da casa e visitante de cada partida, com códigos inteiros.
+
+team_result_matrices(df):
+    Conta vitórias, empates e derrotas de cada time em casa, fora e contra cada adversário.
+
+team_home_advantage(df):
+    Calcula, para cada time, a diferença entre o desempenho em casa e fora.
+
+head_to_head_dataframe(matrices):
+    Transforma a matriz de confrontos em um DataFrame com uma linha por confronto.
+
 Autor
 -----
     Arthur Rabello Oliveira
 """
 
+import os
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from typing import Any, Dict
 
 from utils import filter_df, print_dataframe
+from writer import OUTPUT_DIR, save_figure
+
+def count_goals_by_side(df: pd.DataFrame) -> pd.Series:
+    """
+    Conta os gols marcados por cada lado (casa ou visitante) em cada partida. As
+    contagens de partes diferentes do dataset podem ser somadas, o que permite processar
+    o dataset em pedaços.
+
+    Args:
+        df (pandas.DataFrame): DataFrame contendo os eventos de futebol.
+
+    Returns:
+        pandas.Series: Série indexada por ('id_odsp', 'side') com o número de gols.
+
+    Raises:
+        TypeError: Se df não for um pandas DataFrame.
+        KeyError: Se colunas essenciais não forem encontradas no DataFrame.
+    """
+    #raises
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame")
+
+    required_columns = ['id_odsp', 'side', 'event_type', 'is_goal']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas estão faltando no DataFrame: {missing_columns}")
+
+    #actual code
+    df_goals = filter_df(df, {'event_type': 1, 'is_goal': 1})
+    return df_goals.groupby(['id_odsp', 'side']).size()
+
+
+def goals_per_match_from_counts(goal_counts: pd.Series) -> pd.DataFrame:
+    """
+    Monta o DataFrame de gols por partida a partir das contagens por lado geradas por
+    count_goals_by_side (ou da soma de várias delas).
+
+    Args:
+        goal_counts (pandas.Series): Série indexada por ('id_odsp', 'side') com o número
+        de gols.
+
+    Returns:
+        pandas.DataFrame: Um DataFrame com colunas 'home' e 'away' representando os gols
+        marcados pelos times da casa e visitantes.
+
+    Raises:
+        TypeError: Se goal_counts não for uma pandas Series.
+    """
+    #raises
+    if not isinstance(goal_counts, pd.Series):
+        raise TypeError("O parâmetro 'goal_counts' deve ser uma pandas Series")
+
+    #actual code
+    # Partidas em que só um lado marcou (ou nenhum gol) não têm a coluna do outro lado
+    goals_per_match = goal_counts.unstack(fill_value=0).reindex(columns=[1, 2], fill_value=0)
+    goals_per_match.columns = ['home', 'away']
+    goals_per_match = goals_per_match.reindex(columns=['away', 'home'], fill_value=0)
+    return goals_per_match
+
 
 def group_goals_by_match(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -59,11 +150,7 @@ def group_goals_by_match(df: pd.DataFrame) -> pd.DataFrame:
         raise KeyError(f"As seguintes colunas estão faltando no DataFrame: {missing_columns}")
 
     #actual code
-    df_goals = filter_df(df, {'event_type': 1, 'is_goal': 1})
-    goals_per_match = df_goals.groupby(['id_odsp', 'side']).size().unstack(fill_value=0)
-    goals_per_match.columns = ['home', 'away']
-    goals_per_match = goals_per_match.reindex(columns=['away', 'home'], fill_value=0)
-    return goals_per_match
+    return goals_per_match_from_counts(count_goals_by_side(df))
 
 
 def calculate_results(goals_per_match: pd.DataFrame) -> pd.DataFrame:
@@ -127,7 +214,29 @@ def create_summary_dataframe(goals_per_match: pd.DataFrame) -> pd.DataFrame:
     home_defeats = (goals_per_match['result'] == 0).sum()
     home_draws = (goals_per_match['result'] == -1).sum()
 
+    return summary_from_results(home_victories, home_defeats, home_draws)
+
+
+def summary_from_results(home_victories: int, home_defeats: int,
+                         home_draws: int) -> pd.DataFrame:
+    """
+    Cria o DataFrame de porcentagens de create_summary_dataframe a partir do número de
+    vitórias, derrotas e empates do time da casa.
+
+    Args:
+        home_victories (int): Número de vitórias do time da casa.
+        home_defeats (int): Número de derrotas do time da casa.
+        home_draws (int): Número de empates.
+
+    Returns:
+        pandas.DataFrame: DataFrame com as porcentagens de vitórias, derrotas e empates
+        para o time da casa. Sem partidas, as porcentagens são zero.
+    """
+
     total_matches = home_victories + home_defeats + home_draws
+    if total_matches == 0:
+        # Sem partidas com gols: as porcentagens ficam zeradas
+        total_matches = 1
 
     summary_df = pd.DataFrame({
         'results': ['Vitórias', 'Derrotas', 'Empates'],
@@ -139,7 +248,7 @@ def create_summary_dataframe(goals_per_match: pd.DataFrame) -> pd.DataFrame:
     return summary_df
 
 
-def graph_view(df: pd.DataFrame) -> None:  
+def graph_view(df: pd.DataFrame, output_dir: str = OUTPUT_DIR) -> None:
     """
     Plota um gráfico de barras com as porcentagens de vitórias, derrotas e empates do
     time da casa.
@@ -147,6 +256,7 @@ def graph_view(df: pd.DataFrame) -> None:
     Args:
         df (pandas.DataFrame): DataFrame contendo as porcentagens de vitórias,
         derrotas e empates.
+        output_dir (str): Diretório em que o gráfico é salvo.
 
     Raises:
         TypeError: Se 'df' não for um pandas DataFrame.
@@ -173,27 +283,233 @@ def graph_view(df: pd.DataFrame) -> None:
     ax.tick_params(axis='x', colors='white')
     ax.tick_params(axis='y', colors='white')
 
-    plt.savefig('../data/graph_matches.png', format='png', dpi=300, transparent=True)
+    save_figure(os.path.join(output_dir, 'graph_matches.png'), format='png', dpi=300,
+                transparent=True)
     plt.plot()
 
 
-def matches_main(df: pd.DataFrame) -> pd.DataFrame:   
+def matches_summary(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Função principal para orquestrar a análise e exibir os resultados.
+    Calcula as porcentagens de vitórias, derrotas e empates do time da casa a partir do
+    DataFrame de eventos, sem exibir nem salvar os resultados.
 
     Args:
         df (pandas.DataFrame): O dataset original contendo todos os eventos de futebol.
 
     Returns:
-        pandas.DataFrame: DataFrame contendo as porcentagens de vitórias, derrotas e
-        empates do time da casa.
+        pandas.DataFrame: DataFrame no formato de create_summary_dataframe.
     """
 
     goals_per_match = group_goals_by_match(df)
     goals_per_match = calculate_results(goals_per_match)
-    summary_df = create_summary_dataframe(goals_per_match)
+    return create_summary_dataframe(goals_per_match)
+
+
+def matches_report(summary_df: pd.DataFrame, output_dir: str = OUTPUT_DIR) -> None:
+    """
+    Exibe e salva o gráfico das porcentagens de vitórias, derrotas e empates.
+
+    Args:
+        summary_df (pandas.DataFrame): DataFrame gerado por matches_summary.
+        output_dir (str): Diretório em que o gráfico é salvo.
+    """
 
-    graph_view(summary_df)
+    graph_view(summary_df, output_dir)
     print_dataframe(summary_df, "RESULTADOS DOS JOGOS")
 
+
+def matches_main(df: pd.DataFrame) -> pd.DataFrame:   
+    """
+    Função principal para orquestrar a análise e exibir os resultados.
+
+    Args:
+        df (pandas.DataFrame): O dataset original contendo todos os eventos de futebol.
+
+    Returns:
+        pandas.DataFrame: DataFrame contendo as porcentagens de vitórias, derrotas e
+        empates do time da casa.
+    """
+
+    summary_df = matches_summary(df)
+    matches_report(summary_df)
+
     return summary_df
+
+
+def match_teams(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Identifica os times de cada partida a partir das colunas 'event_team' e 'opponent'
+    (descartadas por clean_data) e converte os nomes em códigos inteiros, usando o mesmo
+    código para um time como mandante e como visitante.
+
+    Args:
+        df (pandas.DataFrame): DataFrame de eventos.
+
+    Returns:
+        pandas.DataFrame: DataFrame indexado por 'id_odsp' com as colunas 'home_team',
+        'away_team', 'home_id' e 'away_id'. O atributo `attrs['teams']` guarda os nomes
+        na ordem dos códigos.
+
+    Raises:
+        TypeError: Se df não for um pandas DataFrame.
+        KeyError: Se colunas essenciais não forem encontradas no DataFrame.
+    """
+    #raises
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame")
+
+    required_columns = ['id_odsp', 'side', 'event_team', 'opponent']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas estão faltando no DataFrame: {missing_columns}")
+
+    #actual code
+    is_home = df['side'] == 1
+    names = pd.DataFrame({
+        'id_odsp': df['id_odsp'],
+        'home_team': df['event_team'].where(is_home, df['opponent']),
+        'away_team': df['opponent'].where(is_home, df['event_team']),
+    })
+    teams = names.groupby('id_odsp', sort=False).first().dropna()
+
+    codes, team_names = pd.factorize(pd.concat([teams['home_team'], teams['away_team']]))
+    teams['home_id'], teams['away_id'] = np.split(codes, 2)
+    teams.attrs['teams'] = np.asarray(team_names, dtype=object)
+    return teams
+
+
+def team_result_matrices(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Conta, em uma única passada vetorizada, as vitórias, empates e derrotas de cada time
+    em casa, fora de casa e contra cada adversário. Diferente de create_summary_dataframe,
+    as partidas sem gols entram como empates.
+
+    Args:
+        df (pandas.DataFrame): DataFrame de eventos com as colunas 'event_team' e
+        'opponent'.
+
+    Returns:
+        Dict[str, Any]: 'teams' (nomes na ordem dos códigos), 'home' e 'away' (matrizes
+        times x [vitórias, empates, derrotas] do ponto de vista do time) e
+        'head_to_head' (matriz mandante x visitante x [vitórias, empates, derrotas] do
+        mandante).
+
+    Raises:
+        TypeError: Se df não for um pandas DataFrame.
+        KeyError: Se colunas essenciais não forem encontradas no DataFrame.
+    """
+    #raises
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame")
+
+    required_columns = ['id_odsp', 'side', 'event_type', 'is_goal', 'event_team', 'opponent']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas estão faltando no DataFrame: {missing_columns}")
+
+    #actual code
+    teams = match_teams(df)
+    goals = group_goals_by_match(df).reindex(teams.index, fill_value=0)
+    n_teams = len(teams.attrs['teams'])
+
+    # 0: vitória do mandante, 1: empate, 2: derrota do mandante
+    home_outcome = np.sign(goals['away'].to_numpy() - goals['home'].to_numpy()) + 1
+    home_id = teams['home_id'].to_numpy()
+    away_id = teams['away_id'].to_numpy()
+
+    home = np.bincount(home_id * 3 + home_outcome, minlength=n_teams * 3)
+    away = np.bincount(away_id * 3 + (2 - home_outcome), minlength=n_teams * 3)
+    head_to_head = np.bincount((home_id * n_teams + away_id) * 3 + home_outcome,
+                               minlength=n_teams * n_teams * 3)
+
+    return {
+        'teams': teams.attrs['teams'],
+        'home': home.reshape(n_teams, 3),
+        'away': away.reshape(n_teams, 3),
+        'head_to_head': head_to_head.reshape(n_teams, n_teams, 3),
+    }
+
+
+def team_home_advantage(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula, para cada time, as porcentagens de vitórias, empates e derrotas em casa e
+    fora, e a vantagem de jogar em casa: a diferença entre as porcentagens de vitórias e
+    entre os pontos por jogo (3 por vitória, 1 por empate) em casa e fora.
+
+    Args:
+        df (pandas.DataFrame): DataFrame de eventos com as colunas 'event_team' e
+        'opponent'.
+
+    Returns:
+        pandas.DataFrame: DataFrame indexado pelo nome do time, ordenado pela diferença de
+        porcentagem de vitórias.
+
+    Raises:
+        TypeError: Se df não for um pandas DataFrame.
+        KeyError: Se colunas essenciais não forem encontradas no DataFrame.
+    """
+    #raises
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame")
+
+    required_columns = ['id_odsp', 'side', 'event_type', 'is_goal', 'event_team', 'opponent']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas estão faltando no DataFrame: {missing_columns}")
+
+    #actual code
+    matrices = team_result_matrices(df)
+    columns = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for venue in ['home', 'away']:
+            results = matrices[venue]
+            played = results.sum(axis=1)
+            columns[f'{venue}_matches'] = played
+            for i, result in enumerate(['victories', 'draws', 'defeats']):
+                columns[f'{venue}_{result}_percentage'] = results[:, i] / played * 100
+            columns[f'{venue}_points_per_match'] = (3 * results[:, 0] + results[:, 1]) / played
+
+    advantage = pd.DataFrame(columns, index=pd.Index(matrices['teams'], name='team'))
+    advantage['victories_delta'] = (advantage['home_victories_percentage'] -
+                                    advantage['away_victories_percentage'])
+    advantage['points_delta'] = (advantage['home_points_per_match'] -
+                                 advantage['away_points_per_match'])
+    return advantage.sort_values('victories_delta', ascending=False)
+
+
+def head_to_head_dataframe(matrices: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Transforma a matriz de confrontos de team_result_matrices em um DataFrame com uma
+    linha para cada par (mandante, visitante) que se enfrentou.
+
+    Args:
+        matrices (Dict[str, Any]): Resultado de team_result_matrices.
+
+    Returns:
+        pandas.DataFrame: DataFrame com as colunas 'home_team', 'away_team', 'matches',
+        'home_victories', 'draws' e 'home_defeats'.
+
+    Raises:
+        TypeError: Se matrices não for um dicionário.
+        KeyError: Se matrices não tiver as chaves 'teams' e 'head_to_head'.
+    """
+    #raises
+    if not isinstance(matrices, dict):
+        raise TypeError("O parâmetro 'matrices' deve ser um dicionário")
+
+    if 'teams' not in matrices or 'head_to_head' not in matrices:
+        raise KeyError("As chaves 'teams' e 'head_to_head' são necessárias no dicionário")
+
+    #actual code
+    head_to_head = matrices['head_to_head']
+    home_id, away_id = np.nonzero(head_to_head.sum(axis=2))
+    results = head_to_head[home_id, away_id]
+
+    return pd.DataFrame({
+        'home_team': matrices['teams'][home_id],
+        'away_team': matrices['teams'][away_id],
+        'matches': results.sum(axis=1),
+        'home_victories': results[:, 0],
+        'draws': results[:, 1],
+        'home_defeats': results[:, 2],
+    })
@@ -0,0 +1,263 @@
+"""
+Este módulo guarda os campos codificados de cada evento em uma única palavra de 32 bits,
+em vez de uma coluna de 8 bytes por campo. Cada campo ocupa os bits suficientes para os
+seus códigos em dictionary.txt; o valor guardado é `código - menor código + 1`, e o zero
+representa um valor ausente (exceto nos campos binários, que não aceitam ausentes). O
+identificador da partida fica em um array de inteiros à parte.
+
+Os filtros de igualdade, como os de `filter_df`, são executados diretamente sobre as
+palavras: todas as condições são combinadas em uma máscara e um padrão de bits, e cada
+evento é testado com um único `(palavra & máscara) == padrão`.
+
+Campos (menor código, maior código, bits)
+------------------------------------------
+event_type (0, 11, 4), side (1, 2, 2), location (1, 19, 5), bodypart (1, 3, 2),
+shot_outcome (1, 4, 3), is_goal (0, 1, 1), time (0, 253, 8), assist_method (0, 4, 3),
+situation (1, 4, 3), fast_break (0, 1, 1).
+
+Funções
+-------
+pack_events(df):
+    Empacota os campos codificados de cada evento em palavras de 32 bits.
+
+unpack_events(packed, columns):
+    Reconstrói o DataFrame a partir das palavras.
+
+field_values(packed, column):
+    Extrai os códigos de um campo.
+
+packed_mask(packed, conditions):
+    Marca os eventos que satisfazem as condições, sem desempacotar.
+
+filter_packed(packed, conditions):
+    Equivalente de `filter_df` sobre os eventos empacotados.
+
+packed_nbytes(packed):
+    Memória ocupada pelos eventos empacotados.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Campo: (menor código, maior código, aceita ausentes)
+FIELD_CODES = {
+    'event_type': (0, 11, True),
+    'side': (1, 2, True),
+    'location': (1, 19, True),
+    'bodypart': (1, 3, True),
+    'shot_outcome': (1, 4, True),
+    'is_goal': (0, 1, False),
+    'time': (0, 253, True),
+    'assist_method': (0, 4, True),
+    'situation': (1, 4, True),
+    'fast_break': (0, 1, False),
+}
+
+PackedEvents = Dict[str, Any]
+
+
+def _field_layout() -> Dict[str, Dict[str, int]]:
+    """Calcula o deslocamento e a máscara de bits de cada campo."""
+    layout = {}
+    shift = 0
+    for column, (low, high, nullable) in FIELD_CODES.items():
+        n_values = high - low + 1 + int(nullable)
+        bits = max(int(n_values - 1).bit_length(), 1)
+        layout[column] = {'low': low, 'high': high, 'nullable': int(nullable),
+                          'shift': shift, 'mask': (1 << bits) - 1}
+        shift += bits
+    if shift > 32:
+        raise ValueError("Os campos não cabem em uma palavra de 32 bits")
+    return layout
+
+
+FIELD_LAYOUT = _field_layout()
+
+
+def pack_events(df: pd.DataFrame) -> PackedEvents:
+    """Empacota os campos de `FIELD_CODES` de cada evento em uma palavra de 32 bits.
+    Campos ausentes em `df` não são empacotados (seus bits ficam zerados).
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com a coluna 'id_odsp'.
+
+    Returns:
+        PackedEvents: Dicionário com 'words' (uint32), 'match' (código int32 da partida
+        de cada evento), 'matches' (identificador de cada código) e 'columns' (campos
+        presentes em `df`).
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se a coluna 'id_odsp' não existir em `df`.
+        ValueError: Se algum código estiver fora do intervalo do campo, ou um campo
+                    binário tiver valores ausentes.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if 'id_odsp' not in df.columns:
+        raise KeyError("A coluna id_odsp não existe no DataFrame")
+
+    # Código Principal
+    words = np.zeros(df.shape[0], dtype=np.uint32)
+    columns = []
+    for column, layout in FIELD_LAYOUT.items():
+        if column not in df.columns:
+            continue
+
+        values = df[column].to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        if missing.any() and not layout['nullable']:
+            raise ValueError(f"A coluna {column} não pode ter valores ausentes")
+
+        present = values[~missing]
+        if present.size and (present.min() < layout['low'] or present.max() > layout['high']
+                             or (present != np.floor(present)).any()):
+            raise ValueError(f"A coluna {column} tem códigos fora de "
+                             f"{layout['low']} a {layout['high']}")
+
+        stored = np.where(missing, 0, values - layout['low'] + layout['nullable'])
+        words |= stored.astype(np.uint32) << np.uint32(layout['shift'])
+        columns.append(column)
+
+    match, matches = pd.factorize(df['id_odsp'])
+    return {'words': words, 'match': match.astype(np.int32),
+            'matches': np.asarray(matches), 'columns': columns}
+
+
+def _stored_values(words: np.ndarray, column: str) -> np.ndarray:
+    """Extrai os valores guardados de um campo (0 para ausente nos campos que aceitam
+    ausentes)."""
+    layout = FIELD_LAYOUT[column]
+    return (words >> np.uint32(layout['shift'])) & np.uint32(layout['mask'])
+
+
+def field_values(packed: PackedEvents, column: str) -> np.ndarray:
+    """Extrai os códigos de um campo, como float64 com NaN nos valores ausentes (como a
+    coluna lida por `pd.read_csv`).
+
+    Args:
+        packed (PackedEvents): Eventos criados por `pack_events`.
+        column (str): Um dos campos de `FIELD_CODES`.
+
+    Returns:
+        np.ndarray: Código de cada evento.
+
+    Raises:
+        KeyError: Se `column` não for um campo empacotado.
+    """
+    if column not in packed['columns']:
+        raise KeyError(f"A coluna {column} não está empacotada")
+
+    layout = FIELD_LAYOUT[column]
+    stored = _stored_values(packed['words'], column).astype(np.float64)
+    values = stored + layout['low'] - layout['nullable']
+    if layout['nullable']:
+        values[stored == 0] = np.nan
+    return values
+
+
+def unpack_events(packed: PackedEvents, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Reconstrói o DataFrame de eventos a partir das palavras.
+
+    Args:
+        packed (PackedEvents): Eventos criados por `pack_events`.
+        columns (Optional[List[str]]): Campos desempacotados. Padrão: todos os campos
+                                       empacotados.
+
+    Returns:
+        pd.DataFrame: DataFrame com 'id_odsp' e os campos pedidos. Campos sem valores
+        ausentes são inteiros.
+    """
+    if columns is None:
+        columns = packed['columns']
+
+    data = {'id_odsp': packed['matches'][packed['match']]}
+    for column in columns:
+        values = field_values(packed, column)
+        data[column] = values if np.isnan(values).any() else values.astype(np.int64)
+    return pd.DataFrame(data)
+
+
+def packed_mask(packed: PackedEvents, conditions: Dict[str, Any]) -> np.ndarray:
+    """Marca os eventos que satisfazem todas as condições. As condições de igualdade são
+    combinadas em uma máscara e um padrão de bits e testadas em uma única operação sobre
+    as palavras; listas de valores são testadas campo a campo.
+
+    Args:
+        packed (PackedEvents): Eventos criados por `pack_events`.
+        conditions (Dict[str, Any]): Campo e valor (ou lista de valores) exigido.
+
+    Returns:
+        np.ndarray: Máscara booleana dos eventos.
+
+    Raises:
+        TypeError: Se `conditions` não for um dicionário.
+        KeyError: Se algum campo não estiver empacotado.
+    """
+    # Tratamento de Erro
+    if not isinstance(conditions, dict):
+        raise TypeError("O parâmetro 'conditions' deve ser um dicionário")
+
+    for column in conditions:
+        if column not in packed['columns']:
+            raise KeyError(f"A coluna '{column}' não está empacotada.")
+
+    # Código Principal
+    words = packed['words']
+    bits_mask = 0
+    pattern = 0
+    impossible = False
+    lists = {}
+    for column, value in conditions.items():
+        layout = FIELD_LAYOUT[column]
+        if isinstance(value, (list, tuple, set, np.ndarray)):
+            lists[column] = value
+            continue
+        stored = value - layout['low'] + layout['nullable']
+        if stored != int(stored) or not layout['nullable'] <= stored <= layout['mask']:
+            impossible = True
+            continue
+        bits_mask |= layout['mask'] << layout['shift']
+        pattern |= int(stored) << layout['shift']
+
+    if impossible:
+        return np.zeros(words.shape[0], dtype=bool)
+
+    mask = (words & np.uint32(bits_mask)) == np.uint32(pattern)
+    for column, values in lists.items():
+        layout = FIELD_LAYOUT[column]
+        stored = [value - layout['low'] + layout['nullable'] for value in values]
+        mask &= np.isin(_stored_values(words, column), stored)
+    return mask
+
+
+def filter_packed(packed: PackedEvents, conditions: Dict[str, Any]) -> PackedEvents:
+    """Filtra os eventos empacotados, como `filter_df` faz com o DataFrame.
+
+    Args:
+        packed (PackedEvents): Eventos criados por `pack_events`.
+        conditions (Dict[str, Any]): Campo e valor (ou lista de valores) exigido.
+
+    Returns:
+        PackedEvents: Os eventos que satisfazem as condições, na ordem original.
+    """
+    mask = packed_mask(packed, conditions)
+    return {'words': packed['words'][mask], 'match': packed['match'][mask],
+            'matches': packed['matches'], 'columns': packed['columns']}
+
+
+def packed_nbytes(packed: PackedEvents) -> int:
+    """Memória, em bytes, das palavras e dos códigos de partida (sem a tabela de
+    identificadores das partidas, compartilhada entre os filtros).
+
+    Args:
+        packed (PackedEvents): Eventos criados por `pack_events`.
+
+    Returns:
+        int: Número de bytes.
+    """
+    return int(packed['words'].nbytes + packed['match'].nbytes)
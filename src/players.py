@@ -0,0 +1,179 @@
+"""
+Este módulo calcula estatísticas por jogador a partir das colunas 'player' e 'player2',
+que são descartadas por clean_data. Os nomes dos jogadores são convertidos uma única vez em
+códigos inteiros, e cada estatística é acumulada com `np.bincount` sobre esses códigos. A
+classificação dos chutes em dentro e fora da área é a mesma de shots.py.
+
+Funções
+-------
+encode_players(df, columns):
+    Converte os nomes dos jogadores em códigos inteiros.
+
+player_stats(df, locations_inside, excluded_locations):
+    Calcula chutes, gols, gols de cabeça, assistências e conversão por jogador.
+
+top_players(stats, column, k, min_shots):
+    Devolve os k jogadores com os maiores valores de uma estatística.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from shots import prepare_shots
+
+PLAYER_COLUMNS = ['player', 'player2']
+
+
+def encode_players(df: pd.DataFrame,
+                   columns: Optional[List[str]] = None) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Converte os nomes dos jogadores em códigos inteiros, usando o mesmo dicionário para
+    todas as colunas, de modo que um jogador tem o mesmo código como autor e como
+    assistente.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        columns (Optional[List[str]]): Colunas com nomes de jogadores.
+                                       Padrão: `PLAYER_COLUMNS`.
+
+    Returns:
+        Tuple[List[np.ndarray], np.ndarray]: Os códigos de cada coluna (-1 para valores
+        ausentes) e os nomes correspondentes a cada código.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        KeyError: Se alguma coluna não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if columns is None:
+        columns = PLAYER_COLUMNS
+
+    missing_columns = set(columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+
+    # Código Principal
+    codes, names = pd.factorize(pd.concat([df[column] for column in columns],
+                                          ignore_index=True))
+    return list(np.split(codes, len(columns))), np.asarray(names, dtype=object)
+
+
+def _count(codes: np.ndarray, mask: np.ndarray, n_players: int) -> np.ndarray:
+    """Conta, por jogador, os eventos selecionados por `mask`."""
+    selected = codes[mask & (codes >= 0)]
+    return np.bincount(selected, minlength=n_players)
+
+
+def player_stats(df: pd.DataFrame, locations_inside: Optional[List[int]] = None,
+                 excluded_locations: Optional[List[int]] = None) -> pd.DataFrame:
+    """Calcula as estatísticas de cada jogador. 'shots', 'goals' e 'headed_goals'
+    consideram todos os chutes; as colunas de dentro e fora da área consideram apenas os
+    chutes classificados por `prepare_shots` (as localizações excluídas ficam de fora).
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos com as colunas 'player' e 'player2'.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado pelo nome do jogador com as colunas 'shots',
+        'goals', 'headed_goals', 'assists', 'shots_inside', 'goals_inside',
+        'shots_outside', 'goals_outside', 'conversion_inside' e 'conversion_outside'
+        (gols por chute, NaN se o jogador não chutou naquela situação).
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    required_columns = ['event_type', 'is_goal', 'bodypart'] + PLAYER_COLUMNS
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+
+    # Código Principal
+    (players, assisters), names = encode_players(df)
+    n_players = len(names)
+
+    is_shot = (df['event_type'] == 1).to_numpy()
+    is_goal = is_shot & (df['is_goal'] == 1).to_numpy()
+    is_header = (df['bodypart'] == 3).to_numpy()
+
+    # Mesma seleção e classificação de chutes da hipótese 3
+    shots = prepare_shots(df, locations_inside, excluded_locations)
+    rows = df.index.get_indexer(shots.index)
+    inside = np.zeros(df.shape[0], dtype=bool)
+    outside = np.zeros(df.shape[0], dtype=bool)
+    inside[rows[(shots['situation'] == 'inside').to_numpy()]] = True
+    outside[rows[(shots['situation'] == 'outside').to_numpy()]] = True
+
+    stats = pd.DataFrame({
+        'shots': _count(players, is_shot, n_players),
+        'goals': _count(players, is_goal, n_players),
+        'headed_goals': _count(players, is_goal & is_header, n_players),
+        'assists': _count(assisters, is_goal, n_players),
+        'shots_inside': _count(players, inside, n_players),
+        'goals_inside': _count(players, inside & is_goal, n_players),
+        'shots_outside': _count(players, outside, n_players),
+        'goals_outside': _count(players, outside & is_goal, n_players),
+    }, index=pd.Index(names, name='player'))
+
+    for situation in ['inside', 'outside']:
+        attempts = stats[f'shots_{situation}']
+        stats[f'conversion_{situation}'] = (stats[f'goals_{situation}'] /
+                                            attempts.where(attempts > 0))
+
+    return stats
+
+
+def top_players(stats: pd.DataFrame, column: str, k: int = 10,
+                min_shots: int = 0) -> pd.DataFrame:
+    """Devolve os `k` jogadores com os maiores valores de `column`. Os candidatos são
+    separados com `np.argpartition` e apenas eles são ordenados, em vez de ordenar todos
+    os jogadores. Empates são desfeitos pelo nome do jogador.
+
+    Args:
+        stats (pd.DataFrame): DataFrame gerado por `player_stats`.
+        column (str): Estatística usada na classificação (por exemplo, 'goals').
+        k (int): Número de jogadores.
+        min_shots (int): Número mínimo de chutes para o jogador ser considerado, útil para
+        as taxas de conversão.
+
+    Returns:
+        pd.DataFrame: As linhas de `stats` dos `k` jogadores, em ordem decrescente.
+
+    Raises:
+        TypeError: Se `stats` não for um pd.DataFrame.
+        KeyError: Se a coluna não existir em `stats`.
+        ValueError: Se `k` não for positivo.
+    """
+    # Tratamento de Erro
+    if not isinstance(stats, pd.DataFrame):
+        raise TypeError("O parâmetro 'stats' deve ser um pandas DataFrame.")
+
+    if column not in stats.columns:
+        raise KeyError(f"A coluna '{column}' não existe no DataFrame.")
+
+    if k <= 0:
+        raise ValueError("O parâmetro 'k' deve ser positivo")
+
+    # Código Principal
+    eligible = stats[(stats['shots'] >= min_shots) & stats[column].notna()]
+    values = eligible[column].to_numpy(dtype=float)
+    if values.size > k:
+        # O k-ésimo maior valor delimita os candidatos; os empates com ele são mantidos
+        threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+        candidates = np.flatnonzero(values >= threshold)
+    else:
+        candidates = np.arange(values.size)
+
+    top = eligible.iloc[candidates]
+    order = np.lexsort((top.index.astype(str), -values[candidates]))
+    return top.iloc[order[:k]]
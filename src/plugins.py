@@ -0,0 +1,317 @@
+"""
+Este módulo executa as hipóteses como plugins de uma única leitura dos eventos. Cada
+plugin declara as colunas de que precisa e três funções: `init`, que cria o seu estado;
+`update`, que acumula no estado as contagens de um pedaço de eventos; e `finalize`, que
+monta o resumo a partir do estado. O driver (`scan_events`) percorre os eventos uma única
+vez, de um DataFrame em memória, de um arquivo lido em pedaços ou de qualquer sequência
+de DataFrames, e entrega cada pedaço a todos os plugins. Assim, o custo total cresce com
+o tamanho dos dados, e não com o tamanho dos dados vezes o número de hipóteses.
+
+Os plugins recebem o mesmo pedaço, sem cópias, e não devem modificá-lo. Os pedaços
+devem chegar na ordem original dos eventos.
+
+As três hipóteses usam as mesmas contagens parciais de mapreduce.py, e os resumos são os
+mesmos de matches_summary, shots_summary e head_summary. Uma nova hipótese é registrada
+com `register_plugin(nome, fábrica)`, em que a fábrica recebe os parâmetros da análise e
+devolve o plugin.
+
+Funções
+-------
+make_plugin(name, columns, update, finalize, init):
+    Cria um plugin.
+
+matches_plugin():
+    Plugin da hipótese dos resultados do time da casa.
+
+shots_plugin(locations_inside, excluded_locations):
+    Plugin da hipótese dos chutes dentro e fora da área.
+
+head_plugin(time_window):
+    Plugin da hipótese das origens dos gols de cabeça.
+
+register_plugin(name, factory):
+    Registra a fábrica de um plugin.
+
+build_plugins(params):
+    Cria os plugins registrados com os parâmetros de cada um.
+
+scan_events(source, plugins, chunk_rows):
+    Função principal que percorre os eventos uma vez e devolve o resumo de cada plugin.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, count_headed_goal_origins, origins_from_counts
+from mapreduce import _boundary_records, _sum_counts, boundary_origin
+from matches import (calculate_results, count_goals_by_side, create_summary_dataframe,
+                     goals_per_match_from_counts)
+from shots import (count_shot_outcomes, goals_percentages, prepare_shots,
+                   shot_outcome_count_from_counts, shot_outcome_percentages)
+from utils import load_dataset
+
+Plugin = Dict[str, Any]
+Source = Union[pd.DataFrame, str, Iterable[pd.DataFrame]]
+
+# Número de linhas de cada pedaço quando a fonte é um arquivo
+DEFAULT_CHUNK_ROWS = 200_000
+
+
+def make_plugin(name: str, columns: List[str], update: Callable[[Dict, pd.DataFrame], None],
+                finalize: Callable[[Dict], Any],
+                init: Optional[Callable[[], Dict]] = None) -> Plugin:
+    """Cria um plugin a partir das suas colunas e funções.
+
+    Args:
+        name (str): Nome do resumo produzido pelo plugin.
+        columns (List[str]): Colunas dos eventos usadas pelo plugin.
+        update (Callable[[Dict, pd.DataFrame], None]): Acumula um pedaço no estado.
+        finalize (Callable[[Dict], Any]): Monta o resumo a partir do estado.
+        init (Optional[Callable[[], Dict]]): Cria o estado inicial. Padrão: `dict`.
+
+    Returns:
+        Plugin: Dicionário com 'name', 'columns', 'init', 'update' e 'finalize'.
+
+    Raises:
+        TypeError: Se `name` não for uma string, `columns` não for uma lista ou alguma
+                   função não for chamável.
+    """
+    # Tratamento de Erro
+    if not isinstance(name, str):
+        raise TypeError("O parâmetro 'name' deve ser uma string")
+
+    if not isinstance(columns, list):
+        raise TypeError("O parâmetro 'columns' deve ser uma lista")
+
+    if init is None:
+        init = dict
+
+    for function in (update, finalize, init):
+        if not callable(function):
+            raise TypeError("Os parâmetros 'update', 'finalize' e 'init' devem ser funções")
+
+    # Código Principal
+    return {'name': name, 'columns': columns, 'init': init, 'update': update,
+            'finalize': finalize}
+
+
+def matches_plugin() -> Plugin:
+    """Plugin da hipótese dos resultados do time da casa (ver matches_summary). O estado
+    guarda as contagens de gols por partida de cada pedaço, somadas no final.
+
+    Returns:
+        Plugin: O plugin 'matches'.
+    """
+    def init() -> Dict:
+        return {'goals': []}
+
+    def update(state: Dict, chunk: pd.DataFrame) -> None:
+        state['goals'].append(count_goals_by_side(chunk))
+
+    def finalize(state: Dict) -> pd.DataFrame:
+        goals = pd.concat(state['goals']).groupby(level=[0, 1]).sum()
+        return create_summary_dataframe(calculate_results(goals_per_match_from_counts(goals)))
+
+    return make_plugin('matches', ['id_odsp', 'side', 'event_type', 'is_goal'],
+                       update, finalize, init)
+
+
+def shots_plugin(locations_inside: Optional[List[int]] = None,
+                 excluded_locations: Optional[List[int]] = None) -> Plugin:
+    """Plugin da hipótese dos chutes dentro e fora da área (ver shots_summary).
+
+    Args:
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+
+    Returns:
+        Plugin: O plugin 'shots', cujo resumo é a tupla de shots_summary.
+    """
+    def init() -> Dict:
+        return {'shots_in': None, 'shots_out': None, 'goals_inside': 0, 'goals_outside': 0}
+
+    def update(state: Dict, chunk: pd.DataFrame) -> None:
+        shots = prepare_shots(chunk, locations_inside, excluded_locations)
+        shots_in, shots_out = count_shot_outcomes(shots)
+        if state['shots_in'] is None:
+            state['shots_in'], state['shots_out'] = shots_in, shots_out
+        else:
+            state['shots_in'] = _sum_counts(state['shots_in'], shots_in, sort=False)
+            state['shots_out'] = _sum_counts(state['shots_out'], shots_out, sort=False)
+
+        goals = shots['situation'][(shots['is_goal'] == 1).to_numpy()]
+        state['goals_inside'] += int((goals == 'inside').sum())
+        state['goals_outside'] += int((goals == 'outside').sum())
+
+    def finalize(state: Dict):
+        total_goals = state['goals_inside'] + state['goals_outside']
+        attempts = shot_outcome_count_from_counts(state['shots_in'], state['shots_out'])
+        return (goals_percentages(state['goals_inside'], state['goals_outside'], total_goals),
+                shot_outcome_percentages(attempts))
+
+    return make_plugin('shots', ['event_type', 'location', 'shot_outcome', 'is_goal'],
+                       update, finalize, init)
+
+
+def head_plugin(time_window: float = HEADER_TIME_WINDOW) -> Plugin:
+    """Plugin da hipótese das origens dos gols de cabeça (ver head_summary). O estado
+    guarda o último evento visto, para aplicar a regra do evento anterior ao primeiro
+    evento de cada pedaço.
+
+    Args:
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+                             anterior para que a origem seja contada.
+
+    Returns:
+        Plugin: O plugin 'head'.
+    """
+    def init() -> Dict:
+        return {'counts': {'corners': 0, 'fouls': 0, 'offsides': 0, 'others': 0},
+                'last': None}
+
+    def update(state: Dict, chunk: pd.DataFrame) -> None:
+        if chunk.shape[0] == 0:
+            return
+        is_first = state['last'] is None
+        counts = count_headed_goal_origins(chunk, is_first, time_window)
+        first, last = _boundary_records(chunk)
+        if not is_first:
+            origin = boundary_origin(state['last'], first, False, time_window)
+            if origin is not None:
+                counts[origin] += 1
+
+        for origin, count in counts.items():
+            state['counts'][origin] += count
+        state['last'] = last
+
+    def finalize(state: Dict) -> pd.DataFrame:
+        return origins_from_counts(state['counts'])
+
+    return make_plugin('head', ['id_odsp', 'time', 'event_type', 'is_goal', 'bodypart'],
+                       update, finalize, init)
+
+
+PLUGIN_FACTORIES: Dict[str, Callable[..., Plugin]] = {
+    'matches': matches_plugin,
+    'shots': shots_plugin,
+    'head': head_plugin,
+}
+
+
+def register_plugin(name: str, factory: Callable[..., Plugin]) -> None:
+    """Registra a fábrica de um plugin, para que ele seja criado por `build_plugins`.
+
+    Args:
+        name (str): Nome da hipótese.
+        factory (Callable[..., Plugin]): Função que recebe os parâmetros da análise e
+                                         devolve o plugin.
+
+    Raises:
+        TypeError: Se `factory` não for chamável.
+        ValueError: Se já houver um plugin com esse nome.
+    """
+    if not callable(factory):
+        raise TypeError("O parâmetro 'factory' deve ser uma função")
+
+    if name in PLUGIN_FACTORIES:
+        raise ValueError(f"Já existe um plugin chamado '{name}'")
+
+    PLUGIN_FACTORIES[name] = factory
+
+
+def build_plugins(params: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Plugin]:
+    """Cria os plugins registrados.
+
+    Args:
+        params (Optional[Dict[str, Dict[str, Any]]]): Parâmetros da fábrica de cada
+            plugin. Se informado, apenas os plugins com uma entrada são criados.
+            Padrão: todos os plugins, com os parâmetros padrão.
+
+    Returns:
+        List[Plugin]: Os plugins, na ordem de registro.
+
+    Raises:
+        KeyError: Se algum nome de `params` não estiver registrado.
+    """
+    if params is None:
+        params = {name: {} for name in PLUGIN_FACTORIES}
+
+    for name in params:
+        if name not in PLUGIN_FACTORIES:
+            raise KeyError(f"O plugin '{name}' não está registrado")
+
+    return [factory(**params[name]) for name, factory in PLUGIN_FACTORIES.items()
+            if name in params]
+
+
+def _chunks(source: Source, columns: List[str],
+            chunk_rows: Optional[int]) -> Iterable[pd.DataFrame]:
+    """Gera os pedaços de eventos da fonte. Um DataFrame é entregue inteiro (ou em
+    fatias de `chunk_rows` linhas); um arquivo é lido em pedaços, só com `columns`."""
+    if isinstance(source, pd.DataFrame):
+        if chunk_rows is None:
+            yield source
+            return
+        for start in range(0, max(source.shape[0], 1), chunk_rows):
+            yield source.iloc[start:start + chunk_rows]
+    elif isinstance(source, str):
+        yield from load_dataset(source, chunk_rows or DEFAULT_CHUNK_ROWS, usecols=columns)
+    else:
+        yield from source
+
+
+def scan_events(source: Source, plugins: Optional[List[Plugin]] = None,
+                chunk_rows: Optional[int] = None) -> Dict[str, Any]:
+    """Função principal que percorre os eventos uma única vez e entrega cada pedaço a
+    todos os plugins.
+
+    Args:
+        source (Source): DataFrame de eventos, caminho do arquivo de eventos (lido em
+                         pedaços, apenas com as colunas dos plugins) ou sequência de
+                         DataFrames consecutivos.
+        plugins (Optional[List[Plugin]]): Plugins executados. Padrão: todos os plugins
+                                          registrados, com os parâmetros padrão.
+        chunk_rows (Optional[int]): Número de linhas de cada pedaço. Padrão: o DataFrame
+                                    inteiro, ou `DEFAULT_CHUNK_ROWS` para arquivos.
+
+    Returns:
+        Dict[str, Any]: Resumo de cada plugin, pelo nome.
+
+    Raises:
+        TypeError: Se `chunk_rows` não for um inteiro ou None.
+        ValueError: Se `chunk_rows` não for positivo, dois plugins tiverem o mesmo nome
+                    ou a fonte não tiver nenhum pedaço.
+        KeyError: Se alguma coluna de um plugin não existir nos eventos.
+    """
+    # Tratamento de Erro
+    if chunk_rows is not None and not isinstance(chunk_rows, int):
+        raise TypeError("O parâmetro 'chunk_rows' deve ser um inteiro ou None")
+
+    if chunk_rows is not None and chunk_rows <= 0:
+        raise ValueError("O parâmetro 'chunk_rows' deve ser positivo")
+
+    if plugins is None:
+        plugins = build_plugins()
+
+    names = [plugin['name'] for plugin in plugins]
+    if len(set(names)) != len(names):
+        raise ValueError("Os plugins devem ter nomes diferentes")
+
+    # Código Principal
+    columns = list(dict.fromkeys(column for plugin in plugins for column in plugin['columns']))
+    states = [plugin['init']() for plugin in plugins]
+
+    n_chunks = 0
+    for chunk in _chunks(source, columns, chunk_rows):
+        n_chunks += 1
+        missing_columns = set(columns) - set(chunk.columns)
+        if missing_columns:
+            raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+        for plugin, state in zip(plugins, states):
+            plugin['update'](state, chunk)
+
+    if n_chunks == 0:
+        raise ValueError("A fonte não contém eventos")
+
+    return {plugin['name']: plugin['finalize'](state) for plugin, state in zip(plugins, states)}
@@ -0,0 +1,323 @@
+"""
+Este módulo oferece as três hipóteses como um serviço HTTP local. O dataset é carregado e
+indexado uma única vez, na partida do serviço, e cada consulta devolve o resumo da
+hipótese em JSON. Só a biblioteca padrão é usada (`http.server`).
+
+Cada requisição é atendida em uma thread própria (ThreadingHTTPServer). As respostas
+ficam em um cache LRU indexado pela hipótese e pelos parâmetros normalizados; consultas
+simultâneas iguais esperam pelo mesmo cálculo em vez de repeti-lo, e consultas diferentes
+não esperam umas pelas outras.
+
+Endpoints
+---------
+GET /matches?matches=ID,ID
+    Porcentagens de vitórias, derrotas e empates do time da casa.
+
+GET /shots?locations_inside=3,9&excluded_locations=1,2&matches=ID,ID
+    Gols e resultados de chutes dentro e fora da área.
+
+GET /head?time_window=2&matches=ID,ID
+    Origens dos gols de cabeça.
+
+GET /health
+    Número de eventos e de partidas carregados.
+
+O parâmetro `matches` é opcional em todos os endpoints e restringe o cálculo às partidas
+informadas (valores de 'id_odsp').
+
+Funções
+-------
+load_service_state(csv_path, cache_size):
+    Carrega e indexa o dataset.
+
+state_from_dataframe(df, cache_size):
+    Indexa um DataFrame já carregado.
+
+parse_request(path):
+    Converte o caminho da requisição em endpoint e parâmetros normalizados.
+
+compute_endpoint(state, endpoint, params):
+    Calcula o resumo de um endpoint, sem cache.
+
+cached_response(state, endpoint, params):
+    Devolve o resumo do cache ou o calcula uma única vez.
+
+make_server(state, host, port):
+    Cria o servidor HTTP.
+
+serve(csv_path, host, port):
+    Função principal que carrega o dataset e atende as requisições.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, count_headed_goal_origins, origins_from_counts
+from matches import matches_summary
+from shots import EXCLUDED_LOCATIONS, LOCATIONS_INSIDE, shots_summary
+from utils import load_dataset
+
+ENDPOINTS = ['matches', 'shots', 'head', 'health']
+DEFAULT_CACHE_SIZE = 256
+
+
+def load_service_state(csv_path: str, cache_size: int = DEFAULT_CACHE_SIZE) -> Dict[str, Any]:
+    """Carrega o dataset e guarda, para cada partida, o intervalo das suas linhas, de
+    modo que consultas sobre um subconjunto de partidas não percorram o dataset inteiro.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        cache_size (int): Número máximo de respostas guardadas no cache.
+
+    Returns:
+        Dict[str, Any]: Estado do serviço com as chaves 'df', 'match_rows', 'cache',
+        'cache_size' e 'lock'.
+
+    Raises:
+        TypeError: Se `csv_path` não for uma string.
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    return state_from_dataframe(load_dataset(csv_path), cache_size)
+
+
+def state_from_dataframe(df: pd.DataFrame, cache_size: int = DEFAULT_CACHE_SIZE) -> Dict[str, Any]:
+    """Monta o estado do serviço a partir de um DataFrame já carregado (ver
+    `load_service_state`)."""
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if 'id_odsp' not in df.columns:
+        raise KeyError("A coluna id_odsp não existe no DataFrame")
+
+    df = df.reset_index(drop=True)
+    match_rows = {match: rows for match, rows in df.groupby('id_odsp', sort=False).indices.items()}
+    return {'df': df, 'match_rows': match_rows, 'cache': OrderedDict(),
+            'cache_size': cache_size, 'lock': threading.Lock()}
+
+
+def _int_list(values: List[str], name: str) -> List[int]:
+    """Converte uma lista de valores separados por vírgula em inteiros ordenados."""
+    items = [item for value in values for item in value.split(',') if item != '']
+    try:
+        return sorted(set(int(item) for item in items))
+    except ValueError:
+        raise ValueError(f"O parâmetro '{name}' deve ser uma lista de inteiros")
+
+
+def parse_request(path: str) -> Tuple[str, Dict[str, Any]]:
+    """Converte o caminho da requisição em endpoint e parâmetros. Os parâmetros são
+    normalizados (listas ordenadas e sem repetição, valores padrão preenchidos), de modo
+    que consultas equivalentes tenham a mesma chave no cache.
+
+    Args:
+        path (str): Caminho da requisição, com a query string.
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: O endpoint e os parâmetros.
+
+    Raises:
+        KeyError: Se o endpoint não existir.
+        ValueError: Se algum parâmetro for inválido.
+    """
+    url = urlsplit(path)
+    endpoint = url.path.strip('/')
+    if endpoint not in ENDPOINTS:
+        raise KeyError(f"O endpoint '{endpoint}' não existe")
+
+    query = parse_qs(url.query)
+    unknown = set(query) - {'matches', 'locations_inside', 'excluded_locations', 'time_window'}
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(unknown)}")
+
+    params: Dict[str, Any] = {}
+    if 'matches' in query:
+        params['matches'] = sorted({item for value in query['matches']
+                                    for item in value.split(',') if item != ''})
+        if not params['matches']:
+            raise ValueError("O parâmetro 'matches' deve conter ao menos uma partida")
+
+    if endpoint == 'shots':
+        params['locations_inside'] = (_int_list(query['locations_inside'], 'locations_inside')
+                                      if 'locations_inside' in query else LOCATIONS_INSIDE)
+        params['excluded_locations'] = (_int_list(query['excluded_locations'], 'excluded_locations')
+                                        if 'excluded_locations' in query else EXCLUDED_LOCATIONS)
+
+    if endpoint == 'head':
+        time_window = query.get('time_window', [HEADER_TIME_WINDOW])[-1]
+        try:
+            params['time_window'] = float(time_window)
+        except ValueError:
+            raise ValueError("O parâmetro 'time_window' deve ser um número")
+        if params['time_window'] < 0:
+            raise ValueError("O parâmetro 'time_window' não pode ser negativo")
+
+    return endpoint, params
+
+
+def _select_matches(state: Dict[str, Any], matches: Optional[List[str]]) -> pd.DataFrame:
+    """Devolve as linhas das partidas pedidas, na ordem do arquivo."""
+    if matches is None:
+        return state['df']
+
+    missing = [match for match in matches if match not in state['match_rows']]
+    if missing:
+        raise ValueError(f"Partidas não encontradas: {missing[:5]}")
+
+    rows = np.sort(np.concatenate([state['match_rows'][match] for match in matches]))
+    return state['df'].iloc[rows]
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Converte um DataFrame de resumo em uma lista de registros JSON."""
+    return json.loads(df.to_json(orient='records', force_ascii=False))
+
+
+def compute_endpoint(state: Dict[str, Any], endpoint: str,
+                     params: Dict[str, Any]) -> Dict[str, Any]:
+    """Calcula o resumo de um endpoint sobre as partidas pedidas, sem usar o cache.
+
+    Args:
+        state (Dict[str, Any]): Estado criado por `load_service_state`.
+        endpoint (str): Um dos `ENDPOINTS`.
+        params (Dict[str, Any]): Parâmetros gerados por `parse_request`.
+
+    Returns:
+        Dict[str, Any]: Resposta serializável em JSON.
+
+    Raises:
+        ValueError: Se alguma partida pedida não existir.
+    """
+    if endpoint == 'health':
+        return {'events': int(state['df'].shape[0]), 'matches': len(state['match_rows'])}
+
+    df = _select_matches(state, params.get('matches'))
+    if endpoint == 'matches':
+        return {'summary': _records(matches_summary(df))}
+
+    if endpoint == 'shots':
+        stats_goals, perc_attempts = shots_summary(df, params['locations_inside'],
+                                                   params['excluded_locations'])
+        return {'goals': _records(stats_goals), 'attempts': _records(perc_attempts)}
+
+    counts = count_headed_goal_origins(df.reset_index(drop=True), True, params['time_window'])
+    return {'origins': _records(origins_from_counts(counts))}
+
+
+def cached_response(state: Dict[str, Any], endpoint: str,
+                    params: Dict[str, Any]) -> Dict[str, Any]:
+    """Devolve a resposta guardada no cache ou a calcula. Enquanto uma resposta é
+    calculada, as requisições iguais esperam pelo mesmo resultado; o cálculo em si é
+    feito fora da trava, para não bloquear as demais requisições.
+
+    Args:
+        state (Dict[str, Any]): Estado criado por `load_service_state`.
+        endpoint (str): Um dos `ENDPOINTS`.
+        params (Dict[str, Any]): Parâmetros gerados por `parse_request`.
+
+    Returns:
+        Dict[str, Any]: Resposta serializável em JSON.
+    """
+    key = json.dumps([endpoint, params], sort_keys=True)
+    with state['lock']:
+        future = state['cache'].get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            state['cache'][key] = future
+        state['cache'].move_to_end(key)
+        while len(state['cache']) > state['cache_size']:
+            state['cache'].popitem(last=False)
+
+    if owner:
+        try:
+            future.set_result(compute_endpoint(state, endpoint, params))
+        except Exception as error:
+            # Erros não ficam no cache
+            with state['lock']:
+                if state['cache'].get(key) is future:
+                    del state['cache'][key]
+            future.set_exception(error)
+
+    return future.result()
+
+
+def make_server(state: Dict[str, Any], host: str = '127.0.0.1',
+                port: int = 8000) -> ThreadingHTTPServer:
+    """Cria o servidor HTTP que atende as consultas sobre o estado carregado.
+
+    Args:
+        state (Dict[str, Any]): Estado criado por `load_service_state`.
+        host (str): Endereço do servidor.
+        port (int): Porta do servidor (0 escolhe uma porta livre).
+
+    Returns:
+        ThreadingHTTPServer: O servidor, ainda não iniciado.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            # Só o KeyError de parse_request (endpoint inexistente) vira 404; erros
+            # inesperados do cálculo viram 500, para que o cliente sempre receba resposta
+            try:
+                endpoint, params = parse_request(self.path)
+            except KeyError as error:
+                self._send(404, {'error': str(error.args[0])})
+                return
+            except ValueError as error:
+                self._send(400, {'error': str(error)})
+                return
+
+            try:
+                body = cached_response(state, endpoint, params)
+            except (TypeError, ValueError) as error:
+                self._send(400, {'error': str(error)})
+            except Exception as error:
+                self._send(500, {'error': f'Erro interno: {error!r}'})
+            else:
+                self._send(200, body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(csv_path: str = "../data/events.csv", host: str = '127.0.0.1',
+          port: int = 8000) -> None:
+    """Função principal que carrega o dataset uma vez e atende as requisições até ser
+    interrompida.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        host (str): Endereço do servidor.
+        port (int): Porta do servidor.
+    """
+    server = make_server(load_service_state(csv_path), host, port)
+    print(f"Servindo em http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve()
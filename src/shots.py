@@ -6,18 +6,44 @@ Funções
 calculate_goals(goals):
     Calcula a porcentagem de gols feitos dentro e fora da área.
 
+goals_percentages(goals_inside, goals_outside, total_goals):
+    Monta o resultado de calculate_goals a partir das contagens de gols.
+
+count_shot_outcomes(df)
+    Conta cada resultado de chute dentro e fora da área, em um formato que pode ser somado
+    entre partes do dataset.
+
+shot_outcome_count_from_counts(counts_in, counts_out)
+    Monta o DataFrame de frequências a partir das contagens de count_shot_outcomes.
+
 shot_outcome_count(df)
     Conta a frequência de cada resultado de chute (shot_outcome) dentro e fora da área.
 
 perc_shot_outcome(df)
     Calcula a porcentagem de cada resultado de chute (shot_outcome) dentro e fora da área.
 
+shot_outcome_percentages(attempts)
+    Transforma as contagens de shot_outcome_count em porcentagens.
+
 adjust_shot_outcome_df(df)
     Ajusta a coluna 'shot_outcome' para separar chutes no alvo em 'Gol' e 'Defendido'.
 
+prepare_shots(df)
+    Seleciona os chutes do DataFrame de eventos e classifica cada um como dentro ou
+    fora da área.
+
 graph_view_shot_outcome(df)
     Gera e salva um gráfico de barras comparando os resultados de chutes dentro e fora da área.
 
+shots_summary(df, locations_inside, excluded_locations)
+    Calcula as estatísticas de gols e de chutes sem exibir os resultados.
+
+shots_report(stats_goals, perc_attempts)
+    Exibe as estatísticas e salva o gráfico dos chutes.
+
+expected_goals_summary(df, model, locations_inside, excluded_locations)
+    Compara os gols marcados com os gols esperados (xG) dentro e fora da área.
+
 shots_main(df)
     Função principal que executa o fluxo de análise e visualização dos chutes.
 
@@ -26,14 +52,27 @@ Autor
     Rodrigo Severo Araújo    
 """
 
+import os
+
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from typing import List, Optional, Tuple
 
 from utils import (remove_columns, remove_lines_by_condition, filter_df,
                    map_column_values, print_dataframe)
+from writer import OUTPUT_DIR, save_figure
+from xg import XGModel, load_or_fit_xg, predict_xg
 
 # Hipótese: Chutes de fora da área têm menor chance de conversão a gol
 
+# Localizações (location em dictionary.txt) consideradas dentro da área e localizações
+# descartadas da análise por serem ambíguas ou não registradas.
+LOCATIONS_INSIDE = [3, 9, 10, 11, 12, 13, 14]
+EXCLUDED_LOCATIONS = [1, 2, 7, 8, 19]
+
+SHOTS_MAPPING = {1.0: 'No alvo', 2.0: 'Fora', 3.0: 'Bloqueado', 4.0: 'Trave'}
+
 def calculate_goals(goals: pd.DataFrame) -> pd.DataFrame:
     """Recebe um Dataframe com todos os gols e calcula a porcentagem de gols que 
     foram feitos dentro da área e a porcentagem de gols feitos fora da área.
@@ -64,6 +103,26 @@ def calculate_goals(goals: pd.DataFrame) -> pd.DataFrame:
     goals_inside = filter_df(goals, {'situation': 'inside'}).shape[0]
     goals_outside = filter_df(goals, {'situation': 'outside'}).shape[0]
 
+    return goals_percentages(goals_inside, goals_outside, total_goals)
+
+
+def goals_percentages(goals_inside: int, goals_outside: int, total_goals: int) -> pd.DataFrame:
+    """Monta o DataFrame de `calculate_goals` a partir do número de gols feitos dentro e
+    fora da área.
+
+    Args:
+        goals_inside (int): Número de gols feitos dentro da área.
+        goals_outside (int): Número de gols feitos fora da área.
+        total_goals (int): Número total de gols.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Situação' e 'Porcentagem'. Sem gols, as
+        porcentagens são zero.
+    """
+    if total_goals == 0:
+        # Sem gols: as porcentagens ficam zeradas
+        total_goals = 1
+
     perc_inside = (goals_inside / total_goals) * 100
     perc_outside = (goals_outside / total_goals) * 100
 
@@ -75,6 +134,67 @@ def calculate_goals(goals: pd.DataFrame) -> pd.DataFrame:
     return results
 
 
+def count_shot_outcomes(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Conta cada resultado de chute (shot_outcome) dentro e fora da área, sem ordenar.
+    As contagens de partes diferentes do dataset podem ser somadas e depois passadas para
+    `shot_outcome_count_from_counts`.
+
+    Args:
+        df (pd.DataFrame): DataFrame contendo os dados dos chutes com as colunas
+                           'shot_outcome' e 'situation'.
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: Contagens de cada resultado para chutes dentro e
+        fora da área, na ordem de primeira aparição.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas ['shot_outcome', 'situation'] não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    required_columns = ['shot_outcome', 'situation']
+    for colunm in required_columns:
+        if colunm not in df.columns:
+            raise KeyError(f"A coluna {colunm} não existe no DataFrame")
+
+    # Código principal
+    counts_in = filter_df(df, {'situation': 'inside'})['shot_outcome'].value_counts(sort=False)
+    counts_out = filter_df(df, {'situation': 'outside'})['shot_outcome'].value_counts(sort=False)
+
+    return counts_in, counts_out
+
+
+def shot_outcome_count_from_counts(counts_in: pd.Series, counts_out: pd.Series) -> pd.DataFrame:
+    """Monta o DataFrame de frequências de resultados de chutes a partir das contagens
+    geradas por `count_shot_outcomes` (ou da soma de várias delas).
+
+    Args:
+        counts_in (pd.Series): Contagem de cada resultado para chutes dentro da área.
+        counts_out (pd.Series): Contagem de cada resultado para chutes fora da área.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Resultado', 'count_in' e 'count_out'.
+
+    Raises:
+        TypeError: Se `counts_in` ou `counts_out` não forem pd.Series.
+    """
+    # Tratamento de Erro
+    if not isinstance(counts_in, pd.Series) or not isinstance(counts_out, pd.Series):
+        raise TypeError("Os parâmetros 'counts_in' e 'counts_out' devem ser pandas Series.")
+
+    # Código principal
+    attempts_inside = counts_in.sort_values(ascending=False).reset_index()
+    attempts_outside = counts_out.sort_values(ascending=False).reset_index()
+    attempts = attempts_inside.merge(attempts_outside, on='shot_outcome', suffixes=('_in', '_out'))
+
+    attempts.columns = ['Resultado', 'count_in', 'count_out']
+
+    return attempts
+
+
 def shot_outcome_count(df: pd.DataFrame) -> pd.DataFrame:
     """Conta a frequência de cada resultado de chute (shot_outcome) dentro e fora da área.
     Os resultados são agrupados em um Dataframe com as contagens separadas para chutes feitos
@@ -103,13 +223,9 @@ def shot_outcome_count(df: pd.DataFrame) -> pd.DataFrame:
             raise KeyError(f"A coluna {colunm} não existe no DataFrame")
     
     # Código principal
-    attempts_inside = filter_df(df, {'situation': 'inside'})['shot_outcome'].value_counts().reset_index()
-    attempts_outside = filter_df(df, {'situation': 'outside'})['shot_outcome'].value_counts().reset_index()
-    attempts = attempts_inside.merge(attempts_outside, on='shot_outcome', suffixes=('_in', '_out'))
+    counts_in, counts_out = count_shot_outcomes(df)
 
-    attempts.columns = ['Resultado', 'count_in', 'count_out']
-
-    return attempts
+    return shot_outcome_count_from_counts(counts_in, counts_out)
 
 
 def perc_shot_outcome(df: pd.DataFrame) -> pd.DataFrame:
@@ -136,7 +252,21 @@ def perc_shot_outcome(df: pd.DataFrame) -> pd.DataFrame:
         raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
     
     # Código principal
-    attempts = shot_outcome_count(df)
+    return shot_outcome_percentages(shot_outcome_count(df))
+
+
+def shot_outcome_percentages(attempts: pd.DataFrame) -> pd.DataFrame:
+    """Transforma as contagens geradas por `shot_outcome_count` nas porcentagens de
+    `perc_shot_outcome`.
+
+    Args:
+        attempts (pd.DataFrame): DataFrame com as colunas 'Resultado', 'count_in' e
+                                 'count_out'. É modificado pela função.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Resultado', 'Porcentagem_in' e
+        'Porcentagem_out'.
+    """
     attempts['Porcentagem_in'] = ((attempts['count_in'] / attempts['count_in'].sum()) * 100).round(2)
     attempts['Porcentagem_out'] = ((attempts['count_out'] / attempts['count_out'].sum()) * 100).round(2)
 
@@ -169,16 +299,63 @@ def adjust_shot_outcome_df(df: pd.DataFrame) -> pd.DataFrame:
             raise KeyError(f"A coluna {colunm} não existe no DataFrame")
     
     # Código principal
-    df['shot_outcome'] = df.apply(
-        lambda row: 'Gol' if row['shot_outcome'] == 'No alvo' and row['is_goal'] == 1 
-                    else 'Defendido' if row['shot_outcome'] == 'No alvo' and row['is_goal'] == 0
-                    else row['shot_outcome'], axis=1
+    on_target = df['shot_outcome'] == 'No alvo'
+    df['shot_outcome'] = np.select(
+        [on_target & (df['is_goal'] == 1), on_target & (df['is_goal'] == 0)],
+        ['Gol', 'Defendido'],
+        default=df['shot_outcome'].to_numpy(dtype=object)
     )
     
     return df
 
 
-def graph_view_shot_outcome(df: pd.DataFrame) -> None:
+def prepare_shots(df: pd.DataFrame, locations_inside: Optional[List[int]] = None,
+                  excluded_locations: Optional[List[int]] = None) -> pd.DataFrame:
+    """Seleciona os chutes (event_type 1) do DataFrame de eventos, descarta as
+    localizações excluídas, classifica cada chute como dentro ou fora da área na coluna
+    'situation' e traduz os resultados de 'shot_outcome'.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos. Não é modificado.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+                                                Padrão: `LOCATIONS_INSIDE`.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+                                                  Padrão: `EXCLUDED_LOCATIONS`.
+
+    Returns:
+        pd.DataFrame: DataFrame de chutes com as colunas 'is_goal', 'shot_outcome' e
+        'situation'.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    required_columns = ['event_type', 'location', 'shot_outcome', 'is_goal']
+    for colunm in required_columns:
+        if colunm not in df.columns:
+            raise KeyError(f"A coluna {colunm} não existe no DataFrame")
+
+    if locations_inside is None:
+        locations_inside = LOCATIONS_INSIDE
+    if excluded_locations is None:
+        excluded_locations = EXCLUDED_LOCATIONS
+
+    # Código principal
+    shots = filter_df(df[required_columns], {'event_type': 1})
+    shots = remove_lines_by_condition(shots, 'location', list(excluded_locations)).copy()
+    shots['situation'] = np.where(shots['location'].isin(locations_inside), 'inside', 'outside')
+    shots = remove_columns(shots, ['event_type', 'location'])
+
+    shots = map_column_values(shots, 'shot_outcome', SHOTS_MAPPING)
+
+    return adjust_shot_outcome_df(shots)
+
+
+def graph_view_shot_outcome(df: pd.DataFrame, output_dir: str = OUTPUT_DIR) -> None:
     """Exibe um gráfico de barras duplas das porcentagens de resultados de chutes.
 
     Esta função cria e salva um gráfico de barras duplas que compara as porcentagens de resultados 
@@ -187,6 +364,7 @@ def graph_view_shot_outcome(df: pd.DataFrame) -> None:
     Args:
         df (pd.DataFrame): DataFrame contendo dados de chutes, que será utilizado para calcular as 
                            porcentagens que serão exibidas no gráfico.
+        output_dir (str): Diretório em que o gráfico é salvo.
 
     Raises:
         TypeError: Se `df` não for um pd.DataFrame.
@@ -226,37 +404,98 @@ def graph_view_shot_outcome(df: pd.DataFrame) -> None:
     plt.xticks(rotation=0)
     plt.ylim(0, 50) 
     plt.title('Chutes dentro e fora da área', color='white')
-    plt.savefig('../data/graph_shots.png', format='png', dpi=300, transparent=True)
+    save_figure(os.path.join(output_dir, 'graph_shots.png'), format='png', dpi=300,
+                transparent=True)
 
 
-def shots_main(df: pd.DataFrame):
-    """Função principal que executa o fluxo de análise e visualização dos chutes,
-    utilizando as funções documentadas anteriormentes.
+def shots_summary(df: pd.DataFrame, locations_inside: Optional[List[int]] = None,
+                  excluded_locations: Optional[List[int]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Calcula as estatísticas de gols e de chutes dentro e fora da área a partir do
+    DataFrame de eventos, sem exibir nem salvar os resultados.
 
     Args:
-        df (pd.DataFrame): DataFrame a ser recebido pela função.
-    """
-    df = remove_columns(df, ['time', 'side', 'bodypart'])
-    df = filter_df(df, {'event_type': 1})
-    df = remove_lines_by_condition(df, 'location', [1, 2, 7, 8, 19])
-    df = remove_columns(df, ['event_type'])
-
-    locations_inside = [3, 9, 10, 11, 12, 13, 14]
-    df['situation'] = df['location'].apply(lambda x: 'inside' if x in locations_inside else 'outside')
-
-    df = remove_columns(df, ['location'])
-
-    shots_mapping = {1.0: 'No alvo', 2.0: 'Fora', 3.0: 'Bloqueado', 4.0: 'Trave'}
-    df = map_column_values(df, 'shot_outcome', shots_mapping)
+        df (pd.DataFrame): DataFrame de eventos.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
 
-    df = adjust_shot_outcome_df(df)
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: O resultado de `calculate_goals` e o de
+        `perc_shot_outcome`.
+    """
+    df = prepare_shots(df, locations_inside, excluded_locations)
     
     goals = filter_df(df, {'is_goal': 1})
     stats_goals = calculate_goals(goals)
 
     perc_attempts = perc_shot_outcome(df)
 
+    return stats_goals, perc_attempts
+
+
+def shots_report(stats_goals: pd.DataFrame, perc_attempts: pd.DataFrame,
+                 output_dir: str = OUTPUT_DIR) -> None:
+    """Exibe as estatísticas de gols e de chutes e salva o gráfico dos chutes.
+
+    Args:
+        stats_goals (pd.DataFrame): Estatísticas por gol geradas por `shots_summary`.
+        perc_attempts (pd.DataFrame): Estatísticas por chute geradas por `shots_summary`.
+        output_dir (str): Diretório em que o gráfico é salvo.
+    """
     print_dataframe(stats_goals, "ESTATÍSTICAS POR GOL")
     print_dataframe(perc_attempts, "ESTATÍSTICAS POR CHUTE")
 
-    graph_view_shot_outcome(perc_attempts)
+    graph_view_shot_outcome(perc_attempts, output_dir)
+
+
+def expected_goals_summary(df: pd.DataFrame, model: XGModel,
+                           locations_inside: Optional[List[int]] = None,
+                           excluded_locations: Optional[List[int]] = None) -> pd.DataFrame:
+    """Compara os gols marcados com a soma do xG dos chutes dentro e fora da área.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com as colunas usadas pelo modelo.
+        model (XGModel): Modelo de xG (ver xg.py).
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Situação' ('Dentro da área' ou 'Fora da
+        área'), 'Chutes', 'Gols', 'xG', 'xG por chute' e 'Gols - xG'.
+    """
+    shots = prepare_shots(df, locations_inside, excluded_locations)
+    expected = predict_xg(model, df.loc[shots.index])
+    inside = (shots['situation'] == 'inside').to_numpy()
+    goals = (shots['is_goal'] == 1).to_numpy()
+
+    rows = []
+    for situation, mask in (('Dentro da área', inside), ('Fora da área', ~inside)):
+        n_shots = int(mask.sum())
+        total_xg = float(expected[mask].sum())
+        rows.append({'Situação': situation, 'Chutes': n_shots,
+                     'Gols': int(goals[mask].sum()), 'xG': total_xg,
+                     'xG por chute': total_xg / n_shots if n_shots else 0.0,
+                     'Gols - xG': goals[mask].sum() - total_xg})
+
+    return pd.DataFrame(rows).round(3)
+
+
+def shots_main(df: pd.DataFrame, locations_inside: Optional[List[int]] = None,
+               excluded_locations: Optional[List[int]] = None,
+               xg_model_path: Optional[str] = None):
+    """Função principal que executa o fluxo de análise e visualização dos chutes,
+    utilizando as funções documentadas anteriormentes.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser recebido pela função.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+        xg_model_path (Optional[str]): Arquivo do modelo de xG. Se informado, exibe
+                                       também os gols esperados; o modelo só é ajustado
+                                       se o arquivo não existir.
+    """
+    shots_report(*shots_summary(df, locations_inside, excluded_locations))
+
+    if xg_model_path is not None:
+        model = load_or_fit_xg(df, xg_model_path)
+        print_dataframe(expected_goals_summary(df, model, locations_inside, excluded_locations),
+                        "GOLS ESPERADOS (xG)")
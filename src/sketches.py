@@ -0,0 +1,349 @@
+"""
+Este módulo responde perguntas de cardinalidade e de frequência em memória fixa, para
+execuções em pedaços ou em transmissão, como o número de jogadores e de partidas distintos
+e os pares ('location', 'shot_outcome') mais frequentes. Os esboços (sketches) são
+alimentados com os mesmos pedaços de eventos gerados por `load_dataset(csv_path,
+chunksize)` e podem ser combinados entre pedaços e entre processos.
+
+- HyperLogLog: conta valores distintos com 2**p registradores de 1 byte (16 KB com o
+  padrão p=14). O erro relativo típico é 1,04 / sqrt(2**p), cerca de 0,8% com p=14.
+- Count-Min: estima a frequência de cada valor com uma tabela de profundidade
+  ceil(ln(1/delta)) e largura ceil(e/epsilon). A estimativa nunca é menor que a
+  frequência real e, com probabilidade 1 - delta, excede a frequência real em no máximo
+  epsilon * N, sendo N o total de valores (cerca de 110 KB com os padrões).
+- Mais frequentes: guarda apenas os k candidatos com as maiores estimativas do Count-Min,
+  escolhidos com um heap; vale o mesmo limite de erro do Count-Min.
+
+Os valores são identificados por hashes de 64 bits de `pd.util.hash_pandas_object`, que
+são os mesmos em qualquer processo.
+
+Funções
+-------
+hash_values(values):
+    Calcula o hash de 64 bits de cada valor (ou de cada linha, para pares de colunas).
+
+new_hyperloglog(p), hyperloglog_update(sketch, values), hyperloglog_count(sketch):
+    Cria, alimenta e consulta um HyperLogLog.
+
+new_count_min(epsilon, delta), count_min_update(sketch, values),
+count_min_query(sketch, values):
+    Cria, alimenta e consulta um Count-Min.
+
+new_heavy_hitters(k, epsilon, delta), heavy_hitters_update(sketch, values),
+heavy_hitters_top(sketch):
+    Cria, alimenta e consulta os k valores mais frequentes.
+
+merge_sketches(a, b):
+    Combina dois esboços do mesmo tipo (ou dicionários de esboços).
+
+event_sketches(chunks, k):
+    Alimenta os esboços de jogadores, partidas e pares (location, shot_outcome).
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Sketch = Dict[str, Any]
+Values = Union[pd.Series, pd.DataFrame]
+
+HLL_DEFAULT_P = 14
+CM_DEFAULT_EPSILON = 0.001
+CM_DEFAULT_DELTA = 0.01
+
+# Multiplicadores ímpares fixos das linhas do Count-Min (os mesmos em todos os processos)
+CM_MULTIPLIERS = np.random.default_rng(2017).integers(
+    0, 2 ** 63, size=32, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+def hash_values(values: Values) -> np.ndarray:
+    """Calcula o hash de 64 bits de cada valor de uma série, ou de cada linha de um
+    DataFrame (para contar pares de colunas).
+
+    Args:
+        values (Union[pd.Series, pd.DataFrame]): Valores a serem identificados.
+
+    Returns:
+        np.ndarray: Hashes, em um array uint64.
+
+    Raises:
+        TypeError: Se `values` não for uma pd.Series ou um pd.DataFrame.
+    """
+    if not isinstance(values, (pd.Series, pd.DataFrame)):
+        raise TypeError("O parâmetro 'values' deve ser uma pandas Series ou DataFrame.")
+
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def new_hyperloglog(p: int = HLL_DEFAULT_P) -> Sketch:
+    """Cria um HyperLogLog vazio com 2**p registradores.
+
+    Args:
+        p (int): Número de bits do hash usados para escolher o registrador (4 a 18).
+
+    Returns:
+        Sketch: O esboço.
+
+    Raises:
+        ValueError: Se `p` estiver fora do intervalo permitido.
+    """
+    if not 4 <= p <= 18:
+        raise ValueError("O parâmetro 'p' deve estar entre 4 e 18")
+
+    return {'type': 'hyperloglog', 'p': p, 'registers': np.zeros(2 ** p, dtype=np.uint8)}
+
+
+def hyperloglog_update(sketch: Sketch, values: Values) -> None:
+    """Acrescenta valores a um HyperLogLog. Valores ausentes devem ser removidos antes,
+    se não devem ser contados.
+
+    Args:
+        sketch (Sketch): Esboço criado por `new_hyperloglog`.
+        values (Union[pd.Series, pd.DataFrame]): Valores do pedaço.
+    """
+    hashes = hash_values(values)
+    p = sketch['p']
+    buckets = (hashes >> np.uint64(64 - p)).astype(np.int64)
+    # Os 64 - p bits restantes cabem exatamente em um float64, e frexp devolve o número
+    # de bits significativos sem erro de arredondamento
+    remaining = (hashes & np.uint64((1 << (64 - p)) - 1)).astype(np.float64)
+    _, bit_length = np.frexp(remaining)
+    ranks = (64 - p - bit_length + 1).astype(np.uint8)
+    np.maximum.at(sketch['registers'], buckets, ranks)
+
+
+def hyperloglog_count(sketch: Sketch) -> int:
+    """Estima o número de valores distintos acrescentados ao HyperLogLog.
+
+    Args:
+        sketch (Sketch): Esboço criado por `new_hyperloglog`.
+
+    Returns:
+        int: Número estimado de valores distintos.
+    """
+    registers = sketch['registers']
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+
+    # Correção para cardinalidades pequenas (contagem linear)
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * math.log(m / zeros)
+    return int(round(estimate))
+
+
+def new_count_min(epsilon: float = CM_DEFAULT_EPSILON,
+                  delta: float = CM_DEFAULT_DELTA) -> Sketch:
+    """Cria um Count-Min vazio.
+
+    Args:
+        epsilon (float): Erro máximo, como fração do total de valores.
+        delta (float): Probabilidade de o erro ultrapassar `epsilon`.
+
+    Returns:
+        Sketch: O esboço.
+
+    Raises:
+        ValueError: Se `epsilon` ou `delta` não estiverem entre 0 e 1.
+    """
+    if not 0 < epsilon < 1 or not math.exp(-len(CM_MULTIPLIERS)) < delta < 1:
+        raise ValueError("Os parâmetros 'epsilon' e 'delta' devem estar entre 0 e 1")
+
+    width = math.ceil(math.e / epsilon)
+    depth = math.ceil(math.log(1 / delta))
+    return {'type': 'count_min', 'epsilon': epsilon, 'delta': delta, 'total': 0,
+            'table': np.zeros((depth, width), dtype=np.int64)}
+
+
+def _count_min_columns(sketch: Sketch, hashes: np.ndarray) -> np.ndarray:
+    """Coluna de cada hash em cada linha da tabela. Cada linha usa um multiplicador ímpar
+    diferente (hash multiplicativo), o que torna as linhas independentes entre si."""
+    depth, width = sketch['table'].shape
+    mixed = hashes[None, :] * CM_MULTIPLIERS[:depth, None]
+    return ((mixed >> np.uint64(32)) % np.uint64(width)).astype(np.int64)
+
+
+def _count_min_add(sketch: Sketch, hashes: np.ndarray, counts: np.ndarray) -> None:
+    table = sketch['table']
+    for row, columns in enumerate(_count_min_columns(sketch, hashes)):
+        table[row] += np.bincount(columns, weights=counts,
+                                  minlength=table.shape[1]).astype(np.int64)
+    sketch['total'] += int(counts.sum())
+
+
+def _count_min_estimate(sketch: Sketch, hashes: np.ndarray) -> np.ndarray:
+    columns = _count_min_columns(sketch, hashes)
+    return sketch['table'][np.arange(columns.shape[0])[:, None], columns].min(axis=0)
+
+
+def count_min_update(sketch: Sketch, values: Values) -> None:
+    """Acrescenta valores a um Count-Min.
+
+    Args:
+        sketch (Sketch): Esboço criado por `new_count_min`.
+        values (Union[pd.Series, pd.DataFrame]): Valores do pedaço.
+    """
+    hashes = hash_values(values)
+    _count_min_add(sketch, hashes, np.ones(hashes.size))
+
+
+def count_min_query(sketch: Sketch, values: Values) -> np.ndarray:
+    """Estima a frequência de cada valor.
+
+    Args:
+        sketch (Sketch): Esboço criado por `new_count_min`.
+        values (Union[pd.Series, pd.DataFrame]): Valores consultados.
+
+    Returns:
+        np.ndarray: Frequência estimada de cada valor (nunca menor que a real).
+    """
+    return _count_min_estimate(sketch, hash_values(values))
+
+
+def new_heavy_hitters(k: int = 10, epsilon: float = CM_DEFAULT_EPSILON,
+                      delta: float = CM_DEFAULT_DELTA) -> Sketch:
+    """Cria um esboço vazio dos k valores mais frequentes.
+
+    Args:
+        k (int): Número de valores acompanhados.
+        epsilon (float): Erro máximo do Count-Min interno, como fração do total.
+        delta (float): Probabilidade de o erro ultrapassar `epsilon`.
+
+    Returns:
+        Sketch: O esboço.
+
+    Raises:
+        ValueError: Se `k` não for positivo.
+    """
+    if k <= 0:
+        raise ValueError("O parâmetro 'k' deve ser positivo")
+
+    return {'type': 'heavy_hitters', 'k': k, 'count_min': new_count_min(epsilon, delta),
+            'candidates': {}}
+
+
+def _keep_top(sketch: Sketch, candidates: Dict[int, Any]) -> None:
+    """Reestima os candidatos ({hash: valor}) com o Count-Min e mantém os k maiores."""
+    hashes = np.fromiter(candidates, dtype=np.uint64, count=len(candidates))
+    estimates = _count_min_estimate(sketch['count_min'], hashes)
+    top = heapq.nlargest(sketch['k'], zip(estimates.tolist(), hashes.tolist()))
+    sketch['candidates'] = {key: candidates[key] for _, key in top}
+
+
+def heavy_hitters_update(sketch: Sketch, values: Values) -> None:
+    """Acrescenta valores ao esboço dos mais frequentes. Os valores do pedaço são
+    agrupados antes, de modo que o Count-Min recebe uma atualização por valor distinto.
+
+    Args:
+        sketch (Sketch): Esboço criado por `new_heavy_hitters`.
+        values (Union[pd.Series, pd.DataFrame]): Valores do pedaço; para um DataFrame,
+        cada linha é um valor (uma tupla).
+    """
+    counts = values.value_counts(sort=False, dropna=False)
+    if isinstance(values, pd.DataFrame):
+        distinct = counts.index.to_frame(index=False).astype(values.dtypes.to_dict())
+    else:
+        distinct = pd.Series(counts.index, dtype=values.dtype)
+    hashes = hash_values(distinct)
+    _count_min_add(sketch['count_min'], hashes, counts.to_numpy(dtype=float))
+
+    candidates = dict(sketch['candidates'])
+    candidates.update(zip(hashes.tolist(), counts.index.tolist()))
+    _keep_top(sketch, candidates)
+
+
+def heavy_hitters_top(sketch: Sketch) -> List[Tuple[Any, int]]:
+    """Devolve os valores mais frequentes e as suas frequências estimadas.
+
+    Args:
+        sketch (Sketch): Esboço criado por `new_heavy_hitters`.
+
+    Returns:
+        List[Tuple[Any, int]]: Pares (valor, frequência estimada), em ordem decrescente.
+    """
+    candidates = sketch['candidates']
+    hashes = np.fromiter(candidates, dtype=np.uint64, count=len(candidates))
+    estimates = _count_min_estimate(sketch['count_min'], hashes)
+    top = sorted(zip(estimates.tolist(), hashes.tolist()), reverse=True)
+    return [(candidates[key], estimate) for estimate, key in top]
+
+
+def merge_sketches(a: Union[Sketch, Dict[str, Sketch]],
+                   b: Union[Sketch, Dict[str, Sketch]]) -> Union[Sketch, Dict[str, Sketch]]:
+    """Combina dois esboços do mesmo tipo e com os mesmos parâmetros, como se todos os
+    valores tivessem sido acrescentados a um único esboço. Também aceita dicionários de
+    esboços com as mesmas chaves (como os de `event_sketches`).
+
+    Args:
+        a (Sketch): Primeiro esboço.
+        b (Sketch): Segundo esboço.
+
+    Returns:
+        Sketch: Um novo esboço com a combinação.
+
+    Raises:
+        TypeError: Se os esboços forem de tipos diferentes.
+        ValueError: Se os esboços tiverem parâmetros diferentes.
+    """
+    # Tratamento de Erro
+    if not isinstance(a, dict) or not isinstance(b, dict) or a.get('type') != b.get('type'):
+        raise TypeError("Os esboços devem ser do mesmo tipo")
+
+    # Código Principal
+    if 'type' not in a:
+        if set(a) != set(b):
+            raise ValueError("Os dicionários de esboços devem ter as mesmas chaves")
+        return {name: merge_sketches(a[name], b[name]) for name in a}
+
+    if a['type'] == 'hyperloglog':
+        if a['p'] != b['p']:
+            raise ValueError("Os esboços devem ter o mesmo parâmetro 'p'")
+        return {'type': 'hyperloglog', 'p': a['p'],
+                'registers': np.maximum(a['registers'], b['registers'])}
+
+    if a['type'] == 'count_min':
+        if a['table'].shape != b['table'].shape:
+            raise ValueError("Os esboços devem ter os mesmos 'epsilon' e 'delta'")
+        return {**a, 'total': a['total'] + b['total'], 'table': a['table'] + b['table']}
+
+    if a['k'] != b['k']:
+        raise ValueError("Os esboços devem ter o mesmo parâmetro 'k'")
+    merged = {'type': 'heavy_hitters', 'k': a['k'],
+              'count_min': merge_sketches(a['count_min'], b['count_min']), 'candidates': {}}
+    _keep_top(merged, {**a['candidates'], **b['candidates']})
+    return merged
+
+
+def event_sketches(chunks: Iterable[pd.DataFrame], k: int = 10) -> Dict[str, Sketch]:
+    """Alimenta os esboços usados nas análises com pedaços de eventos, por exemplo os de
+    `load_dataset(csv_path, chunksize)`.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Pedaços do DataFrame de eventos.
+        k (int): Número de pares (location, shot_outcome) mais frequentes acompanhados.
+
+    Returns:
+        Dict[str, Sketch]: 'players' e 'matches' (HyperLogLog) e 'shot_pairs' (mais
+        frequentes entre os chutes).
+
+    Raises:
+        KeyError: Se algum pedaço não tiver as colunas necessárias.
+    """
+    sketches = {'players': new_hyperloglog(), 'matches': new_hyperloglog(),
+                'shot_pairs': new_heavy_hitters(k)}
+    required_columns = ['id_odsp', 'player', 'event_type', 'location', 'shot_outcome']
+    for chunk in chunks:
+        missing_columns = set(required_columns) - set(chunk.columns)
+        if missing_columns:
+            raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+
+        hyperloglog_update(sketches['players'], chunk['player'].dropna().astype(str))
+        hyperloglog_update(sketches['matches'], chunk['id_odsp'].astype(str))
+        shots = chunk.loc[chunk['event_type'] == 1, ['location', 'shot_outcome']]
+        if not shots.empty:
+            heavy_hitters_update(sketches['shot_pairs'], shots.astype('float64'))
+    return sketches
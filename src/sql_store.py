@@ -0,0 +1,265 @@
+"""
+Este módulo oferece um armazenamento opcional dos eventos em um arquivo SQLite local, para
+responder perguntas pontuais sem recarregar events.csv a cada vez. Os eventos são
+carregados uma única vez, em lotes de `executemany` dentro de uma única transação, e
+recebem índices nas colunas usadas pelos filtros das hipóteses. As três hipóteses podem
+então ser calculadas com os filtros executados como SQL no próprio banco, gerando os mesmos
+DataFrames de matches_summary, shots_summary e head_summary.
+
+Funções
+-------
+build_event_store(csv_path, db_path, batch_rows):
+    Carrega um CSV de eventos em um arquivo SQLite e cria os índices.
+
+connect_store(db_path):
+    Abre um armazenamento criado por build_event_store.
+
+query_events(conn, sql, params):
+    Executa uma consulta qualquer e devolve um DataFrame.
+
+matches_summary_sql(conn):
+    Hipótese 1 com os filtros executados em SQL.
+
+shots_summary_sql(conn, locations_inside, excluded_locations):
+    Hipótese 3 com os filtros executados em SQL.
+
+head_summary_sql(conn, time_window):
+    Hipótese 2 com os filtros executados em SQL.
+"""
+
+import os
+import sqlite3
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, ORIGIN_EVENT_TYPES, origins_from_counts
+from matches import calculate_results, create_summary_dataframe, goals_per_match_from_counts
+from shots import (EXCLUDED_LOCATIONS, LOCATIONS_INSIDE, SHOTS_MAPPING, goals_percentages,
+                   shot_outcome_count_from_counts, shot_outcome_percentages)
+
+TABLE = 'events'
+
+# (nome, colunas) de cada índice criado após a carga
+INDEXES = [
+    ('idx_events_match', ['id_odsp']),
+    ('idx_events_event_type', ['event_type']),
+    ('idx_events_is_goal', ['is_goal']),
+    ('idx_events_match_order', ['id_odsp', 'sort_order']),
+]
+
+
+def _sql_type(dtype) -> str:
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def build_event_store(csv_path: str, db_path: str, batch_rows: int = 50_000) -> int:
+    """Carrega um CSV de eventos em uma tabela SQLite. Cada evento recebe a coluna
+    'row_id' com a sua posição no arquivo, usada pela regra do evento anterior de
+    head.py. Todos os lotes são inseridos com `executemany` em uma única transação, e os
+    índices são criados apenas no final.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+        db_path (str): Caminho do arquivo SQLite a ser criado (é substituído se existir).
+        batch_rows (int): Número de linhas de cada lote de inserção.
+
+    Returns:
+        int: Número de eventos carregados.
+
+    Raises:
+        TypeError: Se `csv_path` ou `db_path` não forem strings.
+        FileNotFoundError: Se o CSV não for encontrado.
+    """
+    # Tratamento de Erro
+    if not isinstance(csv_path, str) or not isinstance(db_path, str):
+        raise TypeError("Os parâmetros 'csv_path' e 'db_path' devem ser strings")
+
+    if not os.path.isfile(csv_path):
+        raise FileNotFoundError(f"O arquivo '{csv_path}' não foi encontrado")
+
+    # Código Principal
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    rows = 0
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('BEGIN')
+        insert = None
+        for chunk in pd.read_csv(csv_path, chunksize=batch_rows):
+            if insert is None:
+                columns = ', '.join(f'"{column}" {_sql_type(dtype)}'
+                                    for column, dtype in chunk.dtypes.items())
+                conn.execute(f'CREATE TABLE {TABLE} (row_id INTEGER PRIMARY KEY, {columns})')
+                placeholders = ', '.join(['?'] * (chunk.shape[1] + 1))
+                insert = f'INSERT INTO {TABLE} VALUES ({placeholders})'
+
+            chunk.insert(0, 'row_id', range(rows, rows + chunk.shape[0]))
+            values = chunk.astype(object).where(chunk.notna(), None)
+            conn.executemany(insert, values.itertuples(index=False, name=None))
+            rows += chunk.shape[0]
+
+        for name, columns in INDEXES:
+            conn.execute(f'CREATE INDEX {name} ON {TABLE} ({", ".join(columns)})')
+        conn.execute('COMMIT')
+        conn.execute('ANALYZE')
+    finally:
+        conn.close()
+
+    return rows
+
+
+def connect_store(db_path: str) -> sqlite3.Connection:
+    """Abre um armazenamento criado por `build_event_store`.
+
+    Args:
+        db_path (str): Caminho do arquivo SQLite.
+
+    Returns:
+        sqlite3.Connection: Conexão com o banco.
+
+    Raises:
+        TypeError: Se `db_path` não for uma string.
+        FileNotFoundError: Se o arquivo não existir.
+    """
+    if not isinstance(db_path, str):
+        raise TypeError("O parâmetro 'db_path' deve ser uma string")
+
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(f"O arquivo '{db_path}' não foi encontrado")
+
+    return sqlite3.connect(db_path, check_same_thread=False)
+
+
+def query_events(conn: sqlite3.Connection, sql: str, params: Sequence = ()) -> pd.DataFrame:
+    """Executa uma consulta SQL qualquer sobre a tabela 'events'.
+
+    Args:
+        conn (sqlite3.Connection): Conexão aberta por `connect_store`.
+        sql (str): Consulta SQL, com '?' no lugar dos parâmetros.
+        params (Sequence): Valores dos parâmetros.
+
+    Returns:
+        pd.DataFrame: Resultado da consulta.
+
+    Examples:
+        >>> query_events(conn, "SELECT COUNT(*) AS n FROM events WHERE is_goal = ?", (1,))
+    """
+    if not isinstance(conn, sqlite3.Connection):
+        raise TypeError("O parâmetro 'conn' deve ser uma conexão sqlite3")
+
+    if not isinstance(sql, str):
+        raise TypeError("O parâmetro 'sql' deve ser uma string")
+
+    return pd.read_sql_query(sql, conn, params=list(params))
+
+
+def _placeholders(values: Sequence) -> str:
+    return ', '.join(['?'] * len(values))
+
+
+def matches_summary_sql(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Calcula a hipótese 1 com a contagem de gols por partida feita em SQL.
+
+    Args:
+        conn (sqlite3.Connection): Conexão aberta por `connect_store`.
+
+    Returns:
+        pd.DataFrame: DataFrame no formato de matches_summary.
+    """
+    counts = query_events(conn, f"""
+        SELECT id_odsp, side, COUNT(*) AS goals FROM {TABLE}
+        WHERE event_type = 1 AND is_goal = 1
+        GROUP BY id_odsp, side ORDER BY id_odsp, side""")
+    goal_counts = counts.set_index(['id_odsp', 'side'])['goals'].astype('int64')
+
+    goals_per_match = goals_per_match_from_counts(goal_counts)
+    return create_summary_dataframe(calculate_results(goals_per_match))
+
+
+def shots_summary_sql(conn: sqlite3.Connection, locations_inside: Optional[List[int]] = None,
+                      excluded_locations: Optional[List[int]] = None
+                      ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Calcula a hipótese 3 com a seleção e a contagem dos chutes feitas em SQL.
+
+    Args:
+        conn (sqlite3.Connection): Conexão aberta por `connect_store`.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Os mesmos DataFrames de shots_summary.
+    """
+    if locations_inside is None:
+        locations_inside = LOCATIONS_INSIDE
+    if excluded_locations is None:
+        excluded_locations = EXCLUDED_LOCATIONS
+
+    groups = query_events(conn, f"""
+        SELECT CASE WHEN location IN ({_placeholders(locations_inside)})
+                    THEN 'inside' ELSE 'outside' END AS situation,
+               shot_outcome, is_goal, COUNT(*) AS n, MIN(row_id) AS first_row
+        FROM {TABLE}
+        WHERE event_type = 1
+          AND (location IS NULL OR location NOT IN ({_placeholders(excluded_locations)}))
+        GROUP BY 1, 2, 3""", list(locations_inside) + list(excluded_locations))
+
+    goals = groups[groups['is_goal'] == 1]
+    goals_inside = int(goals.loc[goals['situation'] == 'inside', 'n'].sum())
+    goals_outside = int(goals.loc[goals['situation'] == 'outside', 'n'].sum())
+    stats_goals = goals_percentages(goals_inside, goals_outside, int(goals['n'].sum()))
+
+    # Mesmo ajuste de adjust_shot_outcome_df
+    outcome = groups['shot_outcome'].map(SHOTS_MAPPING)
+    on_target = outcome == 'No alvo'
+    outcome = outcome.mask(on_target & (groups['is_goal'] == 1), 'Gol')
+    outcome = outcome.mask(on_target & (groups['is_goal'] == 0), 'Defendido')
+    groups = groups.assign(shot_outcome=outcome).dropna(subset=['shot_outcome'])
+
+    # A ordem de primeira aparição reproduz value_counts(sort=False)
+    counts = []
+    for situation in ['inside', 'outside']:
+        selected = groups[groups['situation'] == situation]
+        aggregated = selected.groupby('shot_outcome').agg(count=('n', 'sum'),
+                                                          first_row=('first_row', 'min'))
+        counts.append(aggregated.sort_values('first_row')['count'].astype('int64'))
+
+    attempts = shot_outcome_count_from_counts(*counts)
+    return stats_goals, shot_outcome_percentages(attempts)
+
+
+def head_summary_sql(conn: sqlite3.Connection,
+                     time_window: float = HEADER_TIME_WINDOW) -> pd.DataFrame:
+    """Calcula a hipótese 2 em SQL: os gols de cabeça são encontrados pelo índice de
+    'is_goal' e o evento anterior de cada um pela chave primária 'row_id'.
+
+    Args:
+        conn (sqlite3.Connection): Conexão aberta por `connect_store`.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior para que a origem seja contada.
+
+    Returns:
+        pd.DataFrame: DataFrame no formato de head_summary.
+    """
+    previous = query_events(conn, f"""
+        SELECT p.event_type, COUNT(*) AS n
+        FROM {TABLE} AS g JOIN {TABLE} AS p ON p.row_id = g.row_id - 1
+        WHERE g.is_goal = 1 AND g.bodypart = 3
+          AND p.id_odsp = g.id_odsp AND g.time - p.time <= ?
+        GROUP BY p.event_type""", (time_window,))
+    first_row = query_events(conn, f"""
+        SELECT COUNT(*) AS n FROM {TABLE}
+        WHERE row_id = 0 AND is_goal = 1 AND bodypart = 3""")
+
+    counts = {'corners': 0, 'fouls': 0, 'offsides': 0, 'others': int(first_row['n'][0])}
+    for event_type, n in zip(previous['event_type'], previous['n']):
+        counts[ORIGIN_EVENT_TYPES.get(event_type, 'others')] += int(n)
+
+    return origins_from_counts(counts)
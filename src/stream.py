@@ -0,0 +1,327 @@
+"""
+Este módulo acompanha as três hipóteses em tempo real, a partir de eventos ao vivo com as
+mesmas colunas de events.csv. Cada evento atualiza, em tempo constante, o placar da sua
+partida, o último evento da partida (usado pela regra do evento anterior de head.py) e os
+contadores de resultados de chutes. Resumos são publicados periodicamente, com um intervalo
+configurável, enquanto os eventos são consumidos.
+
+Diferente do caminho em lote, o evento anterior de um gol de cabeça é o último evento da
+mesma partida, pois eventos de partidas simultâneas chegam intercalados.
+
+Funções
+-------
+new_stream_state():
+    Cria o estado vazio da transmissão.
+
+update_state(state, event):
+    Atualiza o estado com um evento, em tempo constante.
+
+snapshot(state):
+    Monta os resumos das três hipóteses a partir do estado.
+
+parse_event_line(header, line):
+    Converte uma linha CSV em um evento (dicionário).
+
+tail_csv(path, poll_interval, follow):
+    Lê eventos de um arquivo CSV que continua crescendo.
+
+socket_events(host, port):
+    Lê eventos em formato CSV de um socket local.
+
+run_stream(source, on_snapshot, interval, max_events):
+    Função principal que consome os eventos e publica os resumos.
+"""
+
+import asyncio
+import csv
+import inspect
+import math
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, ORIGIN_EVENT_TYPES, origins_from_counts
+from matches import summary_from_results
+from shots import (EXCLUDED_LOCATIONS, LOCATIONS_INSIDE, SHOTS_MAPPING,
+                   shot_outcome_count_from_counts)
+
+Event = Dict[str, Any]
+
+
+def _code(value: Any) -> Optional[int]:
+    """Converte um valor codificado em inteiro, ou None se estiver ausente."""
+    if value is None or value == '':
+        return None
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value)
+
+
+def new_stream_state() -> Dict[str, Any]:
+    """Cria o estado vazio da transmissão.
+
+    Returns:
+        Dict[str, Any]: Estado com placares, últimos eventos por partida e contadores.
+    """
+    return {
+        'scores': {},
+        'last_events': {},
+        'results': {1: 0, 0: 0, -1: 0},
+        'shots': {'inside': {}, 'outside': {}},
+        'head': {'corners': 0, 'fouls': 0, 'offsides': 0, 'others': 0},
+        'events': 0,
+        'skipped_goals': 0,
+    }
+
+
+def _result(scores: List[int]) -> int:
+    """Resultado de uma partida com a mesma codificação de calculate_results."""
+    return 1 if scores[0] > scores[1] else (0 if scores[0] < scores[1] else -1)
+
+
+def update_state(state: Dict[str, Any], event: Event,
+                 time_window: float = HEADER_TIME_WINDOW) -> None:
+    """Atualiza o estado com um evento. Todas as operações são consultas ou atualizações
+    de dicionários, com custo constante por evento. Gols sem 'side' não entram no placar,
+    como no caminho em lote, e são contados em 'skipped_goals'.
+
+    Args:
+        state (Dict[str, Any]): Estado criado por `new_stream_state`.
+        event (Event): Evento com as colunas de events.csv ('id_odsp', 'time',
+        'event_type', 'side', 'is_goal', 'location', 'bodypart' e 'shot_outcome').
+        time_window (float): Diferença máxima, em minutos, entre um gol de cabeça e o
+        evento anterior para que a origem seja contada.
+
+    Raises:
+        TypeError: Se `state` ou `event` não forem dicionários.
+        KeyError: Se o evento não tiver alguma das colunas necessárias.
+    """
+    # Tratamento de Erro
+    if not isinstance(state, dict) or not isinstance(event, dict):
+        raise TypeError("Os parâmetros 'state' e 'event' devem ser dicionários.")
+
+    # Código Principal
+    match = event['id_odsp']
+    event_time = float(event['time'])
+    event_type = _code(event['event_type'])
+    is_goal = _code(event['is_goal']) == 1
+
+    # Hipótese 2: origem dos gols de cabeça
+    if is_goal and _code(event['bodypart']) == 3:
+        previous = state['last_events'].get(match)
+        if previous is None:
+            if state['events'] == 0:
+                state['head']['others'] += 1
+        elif event_time - previous[0] <= time_window:
+            state['head'][ORIGIN_EVENT_TYPES.get(previous[1], 'others')] += 1
+    state['last_events'][match] = (event_time, event_type)
+
+    if event_type == 1:
+        # Hipótese 1: placar da partida e resultado do time da casa
+        side = _code(event['side'])
+        if is_goal and side is None:
+            state['skipped_goals'] += 1
+        elif is_goal:
+            scores = state['scores'].setdefault(match, [0, 0])
+            if any(scores):
+                state['results'][_result(scores)] -= 1
+            scores[side - 1] += 1
+            state['results'][_result(scores)] += 1
+
+        # Hipótese 3: resultados dos chutes dentro e fora da área
+        location = _code(event['location'])
+        if location not in EXCLUDED_LOCATIONS:
+            situation = 'inside' if location in LOCATIONS_INSIDE else 'outside'
+            outcome = SHOTS_MAPPING.get(_code(event['shot_outcome']))
+            if outcome == 'No alvo':
+                outcome = 'Gol' if is_goal else 'Defendido'
+            if outcome is not None:
+                counts = state['shots'][situation]
+                counts[outcome] = counts.get(outcome, 0) + 1
+
+    state['events'] += 1
+
+
+def snapshot(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Monta os resumos das três hipóteses a partir do estado atual.
+
+    Args:
+        state (Dict[str, Any]): Estado criado por `new_stream_state`.
+
+    Returns:
+        Dict[str, Any]: 'events' (número de eventos consumidos), 'skipped_goals' (gols
+        sem 'side', fora do placar), 'matches' (no formato de create_summary_dataframe),
+        'shots' (no formato de shot_outcome_count) e 'head' (no formato de
+        origin_of_headed_goals).
+    """
+    if not isinstance(state, dict):
+        raise TypeError("O parâmetro 'state' deve ser um dicionário.")
+
+    results = state['results']
+    counts = [pd.Series(state['shots'][situation], dtype='int64', name='count')
+              .rename_axis('shot_outcome') for situation in ['inside', 'outside']]
+
+    return {
+        'events': state['events'],
+        'skipped_goals': state['skipped_goals'],
+        'matches': summary_from_results(results[1], results[0], results[-1]),
+        'shots': shot_outcome_count_from_counts(*counts),
+        'head': origins_from_counts(state['head']),
+    }
+
+
+def parse_event_line(header: List[str], line: str) -> Event:
+    """Converte uma linha no formato de events.csv em um evento.
+
+    Args:
+        header (List[str]): Nomes das colunas, na ordem do arquivo.
+        line (str): Linha CSV do evento.
+
+    Returns:
+        Event: Dicionário {coluna: valor}, com campos vazios como None.
+
+    Raises:
+        ValueError: Se a linha não tiver o mesmo número de campos do cabeçalho.
+    """
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError("A linha não tem o mesmo número de campos do cabeçalho")
+    return {column: (value if value != '' else None) for column, value in zip(header, values)}
+
+
+async def tail_csv(path: str, poll_interval: float = 0.1,
+                   follow: bool = True) -> AsyncIterator[Event]:
+    """Lê eventos de um arquivo CSV, como `tail -f`: ao chegar ao fim do arquivo, espera
+    `poll_interval` segundos e tenta ler novas linhas.
+
+    Args:
+        path (str): Caminho do arquivo CSV, com cabeçalho.
+        poll_interval (float): Intervalo, em segundos, entre tentativas de leitura.
+        follow (bool): Se False, termina ao chegar ao fim do arquivo.
+
+    Yields:
+        Event: Cada evento do arquivo.
+    """
+    with open(path, encoding='utf-8', newline='') as file:
+        header = None
+        pending = ''
+        while True:
+            line = file.readline()
+            if not line:
+                if not follow:
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+            pending += line
+            if not pending.endswith('\n'):
+                continue  # linha ainda sendo escrita
+            line, pending = pending.rstrip('\r\n'), ''
+            if header is None:
+                header = next(csv.reader([line]))
+            elif line:
+                yield parse_event_line(header, line)
+
+
+async def socket_events(host: str, port: int) -> AsyncIterator[Event]:
+    """Lê eventos de um socket TCP local. O produtor envia o cabeçalho de events.csv
+    seguido de uma linha CSV por evento; a leitura termina quando a conexão é fechada.
+
+    Args:
+        host (str): Endereço do produtor (por exemplo, '127.0.0.1').
+        port (int): Porta do produtor.
+
+    Yields:
+        Event: Cada evento recebido.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        header = None
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            line = line.decode('utf-8').rstrip('\r\n')
+            if header is None:
+                header = next(csv.reader([line]))
+            elif line:
+                yield parse_event_line(header, line)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _as_async(source: Union[Iterable[Event], AsyncIterator[Event]]) -> AsyncIterator[Event]:
+    """Permite consumir geradores comuns e assíncronos da mesma forma."""
+    if hasattr(source, '__aiter__'):
+        async for event in source:
+            yield event
+    else:
+        for event in source:
+            yield event
+
+
+async def run_stream(source: Union[Iterable[Event], AsyncIterator[Event]],
+                     on_snapshot: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                     interval: float = 1.0, max_events: Optional[int] = None,
+                     time_window: float = HEADER_TIME_WINDOW) -> Dict[str, Any]:
+    """Consome os eventos de `source` e publica resumos a cada `interval` segundos. A
+    publicação é verificada após cada evento e também por uma tarefa separada quando não
+    chegam eventos, de modo que o atraso entre publicações fica limitado a `interval`
+    mais o tempo de montar um resumo.
+
+    Args:
+        source (Union[Iterable[Event], AsyncIterator[Event]]): Gerador de eventos, como
+        `tail_csv` ou `socket_events`.
+        on_snapshot (Optional[Callable]): Função (comum ou assíncrona) chamada com cada
+        resumo publicado.
+        interval (float): Intervalo, em segundos, entre publicações.
+        max_events (Optional[int]): Número máximo de eventos a consumir.
+        time_window (float): Janela, em minutos, da regra do evento anterior.
+
+    Returns:
+        Dict[str, Any]: O resumo final, no formato de `snapshot`.
+
+    Raises:
+        ValueError: Se `interval` não for positivo.
+    """
+    # Tratamento de Erro
+    if interval <= 0:
+        raise ValueError("O parâmetro 'interval' deve ser positivo")
+
+    # Código Principal
+    state = new_stream_state()
+    next_publish = time.monotonic() + interval
+    lock = asyncio.Lock()
+
+    async def publish() -> None:
+        nonlocal next_publish
+        async with lock:
+            next_publish = time.monotonic() + interval
+            if on_snapshot is not None:
+                result = on_snapshot(snapshot(state))
+                if inspect.isawaitable(result):
+                    await result
+
+    async def ticker() -> None:
+        while True:
+            await asyncio.sleep(max(next_publish - time.monotonic(), 0))
+            if time.monotonic() >= next_publish:
+                await publish()
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        async for event in _as_async(source):
+            update_state(state, event, time_window)
+            if time.monotonic() >= next_publish:
+                await publish()
+            if max_events is not None and state['events'] >= max_events:
+                break
+    finally:
+        ticker_task.cancel()
+        if hasattr(source, 'aclose'):
+            await source.aclose()
+
+    await publish()
+    return snapshot(state)
@@ -0,0 +1,415 @@
+"""
+Este módulo avalia a sensibilidade das hipóteses às escolhas fixas da análise: quais
+localizações contam como dentro da área e quais são descartadas (shots.py), a janela de
+tempo e o número de eventos anteriores considerados na origem dos gols de cabeça, e quais
+event_type contam como bola parada (head.py). Uma grade de parâmetros é avaliada em uma
+única execução.
+
+Os eventos são lidos uma vez só. Para os chutes, é montada uma matriz de contagens
+localização x resultado (e o número de gols por localização); cada ponto da grade apenas
+soma as linhas das localizações de dentro e de fora da área. Para os gols de cabeça, são
+guardados, para cada gol, a diferença de tempo e o event_type de cada um dos eventos
+anteriores da mesma partida; cada ponto da grade apenas compara essas diferenças com a
+janela. Os resultados de cada ponto são iguais aos de `shots_summary` e `head_summary` com
+os mesmos parâmetros.
+
+Funções
+-------
+parameter_grid(options):
+    Monta a grade com todas as combinações de valores dos parâmetros.
+
+shot_location_counts(df):
+    Conta os chutes de cada localização e resultado, uma única vez.
+
+shots_from_counts(counts, locations_inside, excluded_locations):
+    Calcula o resultado de `shots_summary` a partir das contagens.
+
+headed_goal_gaps(df, max_previous):
+    Guarda a distância de cada gol de cabeça até os eventos anteriores, uma única vez.
+
+head_from_gaps(gaps, time_window, previous_events, set_pieces):
+    Calcula o resultado de `head_summary` a partir das distâncias.
+
+sweep_shots(df, grid):
+    Avalia a hipótese dos chutes em cada ponto da grade.
+
+sweep_head(df, grid):
+    Avalia a hipótese dos gols de cabeça em cada ponto da grade.
+
+sensitivity_table(results):
+    Resume uma varredura em uma tabela com uma linha por ponto da grade.
+"""
+
+import itertools
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from head import HEADER_TIME_WINDOW, ORIGIN_EVENT_TYPES, origins_from_counts
+from shots import (EXCLUDED_LOCATIONS, LOCATIONS_INSIDE, goals_percentages,
+                   prepare_shots, shot_outcome_count_from_counts, shot_outcome_percentages)
+
+Grid = List[Dict[str, Any]]
+
+SHOTS_PARAMETERS = {'locations_inside': LOCATIONS_INSIDE,
+                    'excluded_locations': EXCLUDED_LOCATIONS}
+HEAD_PARAMETERS = {'time_window': HEADER_TIME_WINDOW, 'previous_events': 1,
+                   'set_pieces': list(ORIGIN_EVENT_TYPES)}
+
+
+def parameter_grid(options: Dict[str, List[Any]]) -> Grid:
+    """Monta a grade com todas as combinações dos valores de cada parâmetro.
+
+    Args:
+        options (Dict[str, List[Any]]): Valores possíveis de cada parâmetro.
+
+    Returns:
+        Grid: Lista de dicionários parâmetro -> valor, um por combinação.
+
+    Raises:
+        TypeError: Se `options` não for um dicionário de listas.
+
+    Examples:
+        >>> parameter_grid({'time_window': [1, 2], 'previous_events': [1]})
+        [{'time_window': 1, 'previous_events': 1}, {'time_window': 2, 'previous_events': 1}]
+    """
+    # Tratamento de Erro
+    if not isinstance(options, dict):
+        raise TypeError("O parâmetro 'options' deve ser um dicionário.")
+
+    for name, values in options.items():
+        if not isinstance(values, list):
+            raise TypeError(f"Os valores do parâmetro '{name}' devem estar em uma lista.")
+
+    # Código Principal
+    names = list(options)
+    return [dict(zip(names, values)) for values in itertools.product(*options.values())]
+
+
+def _complete(params: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Completa um ponto da grade com os valores padrão dos parâmetros ausentes."""
+    if not isinstance(params, dict):
+        raise TypeError("Cada ponto da grade deve ser um dicionário.")
+
+    for name in params:
+        if name not in defaults:
+            raise KeyError(f"O parâmetro '{name}' não existe. Parâmetros: {list(defaults)}")
+
+    return {**defaults, **params}
+
+
+def shot_location_counts(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Conta os chutes de cada par (localização, resultado) e os gols de cada
+    localização, sem descartar nenhuma localização. Guarda também a primeira aparição de
+    cada par, que define a ordem dos resultados empatados em `shots_summary`.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos. Não é modificado.
+
+    Returns:
+        Dict[str, np.ndarray]: Dicionário com:
+            - 'locations': As localizações (linhas das matrizes).
+            - 'outcomes': Os resultados de chute (colunas das matrizes).
+            - 'counts': Matriz com o número de chutes de cada par.
+            - 'first': Matriz com a posição do primeiro chute de cada par.
+            - 'goals': Número de gols de cada localização.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    # Código Principal
+    shots = prepare_shots(df, [], [])
+    location_codes, locations = pd.factorize(df.loc[shots.index, 'location'],
+                                             use_na_sentinel=False)
+    outcome_codes, outcomes = pd.factorize(shots['shot_outcome'])
+    goals = np.bincount(location_codes, weights=(shots['is_goal'] == 1).to_numpy(),
+                        minlength=len(locations)).astype(np.int64)
+
+    # Resultados ausentes (NaN) não entram nas contagens, como em value_counts
+    valid = outcome_codes >= 0
+    pairs = location_codes[valid] * len(outcomes) + outcome_codes[valid]
+    shape = (len(locations), len(outcomes))
+    counts = np.bincount(pairs, minlength=shape[0] * shape[1]).reshape(shape)
+
+    first = np.full(shape[0] * shape[1], np.iinfo(np.int64).max, dtype=np.int64)
+    unique_pairs, first_positions = np.unique(pairs, return_index=True)
+    first[unique_pairs] = first_positions
+
+    return {'locations': np.asarray(locations), 'outcomes': np.asarray(outcomes),
+            'counts': counts, 'first': first.reshape(shape), 'goals': goals}
+
+
+def _situation_counts(counts: Dict[str, np.ndarray], rows: np.ndarray) -> pd.Series:
+    """Soma as contagens das localizações `rows` no formato de `count_shot_outcomes`."""
+    totals = counts['counts'][rows].sum(axis=0)
+    first = counts['first'][rows].min(axis=0, initial=np.iinfo(np.int64).max)
+    present = np.flatnonzero(totals > 0)
+    order = present[np.argsort(first[present], kind='stable')]
+
+    index = pd.Index(counts['outcomes'][order], name='shot_outcome')
+    return pd.Series(totals[order], index=index, name='count')
+
+
+def shots_from_counts(counts: Dict[str, np.ndarray], locations_inside: Optional[List[int]] = None,
+                      excluded_locations: Optional[List[int]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Calcula as estatísticas de gols e de chutes dentro e fora da área a partir das
+    contagens de `shot_location_counts`, com o mesmo resultado de `shots_summary`.
+
+    Args:
+        counts (Dict[str, np.ndarray]): Contagens geradas por `shot_location_counts`.
+        locations_inside (Optional[List[int]]): Localizações consideradas dentro da área.
+                                                Padrão: `LOCATIONS_INSIDE`.
+        excluded_locations (Optional[List[int]]): Localizações descartadas.
+                                                  Padrão: `EXCLUDED_LOCATIONS`.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: O resultado de `calculate_goals` e o de
+        `perc_shot_outcome`.
+
+    Raises:
+        TypeError: Se `counts` não for um dicionário.
+    """
+    # Tratamento de Erro
+    if not isinstance(counts, dict):
+        raise TypeError("O parâmetro 'counts' deve ser um dicionário.")
+
+    if locations_inside is None:
+        locations_inside = LOCATIONS_INSIDE
+    if excluded_locations is None:
+        excluded_locations = EXCLUDED_LOCATIONS
+
+    # Código Principal
+    kept = ~np.isin(counts['locations'], list(excluded_locations))
+    inside = kept & np.isin(counts['locations'], list(locations_inside))
+    outside = kept & ~inside
+
+    goals_inside = int(counts['goals'][inside].sum())
+    goals_outside = int(counts['goals'][outside].sum())
+    stats_goals = goals_percentages(goals_inside, goals_outside, goals_inside + goals_outside)
+
+    attempts = shot_outcome_count_from_counts(_situation_counts(counts, inside),
+                                              _situation_counts(counts, outside))
+
+    return stats_goals, shot_outcome_percentages(attempts)
+
+
+def headed_goal_gaps(df: pd.DataFrame, max_previous: int = 1) -> Dict[str, np.ndarray]:
+    """Guarda, para cada gol de cabeça, a diferença de tempo até cada um dos
+    `max_previous` eventos anteriores e o event_type desses eventos. Eventos de outra
+    partida (ou antes do início do dataset) são marcados como inválidos.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, na ordem original. Não é modificado.
+        max_previous (int): Maior número de eventos anteriores que será avaliado.
+
+    Returns:
+        Dict[str, np.ndarray]: Dicionário com matrizes gol x evento anterior (o mais
+        próximo primeiro):
+            - 'gaps': Diferença de tempo, em minutos, entre o gol e o evento anterior.
+            - 'types': event_type do evento anterior.
+            - 'valid': Se o evento anterior existe e é da mesma partida.
+        e com 'first_row', o número de gols de cabeça na primeira linha do dataset.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame ou `max_previous` não for um inteiro.
+        ValueError: Se `max_previous` não for positivo.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if not isinstance(max_previous, int):
+        raise TypeError("O parâmetro 'max_previous' deve ser um inteiro.")
+
+    if max_previous <= 0:
+        raise ValueError("O parâmetro 'max_previous' deve ser positivo.")
+
+    required_columns = ['id_odsp', 'time', 'event_type', 'is_goal', 'bodypart']
+    for colunm in required_columns:
+        if colunm not in df.columns:
+            raise KeyError(f"A coluna {colunm} não existe no DataFrame")
+
+    # Código Principal
+    headed = np.flatnonzero((df['is_goal'].to_numpy() == 1) & (df['bodypart'].to_numpy() == 3))
+    matches = df['id_odsp'].to_numpy()
+    times = df['time'].to_numpy(dtype=float)
+    event_types = df['event_type'].to_numpy()
+
+    previous = headed[:, None] - np.arange(1, max_previous + 1)
+    exists = previous >= 0
+    previous = np.where(exists, previous, 0)
+
+    return {'gaps': times[headed][:, None] - times[previous],
+            'types': event_types[previous],
+            'valid': exists & (matches[previous] == matches[headed][:, None]),
+            'first_row': int(headed.size > 0 and headed[0] == 0)}
+
+
+def head_from_gaps(gaps: Dict[str, np.ndarray], time_window: float = HEADER_TIME_WINDOW,
+                   previous_events: int = 1,
+                   set_pieces: Optional[List[int]] = None) -> pd.DataFrame:
+    """Calcula as porcentagens das origens dos gols de cabeça a partir das distâncias de
+    `headed_goal_gaps`. Um gol é contado se algum dos `previous_events` eventos
+    anteriores da mesma partida está dentro da janela de tempo; sua origem é o evento de
+    bola parada mais próximo entre eles, ou 'Outros' se não houver nenhum. Com
+    `previous_events` = 1, o resultado é igual ao de `head_summary`.
+
+    Args:
+        gaps (Dict[str, np.ndarray]): Distâncias geradas por `headed_goal_gaps`.
+        time_window (float): Diferença máxima, em minutos, entre o gol e o evento
+        anterior.
+        previous_events (int): Número de eventos anteriores avaliados. Não pode ser
+        maior que o `max_previous` de `gaps`.
+        set_pieces (Optional[List[int]]): event_type considerados bola parada, entre as
+        chaves de `ORIGIN_EVENT_TYPES`. Padrão: todas.
+
+    Returns:
+        pd.DataFrame: DataFrame no formato de origin_of_headed_goals.
+
+    Raises:
+        TypeError: Se `gaps` não for um dicionário ou `previous_events` não for um inteiro.
+        ValueError: Se `previous_events` estiver fora do intervalo disponível ou algum
+        event_type de `set_pieces` não estiver em `ORIGIN_EVENT_TYPES`.
+    """
+    # Tratamento de Erro
+    if not isinstance(gaps, dict):
+        raise TypeError("O parâmetro 'gaps' deve ser um dicionário.")
+
+    if not isinstance(previous_events, int):
+        raise TypeError("O parâmetro 'previous_events' deve ser um inteiro.")
+
+    if not 1 <= previous_events <= gaps['gaps'].shape[1]:
+        raise ValueError(f"O parâmetro 'previous_events' deve estar entre 1 e "
+                         f"{gaps['gaps'].shape[1]}.")
+
+    if set_pieces is None:
+        set_pieces = list(ORIGIN_EVENT_TYPES)
+
+    for event_type in set_pieces:
+        if event_type not in ORIGIN_EVENT_TYPES:
+            raise ValueError(f"O event_type {event_type} não é uma origem conhecida. "
+                             f"Origens: {list(ORIGIN_EVENT_TYPES)}")
+
+    # Código Principal
+    within = (gaps['valid'][:, :previous_events] &
+              (gaps['gaps'][:, :previous_events] <= time_window))
+    types = gaps['types'][:, :previous_events]
+    is_set_piece = within & np.isin(types, list(set_pieces))
+
+    has_set_piece = is_set_piece.any(axis=1)
+    nearest = is_set_piece.argmax(axis=1)
+    origin_types = types[has_set_piece, nearest[has_set_piece]]
+
+    counts = {origin: int((origin_types == event_type).sum())
+              for event_type, origin in ORIGIN_EVENT_TYPES.items()}
+    counts['others'] = (int(within.any(axis=1).sum()) - int(has_set_piece.sum()) +
+                        gaps['first_row'])
+
+    return origins_from_counts(counts)
+
+
+def sweep_shots(df: pd.DataFrame, grid: Grid) -> List[Tuple[Dict[str, Any], Tuple[pd.DataFrame, pd.DataFrame]]]:
+    """Avalia a hipótese dos chutes em cada ponto da grade, com uma única contagem dos
+    eventos.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos. Não é modificado.
+        grid (Grid): Pontos da grade, com os parâmetros 'locations_inside' e
+                     'excluded_locations'. Os ausentes usam os valores padrão de shots.py.
+
+    Returns:
+        List[Tuple[Dict[str, Any], Tuple[pd.DataFrame, pd.DataFrame]]]: Para cada ponto,
+        os parâmetros completos e o resultado de `shots_summary`.
+
+    Raises:
+        TypeError: Se `grid` não for uma lista de dicionários.
+        KeyError: Se algum parâmetro não existir.
+    """
+    # Tratamento de Erro
+    if not isinstance(grid, list):
+        raise TypeError("O parâmetro 'grid' deve ser uma lista.")
+
+    points = [_complete(params, SHOTS_PARAMETERS) for params in grid]
+
+    # Código Principal
+    counts = shot_location_counts(df)
+
+    return [(params, shots_from_counts(counts, **params)) for params in points]
+
+
+def sweep_head(df: pd.DataFrame, grid: Grid) -> List[Tuple[Dict[str, Any], pd.DataFrame]]:
+    """Avalia a hipótese dos gols de cabeça em cada ponto da grade, com uma única
+    leitura dos eventos anteriores aos gols.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, na ordem original. Não é modificado.
+        grid (Grid): Pontos da grade, com os parâmetros 'time_window',
+                     'previous_events' e 'set_pieces'. Os ausentes usam os valores
+                     padrão de head.py.
+
+    Returns:
+        List[Tuple[Dict[str, Any], pd.DataFrame]]: Para cada ponto, os parâmetros
+        completos e o resultado de `head_summary`.
+
+    Raises:
+        TypeError: Se `grid` não for uma lista de dicionários.
+        KeyError: Se algum parâmetro não existir.
+    """
+    # Tratamento de Erro
+    if not isinstance(grid, list):
+        raise TypeError("O parâmetro 'grid' deve ser uma lista.")
+
+    points = [_complete(params, HEAD_PARAMETERS) for params in grid]
+
+    # Código Principal
+    max_previous = max((params['previous_events'] for params in points), default=1)
+    gaps = headed_goal_gaps(df, max_previous)
+
+    return [(params, head_from_gaps(gaps, **params)) for params in points]
+
+
+def sensitivity_table(results: List[Tuple[Dict[str, Any], Any]]) -> pd.DataFrame:
+    """Resume uma varredura em uma tabela com uma linha por ponto da grade: os parâmetros
+    e a porcentagem que decide a hipótese (gols dentro da área, para os chutes, e gols de
+    bola parada, para os gols de cabeça).
+
+    Args:
+        results (List[Tuple[Dict[str, Any], Any]]): Resultado de `sweep_shots` ou de
+                                                    `sweep_head`.
+
+    Returns:
+        pd.DataFrame: Uma coluna por parâmetro (as listas viram tuplas) e a coluna
+        'Porcentagem'.
+
+    Raises:
+        TypeError: Se `results` não for uma lista.
+    """
+    # Tratamento de Erro
+    if not isinstance(results, list):
+        raise TypeError("O parâmetro 'results' deve ser uma lista.")
+
+    # Código Principal
+    rows = []
+    for params, result in results:
+        if isinstance(result, tuple):
+            stats_goals = result[0]
+            percentage = stats_goals.loc[stats_goals['Situação'] == 'Dentro da área', 'Porcentagem']
+        elif 'ORIGEM' in result.columns:
+            percentage = result.loc[result['ORIGEM'] == 'BOLA PARADA', 'PORCENTAGEM']
+        else:
+            # Sem gols de cabeça
+            percentage = pd.Series(dtype=float)
+
+        row = {name: tuple(value) if isinstance(value, list) else value
+               for name, value in params.items()}
+        row['Porcentagem'] = float(percentage.iloc[0]) if len(percentage) else np.nan
+        rows.append(row)
+
+    return pd.DataFrame(rows)
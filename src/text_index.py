@@ -0,0 +1,316 @@
+"""
+Este módulo cria um índice invertido da coluna 'text' (comentários dos lances), que é
+descartada por clean_data mas é a única forma de encontrar lances como "volley" ou
+"deflected". O texto é separado em termos uma única vez; para cada termo são guardadas as
+linhas (eventos) em que ele aparece, em ordem crescente e comprimidas (diferenças entre
+linhas consecutivas codificadas como varint), e as posições do termo em cada linha, usadas
+nas buscas por frases. O índice é salvo ao lado do arquivo de dados e devolve os números
+das linhas de eventos, que podem ser usados diretamente no DataFrame das hipóteses.
+
+Sintaxe das buscas: termos separados por espaços são combinados com E; 'OR' separa
+alternativas; '-termo' exclui eventos com o termo; "duas palavras" busca a frase exata.
+
+Funções
+-------
+tokenize(texts):
+    Separa cada texto em termos (minúsculos, sem pontuação).
+
+build_text_index(texts):
+    Cria o índice invertido de uma série de textos.
+
+save_text_index(index, path) / load_text_index(path):
+    Grava e lê o índice em disco.
+
+load_dataset_with_text_index(csv_path):
+    Carrega o dataset e o índice, criando o índice se ele não existir ou estiver velho.
+
+search(index, query):
+    Devolve as linhas que satisfazem a busca.
+
+search_events(index, df, query):
+    Devolve os eventos que satisfazem a busca.
+"""
+
+import os
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils import load_dataset
+
+TextIndex = Dict[str, Any]
+
+TOKEN_PATTERN = r"[^\W_]+"
+INDEX_SUFFIX = '.textidx.npz'
+
+
+def _varint_lengths(values: np.ndarray) -> np.ndarray:
+    """Número de bytes de cada valor codificado em varint."""
+    n_bytes = np.ones(values.size, dtype=np.int64)
+    for k in range(1, 10):
+        n_bytes += values >= np.uint64(1 << (7 * k))
+    return n_bytes
+
+
+def _encode_varint(values: np.ndarray) -> np.ndarray:
+    """Codifica inteiros não negativos em varint (7 bits por byte, bit 8 indica que o
+    número continua no próximo byte), de forma vetorizada."""
+    values = values.astype(np.uint64)
+    n_bytes = _varint_lengths(values)
+
+    starts = np.cumsum(n_bytes) - n_bytes
+    encoded = np.empty(int(n_bytes.sum()), dtype=np.uint8)
+    for k in range(int(n_bytes.max(initial=0))):
+        mask = n_bytes > k
+        chunk = (values[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        chunk |= np.where(n_bytes[mask] > k + 1, np.uint64(0x80), np.uint64(0))
+        encoded[starts[mask] + k] = chunk.astype(np.uint8)
+    return encoded
+
+
+def _decode_varint(encoded: np.ndarray) -> np.ndarray:
+    """Decodifica uma sequência de bytes gerada por `_encode_varint`."""
+    if encoded.size == 0:
+        return np.empty(0, dtype=np.int64)
+    ends = (encoded & 0x80) == 0
+    value_ids = np.concatenate([[0], np.cumsum(ends)[:-1]])
+    starts = np.flatnonzero(np.concatenate([[True], ends[:-1]]))
+    shifts = 7 * (np.arange(encoded.size) - starts[value_ids])
+    parts = (encoded & 0x7F).astype(np.uint64) << shifts.astype(np.uint64)
+    return np.add.reduceat(parts, starts).astype(np.int64)
+
+
+def tokenize(texts: pd.Series) -> pd.Series:
+    """Separa cada texto em termos minúsculos, descartando pontuação.
+
+    Args:
+        texts (pd.Series): Série de textos (valores ausentes viram listas vazias).
+
+    Returns:
+        pd.Series: Série de listas de termos, com o mesmo índice de `texts`.
+
+    Raises:
+        TypeError: Se `texts` não for uma pd.Series.
+    """
+    if not isinstance(texts, pd.Series):
+        raise TypeError("O parâmetro 'texts' deve ser uma pandas Series.")
+
+    return texts.fillna('').astype(str).str.lower().str.findall(TOKEN_PATTERN)
+
+
+def build_text_index(texts: pd.Series) -> TextIndex:
+    """Cria o índice invertido de uma série de textos. As linhas são as posições dos
+    textos na série (0, 1, 2, ...), isto é, as linhas do DataFrame de eventos.
+
+    Args:
+        texts (pd.Series): Coluna 'text' do DataFrame de eventos.
+
+    Returns:
+        TextIndex: Índice com o vocabulário, as linhas comprimidas de cada termo e as
+        posições de cada ocorrência.
+
+    Raises:
+        TypeError: Se `texts` não for uma pd.Series.
+    """
+    # Tratamento de Erro
+    if not isinstance(texts, pd.Series):
+        raise TypeError("O parâmetro 'texts' deve ser uma pandas Series.")
+
+    # Código Principal
+    tokens = tokenize(texts.reset_index(drop=True)).explode().dropna()
+    rows = tokens.index.to_numpy(dtype=np.int64)
+    positions = tokens.groupby(level=0).cumcount().to_numpy(dtype=np.int64)
+    term_ids, terms = pd.factorize(tokens.to_numpy(dtype=object), sort=True)
+
+    order = np.lexsort((positions, rows, term_ids))
+    term_ids, rows, positions = term_ids[order], rows[order], positions[order]
+
+    # A primeira linha de cada termo é guardada inteira e as demais como diferenças
+    posting_offsets = np.searchsorted(term_ids, np.arange(len(terms) + 1))
+    deltas = np.diff(rows, prepend=0)
+    deltas[posting_offsets[:-1]] = rows[posting_offsets[:-1]]
+
+    # Como cada varint termina em um byte sem o bit 8, os termos podem ser codificados
+    # juntos e lidos separadamente a partir de `byte_offsets`
+    value_ends = np.concatenate([[0], np.cumsum(_varint_lengths(deltas.astype(np.uint64)))])
+    byte_offsets = value_ends[posting_offsets]
+    encoded = _encode_varint(deltas)
+
+    max_position = int(positions.max(initial=0))
+    position_dtype = np.uint8 if max_position < 2 ** 8 else (
+        np.uint16 if max_position < 2 ** 16 else np.uint32)
+
+    return _with_lookup({
+        'terms': np.asarray(terms, dtype=str),
+        'byte_offsets': byte_offsets.astype(np.int64),
+        'posting_offsets': posting_offsets.astype(np.int64),
+        'rows': encoded,
+        'positions': positions.astype(position_dtype),
+        'n_rows': np.int64(texts.shape[0]),
+    })
+
+
+def _with_lookup(index: TextIndex) -> TextIndex:
+    index['lookup'] = {term: i for i, term in enumerate(index['terms'].tolist())}
+    return index
+
+
+def save_text_index(index: TextIndex, path: str) -> None:
+    """Grava o índice em um arquivo .npz.
+
+    Args:
+        index (TextIndex): Índice criado por `build_text_index`.
+        path (str): Caminho do arquivo.
+    """
+    arrays = {key: value for key, value in index.items() if key != 'lookup'}
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_text_index(path: str) -> TextIndex:
+    """Lê um índice gravado por `save_text_index`.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        TextIndex: O índice.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"O arquivo '{path}' não foi encontrado")
+
+    with np.load(path, allow_pickle=False) as data:
+        return _with_lookup({key: data[key] for key in data.files})
+
+
+def load_dataset_with_text_index(csv_path: str) -> Tuple[pd.DataFrame, TextIndex]:
+    """Carrega o dataset e o índice de textos salvo ao lado dele. O índice é criado
+    durante o carregamento se ainda não existir ou se for mais antigo que o CSV.
+
+    Args:
+        csv_path (str): Caminho do CSV de eventos.
+
+    Returns:
+        Tuple[pd.DataFrame, TextIndex]: O DataFrame de eventos e o índice.
+    """
+    df = load_dataset(csv_path)
+    index_path = csv_path + INDEX_SUFFIX
+
+    if (os.path.isfile(index_path) and
+            os.path.getmtime(index_path) >= os.path.getmtime(csv_path)):
+        index = load_text_index(index_path)
+        if int(index['n_rows']) == df.shape[0]:
+            return df, index
+
+    index = build_text_index(df['text'])
+    save_text_index(index, index_path)
+    return df, index
+
+
+def _postings(index: TextIndex, term: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Linhas e posições de um termo (vazias se o termo não existir)."""
+    term_id = index['lookup'].get(term)
+    if term_id is None:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    encoded = index['rows'][index['byte_offsets'][term_id]:index['byte_offsets'][term_id + 1]]
+    start, end = index['posting_offsets'][term_id], index['posting_offsets'][term_id + 1]
+    return np.cumsum(_decode_varint(encoded)), index['positions'][start:end].astype(np.int64)
+
+
+def _term_rows(index: TextIndex, term: str) -> np.ndarray:
+    return np.unique(_postings(index, term)[0])
+
+
+def _phrase_rows(index: TextIndex, words: List[str]) -> np.ndarray:
+    """Linhas em que os termos aparecem consecutivamente."""
+    if not words:
+        return np.empty(0, dtype=np.int64)
+    stride = np.int64(1 << 20)
+    rows, positions = _postings(index, words[0])
+    keys = rows * stride + positions
+    for offset, word in enumerate(words[1:], start=1):
+        next_rows, next_positions = _postings(index, word)
+        next_keys = next_rows * stride + next_positions - offset
+        keys = keys[np.isin(keys, next_keys)]
+    return np.unique(keys // stride)
+
+
+def search(index: TextIndex, query: str) -> np.ndarray:
+    """Devolve, em ordem crescente, as linhas de eventos que satisfazem a busca.
+
+    Args:
+        index (TextIndex): Índice criado por `build_text_index` ou `load_text_index`.
+        query (str): Busca, por exemplo 'volley OR "deflected shot" -missed'.
+
+    Returns:
+        np.ndarray: Números das linhas dos eventos encontrados.
+
+    Raises:
+        TypeError: Se `index` não for um dicionário ou `query` não for uma string.
+        ValueError: Se a busca não tiver nenhum termo positivo.
+    """
+    # Tratamento de Erro
+    if not isinstance(index, dict):
+        raise TypeError("O parâmetro 'index' deve ser um dicionário.")
+
+    if not isinstance(query, str):
+        raise TypeError("O parâmetro 'query' deve ser uma string.")
+
+    # Código Principal
+    result = np.empty(0, dtype=np.int64)
+    clauses = re.split(r'\s+OR\s+', query.strip())
+    for clause in clauses:
+        included, excluded = [], []
+        for phrase, word in re.findall(r'(-?"[^"]*")|(\S+)', clause):
+            item = phrase or word
+            if item == 'AND':
+                continue
+            negated = item.startswith('-')
+            words = re.findall(TOKEN_PATTERN, item.lower())
+            rows = _phrase_rows(index, words) if len(words) > 1 else (
+                _term_rows(index, words[0]) if words else None)
+            if rows is not None:
+                (excluded if negated else included).append(rows)
+
+        if not included:
+            raise ValueError("Cada alternativa da busca deve ter ao menos um termo positivo")
+
+        rows = included[0]
+        for other in included[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        for other in excluded:
+            rows = np.setdiff1d(rows, other, assume_unique=True)
+        result = np.union1d(result, rows)
+
+    return result
+
+
+def search_events(index: TextIndex, df: pd.DataFrame, query: str) -> pd.DataFrame:
+    """Devolve os eventos de `df` que satisfazem a busca, mantendo o índice original do
+    DataFrame para que o resultado possa ser combinado com as hipóteses.
+
+    Args:
+        index (TextIndex): Índice criado a partir de `df['text']`.
+        df (pd.DataFrame): DataFrame de eventos usado na criação do índice.
+        query (str): Busca (ver `search`).
+
+    Returns:
+        pd.DataFrame: Eventos encontrados.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        ValueError: Se `df` não tiver o mesmo número de linhas do índice.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if df.shape[0] != int(index['n_rows']):
+        raise ValueError("O DataFrame não corresponde ao índice de textos")
+
+    return df.iloc[search(index, query)]
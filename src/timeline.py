@@ -0,0 +1,313 @@
+"""
+Este módulo analisa a distribuição dos eventos ao longo das partidas, a partir da coluna
+'time' (minuto do evento). As contagens por (tipo de evento, lado, minuto) são feitas em
+uma única passada com `np.bincount`, e as janelas deslizantes, como "gols nos 10 minutos
+após um cartão vermelho", são calculadas com somas acumuladas por partida, sem percorrer
+novamente os eventos de cada janela. Os resultados alimentam um gráfico de barras no mesmo
+estilo dos gráficos das hipóteses.
+
+Funções
+-------
+minute_counts(df, n_minutes):
+    Conta os eventos de cada tipo, lado e minuto.
+
+minute_rates(df, series):
+    Calcula a média de eventos por partida em cada minuto, separada por lado.
+
+rates_by_interval(df, series, interval):
+    Agrupa as médias por intervalos de minutos, no formato do gráfico de barras.
+
+events_after(df, trigger_types, target, window):
+    Conta, para cada evento gatilho, os eventos de um tipo nos minutos seguintes.
+
+window_summary(after):
+    Resume as contagens de events_after para o time do gatilho e o adversário.
+
+graph_view(df, title):
+    Gera e salva o gráfico de barras das médias por intervalo.
+
+timeline_main(df, series, interval):
+    Função principal que calcula e exibe a distribuição de um tipo de evento.
+"""
+
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from utils import print_dataframe
+from writer import OUTPUT_DIR, save_figure
+
+# Os tipos de evento vão de 0 a 11 (dictionary.txt); os gols formam uma categoria extra
+N_EVENT_TYPES = 12
+GOAL_CATEGORY = N_EVENT_TYPES
+N_CATEGORIES = N_EVENT_TYPES + 1
+
+# Cartões vermelhos: segundo amarelo (5) e vermelho direto (6)
+RED_CARD_TYPES = [5, 6]
+
+# Nome de cada série -> categorias usadas em minute_counts
+SERIES = {'goals': [GOAL_CATEGORY], 'shots': [1], 'corners': [2], 'fouls': [3],
+          'yellow_cards': [4], 'red_cards': RED_CARD_TYPES}
+
+SERIES_LABELS = {'goals': 'Gols', 'shots': 'Chutes', 'corners': 'Escanteios',
+                 'fouls': 'Faltas', 'yellow_cards': 'Cartões amarelos',
+                 'red_cards': 'Cartões vermelhos'}
+
+
+def _check_events(df: pd.DataFrame) -> None:
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    required_columns = ['id_odsp', 'time', 'event_type', 'side', 'is_goal']
+    missing_columns = set(required_columns) - set(df.columns)
+    if missing_columns:
+        raise KeyError(f"As seguintes colunas não existem no DataFrame: {missing_columns}")
+
+
+def _categories(name: str) -> List[int]:
+    if name not in SERIES:
+        raise KeyError(f"A série '{name}' não existe. Séries disponíveis: {list(SERIES)}")
+    return SERIES[name]
+
+
+def _binned_events(df: pd.DataFrame) -> pd.DataFrame:
+    """Eventos com lado e minuto válidos, com o minuto como inteiro e os gols repetidos
+    na categoria GOAL_CATEGORY."""
+    valid = df['side'].isin([1, 2]) & df['time'].notna()
+    events = df.loc[valid, ['id_odsp', 'time', 'event_type', 'side', 'is_goal']]
+    events = events.assign(minute=events['time'].clip(lower=0).astype('int64'),
+                           category=events['event_type'].astype('int64'))
+    goals = events[(events['event_type'] == 1) & (events['is_goal'] == 1)]
+    return pd.concat([events, goals.assign(category=GOAL_CATEGORY)])
+
+
+def minute_counts(df: pd.DataFrame, n_minutes: Optional[int] = None) -> np.ndarray:
+    """Conta os eventos de cada categoria, lado e minuto com um único `np.bincount`.
+    Eventos sem lado ou sem minuto ('time' ausente) são ignorados.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        n_minutes (Optional[int]): Número de minutos. Padrão: o maior minuto + 1.
+
+    Returns:
+        np.ndarray: Array (categoria, lado, minuto), em que a categoria é o event_type
+        (0 a 11) ou GOAL_CATEGORY para gols e o lado é 0 (casa) ou 1 (visitante).
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+    """
+    # Tratamento de Erro
+    _check_events(df)
+
+    # Código Principal
+    events = _binned_events(df)
+    if n_minutes is None:
+        n_minutes = int(events['minute'].max()) + 1 if not events.empty else 1
+    events = events[events['minute'] < n_minutes]
+
+    codes = ((events['category'].to_numpy() * 2 + events['side'].to_numpy(dtype=np.int64) - 1)
+             * n_minutes + events['minute'].to_numpy())
+    counts = np.bincount(codes, minlength=N_CATEGORIES * 2 * n_minutes)
+    return counts.reshape(N_CATEGORIES, 2, n_minutes)
+
+
+def minute_rates(df: pd.DataFrame, series: Optional[List[str]] = None) -> pd.DataFrame:
+    """Calcula a média de eventos por partida em cada minuto, separada por lado.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        series (Optional[List[str]]): Nomes das séries (chaves de SERIES).
+                                      Padrão: 'goals', 'shots', 'corners' e 'fouls'.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado pelo minuto com as colunas '<série>_home' e
+        '<série>_away'.
+    """
+    if series is None:
+        series = ['goals', 'shots', 'corners', 'fouls']
+
+    counts = minute_counts(df)
+    n_matches = df['id_odsp'].nunique()
+    rates = pd.DataFrame(index=pd.RangeIndex(counts.shape[2], name='minute'))
+    for name in series:
+        categories = _categories(name)
+        rates[f'{name}_home'] = counts[categories, 0].sum(axis=0) / n_matches
+        rates[f'{name}_away'] = counts[categories, 1].sum(axis=0) / n_matches
+    return rates
+
+
+def rates_by_interval(df: pd.DataFrame, series: str = 'goals',
+                      interval: int = 15) -> pd.DataFrame:
+    """Agrupa as médias por partida de uma série em intervalos de minutos.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        series (str): Nome da série (chave de SERIES).
+        interval (int): Tamanho de cada intervalo, em minutos.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Intervalo', 'Casa' e 'Fora'.
+
+    Raises:
+        ValueError: Se `interval` não for positivo.
+    """
+    if interval <= 0:
+        raise ValueError("O parâmetro 'interval' deve ser positivo")
+
+    rates = minute_rates(df, [series])
+    groups = rates.index // interval
+    grouped = rates.groupby(groups).sum()
+    labels = [f'{start * interval}-{start * interval + interval - 1}' for start in grouped.index]
+
+    return pd.DataFrame({
+        'Intervalo': labels,
+        'Casa': grouped[f'{series}_home'].round(4).to_numpy(),
+        'Fora': grouped[f'{series}_away'].round(4).to_numpy(),
+    })
+
+
+def events_after(df: pd.DataFrame, trigger_types: Sequence[int] = RED_CARD_TYPES,
+                 target: str = 'goals', window: int = 10) -> pd.DataFrame:
+    """Conta, para cada evento gatilho (por padrão, cartões vermelhos), os eventos da
+    série `target` da mesma partida nos `window` minutos seguintes, isto é, nos minutos
+    (t, t + window] após o minuto t do gatilho. As contagens vêm de somas acumuladas
+    por partida, lado e minuto, com custo constante por gatilho.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        trigger_types (Sequence[int]): Tipos de evento (event_type) usados como gatilho.
+        target (str): Série contada após o gatilho (chave de SERIES).
+        window (int): Tamanho da janela, em minutos.
+
+    Returns:
+        pd.DataFrame: Uma linha por gatilho, com as colunas 'id_odsp', 'time', 'side',
+        'same_side' (eventos do time do gatilho) e 'opponent' (eventos do adversário).
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        KeyError: Se alguma coluna ou a série não existir.
+        ValueError: Se `window` não for positivo.
+    """
+    # Tratamento de Erro
+    _check_events(df)
+    categories = _categories(target)
+
+    if window <= 0:
+        raise ValueError("O parâmetro 'window' deve ser positivo")
+
+    # Código Principal
+    events = _binned_events(df)
+    match_codes, matches = pd.factorize(events['id_odsp'])
+    n_minutes = int(events['minute'].max()) + 1 if not events.empty else 1
+
+    sides = events['side'].to_numpy(dtype=np.int64) - 1
+    minutes = events['minute'].to_numpy()
+    selected = events['category'].isin(categories).to_numpy()
+    codes = (match_codes[selected] * 2 + sides[selected]) * n_minutes + minutes[selected]
+    counts = np.bincount(codes, minlength=len(matches) * 2 * n_minutes)
+    # cumulative[m, s, t + 1] = eventos da partida m e lado s até o minuto t
+    cumulative = np.zeros((len(matches), 2, n_minutes + 1), dtype=np.int64)
+    np.cumsum(counts.reshape(len(matches), 2, n_minutes), axis=2, out=cumulative[:, :, 1:])
+
+    is_trigger = events['category'].isin(list(trigger_types)).to_numpy()
+    trigger_match = match_codes[is_trigger]
+    trigger_side = sides[is_trigger]
+    start = minutes[is_trigger]
+    end = np.minimum(start + window, n_minutes - 1)
+
+    after = cumulative[trigger_match, :, end + 1] - cumulative[trigger_match, :, start + 1]
+    rows = np.arange(after.shape[0])
+    return pd.DataFrame({
+        'id_odsp': matches[trigger_match],
+        'time': events['time'].to_numpy()[is_trigger],
+        'side': trigger_side + 1,
+        'same_side': after[rows, trigger_side],
+        'opponent': after[rows, 1 - trigger_side],
+    })
+
+
+def window_summary(after: pd.DataFrame) -> pd.DataFrame:
+    """Resume as contagens de `events_after`: média de eventos por gatilho para o time
+    do gatilho e para o adversário.
+
+    Args:
+        after (pd.DataFrame): DataFrame gerado por `events_after`.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas 'Time', 'Média' e 'Total'.
+
+    Raises:
+        TypeError: Se `after` não for um pd.DataFrame.
+    """
+    if not isinstance(after, pd.DataFrame):
+        raise TypeError("O parâmetro 'after' deve ser um pandas DataFrame.")
+
+    return pd.DataFrame({
+        'Time': ['Time do gatilho', 'Adversário'],
+        'Média': [round(after['same_side'].mean(), 4), round(after['opponent'].mean(), 4)],
+        'Total': [int(after['same_side'].sum()), int(after['opponent'].sum())],
+    })
+
+
+def graph_view(df: pd.DataFrame, title: str, output_dir: str = OUTPUT_DIR) -> None:
+    """Gera e salva um gráfico de barras duplas com as médias por intervalo dos times da
+    casa e visitante.
+
+    Args:
+        df (pd.DataFrame): DataFrame gerado por `rates_by_interval`.
+        title (str): Título do gráfico.
+        output_dir (str): Diretório em que o gráfico é salvo.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame.
+        KeyError: Se a coluna 'Intervalo' não existir no DataFrame.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if 'Intervalo' not in df.columns:
+        raise KeyError("A coluna 'Intervalo' não existe no DataFrame.")
+
+    # Código principal
+    ax = df.set_index('Intervalo').plot.bar(title=title, color=['#3889ce', 'lightblue'])
+
+    ax.set_xlabel('Minutos', color='white')
+    ax.set_ylabel('Média por partida', color='white')
+    legend = ax.legend(title='Time', labels=['Casa', 'Fora'], facecolor='none',
+                       edgecolor='white')
+    plt.setp(legend.get_texts(), color='white')
+    plt.setp(legend.get_title(), color='white')
+
+    ax.tick_params(axis='x', colors='white')
+    ax.tick_params(axis='y', colors='white')
+
+    for spine in ax.spines.values():
+        spine.set_color('white')
+    ax.title.set_color('white')
+
+    save_figure(os.path.join(output_dir, 'graph_timeline.png'), format='png', dpi=300,
+                transparent=True, bbox_inches='tight')
+    plt.plot()
+
+
+def timeline_main(df: pd.DataFrame, series: str = 'goals', interval: int = 15) -> None:
+    """Função principal que calcula e exibe a distribuição de uma série ao longo das
+    partidas e os gols após cartões vermelhos.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        series (str): Nome da série (chave de SERIES).
+        interval (int): Tamanho de cada intervalo, em minutos.
+    """
+    by_interval = rates_by_interval(df, series, interval)
+    label = SERIES_LABELS[series]
+    print_dataframe(by_interval, f"{label.upper()} POR INTERVALO")
+    graph_view(by_interval, f'{label} por partida')
+
+    after = events_after(df, RED_CARD_TYPES, 'goals', 10)
+    print_dataframe(window_summary(after), "GOLS NOS 10 MINUTOS APÓS UM CARTÃO VERMELHO")
@@ -1,30 +1,208 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+import zipfile
+
 import pandas as pd
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
+
+# Tamanho de cada bloco descomprimido e número de blocos lidos à frente do parser
+READ_AHEAD_BLOCK_SIZE = 1 << 20
+READ_AHEAD_BLOCKS = 2
+
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+
+class _ReadAheadStream(io.RawIOBase):
+    """Arquivo somente leitura cujos blocos são lidos (e descomprimidos) por uma thread
+    em segundo plano, até READ_AHEAD_BLOCKS blocos à frente de quem consome o arquivo.
+    A descompressão libera o GIL, então ela ocorre em paralelo com o parser do CSV."""
+
+    def __init__(self, source):
+        super().__init__()
+        self._source = source
+        self._blocks = queue.Queue(maxsize=READ_AHEAD_BLOCKS)
+        self._closing = threading.Event()
+        self._pending = memoryview(b'')
+        self._finished = False
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Entrega um item à fila, desistindo se o arquivo for fechado."""
+        while not self._closing.is_set():
+            try:
+                self._blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        """Laço da thread: lê os blocos até o fim do arquivo ou até ele ser fechado."""
+        try:
+            while True:
+                block = self._source.read(READ_AHEAD_BLOCK_SIZE)
+                if not self._put(block) or not block:
+                    return
+        except Exception as error:
+            self._put(error)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._finished:
+            item = self._blocks.get()
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            if not item:
+                self._finished = True
+            self._pending = memoryview(item)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._closing.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def _archive_member(archive: zipfile.ZipFile, csv_path: str) -> str:
+    """Escolhe o CSV a ser lido de um arquivo zip: events.csv, se existir, ou o único
+    CSV do arquivo."""
+    names = [name for name in archive.namelist() if name.lower().endswith('.csv')]
+    for name in names:
+        if os.path.basename(name) == 'events.csv':
+            return name
+    if len(names) != 1:
+        raise ValueError(f"O arquivo '{csv_path}' deve conter events.csv ou um único CSV")
+    return names[0]
+
+
+def open_compressed(csv_path: str) -> io.BufferedReader:
+    """Abre um CSV comprimido (.gz, .bz2 ou .xz) ou dentro de um arquivo .zip, com a
+    descompressão feita em segundo plano por `_ReadAheadStream`.
+
+    Args:
+        csv_path (str): Caminho do arquivo comprimido.
 
-def load_dataset(csv_path):
+    Returns:
+        io.BufferedReader: O conteúdo descomprimido. Deve ser fechado por quem o abriu.
+
+    Raises:
+        ValueError: Se a extensão não for suportada, ou o zip não tiver um CSV a ler.
     """
-    Carrega o dataset de eventos de futebol a partir de um arquivo CSV especificado
+    extension = os.path.splitext(csv_path)[1].lower()
+    if extension == '.zip':
+        archive = zipfile.ZipFile(csv_path)
+        try:
+            source = archive.open(_archive_member(archive, csv_path))
+        finally:
+            # O membro aberto continua legível depois que o ZipFile é fechado
+            archive.close()
+    elif extension in COMPRESSED_OPENERS:
+        source = COMPRESSED_OPENERS[extension](csv_path, 'rb')
+    else:
+        raise ValueError(f"A extensão '{extension}' não é suportada")
+
+    return io.BufferedReader(_ReadAheadStream(source), buffer_size=READ_AHEAD_BLOCK_SIZE)
+
+
+def load_dataset(csv_path, chunksize: Optional[int] = None,
+                 usecols: Optional[List[str]] = None):
+    """
+    Carrega o dataset de eventos de futebol a partir de um arquivo CSV especificado.
+    Arquivos .zip (com events.csv ou um único CSV), .gz, .bz2 e .xz são descomprimidos
+    em segundo plano, em paralelo com a leitura do CSV
 
     Args:
         csv_path (str): Caminho para o arquivo CSV contendo o dataset
+        chunksize (Optional[int]): Se informado, o arquivo é lido em pedaços com esse
+        número de linhas
+        usecols (Optional[List[str]]): Se informado, apenas essas colunas são lidas
 
     Returns:
-        pandas.DataFrame: Um DataFrame contendo todos os dados carregados do arquivo CSV
+        pandas.DataFrame: Um DataFrame contendo todos os dados carregados do arquivo CSV,
+        ou um iterador de DataFrames com até `chunksize` linhas cada
 
     Raises:
         TypeError: Se `csv_path` não for uma string
         FileNotFoundError: Se o arquivo CSV não for encontrado
+        ValueError: Se um arquivo .zip não contiver events.csv nem um único CSV
     """
     # Tratamento de Erro
     if not isinstance(csv_path, str):
         raise TypeError("O parâmetro 'csv_path' deve ser uma string")
     
     # Código Principal
+    extension = os.path.splitext(csv_path)[1].lower()
     try:
-        return pd.read_csv(csv_path)
+        if extension != '.zip' and extension not in COMPRESSED_OPENERS:
+            return pd.read_csv(csv_path, chunksize=chunksize, usecols=usecols)
+        stream = open_compressed(csv_path)
     except FileNotFoundError:
         raise FileNotFoundError(f"O arquivo '{csv_path}' não foi encontrado")
 
+    if chunksize is not None:
+        # O leitor em pedaços lê o arquivo aos poucos; a thread termina no fim do arquivo
+        return pd.read_csv(stream, chunksize=chunksize, usecols=usecols)
+
+    with stream:
+        return pd.read_csv(stream, usecols=usecols)
+
+
+def load_dictionary(path: str) -> Dict[str, Dict[int, str]]:
+    """Lê o arquivo dictionary.txt, que descreve os códigos de cada coluna codificada de
+    events.csv. O arquivo é formado por seções separadas por linhas em branco, cada uma
+    com o nome da coluna seguido de linhas "código<TAB>descrição".
+
+    Args:
+        path (str): Caminho para o arquivo dictionary.txt
+
+    Returns:
+        Dict[str, Dict[int, str]]: Dicionário {coluna: {código: descrição}}
+
+    Raises:
+        TypeError: Se `path` não for uma string
+        FileNotFoundError: Se o arquivo não for encontrado
+    """
+    # Tratamento de Erro
+    if not isinstance(path, str):
+        raise TypeError("O parâmetro 'path' deve ser uma string")
+
+    # Código Principal
+    try:
+        with open(path, encoding='utf-8') as file:
+            lines = file.read().splitlines()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"O arquivo '{path}' não foi encontrado")
+
+    dictionary = {}
+    column = None
+    for line in lines:
+        line = line.strip()
+        if not line:
+            column = None
+        elif column is None:
+            column = line
+            dictionary[column] = {}
+        else:
+            code, description = line.split('\t', 1)
+            dictionary[column][int(code)] = description.strip()
+
+    return dictionary
+
 
 def remove_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
     """Remove colunas de um DataFrame
@@ -0,0 +1,180 @@
+"""
+Este módulo verifica a integridade do DataFrame de eventos antes das análises. Códigos
+inválidos e eventos fora de ordem não geram erros nas hipóteses, mas corrompem os
+resultados: uma 'location' fora de 1 a 19 é contada como "fora da área" em shots.py, e
+eventos fora de ordem quebram a regra do evento anterior de head.py.
+
+Todas as verificações são vetorizadas (máscaras de intervalo, `isin` e `duplicated`, que
+usam tabelas hash, e `np.diff`), de modo que a validação pode ficar ligada a cada carga.
+
+Verificações
+------------
+codes: colunas codificadas só contêm os códigos de dictionary.txt (ou valores ausentes).
+binary: 'is_goal' e 'fast_break' só contêm 0 e 1 (sem valores ausentes).
+id_event_unique: 'id_event' não se repete.
+match_contiguous: os eventos de cada partida são consecutivos.
+sort_order_monotonic: 'sort_order' é crescente dentro de cada partida.
+time_range: 'time' está presente e entre TIME_RANGE.
+goal_is_shot: todo gol ('is_goal' = 1) é um chute ('event_type' = 1).
+goal_on_target: todo gol com 'shot_outcome' tem 'shot_outcome' = 1 (no alvo).
+
+Funções
+-------
+code_violations(df, dictionary):
+    Marca os valores das colunas codificadas que não existem em dictionary.txt.
+
+validate_events(df, dictionary):
+    Executa todas as verificações e devolve o relatório de violações.
+
+check_events(df, dictionary):
+    Executa as verificações e levanta um erro se houver violações.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Intervalo aceito para 'time', em minutos (inclui acréscimos e prorrogação)
+TIME_RANGE = (0, 130)
+
+BINARY_COLUMNS = ['is_goal', 'fast_break']
+
+# Número de linhas de exemplo guardadas para cada verificação
+N_EXAMPLES = 5
+
+
+def _code_mask(values: pd.Series, codes: List[int], allow_missing: bool = True) -> np.ndarray:
+    """Máscara dos valores que não estão em `codes`. Códigos contíguos, como os de
+    'location', são verificados com uma máscara de intervalo."""
+    present = values.notna().to_numpy() if allow_missing else np.ones(len(values), dtype=bool)
+    lowest, highest = min(codes), max(codes)
+    if highest - lowest + 1 == len(set(codes)) and pd.api.types.is_numeric_dtype(values):
+        numbers = values.to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            valid = (numbers >= lowest) & (numbers <= highest) & (numbers == np.floor(numbers))
+    else:
+        valid = values.isin(codes).to_numpy()
+    return present & ~valid
+
+
+def code_violations(df: pd.DataFrame,
+                    dictionary: Dict[str, Dict[int, str]]) -> Dict[str, np.ndarray]:
+    """Marca, em cada coluna codificada de `df`, os valores que não existem em
+    dictionary.txt. Colunas do dicionário ausentes em `df` são ignoradas.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        dictionary (Dict[str, Dict[int, str]]): Códigos lidos por `load_dictionary`.
+
+    Returns:
+        Dict[str, np.ndarray]: Máscara de valores inválidos de cada coluna codificada
+        (incluindo as colunas binárias).
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame ou `dictionary` não for um dicionário.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if not isinstance(dictionary, dict):
+        raise TypeError("O parâmetro 'dictionary' deve ser um dicionário.")
+
+    # Código Principal
+    masks = {column: _code_mask(df[column], list(codes))
+             for column, codes in dictionary.items() if column in df.columns}
+    for column in BINARY_COLUMNS:
+        if column in df.columns:
+            masks[column] = _code_mask(df[column], [0, 1], allow_missing=False)
+    return masks
+
+
+def validate_events(df: pd.DataFrame, dictionary: Dict[str, Dict[int, str]],
+                    time_range: Optional[tuple] = None) -> pd.DataFrame:
+    """Executa todas as verificações de integridade. Verificações que dependem de colunas
+    ausentes em `df` são ignoradas.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, na ordem do arquivo.
+        dictionary (Dict[str, Dict[int, str]]): Códigos lidos por `load_dictionary`.
+        time_range (Optional[tuple]): Intervalo aceito para 'time'. Padrão: `TIME_RANGE`.
+
+    Returns:
+        pd.DataFrame: Relatório com uma linha por verificação e as colunas 'check',
+        'column', 'violations' (número de linhas inválidas) e 'examples' (índices de até
+        N_EXAMPLES linhas inválidas).
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame ou `dictionary` não for um dicionário.
+    """
+    if time_range is None:
+        time_range = TIME_RANGE
+
+    checks = [('codes' if column not in BINARY_COLUMNS else 'binary', column, mask)
+              for column, mask in code_violations(df, dictionary).items()]
+    columns = set(df.columns)
+
+    if 'id_event' in columns:
+        checks.append(('id_event_unique', 'id_event',
+                       df['id_event'].duplicated(keep=False).to_numpy()))
+
+    if 'id_odsp' in columns:
+        # Uma partida que reaparece depois de outra começa um novo bloco
+        match_codes, _ = pd.factorize(df['id_odsp'])
+        starts = np.flatnonzero(np.diff(match_codes, prepend=-1) != 0)
+        seen_before = pd.Series(match_codes[starts]).duplicated().to_numpy()
+        mask = np.zeros(df.shape[0], dtype=bool)
+        mask[starts[seen_before]] = True
+        checks.append(('match_contiguous', 'id_odsp', mask))
+
+        if 'sort_order' in columns:
+            same_match = np.diff(match_codes) == 0
+            not_increasing = np.diff(df['sort_order'].to_numpy(dtype=float)) <= 0
+            mask = np.concatenate([[False], same_match & not_increasing])
+            checks.append(('sort_order_monotonic', 'sort_order', mask))
+
+    if 'time' in columns:
+        times = df['time'].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            mask = np.isnan(times) | (times < time_range[0]) | (times > time_range[1])
+        checks.append(('time_range', 'time', mask))
+
+    if {'is_goal', 'event_type'} <= columns:
+        goals = (df['is_goal'] == 1).to_numpy()
+        checks.append(('goal_is_shot', 'is_goal', goals & (df['event_type'] != 1).to_numpy()))
+
+        if 'shot_outcome' in columns:
+            outcome = df['shot_outcome']
+            mask = goals & (outcome.notna() & (outcome != 1)).to_numpy()
+            checks.append(('goal_on_target', 'shot_outcome', mask))
+
+    index = df.index.to_numpy()
+    return pd.DataFrame({
+        'check': [check for check, _, _ in checks],
+        'column': [column for _, column, _ in checks],
+        'violations': [int(mask.sum()) for _, _, mask in checks],
+        'examples': [index[np.flatnonzero(mask)[:N_EXAMPLES]].tolist() for _, _, mask in checks],
+    })
+
+
+def check_events(df: pd.DataFrame, dictionary: Dict[str, Dict[int, str]]) -> pd.DataFrame:
+    """Executa as verificações de `validate_events` e levanta um erro se alguma falhar.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos.
+        dictionary (Dict[str, Dict[int, str]]): Códigos lidos por `load_dictionary`.
+
+    Returns:
+        pd.DataFrame: O relatório, se não houver violações.
+
+    Raises:
+        ValueError: Se alguma verificação encontrar violações.
+    """
+    report = validate_events(df, dictionary)
+    failed = report[report['violations'] > 0]
+    if not failed.empty:
+        details = ', '.join(f"{check} ({column}: {violations})" for check, column, violations
+                            in failed[['check', 'column', 'violations']].itertuples(index=False))
+        raise ValueError(f"O DataFrame de eventos tem violações de integridade: {details}")
+    return report
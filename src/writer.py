@@ -0,0 +1,297 @@
+"""
+Este módulo grava os arquivos produzidos pela análise (os eventos limpos e os gráficos)
+sem bloquear as hipóteses e sem que execuções simultâneas sobrescrevam os arquivos umas
+das outras. Cada arquivo é escrito em um arquivo temporário no mesmo diretório e
+publicado com `os.replace`, que é atômico: quem lê o caminho final vê o arquivo antigo
+ou o novo completo, nunca um arquivo pela metade. Cada execução de main.py grava em um
+diretório próprio, criado por `run_output_dir`; ao final, os arquivos da execução são
+publicados em ../data (`publish_latest`), onde o relatório e os testes os procuram, e só
+os diretórios das `KEEP_RUNS` execuções mais recentes são mantidos (`prune_runs`).
+
+Os CSVs grandes podem ser gravados em segundo plano (`write_in_background`), comprimidos
+(.gz, .bz2 ou .xz, pela extensão do caminho) e divididos em blocos serializados e
+comprimidos em paralelo. Os blocos são concatenados no mesmo arquivo: um CSV só com o
+cabeçalho do primeiro bloco, ou uma sequência de fluxos comprimidos, que gzip, bz2 e xz
+leem como um único arquivo (e que `load_dataset` também lê).
+
+Funções
+-------
+run_output_dir(base):
+    Cria o diretório de saída de uma execução.
+
+atomic_output(path):
+    Gerenciador de contexto que publica um arquivo atomicamente.
+
+write_csv(df, path, blocks):
+    Grava um DataFrame em CSV, opcionalmente comprimido e em blocos paralelos.
+
+write_in_background(df, path, blocks):
+    Grava um DataFrame em segundo plano.
+
+wait_for_writes():
+    Espera as gravações em segundo plano terminarem.
+
+save_figure(path, **kwargs):
+    Salva a figura atual do matplotlib atomicamente.
+
+publish_latest(run_dir, target):
+    Publica os arquivos de uma execução no diretório de saída.
+
+prune_runs(base, keep):
+    Remove os diretórios das execuções mais antigas.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+OUTPUT_DIR = "../data"
+RUNS_DIR = "../data/runs"
+
+# Número de gravações em segundo plano simultâneas
+BACKGROUND_WORKERS = 2
+
+# Número de diretórios de execução mantidos em RUNS_DIR
+KEEP_RUNS = 5
+
+COMPRESSORS = {'.gz': gzip.compress, '.bz2': bz2.compress, '.xz': lzma.compress}
+
+_executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS,
+                               thread_name_prefix='writer')
+_pending: List[Future] = []
+
+
+def run_output_dir(base: str = RUNS_DIR) -> str:
+    """Cria um diretório de saída exclusivo para uma execução, nomeado pela data, hora
+    e processo (por exemplo, '20240131-142501-1234').
+
+    Args:
+        base (str): Diretório em que os diretórios das execuções são criados.
+
+    Returns:
+        str: Caminho do diretório criado.
+
+    Raises:
+        TypeError: Se `base` não for uma string.
+    """
+    if not isinstance(base, str):
+        raise TypeError("O parâmetro 'base' deve ser uma string")
+
+    os.makedirs(base, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    path = os.path.join(base, name)
+    suffix = 0
+    while True:
+        try:
+            os.mkdir(path)
+            return path
+        except FileExistsError:
+            suffix += 1
+            path = os.path.join(base, f'{name}-{suffix}')
+
+
+@contextmanager
+def atomic_output(path: str) -> Iterator[str]:
+    """Entrega um caminho temporário no diretório de `path` e, se o bloco terminar sem
+    erros, o renomeia para `path`. Em caso de erro, o arquivo temporário é removido e
+    `path` não é alterado.
+
+    Args:
+        path (str): Caminho final do arquivo.
+
+    Yields:
+        str: Caminho temporário em que o arquivo deve ser escrito.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Nome exclusivo por processo e thread, como os temporários de cache.py
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _serialize_block(df: pd.DataFrame, header: bool, compress) -> bytes:
+    """Serializa um bloco em CSV e o comprime, se for o caso."""
+    data = df.to_csv(index=False, header=header).encode('utf-8')
+    return compress(data) if compress is not None else data
+
+
+def write_csv(df: pd.DataFrame, path: str, blocks: int = 1) -> str:
+    """Grava `df` em CSV, sem o índice, e publica o arquivo atomicamente. A compressão é
+    escolhida pela extensão de `path` (.gz, .bz2 ou .xz). Com `blocks` > 1, os blocos de
+    linhas são serializados e comprimidos em paralelo e gravados em ordem no mesmo
+    arquivo.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser gravado. Não deve ser modificado durante a
+                           gravação.
+        path (str): Caminho final do arquivo.
+        blocks (int): Número de blocos gravados em paralelo.
+
+    Returns:
+        str: O caminho final do arquivo.
+
+    Raises:
+        TypeError: Se `df` não for um pd.DataFrame ou `blocks` não for um inteiro.
+        ValueError: Se `blocks` não for positivo.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if not isinstance(blocks, int):
+        raise TypeError("O parâmetro 'blocks' deve ser um inteiro")
+
+    if blocks <= 0:
+        raise ValueError("O parâmetro 'blocks' deve ser positivo")
+
+    # Código Principal
+    compress = COMPRESSORS.get(os.path.splitext(path)[1].lower())
+    with atomic_output(path) as tmp_path:
+        if blocks == 1 and compress is None:
+            df.to_csv(tmp_path, index=False)
+            return path
+
+        size = -(-df.shape[0] // blocks) or 1
+        parts = [df.iloc[start:start + size] for start in range(0, max(df.shape[0], 1), size)]
+        with ThreadPoolExecutor(max_workers=blocks) as executor, open(tmp_path, 'wb') as file:
+            serialized = executor.map(_serialize_block, parts,
+                                      [index == 0 for index in range(len(parts))],
+                                      [compress] * len(parts))
+            for data in serialized:
+                file.write(data)
+    return path
+
+
+def write_in_background(df: pd.DataFrame, path: str, blocks: int = 1) -> Future:
+    """Agenda a gravação de `df` com `write_csv` em uma thread em segundo plano.
+
+    Args:
+        df (pd.DataFrame): DataFrame a ser gravado. Não deve ser modificado até a
+                           gravação terminar.
+        path (str): Caminho final do arquivo.
+        blocks (int): Número de blocos gravados em paralelo.
+
+    Returns:
+        Future: Resultado da gravação (o caminho final), também acompanhado por
+        `wait_for_writes`.
+    """
+    future = _executor.submit(write_csv, df, path, blocks)
+    _pending.append(future)
+    return future
+
+
+def wait_for_writes() -> List[str]:
+    """Espera todas as gravações agendadas por `write_in_background` terminarem.
+
+    Returns:
+        List[str]: Os caminhos gravados, na ordem em que foram agendados.
+
+    Raises:
+        Exception: O primeiro erro ocorrido em alguma das gravações, levantado depois que
+        todas terminarem.
+    """
+    futures = list(_pending)
+    _pending.clear()
+    wait(futures)
+
+    for future in futures:
+        if future.exception() is not None:
+            raise future.exception()
+    return [future.result() for future in futures]
+
+
+def save_figure(path: str, **kwargs) -> str:
+    """Salva a figura atual do matplotlib em `path` e a publica atomicamente.
+
+    Args:
+        path (str): Caminho final da imagem. O formato é dado por `kwargs['format']`,
+                    ou pela extensão de `path`.
+        **kwargs: Argumentos repassados para `plt.savefig`.
+
+    Returns:
+        str: O caminho final da imagem.
+    """
+    kwargs.setdefault('format', os.path.splitext(path)[1].lstrip('.') or 'png')
+    with atomic_output(path) as tmp_path:
+        plt.savefig(tmp_path, **kwargs)
+    return path
+
+
+def publish_latest(run_dir: str, target: str = OUTPUT_DIR) -> List[str]:
+    """Publica em `target` os arquivos gravados em `run_dir`, cada um atomicamente, de
+    modo que `target` tenha sempre os arquivos da execução mais recente. Sempre que
+    possível, o arquivo publicado é um link para o da execução, sem cópia.
+
+    Args:
+        run_dir (str): Diretório da execução, criado por `run_output_dir`.
+        target (str): Diretório em que os arquivos são publicados.
+
+    Returns:
+        List[str]: Os caminhos publicados.
+
+    Raises:
+        FileNotFoundError: Se `run_dir` não existir.
+    """
+    published = []
+    for name in sorted(os.listdir(run_dir)):
+        source = os.path.join(run_dir, name)
+        if not os.path.isfile(source):
+            continue
+
+        path = os.path.join(target, name)
+        with atomic_output(path) as tmp_path:
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                shutil.copyfile(source, tmp_path)
+        published.append(path)
+    return published
+
+
+def prune_runs(base: str = RUNS_DIR, keep: int = KEEP_RUNS) -> List[str]:
+    """Remove os diretórios de execução mais antigos de `base`, mantendo os `keep` mais
+    recentes. Os nomes criados por `run_output_dir` começam pela data e hora, então a
+    ordem alfabética é a ordem das execuções.
+
+    Args:
+        base (str): Diretório com os diretórios das execuções.
+        keep (int): Número de execuções mantidas.
+
+    Returns:
+        List[str]: Os diretórios removidos.
+
+    Raises:
+        TypeError: Se `keep` não for um inteiro.
+        ValueError: Se `keep` for negativo.
+    """
+    # Tratamento de Erro
+    if not isinstance(keep, int):
+        raise TypeError("O parâmetro 'keep' deve ser um inteiro")
+
+    if keep < 0:
+        raise ValueError("O parâmetro 'keep' não pode ser negativo")
+
+    # Código Principal
+    if not os.path.isdir(base):
+        return []
+
+    runs = sorted(name for name in os.listdir(base) if os.path.isdir(os.path.join(base, name)))
+    removed = [os.path.join(base, name) for name in runs[:max(len(runs) - keep, 0)]]
+    for path in removed:
+        shutil.rmtree(path, ignore_errors=True)
+    return removed
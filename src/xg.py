@@ -0,0 +1,274 @@
+"""
+Este módulo estima a qualidade de cada chute (gols esperados, ou xG) com uma regressão
+logística. A hipótese 3 de shots.py compara a conversão média dentro e fora da área; o
+xG dá a probabilidade de gol de cada chute a partir de 'location', 'bodypart',
+'assist_method', 'situation' e 'fast_break'.
+
+As colunas são codificadas em one-hot em uma única matriz (uma coluna por código de
+dictionary.txt, mais o intercepto). O modelo é ajustado por IRLS (Newton-Raphson) com
+penalização L2: cada iteração é um produto de matrizes sobre todos os chutes e a solução
+de um sistema do tamanho do número de colunas, de modo que o ajuste sobre todos os
+chutes leva poucos segundos. A pontuação é um único produto matriz-vetor.
+
+Os pesos são gravados em XG_MODEL_PATH, junto com a impressão digital do dataset usado
+no ajuste (ver cache.dataset_fingerprint), e `load_or_fit_xg` só ajusta o modelo quando
+o arquivo não existe ou foi ajustado sobre outro dataset.
+
+Funções
+-------
+shot_features(df, feature_codes):
+    Codifica as colunas dos chutes em uma matriz one-hot.
+
+fit_xg(df, l2, max_iter, tol):
+    Ajusta o modelo de xG sobre os chutes de `df`.
+
+predict_xg(model, df):
+    Calcula o xG de cada chute de `df`.
+
+save_xg_model(model, path):
+    Grava o modelo em um arquivo .npz.
+
+load_xg_model(path):
+    Lê um modelo gravado por `save_xg_model`.
+
+load_or_fit_xg(df, path, fingerprint):
+    Lê o modelo gravado ou o ajusta e grava, se o arquivo não existir ou for de outro
+    dataset.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+XG_MODEL_PATH = "../data/xg_model.npz"
+
+# Códigos de cada coluna usada pelo modelo, como em dictionary.txt
+FEATURE_CODES = {
+    'location': list(range(1, 20)),
+    'bodypart': [1, 2, 3],
+    'assist_method': [0, 1, 2, 3, 4],
+    'situation': [1, 2, 3, 4],
+    'fast_break': [0, 1],
+}
+
+XGModel = Dict[str, Any]
+
+
+def _shots(df: pd.DataFrame) -> pd.DataFrame:
+    """Seleciona os chutes (event_type 1) de um DataFrame de eventos."""
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if 'event_type' not in df.columns:
+        raise KeyError("A coluna event_type não existe no DataFrame")
+
+    return df[(df['event_type'] == 1).to_numpy()]
+
+
+def shot_features(df: pd.DataFrame,
+                  feature_codes: Optional[Dict[str, List[int]]] = None
+                  ) -> Tuple[np.ndarray, List[str]]:
+    """Codifica as colunas de `df` em uma matriz one-hot, com o intercepto na primeira
+    coluna. Valores ausentes ou fora dos códigos conhecidos ficam com todas as colunas
+    da variável zeradas.
+
+    Args:
+        df (pd.DataFrame): DataFrame de chutes.
+        feature_codes (Optional[Dict[str, List[int]]]): Códigos de cada coluna.
+                                                        Padrão: `FEATURE_CODES`.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: A matriz (chutes x colunas) e o nome de cada coluna,
+        no formato 'coluna=código'.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas de `feature_codes` não existir em `df`.
+    """
+    # Tratamento de Erro
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("O parâmetro 'df' deve ser um pandas DataFrame.")
+
+    if feature_codes is None:
+        feature_codes = FEATURE_CODES
+
+    for column in feature_codes:
+        if column not in df.columns:
+            raise KeyError(f"A coluna {column} não existe no DataFrame")
+
+    # Código Principal
+    names = ['intercept'] + [f'{column}={code}' for column, codes in feature_codes.items()
+                             for code in codes]
+    features = np.zeros((df.shape[0], len(names)))
+    features[:, 0] = 1.0
+
+    rows = np.arange(df.shape[0])
+    offset = 1
+    for column, codes in feature_codes.items():
+        codes = np.asarray(codes, dtype=float)
+        values = df[column].to_numpy(dtype=float)
+        positions = np.minimum(np.searchsorted(codes, values), len(codes) - 1)
+        known = codes[positions] == values
+        features[rows[known], offset + positions[known]] = 1.0
+        offset += len(codes)
+
+    return features, names
+
+
+def fit_xg(df: pd.DataFrame, l2: float = 1.0, max_iter: int = 25,
+           tol: float = 1e-8) -> XGModel:
+    """Ajusta a regressão logística de xG sobre os chutes de `df` por IRLS, com
+    penalização L2 em todos os pesos exceto o intercepto.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, com as colunas de `FEATURE_CODES` e
+                           'is_goal'.
+        l2 (float): Peso da penalização L2. Mantém o sistema invertível quando algum
+                    código não aparece nos chutes.
+        max_iter (int): Número máximo de iterações.
+        tol (float): O ajuste termina quando o maior passo for menor que `tol`.
+
+    Returns:
+        XGModel: Dicionário com 'weights', 'feature_names', 'feature_codes',
+        'n_shots', 'iterations', 'log_loss' e 'fingerprint' (o dataset do ajuste,
+        preenchido por `load_or_fit_xg`).
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas necessárias não existir em `df`.
+        ValueError: Se `df` não tiver chutes ou `l2` for negativo.
+    """
+    # Tratamento de Erro
+    shots = _shots(df)
+    if 'is_goal' not in shots.columns:
+        raise KeyError("A coluna is_goal não existe no DataFrame")
+
+    if shots.empty:
+        raise ValueError("O DataFrame não tem chutes para ajustar o modelo.")
+
+    if l2 < 0:
+        raise ValueError("O parâmetro 'l2' não pode ser negativo.")
+
+    # Código Principal
+    features, names = shot_features(shots)
+    goals = (shots['is_goal'] == 1).to_numpy(dtype=float)
+
+    penalty = np.full(len(names), float(l2))
+    penalty[0] = 0.0
+    weights = np.zeros(len(names))
+    weights[0] = np.log((goals.sum() + 0.5) / (len(goals) - goals.sum() + 0.5))
+
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        probabilities = 1.0 / (1.0 + np.exp(-(features @ weights)))
+        gradient = features.T @ (goals - probabilities) - penalty * weights
+        hessian = features.T @ (features * (probabilities * (1.0 - probabilities))[:, None])
+        hessian[np.diag_indices_from(hessian)] += penalty + 1e-12
+        step = np.linalg.solve(hessian, gradient)
+        weights += step
+        if np.abs(step).max() < tol:
+            break
+
+    probabilities = np.clip(1.0 / (1.0 + np.exp(-(features @ weights))), 1e-15, 1 - 1e-15)
+    log_loss = -np.mean(goals * np.log(probabilities) + (1 - goals) * np.log(1 - probabilities))
+
+    return {'weights': weights, 'feature_names': names,
+            'feature_codes': {column: list(codes) for column, codes in FEATURE_CODES.items()},
+            'n_shots': int(len(goals)), 'iterations': iterations, 'log_loss': float(log_loss),
+            'fingerprint': None}
+
+
+def predict_xg(model: XGModel, df: pd.DataFrame) -> np.ndarray:
+    """Calcula o xG de cada linha de `df` com um único produto matriz-vetor. Todas as
+    linhas são tratadas como chutes.
+
+    Args:
+        model (XGModel): Modelo criado por `fit_xg` ou lido por `load_xg_model`.
+        df (pd.DataFrame): DataFrame de chutes, com as colunas do modelo.
+
+    Returns:
+        np.ndarray: Probabilidade de gol de cada linha de `df`.
+
+    Raises:
+        TypeError: Se o parâmetro `df` não for um pd.DataFrame.
+        KeyError: Se alguma das colunas do modelo não existir em `df`.
+    """
+    features, _ = shot_features(df, model['feature_codes'])
+    return 1.0 / (1.0 + np.exp(-(features @ model['weights'])))
+
+
+def save_xg_model(model: XGModel, path: str = XG_MODEL_PATH) -> None:
+    """Grava o modelo em um arquivo .npz.
+
+    Args:
+        model (XGModel): Modelo criado por `fit_xg`.
+        path (str): Caminho do arquivo. Padrão: `XG_MODEL_PATH`.
+    """
+    arrays = {f'codes_{column}': np.asarray(codes)
+              for column, codes in model['feature_codes'].items()}
+    arrays['columns'] = np.array(list(model['feature_codes']))
+    arrays['weights'] = model['weights']
+    arrays['feature_names'] = np.array(model['feature_names'])
+    arrays['stats'] = np.array([model['n_shots'], model['iterations'], model['log_loss']])
+    if model.get('fingerprint') is not None:
+        arrays['fingerprint'] = np.array(model['fingerprint'])
+
+    tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_xg_model(path: str = XG_MODEL_PATH) -> XGModel:
+    """Lê um modelo gravado por `save_xg_model`.
+
+    Args:
+        path (str): Caminho do arquivo. Padrão: `XG_MODEL_PATH`.
+
+    Returns:
+        XGModel: O modelo.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não for encontrado.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"O arquivo '{path}' não foi encontrado")
+
+    with np.load(path, allow_pickle=False) as data:
+        n_shots, iterations, log_loss = data['stats']
+        return {'weights': data['weights'],
+                'feature_names': data['feature_names'].tolist(),
+                'feature_codes': {column: data[f'codes_{column}'].tolist()
+                                  for column in data['columns'].tolist()},
+                'n_shots': int(n_shots), 'iterations': int(iterations),
+                'log_loss': float(log_loss),
+                'fingerprint': (str(data['fingerprint']) if 'fingerprint' in data.files
+                                else None)}
+
+
+def load_or_fit_xg(df: pd.DataFrame, path: str = XG_MODEL_PATH,
+                   fingerprint: Optional[str] = None) -> XGModel:
+    """Lê o modelo gravado em `path`. Se o arquivo não existir, ou se `fingerprint` for
+    dado e o modelo gravado tiver sido ajustado sobre outro dataset, ajusta o modelo
+    sobre os chutes de `df` e o grava.
+
+    Args:
+        df (pd.DataFrame): DataFrame de eventos, usado apenas se o modelo for ajustado.
+        path (str): Caminho do arquivo. Padrão: `XG_MODEL_PATH`.
+        fingerprint (Optional[str]): Impressão digital do dataset de `df` (ver
+                                     cache.dataset_fingerprint). Se None, o modelo
+                                     gravado é sempre reaproveitado.
+
+    Returns:
+        XGModel: O modelo.
+    """
+    if os.path.isfile(path):
+        model = load_xg_model(path)
+        if fingerprint is None or model['fingerprint'] == fingerprint:
+            return model
+
+    model = fit_xg(df)
+    model['fingerprint'] = fingerprint
+    save_xg_model(model, path)
+    return model
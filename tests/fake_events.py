@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# Colunas de events.csv, na ordem do arquivo original
+EVENTS_COLUMNS = ['id_odsp', 'id_event', 'sort_order', 'time', 'text', 'event_type',
+                  'event_type2', 'side', 'event_team', 'opponent', 'player', 'player2',
+                  'player_in', 'player_out', 'shot_place', 'shot_outcome', 'is_goal',
+                  'location', 'bodypart', 'assist_method', 'situation', 'fast_break']
+
+TEAMS = ['Alpha FC', 'Beta United', 'Gamma City', 'Delta Rovers', 'Epsilon Athletic',
+         'Zeta Town']
+PLAYERS = ['joao silva', 'pedro souza', 'lucas lima', 'mateus costa', 'rafael alves',
+           'bruno rocha', 'diego pires', 'tiago melo']
+EVENT_TYPES = [1, 2, 3, 4, 7, 8, 9, 10, 11, 6]
+EVENT_WEIGHTS = [0.35, 0.15, 0.2, 0.05, 0.05, 0.1, 0.05, 0.02, 0.02, 0.01]
+
+
+def make_events(n_matches: int = 40, seed: int = 0) -> pd.DataFrame:
+    """Gera um DataFrame aleatório com as mesmas colunas e códigos de events.csv,
+    ordenado por partida e por sort_order."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    event_id = 0
+    for match in range(n_matches):
+        home, away = rng.choice(TEAMS, size=2, replace=False)
+        n_events = int(rng.integers(20, 60))
+        times = np.sort(rng.integers(1, 95, size=n_events))
+        previous_type = 0
+        for order, time in enumerate(times, start=1):
+            event_type = int(rng.choice(EVENT_TYPES, p=EVENT_WEIGHTS))
+            side = int(rng.integers(1, 3))
+            team, opponent = (home, away) if side == 1 else (away, home)
+            player = str(rng.choice(PLAYERS))
+            row = {
+                'id_odsp': f'match{match:04d}', 'id_event': f'ev{event_id:06d}',
+                'sort_order': order, 'time': int(time), 'event_type': event_type,
+                'event_type2': np.nan, 'side': side, 'event_team': team,
+                'opponent': opponent, 'player': player, 'player2': np.nan,
+                'player_in': np.nan, 'player_out': np.nan, 'shot_place': np.nan,
+                'shot_outcome': np.nan, 'is_goal': 0, 'location': np.nan,
+                'bodypart': np.nan, 'assist_method': 0, 'situation': np.nan,
+                'fast_break': 0,
+            }
+            if event_type == 1:
+                location = int(rng.integers(1, 20))
+                bodypart = int(rng.choice([1, 2, 3], p=[0.45, 0.3, 0.25]))
+                if previous_type == 2:
+                    bodypart = 3
+                inside = location in (3, 9, 10, 11, 12, 13, 14)
+                is_goal = int(rng.random() < (0.25 if inside else 0.06))
+                outcome = 1 if is_goal else int(rng.integers(1, 5))
+                situation = 3 if previous_type == 2 else int(rng.choice([1, 2, 4]))
+                row.update({
+                    'shot_place': int(rng.integers(1, 14)), 'shot_outcome': outcome,
+                    'is_goal': is_goal, 'location': location, 'bodypart': bodypart,
+                    'assist_method': int(rng.integers(0, 5)), 'situation': situation,
+                    'fast_break': int(rng.random() < 0.05),
+                })
+                verb = 'Goal!' if is_goal else 'Attempt missed.'
+                part = 'header' if bodypart == 3 else 'right footed shot'
+                row['text'] = f'{verb} {player.title()} ({team}) {part} from the box.'
+            elif event_type == 2:
+                row['text'] = f'Corner,  {team}. Conceded by {player.title()}.'
+            elif event_type == 3:
+                row['text'] = f'Foul by {player.title()} ({team}).'
+            else:
+                row['text'] = f'{player.title()} ({team}) event {event_type}.'
+            rows.append(row)
+            previous_type = event_type
+            event_id += 1
+    return pd.DataFrame(rows, columns=EVENTS_COLUMNS)
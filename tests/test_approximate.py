@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from approximate import (match_in_sample, load_sampled_dataset, ratio_estimates,
+                         matches_approximate, shots_approximate, head_approximate,
+                         approximate_main)
+from head import head_summary
+from matches import matches_summary
+from shots import shots_summary
+
+
+class TestApproximate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.csv_path = os.path.join(cls.tmpdir.name, 'events.csv')
+        make_events(80, seed=10).to_csv(cls.csv_path, index=False)
+        cls.events = pd.read_csv(cls.csv_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_load_sampled_dataset(self):
+        """Testa se a amostra contém partidas inteiras, escolhidas pelo hash do id."""
+        sample = load_sampled_dataset(self.csv_path, 0.3, seed=1)
+        expected_matches = [match for match in self.events['id_odsp'].unique()
+                            if match_in_sample(match, 0.3, seed=1)]
+        self.assertEqual(list(sample['id_odsp'].unique()), expected_matches)
+        expected = self.events[self.events['id_odsp'].isin(expected_matches)]
+        pd.testing.assert_frame_equal(sample, expected.reset_index(drop=True))
+
+    def test_multiline_text(self):
+        """Testa se um comentário entre aspas com quebra de linha fica no seu evento."""
+        events = self.events.assign(text=[f'linha um\nAAAA,linha "{i}" dois' if i % 5 == 0
+                                          else f'lance {i}' for i in range(len(self.events))])
+        path = os.path.join(self.tmpdir.name, 'multiline.csv')
+        events.to_csv(path, index=False)
+
+        sample = load_sampled_dataset(path, 0.3, seed=1)
+        expected = events[events['id_odsp'].apply(match_in_sample, args=(0.3, 1))]
+        pd.testing.assert_frame_equal(sample, expected.reset_index(drop=True))
+
+    def test_graphs_in_run_directory(self):
+        """Testa se os gráficos do modo aproximado ficam no diretório da execução."""
+        output_dir = os.path.join(self.tmpdir.name, 'run')
+        os.makedirs(output_dir)
+        approximate_main(self.csv_path, 0.5, output_dir=output_dir)
+        self.assertEqual(sorted(os.listdir(output_dir)),
+                         ['graph_head.png', 'graph_matches.png', 'graph_shots.png'])
+
+    def test_samples_are_nested(self):
+        """Testa se uma amostra menor está contida em uma maior com a mesma semente."""
+        small = set(load_sampled_dataset(self.csv_path, 0.2)['id_odsp'])
+        large = set(load_sampled_dataset(self.csv_path, 0.5)['id_odsp'])
+        self.assertTrue(small <= large)
+
+    def test_load_errors(self):
+        """Testa os erros de load_sampled_dataset."""
+        with self.assertRaises(ValueError):
+            load_sampled_dataset(self.csv_path, 0)
+        with self.assertRaises(FileNotFoundError):
+            load_sampled_dataset(os.path.join(self.tmpdir.name, 'missing.csv'), 0.5)
+        with self.assertRaises(TypeError):
+            load_sampled_dataset(3, 0.5)
+
+    def test_ratio_estimates(self):
+        """Testa o estimador de razão e a margem nula quando não há amostragem."""
+        y = np.array([[1, 0], [2, 1], [0, 3]])
+        x = np.array([1, 3, 3])
+        ratios, margins = ratio_estimates(y, x, 0.5)
+        np.testing.assert_allclose(ratios, [3 / 7, 4 / 7])
+        self.assertTrue((margins > 0).all())
+        _, margins = ratio_estimates(y, x, 1.0)
+        np.testing.assert_allclose(margins, 0)
+
+    def test_full_rate_matches_exact(self):
+        """Testa se, com taxa 1, os resultados coincidem com os exatos."""
+        df = load_sampled_dataset(self.csv_path, 1.0)
+        summary_df = matches_approximate(df, 1.0)
+        pd.testing.assert_frame_equal(summary_df[['results', 'home_percentage']],
+                                      matches_summary(self.events.copy()))
+        self.assertTrue((summary_df['margin'] == 0).all())
+
+        stats_goals, perc_attempts = shots_approximate(df, 1.0)
+        expected_goals, expected_attempts = shots_summary(self.events.copy())
+        pd.testing.assert_frame_equal(stats_goals[['Situação', 'Porcentagem']], expected_goals)
+        pd.testing.assert_frame_equal(
+            perc_attempts[['Resultado', 'Porcentagem_in', 'Porcentagem_out']],
+            expected_attempts)
+
+        percent_of_origins = head_approximate(df, 1.0)
+        pd.testing.assert_frame_equal(percent_of_origins[['ORIGEM', 'PORCENTAGEM']],
+                                      head_summary(self.events.copy()))
+
+    def test_sample_within_bounds(self):
+        """Testa se as margens são positivas e os totais são reescalados pela taxa."""
+        df = load_sampled_dataset(self.csv_path, 0.5)
+        summary_df = matches_approximate(df, 0.5)
+        self.assertTrue((summary_df['margin'] > 0).all())
+        n_results = (summary_df['estimated_count'] * 0.5).round().sum()
+        self.assertEqual(n_results, len(matches_summary_count(df)))
+
+        percent_of_origins = head_approximate(df, 0.5)
+        self.assertEqual(list(percent_of_origins.columns),
+                         ['ORIGEM', 'PORCENTAGEM', 'MARGEM', 'ESTIMATIVA'])
+
+
+def matches_summary_count(df):
+    """Partidas com gols na amostra."""
+    goals = df[(df['event_type'] == 1) & (df['is_goal'] == 1)]
+    return goals['id_odsp'].unique()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+import utils
+from array_utils import (to_arrays, to_dataframe, remove_columns, filter_df,
+                         remove_lines_by_condition, map_column_values, split_table)
+from fake_events import make_events
+
+grades = [
+        [1, 'Arnaldo', 7.0],
+        [2, 'Bernaldo', 8.5],
+        [3, 'Cernaldo', 7.0]
+        ]
+grades_df = pd.DataFrame(grades, columns=['ID', 'Nome', 'Nota'])
+
+
+def grades_table():
+    return to_arrays(grades_df)
+
+
+def grades_structured():
+    return np.array([tuple(row) for row in grades],
+                    dtype=[('ID', 'i8'), ('Nome', 'U10'), ('Nota', 'f8')])
+
+
+class TestConversion(unittest.TestCase):
+    def test_round_trip(self):
+        """Testa a conversão de ida e volta entre DataFrame e tabela de arrays."""
+        pd.testing.assert_frame_equal(to_dataframe(grades_table()), grades_df)
+        result = to_dataframe(grades_structured())
+        self.assertEqual(list(result.columns), ['ID', 'Nome', 'Nota'])
+
+    def test_invalid_input(self):
+        """Testa as conversões ao receber parâmetros do tipo errado."""
+        self.assertRaises(TypeError, to_arrays, grades)
+        self.assertRaises(TypeError, to_dataframe, np.arange(3))
+
+
+class TestRemoveColumns(unittest.TestCase):
+    def test_remove_columns_success(self):
+        """Testa a remoção de colunas nas duas representações."""
+        table = grades_table()
+        result = remove_columns(table, ['Nome'])
+        self.assertIs(result, table)
+        self.assertEqual(list(result), ['ID', 'Nota'])
+        self.assertEqual(remove_columns(grades_structured(), ['Nome']).dtype.names,
+                         ('ID', 'Nota'))
+
+    def test_errors(self):
+        """Testa os mesmos erros da versão de utils.py."""
+        self.assertRaises(TypeError, remove_columns, grades, ['ID'])
+        self.assertRaises(TypeError, remove_columns, grades_table(), 'ID')
+        self.assertRaises(KeyError, remove_columns, grades_table(), ['Situação'])
+
+
+class TestFilterDf(unittest.TestCase):
+    def test_filter_df_success(self):
+        """Testa o filtro contra a versão de utils.py."""
+        for conditions in [{'Nota': 7}, {'Nome': 'Arnaldo'}, {'Nota': 7.0, 'ID': 3},
+                           {'Nome': 5}]:
+            expected = utils.filter_df(grades_df.copy(), conditions).reset_index(drop=True)
+            pd.testing.assert_frame_equal(to_dataframe(filter_df(grades_table(), conditions)),
+                                          expected)
+            result = to_dataframe(filter_df(grades_structured(), conditions))
+            np.testing.assert_array_equal(result['ID'], expected['ID'])
+
+    def test_errors(self):
+        """Testa os mesmos erros da versão de utils.py."""
+        self.assertRaises(TypeError, filter_df, grades, {'ID': 2})
+        self.assertRaises(TypeError, filter_df, grades_table(), [('ID', 2)])
+        self.assertRaises(KeyError, filter_df, grades_table(), {'Situação': "Aprovado"})
+
+
+class TestRemoveLinesByCondition(unittest.TestCase):
+    def test_remove_lines_success(self):
+        """Testa a remoção de linhas contra a versão de utils.py."""
+        for column, conditions in [('Nota', [7.0]), ('ID', [1, 2]), ('Nome', [])]:
+            expected = utils.remove_lines_by_condition(grades_df.copy(), column, conditions)
+            result = remove_lines_by_condition(grades_table(), column, conditions)
+            pd.testing.assert_frame_equal(to_dataframe(result),
+                                          expected.reset_index(drop=True))
+
+    def test_errors(self):
+        """Testa os mesmos erros da versão de utils.py."""
+        self.assertRaises(TypeError, remove_lines_by_condition, grades, 'ID', [2])
+        self.assertRaises(TypeError, remove_lines_by_condition, grades_table(), 'ID', (1, 2))
+        self.assertRaises(KeyError, remove_lines_by_condition, grades_table(), 'Situação',
+                          ["Aprovado"])
+
+
+class TestMapColumnValues(unittest.TestCase):
+    def test_map_column_values_success(self):
+        """Testa o mapeamento completo e parcial contra a versão de utils.py."""
+        for mapping in [{"Arnaldo": "Aluno 1", "Bernaldo": "Aluno 2", "Cernaldo": "Aluno 3"},
+                        {"Arnaldo": "Aluno 1", "Cernaldo": "Aluno 3"}]:
+            expected = utils.map_column_values(grades_df.copy(), 'Nome', mapping)
+            result = to_dataframe(map_column_values(grades_table(), 'Nome', mapping))
+            pd.testing.assert_frame_equal(result, expected)
+
+    def test_numeric_mapping(self):
+        """Testa que mapeamentos numéricos produzem arrays numéricos."""
+        result = map_column_values(grades_table(), 'Nota', {7.0: 1, 8.5: 2})
+        np.testing.assert_array_equal(result['Nota'], [1, 2, 1])
+        result = map_column_values(grades_table(), 'Nota', {7.0: 1})
+        self.assertEqual(result['Nota'].dtype, np.float64)
+        self.assertTrue(np.isnan(result['Nota'][1]))
+
+    def test_structured(self):
+        """Testa que o array estruturado é copiado com o novo tipo da coluna."""
+        original = grades_structured()
+        result = map_column_values(original, 'ID', {1: 'um', 2: 'dois', 3: 'três'})
+        self.assertEqual(list(result['ID']), ['um', 'dois', 'três'])
+        self.assertEqual(original['ID'][0], 1)
+
+    def test_errors(self):
+        """Testa os mesmos erros da versão de utils.py."""
+        mapping = {"Arnaldo": "Aluno 1"}
+        self.assertRaises(TypeError, map_column_values, grades, 'Nome', mapping)
+        self.assertRaises(TypeError, map_column_values, grades_table(), 'Nome',
+                          [("Arnaldo", "Aluno 1")])
+        self.assertRaises(KeyError, map_column_values, grades_table(), 'Situação', mapping)
+
+
+class TestSplitTable(unittest.TestCase):
+    def test_split_by_match(self):
+        """Testa a separação por partida contra o groupby do pandas."""
+        df = make_events(10, seed=4)
+        groups = split_table(to_arrays(df), 'id_odsp')
+        self.assertEqual(set(groups), set(df['id_odsp']))
+        for match, subset in df.groupby('id_odsp'):
+            pd.testing.assert_frame_equal(to_dataframe(groups[match]),
+                                          subset.reset_index(drop=True))
+
+    def test_errors(self):
+        """Testa os erros de tipo e de coluna."""
+        self.assertRaises(TypeError, split_table, grades, 'ID')
+        self.assertRaises(KeyError, split_table, grades_table(), 'Situação')
+
+
+if __name__ == '__main__':
+    unittest.main()
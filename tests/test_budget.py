@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+import budget
+from fake_events import make_events
+from budget import (estimate_working_set, plan_execution, run_out_of_core,
+                    budgeted_summaries, execution_report)
+
+
+class TestBudget(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'events.csv')
+        make_events(40, seed=4).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assert_same_summaries(self, result, expected):
+        pd.testing.assert_frame_equal(result['matches'], expected['matches'])
+        pd.testing.assert_frame_equal(result['head'], expected['head'])
+        for result_df, expected_df in zip(result['shots'], expected['shots']):
+            pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_plan_execution(self):
+        """Testa a escolha entre o caminho em memória e o caminho em pedaços."""
+        estimated = estimate_working_set(self.path)
+        self.assertGreater(estimated, 0)
+        self.assertEqual(plan_execution(self.path, None)['mode'], 'memory')
+        self.assertEqual(plan_execution(self.path, estimated + 1)['mode'], 'memory')
+        plan = plan_execution(self.path, estimated // 10)
+        self.assertEqual(plan['mode'], 'chunked')
+        self.assertGreaterEqual(plan['chunk_rows'], budget.MIN_CHUNK_ROWS)
+
+    def test_out_of_core_matches_memory(self):
+        """Testa que o caminho em pedaços produz os mesmos resumos."""
+        expected, report = budgeted_summaries(self.path, None)
+        self.assertEqual(report['mode'], 'memory')
+        for chunk_rows in (997, 5000):
+            result, stats = run_out_of_core(self.path, chunk_rows, self.tmp.name)
+            self.assert_same_summaries(result, expected)
+            self.assertEqual(stats['rows'], report['rows'])
+            self.assertGreater(stats['spilled_bytes'], 0)
+        # O arquivo de despejo é removido
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['events.csv'])
+
+    def test_budgeted_summaries(self):
+        """Testa a execução com um limite menor que a estimativa."""
+        expected, _ = budgeted_summaries(self.path, None)
+        result, report = budgeted_summaries(self.path, 1)
+        self.assertEqual(report['mode'], 'chunked')
+        self.assertGreater(report['chunks'], 1)
+        self.assert_same_summaries(result, expected)
+        self.assertEqual(execution_report(report).shape, (8, 2))
+
+    def test_precomputed_plan(self):
+        """Testa que um plano já calculado é usado sem ler o arquivo de novo e que a
+        falta de memória no caminho em memória recomeça em pedaços."""
+        expected, _ = budgeted_summaries(self.path, None)
+        plan = plan_execution(self.path, 10 ** 12)
+        with mock.patch.object(budget, 'plan_execution') as planner, \
+                mock.patch.object(budget, 'load_dataset', side_effect=MemoryError):
+            result, report = budgeted_summaries(self.path, 10 ** 12, plan=plan)
+        planner.assert_not_called()
+        self.assertEqual(report['mode'], 'chunked')
+        self.assertEqual(report['estimated_bytes'], plan['estimated_bytes'])
+        self.assert_same_summaries(result, expected)
+
+    def test_split_on_memory_error(self):
+        """Testa que pedaços sem memória suficiente são divididos em vez de falhar."""
+        expected, _ = budgeted_summaries(self.path, None)
+        original = budget.map_events
+
+        def limited(df, is_first=True):
+            if df.shape[0] > 1000:
+                raise MemoryError
+            return original(df, is_first)
+
+        with mock.patch.object(budget, 'map_events', limited):
+            result, stats = run_out_of_core(self.path, 10_000)
+        self.assertGreater(stats['splits'], 0)
+        self.assert_same_summaries(result, expected)
+
+    def test_errors(self):
+        """Testa os erros do módulo."""
+        with self.assertRaises(TypeError):
+            estimate_working_set(1)
+        with self.assertRaises(FileNotFoundError):
+            estimate_working_set(os.path.join(self.tmp.name, 'missing.csv'))
+        with self.assertRaises(ValueError):
+            plan_execution(self.path, 0)
+        with self.assertRaises(TypeError):
+            run_out_of_core(self.path, 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from cache import dataset_fingerprint, cache_key, cached_call, evict
+from fake_events import make_events
+from shots import shots_summary
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmpdir.name, 'cache')
+        self.path = os.path.join(self.tmpdir.name, 'events.csv')
+        self.events = make_events(10, seed=5)
+        self.events.to_csv(self.path, index=False)
+        self.calls = []
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def compute(self, name, value=None):
+        def function():
+            self.calls.append(name)
+            return pd.DataFrame({'name': [name], 'value': [value]})
+        return function
+
+    def test_dataset_fingerprint(self):
+        """Testa se a impressão digital é estável e muda quando o conteúdo muda."""
+        first = dataset_fingerprint(self.path, self.cache_dir)
+        self.assertEqual(first, dataset_fingerprint(self.path, self.cache_dir))
+        self.assertEqual(first, dataset_fingerprint(self.path))
+        self.events.iloc[:-1].to_csv(self.path, index=False)
+        self.assertNotEqual(first, dataset_fingerprint(self.path, self.cache_dir))
+
+    def test_cache_key(self):
+        """Testa se a chave depende do dataset, da hipótese e dos parâmetros, mas não
+        da ordem dos parâmetros."""
+        key = cache_key('abc', 'shots', {'a': [1, 2], 'b': 1})
+        self.assertEqual(key, cache_key('abc', 'shots', {'b': 1, 'a': [1, 2]}))
+        self.assertNotEqual(key, cache_key('abc', 'shots', {'a': [1, 3], 'b': 1}))
+        self.assertNotEqual(key, cache_key('abd', 'shots', {'a': [1, 2], 'b': 1}))
+        self.assertNotEqual(key, cache_key('abc', 'head', {'a': [1, 2], 'b': 1}))
+
+    def test_cached_call_reuses_results(self):
+        """Testa se apenas a hipótese com parâmetros alterados é recalculada."""
+        fingerprint = dataset_fingerprint(self.path, self.cache_dir)
+        first = cached_call(self.cache_dir, fingerprint, 'head', {'time_window': 1},
+                            self.compute('head', 1))
+        cached_call(self.cache_dir, fingerprint, 'shots', {}, self.compute('shots'))
+        again = cached_call(self.cache_dir, fingerprint, 'head', {'time_window': 1},
+                            self.compute('head', 1))
+        cached_call(self.cache_dir, fingerprint, 'head', {'time_window': 2},
+                    self.compute('head', 2))
+        cached_call(self.cache_dir, fingerprint, 'shots', {}, self.compute('shots'))
+
+        self.assertEqual(self.calls, ['head', 'shots', 'head'])
+        pd.testing.assert_frame_equal(first, again)
+
+    def test_cached_shots_summary(self):
+        """Testa o cache de um resumo composto por mais de um DataFrame."""
+        fingerprint = dataset_fingerprint(self.path)
+        expected = shots_summary(self.events)
+        cached_call(self.cache_dir, fingerprint, 'shots', {}, lambda: expected)
+        result = cached_call(self.cache_dir, fingerprint, 'shots', {}, self.compute('x'))
+        for result_df, expected_df in zip(result, expected):
+            pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_lru_eviction(self):
+        """Testa se o cache respeita o limite de tamanho removendo os resultados usados
+        há mais tempo."""
+        fingerprint = 'abc'
+        cached_call(self.cache_dir, fingerprint, 'a', {}, self.compute('a'))
+        size = sum(os.path.getsize(os.path.join(self.cache_dir, name))
+                   for name in os.listdir(self.cache_dir) if name.endswith('.pkl'))
+        limit = int(size * 2.5)
+        cached_call(self.cache_dir, fingerprint, 'b', {}, self.compute('b'), limit)
+        cached_call(self.cache_dir, fingerprint, 'a', {}, self.compute('a'), limit)
+        cached_call(self.cache_dir, fingerprint, 'c', {}, self.compute('c'), limit)
+        self.assertEqual(self.calls, ['a', 'b', 'c'])
+
+        # 'b' era o resultado usado há mais tempo
+        cached_call(self.cache_dir, fingerprint, 'a', {}, self.compute('a'), limit)
+        cached_call(self.cache_dir, fingerprint, 'b', {}, self.compute('b'), limit)
+        self.assertEqual(self.calls, ['a', 'b', 'c', 'b'])
+        self.assertEqual(evict(self.cache_dir, 0), 2)
+
+    def test_invalid_inputs(self):
+        """Testa o funcionamento das funções ao receber parâmetros inválidos."""
+        self.assertRaises(TypeError, dataset_fingerprint, 3)
+        self.assertRaises(FileNotFoundError, dataset_fingerprint, 'invalid_path.csv')
+        self.assertRaises(TypeError, cache_key, 'abc', 'shots', [1])
+        self.assertRaises(TypeError, cached_call, self.cache_dir, 'abc', 'a', {}, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+import game_state
+from fake_events import make_events
+from game_state import (add_game_state, shots_by_game_state, headed_goals_by_game_state,
+                        matches_by_game_state, game_state_summary)
+from head import count_headed_goal_origins
+from kernels import running_score
+
+
+class TestGameState(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(40, seed=12)
+
+    def test_add_game_state(self):
+        """Testa o placar antes de cada evento contra o laço por partida."""
+        states = add_game_state(self.df)
+        home, away = running_score(self.df, use_jit=False)
+        np.testing.assert_array_equal(states['home_score'], home)
+        np.testing.assert_array_equal(states['away_score'], away)
+
+        side = self.df['side'].to_numpy()
+        own = np.where(side == 1, home, away)
+        other = np.where(side == 1, away, home)
+        np.testing.assert_array_equal(states['goal_difference'], own - other)
+        expected = np.where(own > other, 'leading', np.where(own < other, 'trailing', 'level'))
+        np.testing.assert_array_equal(states['game_state'], expected)
+        self.assertNotIn('game_state', self.df.columns)
+
+    def test_first_event_is_level(self):
+        """Testa que cada partida começa empatada."""
+        states = add_game_state(self.df)
+        first = states.groupby('id_odsp').head(1)
+        self.assertTrue((first['game_state'] == 'level').all())
+
+    def test_shots_by_game_state(self):
+        """Testa que os chutes de todas as situações somam o total."""
+        result = shots_by_game_state(self.df)
+        self.assertEqual(result.shape[0], 6)
+        inside = result[result['Situação'] == 'Dentro da área']
+        total = self.df[(self.df['event_type'] == 1) &
+                        self.df['location'].isin([3, 9, 10, 11, 12, 13, 14])]
+        self.assertEqual(inside['Chutes'].sum(), total.shape[0])
+        self.assertEqual(inside['Gols'].sum(), total['is_goal'].sum())
+
+    def test_headed_goals_by_game_state(self):
+        """Testa que a origem dos gols de cabeça, somada nas situações do jogo, é a
+        mesma de count_headed_goal_origins."""
+        for time_window in (1, 5):
+            result = headed_goals_by_game_state(self.df, time_window)
+            self.assertEqual(result.shape[0], 12)
+            by_origin = result.groupby('ORIGEM', sort=False)['Gols de cabeça'].sum()
+            counts = count_headed_goal_origins(self.df, True, time_window)
+            self.assertEqual(list(by_origin), [counts['corners'], counts['fouls'],
+                                               counts['offsides'], counts['others']])
+
+            by_state = result.groupby('Situação do jogo')
+            for goals, percentages in zip(by_state['Gols de cabeça'].sum(),
+                                          by_state['Porcentagem'].sum()):
+                self.assertAlmostEqual(percentages, 100 if goals else 0, delta=0.05)
+
+    def test_headed_goal_states(self):
+        """Testa a situação do jogo atribuída a cada gol de cabeça contado."""
+        df = pd.DataFrame({
+            'id_odsp': ['a'] * 5,
+            'time': [1, 2, 3, 10, 11],
+            'event_type': [2, 1, 2, 1, 1],
+            'side': [1, 1, 2, 2, 1],
+            'is_goal': [0, 1, 0, 1, 1],
+            'bodypart': [1, 3, 1, 3, 1],
+        })
+        result = headed_goals_by_game_state(df).set_index(['Situação do jogo', 'ORIGEM'])
+        # O visitante marcou de cabeça perdendo por 1 x 0, mas o evento anterior ficou
+        # fora da janela de tempo; o mandante marcou de escanteio com o jogo empatado
+        self.assertEqual(result['Gols de cabeça'].sum(), 1)
+        self.assertEqual(result.loc[('Empatando', 'Escanteios'), 'Gols de cabeça'], 1)
+
+    def test_matches_by_game_state(self):
+        """Testa que todas as partidas são classificadas e que minute=200 é o final."""
+        result = matches_by_game_state(self.df)
+        self.assertEqual(result['Partidas'].sum(), self.df['id_odsp'].nunique())
+        final = matches_by_game_state(self.df, minute=200).set_index('Situação do jogo')
+        self.assertEqual(final.loc['Vencendo', 'Vitórias'], 100)
+        self.assertEqual(final.loc['Empatando', 'Empates'], 100)
+        self.assertEqual(final.loc['Perdendo', 'Derrotas'], 100)
+
+    def test_game_state_summary(self):
+        """Testa as chaves do resumo e que a situação do jogo é calculada uma única vez."""
+        with mock.patch.object(game_state, 'add_game_state',
+                               wraps=game_state.add_game_state) as states:
+            summary = game_state_summary(self.df)
+        states.assert_called_once()
+        self.assertEqual(set(summary), {'matches', 'shots', 'head'})
+        pd.testing.assert_frame_equal(summary['shots'], shots_by_game_state(self.df))
+        pd.testing.assert_frame_equal(summary['head'], headed_goals_by_game_state(self.df))
+
+    def test_errors(self):
+        """Testa os erros do módulo."""
+        with self.assertRaises(TypeError):
+            add_game_state([])
+        with self.assertRaises(KeyError):
+            add_game_state(self.df.drop(columns=['side']))
+        with self.assertRaises(KeyError):
+            matches_by_game_state(self.df.drop(columns=['time']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from grouped import (attach_metadata, grouped_matches_summary, grouped_shots_summary,
+                     grouped_head_summary, grouped_summaries, load_match_metadata)
+from head import head_summary
+from matches import matches_summary
+from shots import shots_summary
+
+
+class TestGrouped(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(40, seed=3)
+        ids = self.df['id_odsp'].unique()
+        positions = np.arange(len(ids))
+        self.metadata = pd.DataFrame({'id_odsp': ids,
+                                      'league': np.where(positions % 2, 'E0', 'SP1'),
+                                      'season': 2012 + positions % 3})
+        self.keys = ['league', 'season']
+        self.full = attach_metadata(self.df, self.metadata)
+
+    def groups(self):
+        for labels, subset in self.full.groupby(self.keys):
+            yield labels, subset.reset_index(drop=True)
+
+    @staticmethod
+    def select(table, labels):
+        mask = (table['league'] == labels[0]) & (table['season'] == labels[1])
+        return table[mask].reset_index(drop=True)
+
+    def test_attach_metadata(self):
+        """Testa a junção dos metadados e a partida ausente."""
+        metadata = self.metadata.iloc[1:]
+        result = attach_metadata(self.df, metadata)
+        first = self.df['id_odsp'] == self.metadata['id_odsp'].iloc[0]
+        self.assertTrue(result.loc[first, 'league'].isna().all())
+        self.assertEqual(result.loc[~first, 'league'].isna().sum(), 0)
+        self.assertNotIn('league', self.df.columns)
+
+    def test_attach_metadata_errors(self):
+        """Testa os erros de tipo, de coluna e de partida repetida."""
+        with self.assertRaises(TypeError):
+            attach_metadata([], self.metadata)
+        with self.assertRaises(KeyError):
+            attach_metadata(self.df, self.metadata, ['country'])
+        with self.assertRaises(ValueError):
+            attach_metadata(self.df, pd.concat([self.metadata, self.metadata]))
+
+    def test_matches_per_group(self):
+        """Testa as porcentagens de cada grupo contra matches_summary no subconjunto."""
+        result = grouped_matches_summary(self.full, self.keys)
+        for labels, subset in self.groups():
+            expected = matches_summary(subset.copy())
+            group = self.select(result, labels)
+            np.testing.assert_array_equal(group['results'], expected['results'])
+            np.testing.assert_allclose(group['home_percentage'], expected['home_percentage'])
+
+    def test_shots_per_group(self):
+        """Testa as tabelas de gols e de chutes de cada grupo contra shots_summary."""
+        goals, outcomes = grouped_shots_summary(self.full, self.keys)
+        for labels, subset in self.groups():
+            expected_goals, expected_outcomes = shots_summary(subset.copy())
+            group = self.select(goals, labels)
+            np.testing.assert_allclose(group['Porcentagem'], expected_goals['Porcentagem'],
+                                       atol=0.01)
+
+            group = self.select(outcomes, labels).sort_values('Resultado')
+            expected_outcomes = expected_outcomes.sort_values('Resultado')
+            np.testing.assert_array_equal(group['Resultado'], expected_outcomes['Resultado'])
+            for column in ['Porcentagem_in', 'Porcentagem_out']:
+                np.testing.assert_allclose(group[column], expected_outcomes[column], atol=0.01)
+
+    def test_head_per_group(self):
+        """Testa as origens dos gols de cabeça de cada grupo contra head_summary."""
+        result = grouped_head_summary(self.full, self.keys)
+        for labels, subset in self.groups():
+            expected = head_summary(subset.copy())
+            group = self.select(result, labels)
+            if 'ORIGEM' not in expected.columns:
+                self.assertEqual(group.shape[0], 0)
+                continue
+            np.testing.assert_array_equal(group['ORIGEM'], expected['ORIGEM'])
+            np.testing.assert_allclose(group['PORCENTAGEM'], expected['PORCENTAGEM'],
+                                       atol=0.01)
+
+    def test_event_column_key(self):
+        """Testa o agrupamento por uma coluna dos eventos, sem metadados."""
+        result = grouped_matches_summary(self.df, 'side')
+        self.assertEqual(sorted(result['side'].unique()), [1, 2])
+
+    def test_grouped_summaries(self):
+        """Testa que as chaves ausentes são buscadas nos metadados."""
+        result = grouped_summaries(self.df, self.keys, self.metadata)
+        self.assertEqual(set(result), {'matches', 'goals', 'shots', 'head'})
+        for table in result.values():
+            self.assertEqual(list(table.columns[:2]), self.keys)
+
+    def test_missing_key(self):
+        """Testa o erro para uma chave inexistente."""
+        with self.assertRaises(KeyError):
+            grouped_matches_summary(self.df, 'league')
+
+    def test_missing_metadata_file(self):
+        """Testa o erro quando ginf.csv não existe."""
+        with self.assertRaises(FileNotFoundError):
+            load_match_metadata('inexistente.csv')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,8 @@ import sys
 sys.path.append('../src')
 
 from head import (get_rows_with_previous, is_headed_goal, is_same_match,
-                  origin_of_headed_goals)
+                  origin_of_headed_goals, headed_goal_origin_codes,
+                  count_headed_goal_origins)
 
 #Dataframes utilizados para os testes
 events_df = pd.DataFrame({
@@ -169,5 +170,31 @@ class TestOriginOfHeadedGoals(unittest.TestCase):
         self.assertRaises(TypeError, origin_of_headed_goals, 'events')
 
 
+
+class TestHeadedGoalOriginCodes(unittest.TestCase):
+    def test_headed_goal_origin_codes(self):
+        """Testa o código da origem de cada evento e a contagem feita a partir dele.
+        """
+        result = headed_goal_origin_codes(events_df).tolist()
+        self.assertEqual(result, [3, -1, -1, -1, -1, -1, 0, -1, -1, 1])
+        self.assertEqual(count_headed_goal_origins(events_df),
+                         {'corners': 1, 'fouls': 1, 'offsides': 0, 'others': 1})
+
+    def test_partition_and_time_window(self):
+        """Testa a primeira linha de uma parte do dataset e a janela de tempo.
+        """
+        result = headed_goal_origin_codes(events_df, is_first_partition=False)
+        self.assertEqual(result[0], -1)
+        result = headed_goal_origin_codes(events_df, time_window=0)
+        self.assertEqual(result.tolist(), [3] + [-1] * 9)
+        self.assertEqual(headed_goal_origin_codes(events_df.iloc[:0]).size, 0)
+
+    def test_invalid_input_df(self):
+        """Testa o funcionamento da função headed_goal_origin_codes ao receber um
+        parâmetro do tipo errado para o df.
+        """
+        self.assertRaises(TypeError, headed_goal_origin_codes, 'events')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import pickle
+import unittest
+from unittest import mock
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from head import get_rows_with_previous, origin_of_headed_goals
+import incremental
+from incremental import validate_batch, append_events, load_summaries
+from matches import (group_goals_by_match, calculate_results, create_summary_dataframe,
+                     summary_from_results)
+from shots import prepare_shots, shot_outcome_count
+from utils import load_dictionary
+
+dictionary = load_dictionary('../data/dictionary.txt')
+events_df = make_events(25, seed=3)
+
+
+class TestValidateBatch(unittest.TestCase):
+    def test_valid_batch(self):
+        """Testa o funcionamento da função validate_batch com um lote válido."""
+        validate_batch(events_df, dictionary)
+
+    def test_invalid_codes(self):
+        """Testa o funcionamento da função validate_batch ao receber um lote com
+        códigos que não existem em dictionary.txt."""
+        batch = events_df.copy()
+        batch.loc[0, 'location'] = 25
+        self.assertRaises(ValueError, validate_batch, batch, dictionary)
+
+    def test_invalid_inputs(self):
+        """Testa o funcionamento da função validate_batch ao receber parâmetros do
+        tipo errado ou colunas faltando."""
+        self.assertRaises(TypeError, validate_batch, 'events', dictionary)
+        self.assertRaises(TypeError, validate_batch, events_df, [])
+        self.assertRaises(KeyError, validate_batch, events_df[['id_odsp']], dictionary)
+
+
+class TestAppendEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.tmpdir.name, 'store')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_batches_match_full_history(self):
+        """Testa se acrescentar o histórico em lotes, com partidas divididas entre
+        lotes, gera os mesmos resumos do processamento do histórico inteiro."""
+        headed = events_df.index[(events_df['is_goal'] == 1) & (events_df['bodypart'] == 3)]
+        splits = [0, 130, int(headed[headed > 200][0]), 900, len(events_df)]
+        for start, end in zip(splits[:-1], splits[1:]):
+            summaries = append_events(self.store, events_df.iloc[start:end])
+
+        goals_per_match = group_goals_by_match(events_df.copy())
+        expected_matches = create_summary_dataframe(calculate_results(goals_per_match.copy()))
+        expected_head = origin_of_headed_goals(
+            get_rows_with_previous(events_df.copy(), {'bodypart': 3, 'is_goal': 1}))
+
+        pd.testing.assert_frame_equal(summaries['matches'], expected_matches)
+        pd.testing.assert_frame_equal(summaries['shots'],
+                                      shot_outcome_count(prepare_shots(events_df)))
+        pd.testing.assert_frame_equal(summaries['head'], expected_head)
+
+        stored = load_summaries(self.store, include_match_table=True)
+        pd.testing.assert_frame_equal(stored['goals_per_match'], goals_per_match)
+        pd.testing.assert_frame_equal(stored['head'], expected_head)
+
+    def test_invalid_batch_is_not_stored(self):
+        """Testa se um lote inválido é rejeitado sem alterar o histórico."""
+        append_events(self.store, events_df.iloc[:100])
+        batch = events_df.iloc[100:200].copy()
+        batch['side'] = 3
+        self.assertRaises(ValueError, append_events, self.store, batch)
+        summaries = load_summaries(self.store)
+        expected = append_events(os.path.join(self.tmpdir.name, 'other'), events_df.iloc[:100])
+        pd.testing.assert_frame_equal(summaries['shots'], expected['shots'])
+
+    def test_empty_and_goalless_batches(self):
+        """Testa lotes vazios e sem gols no início do histórico."""
+        goalless = events_df.iloc[:300].assign(is_goal=0)
+        summaries = append_events(self.store, goalless.iloc[:0])
+        pd.testing.assert_frame_equal(summaries['matches'], summary_from_results(0, 0, 0))
+        self.assertEqual(summaries['shots'].shape[0], 0)
+
+        summaries = append_events(self.store, goalless)
+        pd.testing.assert_frame_equal(summaries['matches'], summary_from_results(0, 0, 0))
+        pd.testing.assert_frame_equal(summaries['shots'], shot_outcome_count(prepare_shots(goalless)))
+
+        stored = load_summaries(self.store, include_match_table=True)
+        self.assertEqual(stored['goals_per_match'].shape[0], 0)
+        pd.testing.assert_frame_equal(stored['shots'], summaries['shots'])
+
+    def test_goals_outside_pickle(self):
+        """Testa se o pickle guarda só as contagens de tamanho fixo e se uma falha ao
+        gravá-lo não altera a tabela de gols."""
+        append_events(self.store, events_df.iloc[:500])
+        with open(os.path.join(self.store, incremental.STATE_FILE), 'rb') as file:
+            state = pickle.load(file)
+        self.assertNotIn('goals', state)
+        before = load_summaries(self.store, include_match_table=True)
+
+        with mock.patch.object(incremental, '_save_state', side_effect=OSError):
+            self.assertRaises(OSError, append_events, self.store, events_df.iloc[500:])
+        after = load_summaries(self.store, include_match_table=True)
+        pd.testing.assert_frame_equal(after['goals_per_match'], before['goals_per_match'])
+        pd.testing.assert_frame_equal(after['matches'], before['matches'])
+
+    def test_missing_store(self):
+        """Testa o funcionamento da função load_summaries sem histórico salvo."""
+        self.assertRaises(FileNotFoundError, load_summaries, self.store)
+        self.assertRaises(TypeError, load_summaries, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+import kernels
+from fake_events import make_events
+from head import count_headed_goal_origins
+from kernels import HAS_NUMBA, match_offsets, headed_goal_origins, running_score
+
+
+class TestKernels(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(50, seed=8)
+        # Garante um gol de cabeça na primeira linha e depois de um escanteio
+        self.df.loc[0, ['event_type', 'is_goal', 'bodypart']] = [1, 1, 3]
+
+    def test_match_offsets(self):
+        """Testa os deslocamentos dos blocos de cada partida."""
+        offsets = match_offsets(np.array(['a', 'a', 'b', 'b', 'b', 'a']))
+        np.testing.assert_array_equal(offsets, [0, 2, 5, 6])
+        np.testing.assert_array_equal(match_offsets(np.array([], dtype=object)), [0])
+
+    def test_headed_goal_origins(self):
+        """Testa que os laços interpretado e compilado seguem a regra vetorizada."""
+        for time_window in (0, 1, 5):
+            for is_first in (True, False):
+                expected = count_headed_goal_origins(self.df, is_first, time_window)
+                for use_jit in (False, True):
+                    result = headed_goal_origins(self.df, time_window, is_first, use_jit)
+                    self.assertEqual(result, expected)
+
+    def test_running_score(self):
+        """Testa o placar antes de cada evento contra somas acumuladas por partida."""
+        goals = ((self.df['event_type'] == 1) & (self.df['is_goal'] == 1)).astype(int)
+        home_goals = goals * (self.df['side'] == 1)
+        away_goals = goals * (self.df['side'] == 2)
+        grouped = self.df['id_odsp']
+        expected_home = home_goals.groupby(grouped).cumsum() - home_goals
+        expected_away = away_goals.groupby(grouped).cumsum() - away_goals
+
+        python_home, python_away = running_score(self.df, use_jit=False)
+        jit_home, jit_away = running_score(self.df, use_jit=True)
+        np.testing.assert_array_equal(python_home, expected_home)
+        np.testing.assert_array_equal(python_away, expected_away)
+        np.testing.assert_array_equal(jit_home, python_home)
+        np.testing.assert_array_equal(jit_away, python_away)
+
+    @unittest.skipUnless(HAS_NUMBA, "numba não está instalado")
+    def test_kernels_are_compiled(self):
+        """Testa que os laços são compilados quando numba está instalado."""
+        for name, kernel in kernels.JIT_KERNELS.items():
+            self.assertIsNot(kernel, kernels.PYTHON_KERNELS[name])
+
+    def test_errors(self):
+        """Testa os erros do módulo."""
+        with self.assertRaises(TypeError):
+            headed_goal_origins([])
+        with self.assertRaises(KeyError):
+            running_score(self.df.drop(columns=['side']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from head import get_rows_with_previous, origin_of_headed_goals
+from mapreduce import (plan_partitions, map_events, reduce_partials, finalize_partial,
+                       run_map_reduce)
+from matches import group_goals_by_match
+from shots import prepare_shots, shot_outcome_count
+
+
+def single_process(df: pd.DataFrame) -> dict:
+    """Resultados das três contagens pelo caminho em um único processo."""
+    headed = get_rows_with_previous(df.copy(), {'bodypart': 3, 'is_goal': 1})
+    return {
+        'matches': group_goals_by_match(df.copy()),
+        'shots': shot_outcome_count(prepare_shots(df)),
+        'head': origin_of_headed_goals(headed),
+    }
+
+
+class TestMapReduce(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.events = [make_events(30, seed=1), make_events(20, seed=2)]
+        self.paths = []
+        for i, events in enumerate(self.events):
+            path = os.path.join(self.tmpdir.name, f'events_{i}.csv')
+            events.to_csv(path, index=False)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_same_results(self, result, expected):
+        for key in ['matches', 'shots', 'head']:
+            pd.testing.assert_frame_equal(result[key], expected[key])
+
+    def test_plan_partitions(self):
+        """Testa se os pedaços cobrem todas as linhas dos arquivos, em ordem."""
+        partitions = plan_partitions(self.paths, 100)
+        rows = sum(nrows for _, _, _, nrows, _ in partitions)
+        self.assertEqual(rows, sum(len(events) for events in self.events))
+        self.assertTrue(partitions[0][4])
+        self.assertFalse(any(is_first for *_, is_first in partitions[1:]))
+
+        # Os pedaços de cada arquivo são contíguos e vão do fim do cabeçalho ao fim do arquivo
+        for path in self.paths:
+            ranges = [(start, end) for name, start, end, _, _ in partitions if name == path]
+            with open(path, 'rb') as file:
+                header_size = len(file.readline())
+            self.assertEqual(ranges[0][0], header_size)
+            self.assertEqual(ranges[-1][1], os.path.getsize(path))
+            self.assertTrue(all(left[1] == right[0] for left, right in zip(ranges, ranges[1:])))
+
+    def test_multiline_text(self):
+        """Testa arquivos com comentários entre aspas que contêm quebras de linha."""
+        df = self.events[0].copy()
+        df['text'] = [f'Lance "{i}"\ncom duas linhas' if i % 7 == 0 else f'Lance {i}'
+                      for i in range(len(df))]
+        path = os.path.join(self.tmpdir.name, 'multiline.csv')
+        df.to_csv(path, index=False)
+
+        partitions = plan_partitions([path], 61)
+        self.assertEqual(sum(partition[3] for partition in partitions), len(df))
+        result = run_map_reduce(path, workers=2, chunk_rows=61)
+        self.assert_same_results(result, single_process(pd.read_csv(path)))
+
+    def test_run_map_reduce_matches_single_process(self):
+        """Testa se o map-reduce em vários processos reproduz o caminho em um único
+        processo, com pedaços que cortam partidas ao meio."""
+        df = pd.read_csv(self.paths[0])
+        result = run_map_reduce(self.paths[0], workers=3, chunk_rows=97)
+        self.assert_same_results(result, single_process(df))
+
+    def test_run_map_reduce_multiple_files(self):
+        """Testa o map-reduce sobre a concatenação de vários arquivos."""
+        df = pd.concat([pd.read_csv(path) for path in self.paths], ignore_index=True)
+        result = run_map_reduce(self.paths, workers=2, chunk_rows=150)
+        self.assert_same_results(result, single_process(df))
+
+    def test_reduce_split_headed_goal(self):
+        """Testa um gol de cabeça cujo evento anterior está no pedaço anterior."""
+        df = pd.read_csv(self.paths[0])
+        headed = df.index[(df['is_goal'] == 1) & (df['bodypart'] == 3)]
+        split = int(headed[headed > 0][0])
+        partials = [map_events(df.iloc[:split], True), map_events(df.iloc[split:], False)]
+        result = finalize_partial(reduce_partials(partials))
+        self.assert_same_results(result, single_process(df))
+
+    def test_invalid_inputs(self):
+        """Testa o funcionamento das funções ao receber parâmetros inválidos."""
+        self.assertRaises(TypeError, plan_partitions, self.paths[0], 10)
+        self.assertRaises(ValueError, plan_partitions, self.paths, 0)
+        self.assertRaises(FileNotFoundError, plan_partitions, ['invalid_path.csv'], 10)
+        self.assertRaises(TypeError, map_events, 'events')
+        self.assertRaises(KeyError, map_events, pd.DataFrame({'id_odsp': [1]}))
+        self.assertRaises(ValueError, reduce_partials, [])
+        self.assertRaises(ValueError, run_map_reduce, self.paths, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
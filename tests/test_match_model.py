@@ -0,0 +1,120 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from match_model import (match_goals, fit_match_model, expected_match_goals,
+                         outcome_probabilities, team_strengths)
+
+
+def simulate_matches(n_teams=12, rounds=12, home_advantage=0.3, seed=0):
+    """Gera eventos de partidas com gols de Poisson e parâmetros conhecidos."""
+    rng = np.random.default_rng(seed)
+    attack = rng.normal(0, 0.3, n_teams)
+    defence = rng.normal(0, 0.3, n_teams)
+    rows = []
+    match = 0
+    for _ in range(rounds):
+        for home in range(n_teams):
+            for away in range(n_teams):
+                if home == away:
+                    continue
+                home_goals = rng.poisson(np.exp(0.1 + home_advantage + attack[home] - defence[away]))
+                away_goals = rng.poisson(np.exp(0.1 + attack[away] - defence[home]))
+                events = ([(1, 0)] + [(1, 1)] * home_goals + [(2, 1)] * away_goals)
+                for side, is_goal in events:
+                    team, opponent = (home, away) if side == 1 else (away, home)
+                    rows.append({'id_odsp': f'm{match:05d}', 'side': side,
+                                 'event_team': f'T{team}', 'opponent': f'T{opponent}',
+                                 'event_type': 1 if is_goal else 3, 'is_goal': is_goal})
+                match += 1
+    return pd.DataFrame(rows), attack, defence
+
+
+class TestMatchModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df, cls.attack, cls.defence = simulate_matches()
+        cls.model = fit_match_model(cls.df)
+
+    def test_match_goals(self):
+        """Testa que as partidas sem gols também aparecem na tabela."""
+        goals = match_goals(self.df)
+        self.assertEqual(len(goals), self.df['id_odsp'].nunique())
+        self.assertEqual(goals['home_goals'].sum() + goals['away_goals'].sum(),
+                         self.df['is_goal'].sum())
+
+    def test_goalless_and_one_sided_subsets(self):
+        """Testa a tabela e o ajuste sobre partidas sem gols ou com gols de um só lado."""
+        goals = match_goals(self.df)
+        goalless = goals.index[(goals['home_goals'] == 0) & (goals['away_goals'] == 0)][0]
+        one_sided = goals.index[(goals['home_goals'] > 0) & (goals['away_goals'] == 0)][0]
+
+        for matches, expected in (([goalless], [0, 0]), ([one_sided], None),
+                                  ([goalless, one_sided], None)):
+            subset = self.df[self.df['id_odsp'].isin(matches)]
+            table = match_goals(subset)
+            columns = ['home_team', 'away_team', 'home_goals', 'away_goals']
+            pd.testing.assert_frame_equal(table[columns], goals.loc[table.index, columns])
+            if expected is not None:
+                self.assertEqual(table.iloc[0][['home_goals', 'away_goals']].tolist(), expected)
+            self.assertTrue(np.isfinite(fit_match_model(subset)['log_likelihood']))
+
+    def test_parameter_recovery(self):
+        """Testa que o modelo recupera a vantagem de casa e as forças simuladas."""
+        self.assertAlmostEqual(self.model['home_advantage'], 0.3, delta=0.1)
+        teams = [int(name[1:]) for name in self.model['teams']]
+        attack = self.model['attack'] - self.model['attack'].mean()
+        self.assertGreater(np.corrcoef(attack, self.attack[teams])[0, 1], 0.8)
+        self.assertGreater(np.corrcoef(self.model['defence'], self.defence[teams])[0, 1], 0.8)
+
+    def test_outcome_probabilities(self):
+        """Testa as probabilidades de vários confrontos calculadas de uma vez."""
+        teams = list(self.model['teams'])
+        home_teams = teams * len(teams)
+        away_teams = [team for team in teams for _ in teams]
+        probabilities = outcome_probabilities(self.model, home_teams, away_teams)
+        totals = probabilities[['home_win', 'draw', 'away_win']].sum(axis=1)
+        np.testing.assert_allclose(totals, 1.0)
+
+        # Um time contra ele mesmo só difere pela vantagem de casa
+        same = probabilities[probabilities['home_team'] == probabilities['away_team']]
+        self.assertTrue((same['home_win'] > same['away_win']).all())
+
+        home_mean, _ = expected_match_goals(self.model, np.array([0]), np.array([1]))
+        self.assertAlmostEqual(probabilities['home_goals'].iloc[len(teams)], home_mean[0])
+
+    def test_dixon_coles(self):
+        """Testa a correção de Dixon-Coles."""
+        model = fit_match_model(self.df, dixon_coles=True)
+        self.assertGreaterEqual(model['log_likelihood'], self.model['log_likelihood'] - 1e-6)
+        self.assertLess(abs(model['rho']), 0.3)
+        probabilities = outcome_probabilities(model, ['T0'], ['T1'])
+        self.assertAlmostEqual(probabilities[['home_win', 'draw', 'away_win']].sum(axis=1)[0], 1)
+
+    def test_team_strengths(self):
+        """Testa a tabela de forças."""
+        strengths = team_strengths(self.model)
+        self.assertEqual(len(strengths), len(self.model['teams']))
+        self.assertTrue(strengths['strength'].is_monotonic_decreasing)
+
+    def test_fake_events(self):
+        """Testa o ajuste sobre eventos com o formato de events.csv."""
+        model = fit_match_model(make_events(40, seed=3))
+        self.assertTrue(np.isfinite(model['log_likelihood']))
+
+    def test_errors(self):
+        """Testa os erros do módulo."""
+        with self.assertRaises(ValueError):
+            fit_match_model(self.df, l2=0)
+        with self.assertRaises(KeyError):
+            outcome_probabilities(self.model, ['Desconhecido'], ['T1'])
+        with self.assertRaises(ValueError):
+            outcome_probabilities(self.model, ['T0'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from matches import (match_teams, team_result_matrices, team_home_advantage,
+                     head_to_head_dataframe)
+
+
+class TestMatchesTeams(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(60, seed=9)
+        # Resultados esperados calculados partida a partida
+        rows = []
+        for match, events in self.df.groupby('id_odsp'):
+            first = events.iloc[0]
+            home, away = ((first['event_team'], first['opponent']) if first['side'] == 1
+                          else (first['opponent'], first['event_team']))
+            goals = events[(events['event_type'] == 1) & (events['is_goal'] == 1)]
+            rows.append({'id_odsp': match, 'home_team': home, 'away_team': away,
+                         'home_goals': (goals['side'] == 1).sum(),
+                         'away_goals': (goals['side'] == 2).sum()})
+        self.expected = pd.DataFrame(rows)
+
+    def test_match_teams(self):
+        """Testa a identificação dos times e a codificação em inteiros."""
+        teams = match_teams(self.df)
+        self.assertEqual(list(teams['home_team']), list(self.expected['home_team']))
+        self.assertEqual(list(teams['away_team']), list(self.expected['away_team']))
+        names = teams.attrs['teams']
+        self.assertTrue((names[teams['home_id']] == teams['home_team'].to_numpy()).all())
+        self.assertTrue((names[teams['away_id']] == teams['away_team'].to_numpy()).all())
+
+    def test_team_result_matrices(self):
+        """Testa as matrizes de resultados contra a contagem partida a partida."""
+        matrices = team_result_matrices(self.df)
+        teams = list(matrices['teams'])
+        for team in teams:
+            at_home = self.expected[self.expected['home_team'] == team]
+            away = self.expected[self.expected['away_team'] == team]
+            home_expected = [(at_home['home_goals'] > at_home['away_goals']).sum(),
+                             (at_home['home_goals'] == at_home['away_goals']).sum(),
+                             (at_home['home_goals'] < at_home['away_goals']).sum()]
+            away_expected = [(away['away_goals'] > away['home_goals']).sum(),
+                             (away['away_goals'] == away['home_goals']).sum(),
+                             (away['away_goals'] < away['home_goals']).sum()]
+            np.testing.assert_array_equal(matrices['home'][teams.index(team)], home_expected)
+            np.testing.assert_array_equal(matrices['away'][teams.index(team)], away_expected)
+        self.assertEqual(matrices['head_to_head'].sum(), len(self.expected))
+
+    def test_team_home_advantage(self):
+        """Testa as porcentagens e as diferenças entre casa e fora."""
+        advantage = team_home_advantage(self.df)
+        self.assertTrue(advantage['victories_delta'].is_monotonic_decreasing)
+        totals = advantage[['home_victories_percentage', 'home_draws_percentage',
+                            'home_defeats_percentage']].sum(axis=1)
+        np.testing.assert_allclose(totals[advantage['home_matches'] > 0], 100)
+        np.testing.assert_allclose(advantage['points_delta'],
+                                   advantage['home_points_per_match'] -
+                                   advantage['away_points_per_match'])
+        self.assertEqual(advantage['home_matches'].sum(), len(self.expected))
+
+    def test_head_to_head_dataframe(self):
+        """Testa o DataFrame de confrontos."""
+        head_to_head = head_to_head_dataframe(team_result_matrices(self.df))
+        expected = self.expected.groupby(['home_team', 'away_team']).size()
+        result = head_to_head.set_index(['home_team', 'away_team'])['matches'].sort_index()
+        np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+        self.assertEqual(list(result.index), list(expected.index))
+        with self.assertRaises(KeyError):
+            head_to_head_dataframe({})
+
+    def test_errors(self):
+        """Testa os erros de match_teams, team_result_matrices e team_home_advantage."""
+        for function in (match_teams, team_result_matrices, team_home_advantage):
+            with self.assertRaises(TypeError):
+                function([])
+            with self.assertRaises(KeyError):
+                function(self.df.drop(columns=['opponent']))
+
+        for function in (team_result_matrices, team_home_advantage):
+            with self.assertRaises(KeyError):
+                function(self.df.drop(columns=['is_goal']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from packed import (FIELD_CODES, FIELD_LAYOUT, pack_events, unpack_events, field_values,
+                    packed_mask, filter_packed, packed_nbytes)
+from utils import filter_df
+
+
+class TestPacked(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(30, seed=2)
+        self.packed = pack_events(self.df)
+
+    def test_layout(self):
+        """Testa que os campos não se sobrepõem e cabem em 32 bits."""
+        used = 0
+        for layout in FIELD_LAYOUT.values():
+            bits = layout['mask'] << layout['shift']
+            self.assertEqual(used & bits, 0)
+            used |= bits
+        self.assertLess(used, 2 ** 32)
+
+    def test_round_trip(self):
+        """Testa que desempacotar devolve os códigos originais, com os ausentes."""
+        unpacked = unpack_events(self.packed)
+        self.assertEqual(list(unpacked['id_odsp']), list(self.df['id_odsp']))
+        for column in FIELD_CODES:
+            np.testing.assert_array_equal(unpacked[column].to_numpy(dtype=float),
+                                          self.df[column].to_numpy(dtype=float))
+        self.assertTrue(np.isnan(field_values(self.packed, 'location')).any())
+        self.assertEqual(self.packed['words'].dtype, np.uint32)
+        self.assertEqual(packed_nbytes(self.packed), 8 * len(self.df))
+
+    def test_filter_packed(self):
+        """Testa que os filtros sobre as palavras equivalem a filter_df."""
+        for conditions in ({'event_type': 1, 'is_goal': 1},
+                           {'event_type': 1, 'bodypart': 3, 'side': 2},
+                           {'location': 3},
+                           {'event_type': 2, 'fast_break': 0},
+                           {'event_type': 99}):
+            expected = filter_df(self.df, conditions)
+            mask = packed_mask(self.packed, conditions)
+            np.testing.assert_array_equal(np.flatnonzero(mask), expected.index)
+            filtered = filter_packed(self.packed, conditions)
+            self.assertEqual(list(unpack_events(filtered)['id_odsp']),
+                             list(expected['id_odsp']))
+
+    def test_list_conditions(self):
+        """Testa condições com listas de valores."""
+        mask = packed_mask(self.packed, {'event_type': 1, 'location': [3, 9, 10]})
+        expected = (self.df['event_type'] == 1) & self.df['location'].isin([3, 9, 10])
+        np.testing.assert_array_equal(mask, expected.to_numpy())
+
+    def test_errors(self):
+        """Testa os erros do módulo."""
+        with self.assertRaises(TypeError):
+            pack_events([])
+        with self.assertRaises(KeyError):
+            pack_events(self.df.drop(columns=['id_odsp']))
+        invalid = self.df.copy()
+        invalid.loc[0, 'location'] = 25
+        with self.assertRaises(ValueError):
+            pack_events(invalid)
+        invalid = self.df.copy()
+        invalid['is_goal'] = invalid['is_goal'].astype(float)
+        invalid.loc[0, 'is_goal'] = np.nan
+        with self.assertRaises(ValueError):
+            pack_events(invalid)
+        with self.assertRaises(KeyError):
+            packed_mask(pack_events(self.df[['id_odsp', 'side']]), {'event_type': 1})
+        with self.assertRaises(TypeError):
+            packed_mask(self.packed, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from players import encode_players, player_stats, top_players
+from shots import prepare_shots
+
+
+class TestPlayers(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(40, seed=8)
+        # Assistências: o jogador do evento anterior ao gol
+        self.df['player2'] = self.df['player'].shift(1).where(self.df['is_goal'] == 1)
+        self.stats = player_stats(self.df)
+
+    def test_encode_players(self):
+        """Testa se autor e assistente usam o mesmo dicionário de códigos."""
+        (players, assisters), names = encode_players(self.df)
+        self.assertTrue((names[players] == self.df['player'].to_numpy()).all())
+        has_assist = assisters >= 0
+        self.assertTrue((names[assisters[has_assist]] ==
+                         self.df['player2'].to_numpy()[has_assist]).all())
+        self.assertEqual(len(names), self.df['player'].nunique())
+
+    def test_player_stats(self):
+        """Testa as contagens por jogador contra agrupamentos do pandas."""
+        shots = self.df[self.df['event_type'] == 1]
+        goals = shots[shots['is_goal'] == 1]
+        expected_goals = goals.groupby('player').size()
+        pd.testing.assert_series_equal(self.stats['goals'][expected_goals.index],
+                                       expected_goals, check_names=False)
+        self.assertEqual(self.stats['shots'].sum(), len(shots))
+        self.assertEqual(self.stats['headed_goals'].sum(), (goals['bodypart'] == 3).sum())
+        self.assertEqual(self.stats['assists'].sum(), goals['player2'].notna().sum())
+
+    def test_conversion_reuses_shot_classification(self):
+        """Testa se dentro/fora da área seguem a classificação de prepare_shots."""
+        classified = prepare_shots(self.df).join(self.df['player'])
+        inside = classified[classified['situation'] == 'inside']
+        expected = inside.groupby('player')['is_goal'].agg(['size', 'sum'])
+        np.testing.assert_array_equal(self.stats.loc[expected.index, 'shots_inside'],
+                                      expected['size'])
+        np.testing.assert_allclose(self.stats.loc[expected.index, 'conversion_inside'],
+                                   expected['sum'] / expected['size'])
+
+    def test_top_players(self):
+        """Testa se o top-k coincide com a ordenação completa."""
+        top = top_players(self.stats, 'shots', k=3)
+        expected = self.stats.reset_index().sort_values(['shots', 'player'],
+                                                        ascending=[False, True]).head(3)
+        self.assertEqual(list(top.index), list(expected['player']))
+
+        top_conversion = top_players(self.stats, 'conversion_inside', k=2, min_shots=5)
+        self.assertTrue((top_conversion['shots'] >= 5).all())
+        self.assertTrue(top_conversion['conversion_inside'].is_monotonic_decreasing)
+        self.assertEqual(len(top_players(self.stats, 'goals', k=100)), len(self.stats))
+
+    def test_errors(self):
+        """Testa os erros das funções."""
+        with self.assertRaises(TypeError):
+            player_stats([])
+        with self.assertRaises(KeyError):
+            player_stats(self.df.drop(columns=['player2']))
+        with self.assertRaises(KeyError):
+            top_players(self.stats, 'cards')
+        with self.assertRaises(ValueError):
+            top_players(self.stats, 'goals', k=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from head import head_summary
+from matches import matches_summary
+from plugins import (PLUGIN_FACTORIES, build_plugins, head_plugin, make_plugin,
+                     register_plugin, scan_events, shots_plugin)
+from shots import shots_summary
+
+
+class TestPlugins(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(40, seed=5)
+
+    def assert_same_summaries(self, result, time_window=1):
+        pd.testing.assert_frame_equal(result['matches'], matches_summary(self.df.copy()))
+        expected_goals, expected_attempts = shots_summary(self.df.copy())
+        pd.testing.assert_frame_equal(result['shots'][0], expected_goals)
+        pd.testing.assert_frame_equal(result['shots'][1], expected_attempts)
+        pd.testing.assert_frame_equal(result['head'], head_summary(self.df.copy(), time_window))
+
+    def test_single_scan_matches_summaries(self):
+        """Testa os resumos da leitura única contra as funções de cada hipótese."""
+        self.assert_same_summaries(scan_events(self.df))
+
+    def test_chunked_scan(self):
+        """Testa que o resultado não depende do tamanho dos pedaços."""
+        for chunk_rows in [3, 37, 500]:
+            self.assert_same_summaries(scan_events(self.df, chunk_rows=chunk_rows))
+
+    def test_head_time_window(self):
+        """Testa a janela de tempo dos gols de cabeça, inclusive nas fronteiras."""
+        plugins = build_plugins({'matches': {}, 'shots': {}, 'head': {'time_window': 5}})
+        self.assert_same_summaries(scan_events(self.df, plugins, chunk_rows=13), 5)
+
+    def test_file_and_stream_sources(self):
+        """Testa a leitura de um arquivo e de uma sequência de DataFrames."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.csv')
+            self.df.to_csv(path, index=False)
+            self.assert_same_summaries(scan_events(path, chunk_rows=100))
+
+        chunks = (self.df.iloc[start:start + 250] for start in range(0, len(self.df), 250))
+        self.assert_same_summaries(scan_events(chunks))
+
+    def test_input_not_modified(self):
+        """Testa que os plugins não modificam o DataFrame recebido."""
+        original = self.df.copy()
+        scan_events(self.df)
+        pd.testing.assert_frame_equal(self.df, original)
+
+    def test_custom_plugin(self):
+        """Testa um plugin novo executado na mesma leitura."""
+        def update(state, chunk):
+            state['rows'] = state.get('rows', 0) + chunk.shape[0]
+
+        plugin = make_plugin('rows', ['id_odsp'], update, lambda state: state['rows'])
+        result = scan_events(self.df, [plugin, shots_plugin()], chunk_rows=100)
+        self.assertEqual(result['rows'], len(self.df))
+        self.assertEqual(set(result), {'rows', 'shots'})
+
+    def test_register_plugin(self):
+        """Testa o registro de uma fábrica de plugins."""
+        def factory():
+            return make_plugin('events', ['id_odsp'], lambda state, chunk: None,
+                               lambda state: 'ok')
+
+        register_plugin('events', factory)
+        try:
+            self.assertEqual(scan_events(self.df)['events'], 'ok')
+            self.assertRaises(ValueError, register_plugin, 'events', factory)
+        finally:
+            del PLUGIN_FACTORIES['events']
+
+    def test_errors(self):
+        """Testa os erros de parâmetros, de colunas e de fonte vazia."""
+        self.assertRaises(TypeError, make_plugin, 'x', 'id_odsp', print, print)
+        self.assertRaises(TypeError, make_plugin, 'x', ['id_odsp'], None, print)
+        self.assertRaises(KeyError, build_plugins, {'inexistente': {}})
+        self.assertRaises(TypeError, scan_events, self.df, None, 1.5)
+        self.assertRaises(ValueError, scan_events, self.df, None, 0)
+        self.assertRaises(ValueError, scan_events, self.df, [head_plugin(), head_plugin()])
+        self.assertRaises(KeyError, scan_events, self.df.drop(columns=['bodypart']))
+        self.assertRaises(ValueError, scan_events, iter([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import json
+import threading
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import urlopen
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+import server
+from fake_events import make_events
+from head import HEADER_TIME_WINDOW, head_summary
+from matches import matches_summary
+from shots import shots_summary
+from server import (state_from_dataframe, parse_request, compute_endpoint,
+                    cached_response, make_server)
+
+
+class TestServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.df = make_events(30, seed=6)
+        cls.state = state_from_dataframe(cls.df)
+        cls.server = make_server(cls.state, port=0)
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def get(self, path):
+        with urlopen(self.url + path) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def test_parse_request(self):
+        """Testa a normalização dos parâmetros."""
+        endpoint, params = parse_request('/shots?locations_inside=9,3&locations_inside=3')
+        self.assertEqual(endpoint, 'shots')
+        self.assertEqual(params['locations_inside'], [3, 9])
+        self.assertEqual(parse_request('/head')[1], {'time_window': float(HEADER_TIME_WINDOW)})
+        with self.assertRaises(KeyError):
+            parse_request('/players')
+        with self.assertRaises(ValueError):
+            parse_request('/head?time_window=abc')
+        with self.assertRaises(ValueError):
+            parse_request('/shots?locations_inside=a')
+        with self.assertRaises(ValueError):
+            parse_request('/matches?unknown=1')
+
+    def test_endpoints(self):
+        """Testa que os endpoints devolvem os mesmos resumos das hipóteses."""
+        expected = matches_summary(self.df)
+        result = pd.DataFrame(self.get('/matches')['summary'])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+        shots = self.get('/shots?locations_inside=3,9,10')
+        stats_goals, perc_attempts = shots_summary(self.df, [3, 9, 10])
+        pd.testing.assert_frame_equal(pd.DataFrame(shots['goals']), stats_goals,
+                                      check_dtype=False)
+        pd.testing.assert_frame_equal(pd.DataFrame(shots['attempts']), perc_attempts,
+                                      check_dtype=False)
+
+        origins = pd.DataFrame(self.get('/head?time_window=2')['origins'])
+        pd.testing.assert_frame_equal(origins, head_summary(self.df, 2), check_dtype=False)
+
+        self.assertEqual(self.get('/health'), {'events': len(self.df), 'matches': 30})
+
+    def test_subset_of_matches(self):
+        """Testa o cálculo restrito a um subconjunto de partidas."""
+        matches = list(self.df['id_odsp'].unique()[[2, 5, 7]])
+        subset = self.df[self.df['id_odsp'].isin(matches)]
+        result = pd.DataFrame(self.get('/matches?matches=' + ','.join(matches))['summary'])
+        pd.testing.assert_frame_equal(result, matches_summary(subset), check_dtype=False)
+
+    def test_one_sided_and_goalless_matches(self):
+        """Testa partidas em que só um lado marcou e partidas sem gols."""
+        goals = self.df[(self.df['event_type'] == 1) & (self.df['is_goal'] == 1)]
+        sides = goals.groupby('id_odsp')['side'].nunique()
+        one_sided = sides[sides == 1].index[0]
+        goalless = sorted(set(self.df['id_odsp']) - set(goals['id_odsp']))[0]
+
+        result = pd.DataFrame(self.get(f'/matches?matches={one_sided}')['summary'])
+        expected = matches_summary(self.df[self.df['id_odsp'] == one_sided])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+        result = self.get(f'/matches?matches={goalless}')['summary']
+        self.assertEqual([row['home_percentage'] for row in result], [0, 0, 0])
+        result = self.get(f'/shots?matches={goalless}')['goals']
+        self.assertEqual([row['Porcentagem'] for row in result], [0, 0])
+
+    def test_errors(self):
+        """Testa os códigos de erro HTTP."""
+        with self.assertRaises(HTTPError) as context:
+            self.get('/unknown')
+        self.assertEqual(context.exception.code, 404)
+        with self.assertRaises(HTTPError) as context:
+            self.get('/matches?matches=missing')
+        self.assertEqual(context.exception.code, 400)
+
+        def broken(state, endpoint, params):
+            raise KeyError('coluna interna')
+
+        with mock.patch.object(server, 'compute_endpoint', broken):
+            with self.assertRaises(HTTPError) as context:
+                self.get('/head?time_window=7')
+        self.assertEqual(context.exception.code, 500)
+
+    def test_concurrent_requests_share_cache(self):
+        """Testa que requisições simultâneas iguais calculam o resumo uma única vez."""
+        state = state_from_dataframe(self.df)
+        calls = []
+        original = server.compute_endpoint
+
+        def counted(state, endpoint, params):
+            calls.append(endpoint)
+            return original(state, endpoint, params)
+
+        with mock.patch.object(server, 'compute_endpoint', counted):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(
+                    lambda _: cached_response(state, *parse_request('/head')), range(16)))
+        self.assertEqual(calls, ['head'])
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_cache_size(self):
+        """Testa o limite de respostas guardadas no cache."""
+        state = state_from_dataframe(self.df, cache_size=2)
+        for window in (1, 2, 3):
+            cached_response(state, *parse_request(f'/head?time_window={window}'))
+        self.assertEqual(len(state['cache']), 2)
+        self.assertEqual(compute_endpoint(state, 'health', {})['events'], len(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from sketches import (hash_values, new_hyperloglog, hyperloglog_update, hyperloglog_count,
+                      new_count_min, count_min_update, count_min_query, new_heavy_hitters,
+                      heavy_hitters_update, heavy_hitters_top, merge_sketches, event_sketches)
+from utils import load_dataset
+
+
+class TestSketches(unittest.TestCase):
+    def test_hash_values(self):
+        """Testa se valores iguais têm hashes iguais, inclusive em pares de colunas."""
+        hashes = hash_values(pd.Series(['a', 'b', 'a']))
+        self.assertEqual(hashes.dtype, np.uint64)
+        self.assertEqual(hashes[0], hashes[2])
+        pairs = hash_values(pd.DataFrame({'x': [1.0, 1.0, 2.0], 'y': [3.0, 3.0, 3.0]}))
+        self.assertEqual(pairs[0], pairs[1])
+        self.assertNotEqual(pairs[0], pairs[2])
+        with self.assertRaises(TypeError):
+            hash_values([1, 2])
+
+    def test_hyperloglog(self):
+        """Testa a contagem de distintos dentro do erro documentado."""
+        sketch = new_hyperloglog()
+        for start in range(0, 200_000, 50_000):
+            values = pd.Series(np.arange(start, start + 50_000) % 120_000).astype(str)
+            hyperloglog_update(sketch, values)
+        self.assertAlmostEqual(hyperloglog_count(sketch) / 120_000, 1, delta=0.03)
+
+        small = new_hyperloglog()
+        hyperloglog_update(small, pd.Series(['a', 'b', 'c', 'a']))
+        self.assertEqual(hyperloglog_count(small), 3)
+        with self.assertRaises(ValueError):
+            new_hyperloglog(2)
+
+    def test_count_min(self):
+        """Testa se as estimativas nunca ficam abaixo da frequência real."""
+        rng = np.random.default_rng(0)
+        values = pd.Series(rng.zipf(1.5, size=20_000) % 1000)
+        sketch = new_count_min(epsilon=0.01, delta=0.01)
+        count_min_update(sketch, values)
+        counts = values.value_counts()
+        estimates = count_min_query(sketch, pd.Series(counts.index))
+        self.assertTrue((estimates >= counts.to_numpy()).all())
+        self.assertTrue((estimates - counts.to_numpy() <= 0.01 * len(values)).all())
+        self.assertEqual(sketch['total'], len(values))
+
+    def test_heavy_hitters(self):
+        """Testa se os valores mais frequentes são encontrados."""
+        rng = np.random.default_rng(1)
+        values = pd.Series(rng.zipf(1.8, size=30_000) % 500)
+        sketch = new_heavy_hitters(k=5)
+        for start in range(0, len(values), 4_000):
+            heavy_hitters_update(sketch, values.iloc[start:start + 4_000])
+        top = heavy_hitters_top(sketch)
+        self.assertEqual([value for value, _ in top], list(values.value_counts().index[:5]))
+        self.assertEqual([count for _, count in top], list(values.value_counts().iloc[:5]))
+
+    def test_merge(self):
+        """Testa se combinar esboços equivale a alimentar um único esboço."""
+        df = make_events(50, seed=11)
+        half = len(df) // 2
+        merged = merge_sketches(event_sketches([df.iloc[:half]], k=3),
+                                event_sketches([df.iloc[half:]], k=3))
+        single = event_sketches([df], k=3)
+        np.testing.assert_array_equal(merged['players']['registers'],
+                                      single['players']['registers'])
+        np.testing.assert_array_equal(merged['shot_pairs']['count_min']['table'],
+                                      single['shot_pairs']['count_min']['table'])
+        self.assertEqual(heavy_hitters_top(merged['shot_pairs']),
+                         heavy_hitters_top(single['shot_pairs']))
+        with self.assertRaises(TypeError):
+            merge_sketches(new_hyperloglog(), new_count_min())
+        with self.assertRaises(ValueError):
+            merge_sketches(new_hyperloglog(10), new_hyperloglog(12))
+
+    def test_event_sketches_from_load_dataset(self):
+        """Testa os esboços alimentados pelos pedaços de load_dataset."""
+        df = make_events(60, seed=12)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, 'events.csv')
+            df.to_csv(csv_path, index=False)
+            sketches = event_sketches(load_dataset(csv_path, chunksize=500), k=4)
+
+        self.assertEqual(hyperloglog_count(sketches['matches']), df['id_odsp'].nunique())
+        self.assertEqual(hyperloglog_count(sketches['players']), df['player'].nunique())
+        shots = df[df['event_type'] == 1]
+        expected = shots.groupby(['location', 'shot_outcome']).size()
+        for (location, outcome), count in heavy_hitters_top(sketches['shot_pairs']):
+            self.assertGreaterEqual(count, expected[(location, outcome)])
+        self.assertLess(len(pickle.dumps(sketches)), 4 * 1024 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
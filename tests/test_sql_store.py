@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from head import head_summary
+from matches import matches_summary
+from shots import shots_summary
+from sql_store import (build_event_store, connect_store, query_events, matches_summary_sql,
+                       shots_summary_sql, head_summary_sql)
+
+
+class TestSqlStore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        csv_path = os.path.join(cls.tmpdir.name, 'events.csv')
+        make_events(40, seed=6).to_csv(csv_path, index=False)
+        cls.events = pd.read_csv(csv_path)
+        cls.db_path = os.path.join(cls.tmpdir.name, 'events.db')
+        cls.rows = build_event_store(csv_path, cls.db_path, batch_rows=300)
+        cls.conn = connect_store(cls.db_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        cls.tmpdir.cleanup()
+
+    def test_build_event_store(self):
+        """Testa se todos os eventos e índices foram criados."""
+        self.assertEqual(self.rows, len(self.events))
+        count = query_events(self.conn, "SELECT COUNT(*) AS n FROM events")
+        self.assertEqual(count['n'][0], len(self.events))
+        indexes = query_events(self.conn, "SELECT name FROM sqlite_master WHERE type = 'index'")
+        self.assertEqual(set(indexes['name']), {'idx_events_match', 'idx_events_event_type',
+                                                'idx_events_is_goal', 'idx_events_match_order'})
+
+    def test_query_events(self):
+        """Testa uma consulta pontual com parâmetros."""
+        result = query_events(self.conn, "SELECT COUNT(*) AS n FROM events WHERE is_goal = ?", (1,))
+        self.assertEqual(result['n'][0], int((self.events['is_goal'] == 1).sum()))
+
+    def test_matches_summary_sql(self):
+        """Testa se a hipótese 1 em SQL reproduz matches_summary."""
+        pd.testing.assert_frame_equal(matches_summary_sql(self.conn),
+                                      matches_summary(self.events.copy()))
+
+    def test_shots_summary_sql(self):
+        """Testa se a hipótese 3 em SQL reproduz shots_summary, inclusive com outros
+        parâmetros."""
+        for params in [{}, {'locations_inside': [3, 13, 14], 'excluded_locations': [19]}]:
+            result = shots_summary_sql(self.conn, **params)
+            expected = shots_summary(self.events, **params)
+            for result_df, expected_df in zip(result, expected):
+                pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_head_summary_sql(self):
+        """Testa se a hipótese 2 em SQL reproduz head_summary."""
+        for time_window in [1, 3]:
+            pd.testing.assert_frame_equal(head_summary_sql(self.conn, time_window),
+                                          head_summary(self.events.copy(), time_window))
+
+    def test_invalid_inputs(self):
+        """Testa o funcionamento das funções ao receber parâmetros inválidos."""
+        self.assertRaises(TypeError, build_event_store, 3, self.db_path)
+        self.assertRaises(FileNotFoundError, build_event_store, 'invalid.csv', self.db_path)
+        self.assertRaises(FileNotFoundError, connect_store, 'invalid.db')
+        self.assertRaises(TypeError, query_events, 'conn', 'SELECT 1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from head import get_rows_with_previous, origin_of_headed_goals
+from matches import (group_goals_by_match, calculate_results, create_summary_dataframe,
+                     summary_from_results)
+from shots import prepare_shots, shot_outcome_count
+from stream import (new_stream_state, update_state, snapshot, parse_event_line,
+                    tail_csv, socket_events, run_stream)
+
+events_df = make_events(20, seed=4)
+events = events_df.to_dict('records')
+
+
+def assert_matches_batch(test, result, df):
+    """Compara um resumo da transmissão com o caminho em lote."""
+    expected_matches = create_summary_dataframe(calculate_results(group_goals_by_match(df.copy())))
+    expected_head = origin_of_headed_goals(
+        get_rows_with_previous(df.copy(), {'bodypart': 3, 'is_goal': 1}))
+    pd.testing.assert_frame_equal(result['matches'], expected_matches)
+    pd.testing.assert_frame_equal(result['shots'], shot_outcome_count(prepare_shots(df)))
+    pd.testing.assert_frame_equal(result['head'], expected_head)
+
+
+class TestUpdateState(unittest.TestCase):
+    def test_state_matches_batch(self):
+        """Testa se o estado atualizado evento a evento gera os mesmos resumos do
+        caminho em lote."""
+        state = new_stream_state()
+        for event in events:
+            update_state(state, event)
+        result = snapshot(state)
+        self.assertEqual(result['events'], len(events))
+        assert_matches_batch(self, result, events_df)
+
+    def test_empty_state(self):
+        """Testa o resumo de um estado sem eventos."""
+        result = snapshot(new_stream_state())
+        self.assertEqual(result['events'], 0)
+        pd.testing.assert_frame_equal(result['matches'], summary_from_results(0, 0, 0))
+        self.assertEqual(list(result['head']['']), ['Sem gols de cabeça'])
+
+    def test_goal_without_side(self):
+        """Testa se gols sem 'side' ficam fora do placar, como no caminho em lote."""
+        goals = events_df.index[(events_df['event_type'] == 1) & (events_df['is_goal'] == 1)]
+        df = events_df.copy()
+        df.loc[goals[:3], 'side'] = None
+        state = new_stream_state()
+        for event in df.to_dict('records'):
+            update_state(state, event)
+        result = snapshot(state)
+        self.assertEqual(result['skipped_goals'], 3)
+        assert_matches_batch(self, result, df)
+
+    def test_invalid_inputs(self):
+        """Testa o funcionamento da função update_state ao receber parâmetros do tipo
+        errado ou eventos sem as colunas necessárias."""
+        self.assertRaises(TypeError, update_state, [], events[0])
+        self.assertRaises(KeyError, update_state, new_stream_state(), {'id_odsp': 'a'})
+
+
+class TestParseEventLine(unittest.TestCase):
+    def test_parse_event_line(self):
+        """Testa o funcionamento da função parse_event_line com campos vazios e
+        vírgulas dentro de aspas."""
+        event = parse_event_line(['id_odsp', 'text', 'location'], 'm1,"Goal, header",')
+        self.assertEqual(event, {'id_odsp': 'm1', 'text': 'Goal, header', 'location': None})
+        self.assertRaises(ValueError, parse_event_line, ['id_odsp'], 'm1,2')
+
+
+class TestRunStream(unittest.TestCase):
+    def test_generator_source(self):
+        """Testa a transmissão a partir de um gerador, com publicações periódicas."""
+        snapshots = []
+
+        async def slow_events():
+            for event in events:
+                yield event
+                await asyncio.sleep(0.0002)
+
+        result = asyncio.run(run_stream(slow_events(), snapshots.append, interval=0.01))
+        self.assertGreater(len(snapshots), 1)
+        self.assertEqual(snapshots[-1]['events'], len(events))
+        assert_matches_batch(self, result, events_df)
+
+    def test_tail_csv_source(self):
+        """Testa a leitura de um arquivo CSV que recebe novas linhas durante a
+        transmissão."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'live.csv')
+            events_df.iloc[:300].to_csv(path, index=False)
+
+            async def scenario():
+                task = asyncio.create_task(run_stream(tail_csv(path, poll_interval=0.01),
+                                                      interval=0.05,
+                                                      max_events=len(events_df)))
+                await asyncio.sleep(0.05)
+                events_df.iloc[300:].to_csv(path, mode='a', header=False, index=False)
+                return await asyncio.wait_for(task, timeout=10)
+
+            result = asyncio.run(scenario())
+        assert_matches_batch(self, result, events_df)
+
+    def test_socket_source(self):
+        """Testa a leitura de eventos enviados por um socket local."""
+        payload = events_df.to_csv(index=False).encode('utf-8')
+
+        async def scenario():
+            async def producer(reader, writer):
+                writer.write(payload)
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(producer, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return await run_stream(socket_events('127.0.0.1', port))
+
+        result = asyncio.run(scenario())
+        assert_matches_batch(self, result, events_df)
+
+    def test_invalid_interval(self):
+        """Testa o funcionamento da função run_stream ao receber um intervalo
+        inválido."""
+        self.assertRaises(ValueError, asyncio.run, run_stream(events, interval=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from head import ORIGIN_EVENT_TYPES, head_summary, origins_from_counts
+from shots import shots_summary
+from sweep import (head_from_gaps, headed_goal_gaps, parameter_grid, sensitivity_table,
+                   shot_location_counts, shots_from_counts, sweep_head, sweep_shots)
+
+
+def head_by_loop(df, time_window, previous_events, set_pieces):
+    """Implementação direta da regra de head_from_gaps, evento a evento."""
+    counts = {'corners': 0, 'fouls': 0, 'offsides': 0, 'others': 0}
+    for i in range(df.shape[0]):
+        if not (df.loc[i, 'is_goal'] == 1 and df.loc[i, 'bodypart'] == 3):
+            continue
+        if i == 0:
+            counts['others'] += 1
+            continue
+        within = [j for j in range(i - 1, max(i - 1 - previous_events, -1), -1)
+                  if df.loc[j, 'id_odsp'] == df.loc[i, 'id_odsp'] and
+                  df.loc[i, 'time'] - df.loc[j, 'time'] <= time_window]
+        if not within:
+            continue
+        origins = [df.loc[j, 'event_type'] for j in within
+                   if df.loc[j, 'event_type'] in set_pieces]
+        counts[ORIGIN_EVENT_TYPES[origins[0]] if origins else 'others'] += 1
+    return origins_from_counts(counts)
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(30, seed=9)
+
+    def test_parameter_grid(self):
+        """Testa a montagem de todas as combinações de parâmetros."""
+        grid = parameter_grid({'time_window': [1, 2, 3], 'previous_events': [1, 2]})
+        self.assertEqual(len(grid), 6)
+        self.assertIn({'time_window': 3, 'previous_events': 2}, grid)
+        self.assertEqual(parameter_grid({}), [{}])
+        self.assertRaises(TypeError, parameter_grid, {'time_window': 1})
+
+    def test_shots_matches_summary(self):
+        """Testa cada ponto da grade dos chutes contra shots_summary."""
+        grid = parameter_grid({'locations_inside': [[3, 9, 10, 11, 12, 13, 14], [3, 9, 10, 13]],
+                               'excluded_locations': [[1, 2, 7, 8, 19], [], [19]]})
+        results = sweep_shots(self.df, grid)
+        self.assertEqual(len(results), len(grid))
+        for params, (stats_goals, perc_attempts) in results:
+            expected_goals, expected_attempts = shots_summary(self.df.copy(), **params)
+            pd.testing.assert_frame_equal(stats_goals, expected_goals)
+            pd.testing.assert_frame_equal(perc_attempts, expected_attempts)
+
+    def test_shots_default_parameters(self):
+        """Testa que os parâmetros ausentes usam os valores padrão de shots.py."""
+        (params, result), = sweep_shots(self.df, [{}])
+        self.assertEqual(params['excluded_locations'], [1, 2, 7, 8, 19])
+        pd.testing.assert_frame_equal(result[1], shots_summary(self.df.copy())[1])
+        pd.testing.assert_frame_equal(shots_from_counts(shot_location_counts(self.df))[0],
+                                      result[0])
+
+    def test_head_matches_summary(self):
+        """Testa a grade das janelas de tempo contra head_summary."""
+        for params, result in sweep_head(self.df, parameter_grid({'time_window': [0, 1, 2.5, 10]})):
+            pd.testing.assert_frame_equal(result, head_summary(self.df.copy(), params['time_window']))
+
+    def test_head_previous_events_and_set_pieces(self):
+        """Testa vários eventos anteriores e outras definições de bola parada."""
+        grid = parameter_grid({'time_window': [1, 5], 'previous_events': [1, 2, 4],
+                               'set_pieces': [[2, 3, 9], [2], [3, 9]]})
+        for params, result in sweep_head(self.df, grid):
+            pd.testing.assert_frame_equal(result, head_by_loop(self.df, **params))
+
+    def test_input_not_modified(self):
+        """Testa que as varreduras não modificam o DataFrame recebido."""
+        original = self.df.copy()
+        sweep_shots(self.df, [{}])
+        sweep_head(self.df, [{'previous_events': 3}])
+        pd.testing.assert_frame_equal(self.df, original)
+
+    def test_sensitivity_table(self):
+        """Testa a tabela com uma linha por ponto da grade."""
+        grid = parameter_grid({'time_window': [1, 2]})
+        table = sensitivity_table(sweep_head(self.df, grid))
+        self.assertEqual(list(table.columns),
+                         ['time_window', 'previous_events', 'set_pieces', 'Porcentagem'])
+        self.assertEqual(table.loc[0, 'set_pieces'], (2, 3, 9))
+
+        table = sensitivity_table(sweep_shots(self.df, [{'excluded_locations': []}]))
+        expected = shots_summary(self.df.copy(), excluded_locations=[])[0]
+        self.assertEqual(table.loc[0, 'Porcentagem'], expected.loc[0, 'Porcentagem'])
+
+    def test_no_headed_goals(self):
+        """Testa a varredura sem nenhum gol de cabeça."""
+        df = self.df.assign(bodypart=1)
+        (_, result), = sweep_head(df, [{}])
+        pd.testing.assert_frame_equal(result, head_summary(df.copy()))
+        self.assertTrue(np.isnan(sensitivity_table([({}, result)]).loc[0, 'Porcentagem']))
+
+    def test_errors(self):
+        """Testa os erros de parâmetros inexistentes e fora do intervalo."""
+        self.assertRaises(KeyError, sweep_shots, self.df, [{'time_window': 1}])
+        self.assertRaises(TypeError, sweep_head, self.df, {'time_window': 1})
+        self.assertRaises(ValueError, sweep_head, self.df, [{'set_pieces': [1]}])
+        self.assertRaises(ValueError, headed_goal_gaps, self.df, 0)
+        gaps = headed_goal_gaps(self.df, 2)
+        self.assertRaises(ValueError, head_from_gaps, gaps, 1, 3)
+        self.assertRaises(KeyError, shot_location_counts, self.df.drop(columns=['location']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from text_index import (tokenize, build_text_index, save_text_index, load_text_index,
+                        load_dataset_with_text_index, search, search_events, INDEX_SUFFIX,
+                        _encode_varint, _decode_varint)
+
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(30, seed=7)
+        self.index = build_text_index(self.df['text'])
+        self.texts = self.df['text'].str.lower()
+
+    def expected(self, mask):
+        return np.flatnonzero(mask.to_numpy())
+
+    def test_tokenize(self):
+        """Testa a separação dos textos em termos."""
+        tokens = tokenize(pd.Series(['Goal!  Tiago Melo (Alpha FC)', None]))
+        self.assertEqual(tokens.iloc[0], ['goal', 'tiago', 'melo', 'alpha', 'fc'])
+        self.assertEqual(tokens.iloc[1], [])
+
+    def test_varint_round_trip(self):
+        """Testa se a codificação varint é reversível, inclusive para valores grandes."""
+        values = np.array([0, 1, 127, 128, 300, 16384, 2 ** 40], dtype=np.int64)
+        encoded = _encode_varint(values)
+        self.assertEqual(encoded.dtype, np.uint8)
+        np.testing.assert_array_equal(_decode_varint(encoded), values)
+
+    def test_single_term(self):
+        """Testa a busca de um termo, sem diferenciar maiúsculas."""
+        np.testing.assert_array_equal(search(self.index, 'Header'),
+                                      self.expected(self.texts.str.contains(r'\bheader\b')))
+
+    def test_boolean_query(self):
+        """Testa a combinação de termos com E, OR e exclusão."""
+        mask = ((self.texts.str.contains(r'\bgoal\b') & self.texts.str.contains(r'\bheader\b')
+                 & ~self.texts.str.contains(r'\balpha\b'))
+                | (self.texts.str.contains(r'\bfoul\b') & self.texts.str.contains(r'\bbeta\b')))
+        np.testing.assert_array_equal(search(self.index, 'goal AND header -alpha OR foul beta'),
+                                      self.expected(mask))
+
+    def test_phrase_query(self):
+        """Testa se a busca por frase exige os termos em sequência."""
+        mask = self.texts.str.contains(r'corner,\s+alpha fc', regex=True)
+        np.testing.assert_array_equal(search(self.index, '"corner alpha fc"'), self.expected(mask))
+        self.assertEqual(search(self.index, '"fc alpha"').size, 0)
+
+    def test_unknown_term(self):
+        """Testa se termos inexistentes não geram resultados."""
+        self.assertEqual(search(self.index, 'bicycle').size, 0)
+
+    def test_search_errors(self):
+        """Testa os erros da busca."""
+        with self.assertRaises(TypeError):
+            search(self.index, 3)
+        with self.assertRaises(ValueError):
+            search(self.index, '-goal')
+
+    def test_search_events(self):
+        """Testa se os eventos encontrados mantêm o índice do DataFrame original."""
+        events = search_events(self.index, self.df, 'goal header')
+        self.assertTrue((events['bodypart'] == 3).all())
+        self.assertTrue((events['is_goal'] == 1).all())
+        pd.testing.assert_frame_equal(events, self.df.loc[events.index])
+        with self.assertRaises(ValueError):
+            search_events(self.index, self.df.iloc[1:], 'goal')
+
+    def test_save_and_load(self):
+        """Testa se o índice gravado em disco produz as mesmas buscas."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'index.npz')
+            save_text_index(self.index, path)
+            loaded = load_text_index(path)
+        for query in ['goal', '"right footed shot"', 'corner -beta OR offside']:
+            np.testing.assert_array_equal(search(loaded, query), search(self.index, query))
+        with self.assertRaises(FileNotFoundError):
+            load_text_index(os.path.join(tmpdir, 'missing.npz'))
+
+    def test_load_dataset_with_text_index(self):
+        """Testa se o índice é criado ao lado do CSV e reaproveitado depois."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, 'events.csv')
+            self.df.to_csv(csv_path, index=False)
+            df, index = load_dataset_with_text_index(csv_path)
+            self.assertTrue(os.path.isfile(csv_path + INDEX_SUFFIX))
+            mtime = os.path.getmtime(csv_path + INDEX_SUFFIX)
+
+            df_again, index_again = load_dataset_with_text_index(csv_path)
+            self.assertEqual(os.path.getmtime(csv_path + INDEX_SUFFIX), mtime)
+            np.testing.assert_array_equal(search(index_again, 'goal'), search(index, 'goal'))
+            self.assertEqual(len(df_again), len(self.df))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from timeline import (minute_counts, minute_rates, rates_by_interval, events_after,
+                      window_summary, GOAL_CATEGORY)
+
+
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(50, seed=13)
+
+    def test_minute_counts(self):
+        """Testa a contagem por tipo, lado e minuto contra um agrupamento do pandas."""
+        counts = minute_counts(self.df)
+        self.assertEqual(counts.shape[2], self.df['time'].max() + 1)
+        corners = self.df[self.df['event_type'] == 2].groupby(['side', 'time']).size()
+        for (side, minute), n in corners.items():
+            self.assertEqual(counts[2, side - 1, minute], n)
+        self.assertEqual(counts[2].sum(), corners.sum())
+        goals = self.df[(self.df['event_type'] == 1) & (self.df['is_goal'] == 1)]
+        self.assertEqual(counts[GOAL_CATEGORY].sum(), len(goals))
+        self.assertEqual(counts[GOAL_CATEGORY, 0].sum(), (goals['side'] == 1).sum())
+
+    def test_minute_rates(self):
+        """Testa as médias por partida."""
+        rates = minute_rates(self.df, ['shots'])
+        shots = self.df[(self.df['event_type'] == 1) & (self.df['side'] == 2)]
+        self.assertAlmostEqual(rates['shots_away'].sum(), len(shots) / 50)
+        with self.assertRaises(KeyError):
+            minute_rates(self.df, ['passes'])
+
+    def test_red_cards_series(self):
+        """Testa se a série de cartões vermelhos inclui o segundo amarelo e o vermelho
+        direto, também como alvo de events_after."""
+        df = self.df.copy()
+        df.loc[df.index[0], 'event_type'] = 3
+        df.loc[df.index[1:40:2], 'event_type'] = 5
+        df.loc[df.index[2:40:2], 'event_type'] = 6
+        rates = minute_rates(df, ['red_cards'])
+        reds = df[df['event_type'].isin([5, 6])]
+        self.assertAlmostEqual(rates['red_cards_home'].sum(), (reds['side'] == 1).sum() / 50)
+        self.assertAlmostEqual(rates['red_cards_away'].sum(), (reds['side'] == 2).sum() / 50)
+
+        after = events_after(df, [3], 'red_cards', 200)
+        first = df.iloc[0]
+        later = reds[(reds['id_odsp'] == first['id_odsp']) & (reds['time'] > first['time'])]
+        self.assertGreater(len(later), 0)
+        self.assertEqual(after.loc[0, 'same_side'] + after.loc[0, 'opponent'], len(later))
+
+    def test_missing_time(self):
+        """Testa se eventos sem minuto são ignorados em vez de interromper a contagem."""
+        df = self.df.copy()
+        df.loc[df.index[::7], 'time'] = np.nan
+        counts = minute_counts(df)
+        self.assertEqual(counts.sum(), minute_counts(df.dropna(subset=['time'])).sum())
+        after = events_after(df, [3], 'goals', 10)
+        self.assertEqual(len(after), ((df['event_type'] == 3) & df['time'].notna()).sum())
+
+    def test_rates_by_interval(self):
+        """Testa o agrupamento por intervalos, no formato do gráfico."""
+        by_interval = rates_by_interval(self.df, 'goals', 15)
+        self.assertEqual(list(by_interval.columns), ['Intervalo', 'Casa', 'Fora'])
+        self.assertEqual(by_interval['Intervalo'].iloc[0], '0-14')
+        rates = minute_rates(self.df, ['goals'])
+        self.assertAlmostEqual(by_interval['Casa'].sum(), rates['goals_home'].sum(), places=3)
+        with self.assertRaises(ValueError):
+            rates_by_interval(self.df, 'goals', 0)
+
+    def test_events_after(self):
+        """Testa as janelas deslizantes contra uma contagem direta por gatilho."""
+        after = events_after(self.df, [3], 'goals', 10)
+        triggers = self.df[self.df['event_type'] == 3]
+        self.assertEqual(len(after), len(triggers))
+        goals = self.df[(self.df['event_type'] == 1) & (self.df['is_goal'] == 1)]
+        for (_, trigger), (_, row) in zip(triggers.iterrows(), after.iterrows()):
+            window = goals[(goals['id_odsp'] == trigger['id_odsp']) &
+                           (goals['time'] > trigger['time']) &
+                           (goals['time'] <= trigger['time'] + 10)]
+            self.assertEqual(row['same_side'], (window['side'] == trigger['side']).sum())
+            self.assertEqual(row['opponent'], (window['side'] != trigger['side']).sum())
+
+    def test_window_summary(self):
+        """Testa o resumo das janelas."""
+        after = pd.DataFrame({'same_side': [0, 1, 2], 'opponent': [1, 1, 4]})
+        summary = window_summary(after)
+        self.assertEqual(list(summary['Total']), [3, 6])
+        self.assertEqual(list(summary['Média']), [1.0, 2.0])
+
+    def test_errors(self):
+        """Testa os erros das funções."""
+        with self.assertRaises(TypeError):
+            minute_counts([])
+        with self.assertRaises(KeyError):
+            minute_counts(self.df.drop(columns=['side']))
+        with self.assertRaises(ValueError):
+            events_after(self.df, window=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
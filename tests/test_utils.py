@@ -1,10 +1,15 @@
+import os
+import tempfile
 import unittest
+import zipfile
 import pandas as pd
 import sys
 
 sys.path.append('../src')
 
-from utils import remove_columns, filter_df, remove_lines_by_condition, map_column_values, print_dataframe
+from utils import (remove_columns, filter_df, remove_lines_by_condition, map_column_values,
+                   print_dataframe, load_dictionary, load_dataset, open_compressed)
+from fake_events import make_events
 
 grades = [
         [1, 'Arnaldo', 7.0], 
@@ -168,5 +173,81 @@ class PrintDataFrame(unittest.TestCase):
         self.assertRaises(TypeError, print_dataframe, grades_df, 7)
 
 
+class LoadDictionary(unittest.TestCase):
+    def test_load_dictionary_success(self):
+        """Testa o funcionamento da função load_dictionary com o dictionary.txt do
+        projeto."""
+        dictionary = load_dictionary('../data/dictionary.txt')
+        self.assertEqual(dictionary['side'], {1: 'Home', 2: 'Away'})
+        self.assertEqual(len(dictionary['location']), 19)
+        self.assertEqual(dictionary['event_type'][9], 'Offside')
+
+    def test_invalid_path(self):
+        """Testa o funcionamento da função load_dictionary ao receber um caminho
+        inválido ou do tipo errado."""
+        self.assertRaises(TypeError, load_dictionary, 7)
+        self.assertRaises(FileNotFoundError, load_dictionary, 'invalid_path.txt')
+
+
+class LoadDataset(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.df = make_events(5, seed=9)
+        self.csv_path = os.path.join(self.directory.name, 'events.csv')
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_compressed_files(self):
+        """Testa a leitura de arquivos .gz, .bz2 e .xz contra o CSV original."""
+        expected = load_dataset(self.csv_path)
+        for extension in ['gz', 'bz2', 'xz']:
+            path = self.path(f'events.csv.{extension}')
+            self.df.to_csv(path, index=False)
+            pd.testing.assert_frame_equal(load_dataset(path), expected)
+
+    def test_zip_archive(self):
+        """Testa a leitura de events.csv de dentro de um zip com outros arquivos."""
+        path = self.path('football-events.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.write(self.csv_path, 'events.csv')
+            archive.writestr('ginf.csv', 'id_odsp,league\n')
+            archive.writestr('dictionary.txt', 'side\n1\tHome\n')
+        pd.testing.assert_frame_equal(load_dataset(path), load_dataset(self.csv_path))
+
+    def test_chunked_compressed(self):
+        """Testa a leitura em pedaços de um arquivo comprimido."""
+        path = self.path('events.csv.gz')
+        self.df.to_csv(path, index=False)
+        chunks = list(load_dataset(path, chunksize=50))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), len(self.df))
+        self.assertTrue(all(len(chunk) <= 50 for chunk in chunks))
+
+    def test_close_before_end(self):
+        """Testa que fechar o arquivo antes do fim encerra a leitura em segundo plano."""
+        path = self.path('events.csv.gz')
+        self.df.to_csv(path, index=False)
+        stream = open_compressed(path)
+        self.assertTrue(stream.read(10))
+        stream.close()
+        self.assertTrue(stream.closed)
+
+    def test_invalid_inputs(self):
+        """Testa os erros de caminho, de arquivo ausente e de zip sem CSV definido."""
+        self.assertRaises(TypeError, load_dataset, 7)
+        self.assertRaises(FileNotFoundError, load_dataset, self.path('missing.csv.gz'))
+        self.assertRaises(FileNotFoundError, load_dataset, self.path('missing.zip'))
+
+        path = self.path('two.zip')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('a.csv', 'x\n1\n')
+            archive.writestr('b.csv', 'x\n2\n')
+        self.assertRaises(ValueError, load_dataset, path)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from utils import load_dictionary
+from validation import code_violations, validate_events, check_events
+
+dictionary = load_dictionary('../data/dictionary.txt')
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(20, seed=14)
+
+    def violations(self, df):
+        report = validate_events(df, dictionary)
+        return report.set_index(['check', 'column'])
+
+    def test_valid_events(self):
+        """Testa se um DataFrame válido não tem violações."""
+        report = check_events(self.df, dictionary)
+        self.assertEqual(report['violations'].sum(), 0)
+        self.assertIn('sort_order_monotonic', set(report['check']))
+
+    def test_invalid_codes(self):
+        """Testa a detecção de códigos inválidos, inclusive não inteiros."""
+        self.df.loc[3, 'location'] = 25
+        self.df.loc[5, 'location'] = 2.5
+        self.df.loc[7, 'event_type2'] = 3
+        self.df.loc[9, 'is_goal'] = np.nan
+        masks = code_violations(self.df, dictionary)
+        self.assertEqual(list(np.flatnonzero(masks['location'])), [3, 5])
+        self.assertEqual(list(np.flatnonzero(masks['event_type2'])), [7])
+        self.assertEqual(list(np.flatnonzero(masks['is_goal'])), [9])
+        self.assertFalse(masks['shot_place'].any())
+
+        report = self.violations(self.df)
+        self.assertEqual(report.loc[('codes', 'location'), 'violations'], 2)
+        self.assertEqual(report.loc[('codes', 'location'), 'examples'], [3, 5])
+
+    def test_order_checks(self):
+        """Testa a detecção de eventos fora de ordem e de partidas intercaladas."""
+        df = self.df.copy()
+        df.loc[10, 'sort_order'] = df.loc[9, 'sort_order']
+        # Move o primeiro evento da partida 1 para o meio da partida 0
+        moved = df.index[df['id_odsp'] == 'match0001'][0]
+        order = [i for i in df.index[:5]] + [moved] + [i for i in df.index[5:] if i != moved]
+        report = self.violations(df.loc[order].reset_index(drop=True))
+        self.assertEqual(report.loc[('sort_order_monotonic', 'sort_order'), 'violations'], 1)
+        self.assertGreaterEqual(report.loc[('match_contiguous', 'id_odsp'), 'violations'], 1)
+
+    def test_duplicates_time_and_goals(self):
+        """Testa id_event repetido, tempo fora do intervalo e gols inconsistentes."""
+        self.df.loc[4, 'id_event'] = self.df.loc[2, 'id_event']
+        self.df.loc[6, 'time'] = 200
+        non_shot = self.df.index[self.df['event_type'] != 1][0]
+        self.df.loc[non_shot, 'is_goal'] = 1
+        goal = self.df.index[(self.df['event_type'] == 1) & (self.df['is_goal'] == 1)][0]
+        self.df.loc[goal, 'shot_outcome'] = 2
+
+        report = self.violations(self.df)
+        self.assertEqual(report.loc[('id_event_unique', 'id_event'), 'violations'], 2)
+        self.assertEqual(report.loc[('time_range', 'time'), 'examples'], [6])
+        self.assertEqual(report.loc[('goal_is_shot', 'is_goal'), 'examples'], [non_shot])
+        self.assertEqual(report.loc[('goal_on_target', 'shot_outcome'), 'examples'], [goal])
+        with self.assertRaises(ValueError):
+            check_events(self.df, dictionary)
+
+    def test_errors(self):
+        """Testa os erros de code_violations."""
+        with self.assertRaises(TypeError):
+            code_violations([], dictionary)
+        with self.assertRaises(TypeError):
+            code_violations(self.df, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
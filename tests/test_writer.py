@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from clean_data import clean_data
+from fake_events import make_events
+from utils import load_dataset
+from writer import (atomic_output, prune_runs, publish_latest, run_output_dir, save_figure,
+                    wait_for_writes, write_csv, write_in_background)
+
+
+class TestWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.df = make_events(5, seed=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_atomic_output(self):
+        """Testa que o arquivo só é publicado quando a escrita termina sem erros."""
+        path = self.path('report.txt')
+        with atomic_output(path) as tmp_path:
+            with open(tmp_path, 'w') as file:
+                file.write('primeira')
+
+        with self.assertRaises(RuntimeError):
+            with atomic_output(path) as tmp_path:
+                with open(tmp_path, 'w') as file:
+                    file.write('incompleta')
+                raise RuntimeError
+
+        with open(path) as file:
+            self.assertEqual(file.read(), 'primeira')
+        self.assertEqual(os.listdir(self.directory.name), ['report.txt'])
+
+    def test_write_csv_blocks_and_compression(self):
+        """Testa a gravação em blocos, com e sem compressão, contra o CSV original."""
+        expected = self.df.reset_index(drop=True)
+        for name, blocks in [('plain.csv', 1), ('blocks.csv', 4), ('events.csv.gz', 3),
+                             ('events.csv.bz2', 2), ('events.csv.xz', 1)]:
+            path = write_csv(self.df, self.path(name), blocks)
+            pd.testing.assert_frame_equal(load_dataset(path), expected,
+                                          check_dtype=False)
+
+    def test_write_empty_dataframe(self):
+        """Testa que um DataFrame vazio gera um arquivo só com o cabeçalho."""
+        path = write_csv(self.df.iloc[:0], self.path('empty.csv.gz'), 4)
+        self.assertEqual(list(load_dataset(path).columns), list(self.df.columns))
+
+    def test_write_in_background(self):
+        """Testa a gravação em segundo plano e a espera pelo seu término."""
+        future = write_in_background(self.df, self.path('background.csv'), 2)
+        self.assertEqual(wait_for_writes(), [self.path('background.csv')])
+        self.assertTrue(future.done())
+        self.assertEqual(len(load_dataset(self.path('background.csv'))), len(self.df))
+        self.assertEqual(wait_for_writes(), [])
+
+    def test_background_error(self):
+        """Testa que o erro de uma gravação em segundo plano aparece na espera."""
+        write_in_background(self.df, self.path('blocks.csv'), 0)
+        with self.assertRaises(ValueError):
+            wait_for_writes()
+
+    def test_background_errors_wait_for_all(self):
+        """Testa que a espera termina todas as gravações antes de levantar o erro."""
+        write_in_background(self.df, self.path('blocks.csv'), 0)
+        future = write_in_background(self.df, self.path('other.csv'), 1)
+        with self.assertRaises(ValueError):
+            wait_for_writes()
+        self.assertTrue(future.done())
+        self.assertTrue(os.path.isfile(self.path('other.csv')))
+
+    def test_publish_latest(self):
+        """Testa a publicação dos arquivos da execução mais recente."""
+        target = self.path('data')
+        for rows in (3, 7):
+            run_dir = run_output_dir(self.path('runs'))
+            write_csv(self.df.iloc[:rows], os.path.join(run_dir, 'cleaned_events.csv'))
+            published = publish_latest(run_dir, target)
+
+        self.assertEqual(published, [os.path.join(target, 'cleaned_events.csv')])
+        self.assertEqual(len(load_dataset(published[0])), 7)
+        self.assertEqual(sorted(os.listdir(target)), ['cleaned_events.csv'])
+
+    def test_prune_runs(self):
+        """Testa que só as execuções mais recentes são mantidas."""
+        base = self.path('runs')
+        runs = [run_output_dir(base) for _ in range(4)]
+        self.assertEqual(prune_runs(base, keep=2), runs[:2])
+        self.assertEqual(sorted(os.listdir(base)), [os.path.basename(run) for run in runs[2:]])
+        self.assertEqual(prune_runs(self.path('missing')), [])
+        self.assertRaises(ValueError, prune_runs, base, -1)
+
+    def test_run_output_dir(self):
+        """Testa que cada execução recebe um diretório diferente."""
+        first = run_output_dir(self.directory.name)
+        second = run_output_dir(self.directory.name)
+        self.assertNotEqual(first, second)
+        self.assertTrue(os.path.isdir(first) and os.path.isdir(second))
+
+    def test_save_figure(self):
+        """Testa o salvamento atômico da figura atual."""
+        plt.figure()
+        plt.plot([0, 1], [1, 0])
+        path = save_figure(self.path('graph.png'), dpi=50)
+        plt.close()
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_clean_data_background(self):
+        """Testa a gravação dos eventos limpos em segundo plano e comprimida."""
+        def raw_events():
+            df = self.df.copy()
+            for column in ['id_event', 'sort_order', 'text', 'event_type2', 'event_team',
+                           'opponent', 'player', 'player2', 'player_in', 'player_out',
+                           'shot_place']:
+                df[column] = 0
+            return df
+
+        df = raw_events()
+        future = clean_data(df, self.directory.name, background=True, compression='gz',
+                            blocks=2)
+        wait_for_writes()
+        written = load_dataset(future.result())
+        self.assertEqual(list(written.columns), list(df.columns))
+        self.assertEqual(len(written), len(df))
+
+        self.assertIsNone(clean_data(raw_events(), self.directory.name))
+        self.assertTrue(os.path.isfile(self.path('cleaned_events.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
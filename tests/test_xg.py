@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('../src')
+
+from fake_events import make_events
+from shots import expected_goals_summary
+from xg import (FEATURE_CODES, shot_features, fit_xg, predict_xg, save_xg_model,
+                load_xg_model, load_or_fit_xg)
+
+
+class TestXG(unittest.TestCase):
+    def setUp(self):
+        self.df = make_events(80, seed=5)
+        self.shots = self.df[self.df['event_type'] == 1]
+
+    def test_shot_features(self):
+        """Testa a codificação one-hot: uma coluna ativa por variável conhecida."""
+        features, names = shot_features(self.shots)
+        self.assertEqual(features.shape, (len(self.shots), len(names)))
+        self.assertEqual(names[0], 'intercept')
+        self.assertEqual(len(names), 1 + sum(len(codes) for codes in FEATURE_CODES.values()))
+        location = names.index(f"location={int(self.shots['location'].iloc[0])}")
+        self.assertEqual(features[0, location], 1)
+        known = sum(self.shots[column].isin(codes).to_numpy().astype(int)
+                    for column, codes in FEATURE_CODES.items())
+        np.testing.assert_array_equal(features.sum(axis=1), 1 + known)
+
+    def test_unknown_codes(self):
+        """Testa que códigos desconhecidos e ausentes zeram as colunas da variável."""
+        shots = self.shots.head(2).copy()
+        shots['location'] = [99, np.nan]
+        features, names = shot_features(shots)
+        columns = [i for i, name in enumerate(names) if name.startswith('location=')]
+        self.assertEqual(features[:, columns].sum(), 0)
+
+    def test_fit_xg(self):
+        """Testa que o modelo é calibrado e supera a taxa média de conversão."""
+        model = fit_xg(self.df)
+        goals = (self.shots['is_goal'] == 1).to_numpy()
+        expected = predict_xg(model, self.shots)
+        self.assertTrue(((expected > 0) & (expected < 1)).all())
+        self.assertAlmostEqual(expected.sum(), goals.sum(), delta=1.0)
+
+        rate = goals.mean()
+        baseline = -(rate * np.log(rate) + (1 - rate) * np.log(1 - rate))
+        self.assertLess(model['log_loss'], baseline)
+        self.assertEqual(model['n_shots'], len(self.shots))
+
+    def test_save_and_load(self):
+        """Testa que o modelo gravado produz as mesmas probabilidades."""
+        model = fit_xg(self.df)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'xg_model.npz')
+            save_xg_model(model, path)
+            loaded = load_xg_model(path)
+            self.assertEqual(loaded['feature_names'], model['feature_names'])
+            np.testing.assert_allclose(predict_xg(loaded, self.shots),
+                                       predict_xg(model, self.shots))
+
+            # O modelo gravado é usado mesmo para outro DataFrame
+            reused = load_or_fit_xg(make_events(10, seed=1), path)
+            np.testing.assert_array_equal(reused['weights'], model['weights'])
+
+            with self.assertRaises(FileNotFoundError):
+                load_xg_model(os.path.join(tmp, 'missing.npz'))
+
+    def test_refit_on_new_dataset(self):
+        """Testa que o modelo gravado só é reaproveitado para o mesmo dataset."""
+        other = make_events(10, seed=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'xg_model.npz')
+            model = load_or_fit_xg(self.df, path, 'dataset-a')
+            self.assertEqual(load_xg_model(path)['fingerprint'], 'dataset-a')
+
+            reused = load_or_fit_xg(other, path, 'dataset-a')
+            np.testing.assert_array_equal(reused['weights'], model['weights'])
+
+            refit = load_or_fit_xg(other, path, 'dataset-b')
+            np.testing.assert_array_equal(refit['weights'], fit_xg(other)['weights'])
+            self.assertEqual(load_xg_model(path)['fingerprint'], 'dataset-b')
+
+    def test_expected_goals_summary(self):
+        """Testa o resumo de gols esperados dentro e fora da área."""
+        summary = expected_goals_summary(self.df, fit_xg(self.df)).set_index('Situação')
+        self.assertEqual(list(summary.index), ['Dentro da área', 'Fora da área'])
+        self.assertGreater(summary.loc['Dentro da área', 'xG por chute'],
+                           summary.loc['Fora da área', 'xG por chute'])
+
+    def test_errors(self):
+        """Testa os erros do módulo."""
+        with self.assertRaises(TypeError):
+            shot_features([])
+        with self.assertRaises(KeyError):
+            shot_features(self.shots.drop(columns=['situation']))
+        with self.assertRaises(KeyError):
+            fit_xg(self.df.drop(columns=['is_goal']))
+        with self.assertRaises(ValueError):
+            fit_xg(self.df[self.df['event_type'] != 1])
+        with self.assertRaises(ValueError):
+            fit_xg(self.df, l2=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()